@@ -58,7 +58,12 @@ class Config:
             "confidence_threshold": 0.7,
             "max_knowledge_entries": 10000,
             "auto_save": True,
-            "backup_enabled": True
+            "backup_enabled": True,
+            "backup_interval_sec": 3600,       # at most one backup per interval
+            "journal_flush_interval_sec": 1.0,  # write-behind journal flush cadence
+            "journal_fsync": False,
+            "compact_interval_sec": 300,       # fold journal into the JSON file
+            "compact_batch_size": 1000         # ...or after this many journal records
         }
         
         # Application settings
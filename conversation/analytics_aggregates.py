@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+Conversation Analytics Aggregates
+Streaming aggregates behind AdvancedConversationManager's analytics: running
+means, a bounded satisfaction trend with daily rollups and a top-K topic
+heap, so recording an event and reading the dashboard cost O(1) in the
+number of conversations, and only metrics that changed are persisted
+"""
+
+import heapq
+from collections import Counter, OrderedDict, deque
+from datetime import datetime
+from typing import Any, Dict, Hashable, List, Optional, Set, Tuple
+
+
+class RunningMean:
+    """Count and total of a stream of values"""
+
+    def __init__(self, count: int = 0, total: float = 0.0):
+        self.count = count
+        self.total = total
+
+    def add(self, value: float):
+        self.count += 1
+        self.total += value
+
+    @property
+    def mean(self) -> float:
+        return self.total / max(self.count, 1)
+
+    def to_dict(self) -> Dict[str, float]:
+        return {"count": self.count, "total": self.total}
+
+
+class TrendRollup:
+    """Last `recent_size` points in a ring buffer plus per-day (count, total) buckets for `max_days` days"""
+
+    def __init__(self, recent_size: int = 100, max_days: int = 90):
+        self.recent: deque = deque(maxlen=max(1, recent_size))
+        self.max_days = max(1, max_days)
+        self.daily: "OrderedDict[str, List[float]]" = OrderedDict()
+
+    def add(self, timestamp: datetime, value: float):
+        self.recent.append({"timestamp": timestamp.isoformat(), "score": value})
+        day = timestamp.date().isoformat()
+        bucket = self.daily.get(day)
+        if bucket is None:
+            bucket = self.daily[day] = [0, 0.0]
+            # Days normally arrive in order; keep the newest max_days
+            while len(self.daily) > self.max_days:
+                self.daily.popitem(last=False)
+        bucket[0] += 1
+        bucket[1] += value
+
+    def last(self, n: int) -> List[Dict[str, Any]]:
+        start = max(len(self.recent) - n, 0)
+        return [self.recent[i] for i in range(start, len(self.recent))]
+
+
+class TopK:
+    """
+    Exact top-k keys of monotonically increasing counters. Members sit in a
+    min-heap keyed by (count, -first_seen); an increment of a non-member only
+    compares against the heap minimum. Ties rank by first appearance.
+    """
+
+    def __init__(self, k: int = 10):
+        self.k = max(1, k)
+        self.counts: Dict[Hashable, int] = {}
+        self._seq: Dict[Hashable, int] = {}
+        self._members: Set[Hashable] = set()
+        self._heap: List[Tuple[int, int, Hashable]] = []  # May hold stale entries
+
+    def __len__(self) -> int:
+        return len(self.counts)
+
+    def _entry(self, key: Hashable) -> Tuple[int, int, Hashable]:
+        return (self.counts[key], -self._seq[key], key)
+
+    def _min(self) -> Tuple[int, int, Hashable]:
+        while True:
+            entry = self._heap[0]
+            if entry[2] in self._members and entry[0] == self.counts[entry[2]]:
+                return entry
+            heapq.heappop(self._heap)
+
+    def increment(self, key: Hashable, by: int = 1):
+        if key not in self.counts:
+            self._seq[key] = len(self._seq)
+            self.counts[key] = 0
+        self.counts[key] += by
+        entry = self._entry(key)
+        if key in self._members:
+            heapq.heappush(self._heap, entry)
+            if len(self._heap) > 4 * self.k + 16:
+                self._heap = [self._entry(member) for member in self._members]
+                heapq.heapify(self._heap)
+        elif len(self._members) < self.k:
+            self._members.add(key)
+            heapq.heappush(self._heap, entry)
+        else:
+            lowest = self._min()
+            if entry[:2] > lowest[:2]:
+                heapq.heapreplace(self._heap, entry)
+                self._members.discard(lowest[2])
+                self._members.add(key)
+
+    def top(self) -> List[Tuple[Hashable, int]]:
+        """(key, count) of the members, highest count first"""
+        return sorted(((key, self.counts[key]) for key in self._members),
+                      key=lambda item: (-item[1], self._seq[item[0]]))
+
+
+class ConversationAnalytics:
+    """Aggregates recorded per ended conversation, with dirty tracking for persistence"""
+
+    def __init__(self, trend_points: int = 100, retention_days: int = 90, top_topics: int = 10):
+        self.total_conversations = 0
+        self.language_distribution: Dict[str, int] = {}
+        self.language_total = 0
+        self.satisfaction = RunningMean()
+        self.satisfaction_trend = TrendRollup(trend_points, retention_days)
+        self.topics = TopK(top_topics)
+        self.relationships: Counter = Counter()
+        # Metrics loaded from the database that nothing updates any more; kept as they were
+        self.extra: Dict[str, Any] = {}
+        self._loaded: Set[str] = set()
+        self._dirty: Set[str] = set()
+
+    # -------------------- Recording --------------------
+    def record_conversation(self, languages: List[str], satisfaction_score: Optional[float],
+                            end_time: Optional[datetime]):
+        self.total_conversations += 1
+        self._dirty.add("total_conversations")
+        for lang in languages:
+            self.language_distribution[lang] = self.language_distribution.get(lang, 0) + 1
+            self.language_total += 1
+            self._dirty.add("language_distribution")
+        if satisfaction_score:
+            self.satisfaction.add(satisfaction_score)
+            self.satisfaction_trend.add(end_time or datetime.now(), satisfaction_score)
+            self._dirty.update(("satisfaction_summary", "satisfaction_trends", "satisfaction_daily"))
+
+    def record_topic(self, topic: str, by: int = 1):
+        self.topics.increment(topic, by)
+
+    def record_relationship(self, level: str, previous: Optional[str] = None):
+        if previous is not None:
+            self.relationships[previous] -= 1
+            if self.relationships[previous] <= 0:
+                del self.relationships[previous]
+        self.relationships[level] += 1
+
+    # -------------------- Persistence --------------------
+    def _metric(self, name: str) -> Any:
+        if name == "total_conversations":
+            return self.total_conversations
+        if name == "language_distribution":
+            return self.language_distribution
+        if name == "satisfaction_summary":
+            return self.satisfaction.to_dict()
+        if name == "satisfaction_trends":
+            return list(self.satisfaction_trend.recent)
+        if name == "satisfaction_daily":
+            return dict(self.satisfaction_trend.daily)
+        return self.extra[name]
+
+    def load_metric(self, name: str, data: Any):
+        """Restore one persisted metric (including the unbounded pre-aggregate trend list)"""
+        if name == "total_conversations":
+            self.total_conversations = int(data)
+        elif name == "language_distribution":
+            self.language_distribution = dict(data)
+            self.language_total = sum(self.language_distribution.values())
+        elif name == "satisfaction_summary":
+            self.satisfaction = RunningMean(data.get("count", 0), data.get("total", 0.0))
+        elif name == "satisfaction_trends":
+            if "satisfaction_summary" not in self._loaded:
+                # Old databases kept every rating here: fold them into the aggregates once
+                for point in data:
+                    score = point.get("score")
+                    if score:
+                        self.satisfaction.add(score)
+                        self.satisfaction_trend.add(datetime.fromisoformat(point["timestamp"]), score)
+                self._dirty.update(("satisfaction_summary", "satisfaction_trends", "satisfaction_daily"))
+            else:
+                self.satisfaction_trend.recent.extend(data)
+        elif name == "satisfaction_daily":
+            self.satisfaction_trend.daily = OrderedDict(sorted(data.items())[-self.satisfaction_trend.max_days:])
+        else:
+            self.extra[name] = data
+        self._loaded.add(name)
+
+    def load_metrics(self, metrics: Dict[str, Any]):
+        # The summary decides how the trend list is read, so it goes first
+        for name in sorted(metrics, key=lambda n: (n != "satisfaction_summary", n != "satisfaction_daily")):
+            self.load_metric(name, metrics[name])
+
+    def take_dirty(self) -> Dict[str, Any]:
+        """Changed metrics since the last call, as JSON-serializable values"""
+        changed = {name: self._metric(name) for name in sorted(self._dirty)}
+        self._dirty.clear()
+        return changed
+
+    def all_metrics(self) -> Dict[str, Any]:
+        names = ["total_conversations", "language_distribution", "satisfaction_summary",
+                 "satisfaction_trends", "satisfaction_daily", *self.extra]
+        return {name: self._metric(name) for name in names}
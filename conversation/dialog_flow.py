@@ -9,14 +9,17 @@ import json
 import time
 import sqlite3
 import threading
-from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any, Tuple
+from datetime import datetime
+from typing import Dict, List, Optional, Any, Tuple, Callable, Iterator, Union
 from dataclasses import dataclass, asdict
 from enum import Enum
 import hashlib
 import pickle
 import os
 
+from conversation.session_store import ActiveSessionStore
+from conversation.analytics_aggregates import ConversationAnalytics
+
 try:
     from utils.logger import log_info, log_error, log_warning
 except ImportError:
@@ -111,13 +114,164 @@ class ConversationSession:
     business_outcome: Optional[str]
     follow_up_required: bool
     summary: Optional[str]
+    sentiment_total: float = 0.0  # Running sum of turn sentiment weights
+
+SENTIMENT_WEIGHTS = {"positive": 1, "neutral": 0, "negative": -1}
+
+class LazyTurnList:
+    """
+    Turns of a persisted session, read from conversation_turns one page at a
+    time as they are indexed or iterated. New turns are appended in memory.
+    """
+    
+    def __init__(self, load_page: Callable[[int, int], List[ConversationTurn]], count: int, page_size: int = 50):
+        self._load_page = load_page  # (offset, limit) -> turns
+        self._count = count
+        self.page_size = max(1, page_size)
+        self._turns: Dict[int, ConversationTurn] = {}
+    
+    def __len__(self) -> int:
+        return self._count
+    
+    def _ensure(self, index: int):
+        if index not in self._turns:
+            start = index - index % self.page_size
+            for offset, turn in enumerate(self._load_page(start, self.page_size), start):
+                self._turns.setdefault(offset, turn)
+    
+    def __getitem__(self, index: Union[int, slice]):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._count))]
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("turn index out of range")
+        self._ensure(index)
+        return self._turns[index]
+    
+    def __iter__(self) -> Iterator[ConversationTurn]:
+        for index in range(self._count):
+            yield self[index]
+    
+    def append(self, turn: ConversationTurn):
+        self._turns[self._count] = turn
+        self._count += 1
+    
+    @property
+    def loaded(self) -> int:
+        """Number of turns held in memory"""
+        return len(self._turns)
+
+SESSION_COLUMNS = (
+    "session_id, user_id, start_time, end_time, primary_language, languages_used, topics_discussed, "
+    "phases_completed, overall_sentiment, satisfaction_score, business_outcome, follow_up_required, "
+    "summary, turn_count, sentiment_total"
+)
+
+TURN_COLUMNS = (
+    "session_id, turn_index, turn_id, timestamp, user_input, system_response, detected_language, "
+    "intent, sentiment, confidence, topic, phase, voice_used, response_time, satisfaction_score"
+)
+
+# Schema changes, applied in order and tracked in PRAGMA user_version
+SCHEMA_MIGRATIONS: Tuple[Tuple[int, Tuple[str, ...]], ...] = (
+    # Normalized sessions: one header row per session, turns appended by (session_id, turn_index).
+    # Existing conversation_sessions JSON blobs are unpacked, then the blob table is dropped.
+    (1, (
+        """
+        CREATE TABLE IF NOT EXISTS conversation_sessions (
+            session_id TEXT PRIMARY KEY,
+            user_id TEXT,
+            session_data TEXT,
+            start_time TIMESTAMP,
+            end_time TIMESTAMP
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS sessions (
+            session_id TEXT PRIMARY KEY,
+            user_id TEXT,
+            start_time TIMESTAMP,
+            end_time TIMESTAMP,
+            primary_language TEXT,
+            languages_used TEXT,
+            topics_discussed TEXT,
+            phases_completed TEXT,
+            overall_sentiment TEXT,
+            satisfaction_score REAL,
+            business_outcome TEXT,
+            follow_up_required INTEGER DEFAULT 0,
+            summary TEXT,
+            turn_count INTEGER DEFAULT 0,
+            sentiment_total REAL DEFAULT 0
+        )
+        """,
+        "CREATE INDEX IF NOT EXISTS idx_sessions_user_start ON sessions(user_id, start_time)",
+        """
+        CREATE TABLE IF NOT EXISTS conversation_turns (
+            session_id TEXT NOT NULL,
+            turn_index INTEGER NOT NULL,
+            turn_id TEXT,
+            timestamp TIMESTAMP,
+            user_input TEXT,
+            system_response TEXT,
+            detected_language TEXT,
+            intent TEXT,
+            sentiment TEXT,
+            confidence REAL,
+            topic TEXT,
+            phase TEXT,
+            voice_used TEXT,
+            response_time REAL,
+            satisfaction_score REAL,
+            PRIMARY KEY (session_id, turn_index)
+        ) WITHOUT ROWID
+        """,
+        f"""
+        INSERT OR IGNORE INTO sessions ({SESSION_COLUMNS})
+        SELECT session_id, user_id,
+               json_extract(session_data, '$.start_time'), json_extract(session_data, '$.end_time'),
+               json_extract(session_data, '$.primary_language'),
+               json(COALESCE(json_extract(session_data, '$.languages_used'), '[]')),
+               json(COALESCE(json_extract(session_data, '$.topics_discussed'), '[]')),
+               json(COALESCE(json_extract(session_data, '$.phases_completed'), '[]')),
+               json_extract(session_data, '$.overall_sentiment'),
+               json_extract(session_data, '$.satisfaction_score'),
+               json_extract(session_data, '$.business_outcome'),
+               COALESCE(json_extract(session_data, '$.follow_up_required'), 0),
+               json_extract(session_data, '$.summary'),
+               0, 0
+        FROM conversation_sessions WHERE json_valid(session_data)
+        """,
+        f"""
+        INSERT OR IGNORE INTO conversation_turns ({TURN_COLUMNS})
+        SELECT s.session_id, CAST(t.key AS INTEGER),
+               json_extract(t.value, '$.turn_id'), json_extract(t.value, '$.timestamp'),
+               json_extract(t.value, '$.user_input'), json_extract(t.value, '$.system_response'),
+               json_extract(t.value, '$.detected_language'), json_extract(t.value, '$.intent'),
+               json_extract(t.value, '$.sentiment'), json_extract(t.value, '$.confidence'),
+               json_extract(t.value, '$.topic'), json_extract(t.value, '$.phase'),
+               json_extract(t.value, '$.voice_used'), json_extract(t.value, '$.response_time'),
+               json_extract(t.value, '$.satisfaction_score')
+        FROM conversation_sessions s, json_each(s.session_data, '$.turns') t
+        WHERE json_valid(s.session_data)
+        """,
+        """
+        UPDATE sessions SET
+            turn_count = (SELECT COUNT(*) FROM conversation_turns t WHERE t.session_id = sessions.session_id),
+            sentiment_total = (SELECT COALESCE(SUM(CASE t.sentiment WHEN 'positive' THEN 1
+                                                                    WHEN 'negative' THEN -1 ELSE 0 END), 0)
+                               FROM conversation_turns t WHERE t.session_id = sessions.session_id)
+        """,
+        "DROP TABLE conversation_sessions",
+    )),
+)
 
 class AdvancedConversationManager:
     """Advanced conversation management with persistence and analytics"""
     
     def __init__(self, database_path: str = "conversation_data.db"):
         self.database_path = database_path
-        self.active_sessions = {}  # session_id -> ConversationSession
         self.user_profiles = {}    # user_id -> UserProfile
         self.topic_tracker = {}    # topic_id -> TopicInfo
         
@@ -130,19 +284,30 @@ class AdvancedConversationManager:
             "personality_learning_enabled": True,
             "topic_persistence_enabled": True,
             "voice_preference_learning": True,
-            "satisfaction_tracking": True
+            "satisfaction_tracking": True,
+            "turn_page_size": 50,
+            "max_resident_turns": 5000,
+            "session_expiry_tick_seconds": 60,
+            "satisfaction_trend_points": 100,
+            "top_topics": 10
         }
         
-        # Analytics
-        self.analytics = {
-            "total_conversations": 0,
-            "average_conversation_length": 0.0,
-            "most_common_topics": [],
-            "language_distribution": {},
-            "satisfaction_trends": [],
-            "personality_distribution": {},
-            "phase_completion_rates": {}
-        }
+        # session_id -> ConversationSession; idle sessions spill to the database
+        self.active_sessions = ActiveSessionStore(
+            load=self.load_session,
+            spill=self._persist_session,
+            max_sessions=self.config["max_active_sessions"],
+            max_resident_turns=self.config["max_resident_turns"],
+            idle_timeout=self.config["session_timeout_minutes"] * 60,
+            tick_seconds=self.config["session_expiry_tick_seconds"]
+        )
+        
+        # Analytics (streaming aggregates; only changed metrics are persisted)
+        self.analytics = ConversationAnalytics(
+            trend_points=self.config["satisfaction_trend_points"],
+            retention_days=self.config["memory_retention_days"],
+            top_topics=self.config["top_topics"]
+        )
         
         # Thread safety
         self._lock = threading.RLock()
@@ -169,18 +334,6 @@ class AdvancedConversationManager:
                     )
                 """)
                 
-                # Conversation sessions table
-                cursor.execute("""
-                    CREATE TABLE IF NOT EXISTS conversation_sessions (
-                        session_id TEXT PRIMARY KEY,
-                        user_id TEXT,
-                        session_data TEXT,
-                        start_time TIMESTAMP,
-                        end_time TIMESTAMP,
-                        FOREIGN KEY (user_id) REFERENCES user_profiles (user_id)
-                    )
-                """)
-                
                 # Topics table
                 cursor.execute("""
                     CREATE TABLE IF NOT EXISTS topics (
@@ -201,11 +354,32 @@ class AdvancedConversationManager:
                 """)
                 
                 conn.commit()
+                
+                # Sessions and turns tables (and blob migration)
+                self._migrate(conn)
+                
                 log_info("✅ Conversation database initialized")
                 
         except Exception as e:
             log_error(f"Database initialization failed: {e}")
     
+    def _migrate(self, conn: sqlite3.Connection):
+        """Apply SCHEMA_MIGRATIONS newer than the database's user_version, each in one transaction"""
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        for target, statements in SCHEMA_MIGRATIONS:
+            if target <= version:
+                continue
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                for statement in statements:
+                    conn.execute(statement)
+                conn.execute(f"PRAGMA user_version = {int(target)}")
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+            log_info(f"📦 Conversation database migrated to schema version {target}")
+    
     def _load_persistent_data(self):
         """Load persistent data from database"""
         try:
@@ -223,6 +397,7 @@ class AdvancedConversationManager:
                         profile_dict['personality_type'] = UserPersonality(profile_dict['personality_type'])
                         
                         self.user_profiles[user_id] = UserProfile(**profile_dict)
+                        self.analytics.record_relationship(self.user_profiles[user_id].business_relationship)
                     except Exception as e:
                         log_warning(f"Failed to load user profile {user_id}: {e}")
                 
@@ -233,16 +408,19 @@ class AdvancedConversationManager:
                         topic_dict = json.loads(topic_data)
                         topic_dict['last_discussed'] = datetime.fromisoformat(topic_dict['last_discussed'])
                         self.topic_tracker[topic_id] = TopicInfo(**topic_dict)
+                        self.analytics.record_topic(topic_id, self.topic_tracker[topic_id].frequency)
                     except Exception as e:
                         log_warning(f"Failed to load topic {topic_id}: {e}")
                 
                 # Load analytics
                 cursor.execute("SELECT metric_name, metric_data FROM analytics")
+                metrics = {}
                 for metric_name, metric_data in cursor.fetchall():
                     try:
-                        self.analytics[metric_name] = json.loads(metric_data)
+                        metrics[metric_name] = json.loads(metric_data)
                     except Exception as e:
                         log_warning(f"Failed to load analytics {metric_name}: {e}")
+                self.analytics.load_metrics(metrics)
                 
                 log_info(f"📊 Loaded {len(self.user_profiles)} user profiles, {len(self.topic_tracker)} topics")
                 
@@ -278,6 +456,7 @@ class AdvancedConversationManager:
                 )
                 
                 self.active_sessions[session_id] = session
+                self._persist_session(session)
                 
                 # Update user profile
                 user_profile.last_interaction = current_time
@@ -337,6 +516,10 @@ class AdvancedConversationManager:
                 # Update session metadata
                 self._update_session_metadata(session, turn)
                 
+                # Append the turn (and refresh the session header) in the database
+                self._persist_turn(session, turn, len(session.turns) - 1)
+                self.active_sessions.touch(session_id)
+                
                 # Update topic tracking
                 self._update_topic_tracking(topic, detected_language)
                 
@@ -510,15 +693,17 @@ class AdvancedConversationManager:
                 # Get user's conversation history
                 with sqlite3.connect(self.database_path) as conn:
                     cursor = conn.cursor()
-                    cursor.execute("""
-                        SELECT session_data FROM conversation_sessions 
+                    cursor.execute(f"""
+                        SELECT {SESSION_COLUMNS} FROM sessions 
                         WHERE user_id = ? ORDER BY start_time DESC LIMIT 10
                     """, (user_id,))
                     
                     recent_sessions = []
-                    for (session_data,) in cursor.fetchall():
+                    for row in cursor.fetchall():
                         try:
-                            session_dict = json.loads(session_data)
+                            session_dict = dict(zip(SESSION_COLUMNS.split(", "), row))
+                            for key in ("languages_used", "topics_discussed", "phases_completed"):
+                                session_dict[key] = json.loads(session_dict[key] or "[]")
                             recent_sessions.append(session_dict)
                         except:
                             continue
@@ -599,6 +784,7 @@ class AdvancedConversationManager:
         )
         
         self.user_profiles[user_id] = profile
+        self.analytics.record_relationship(profile.business_relationship)
         self._persist_user_profile(profile)
         
         log_info(f"👤 Created new user profile for {user_id}")
@@ -646,10 +832,9 @@ class AdvancedConversationManager:
         if turn.phase not in session.phases_completed:
             session.phases_completed.append(turn.phase)
         
-        # Update overall sentiment (weighted average)
-        sentiments = [t.sentiment for t in session.turns]
-        sentiment_weights = {"positive": 1, "neutral": 0, "negative": -1}
-        avg_sentiment = sum(sentiment_weights.get(s, 0) for s in sentiments) / len(sentiments)
+        # Update overall sentiment (weighted average, kept as a running total)
+        session.sentiment_total += SENTIMENT_WEIGHTS.get(turn.sentiment, 0)
+        avg_sentiment = session.sentiment_total / len(session.turns)
         
         if avg_sentiment > 0.3:
             session.overall_sentiment = "positive"
@@ -675,6 +860,17 @@ class AdvancedConversationManager:
         topic_info = self.topic_tracker[topic]
         topic_info.frequency += 1
         topic_info.last_discussed = datetime.now()
+        self.analytics.record_topic(topic)
+    
+    def set_business_relationship(self, user_id: str, level: str):
+        """Change a user's relationship level ("new", "regular", "vip"), keeping analytics counts in step"""
+        with self._lock:
+            profile = self.user_profiles.get(user_id)
+            if profile is None or profile.business_relationship == level:
+                return
+            self.analytics.record_relationship(level, previous=profile.business_relationship)
+            profile.business_relationship = level
+            self._persist_user_profile(profile)
     
     def _update_user_profile(self, user_id: str, turn: ConversationTurn):
         """Update user profile based on conversation turn"""
@@ -726,42 +922,140 @@ class AdvancedConversationManager:
         except Exception as e:
             log_error(f"Failed to persist user profile {profile.user_id}: {e}")
     
-    def _persist_session(self, session: ConversationSession):
-        """Persist conversation session to database"""
+    def _session_row(self, session: ConversationSession) -> Tuple:
+        """Session header row (everything but the turns)"""
+        return (
+            session.session_id,
+            session.user_id,
+            session.start_time.isoformat(),
+            session.end_time.isoformat() if session.end_time else None,
+            session.primary_language,
+            json.dumps(session.languages_used),
+            json.dumps(session.topics_discussed),
+            json.dumps([p.value for p in session.phases_completed]),
+            session.overall_sentiment,
+            session.satisfaction_score,
+            session.business_outcome,
+            int(session.follow_up_required),
+            session.summary,
+            len(session.turns),
+            session.sentiment_total
+        )
+    
+    def _persist_session(self, session: ConversationSession) -> bool:
+        """Persist conversation session header to database (turns are appended by _persist_turn)"""
         try:
             with sqlite3.connect(self.database_path) as conn:
-                cursor = conn.cursor()
-                
-                session_dict = asdict(session)
-                # Convert datetime objects and enums to serializable format
-                session_dict['start_time'] = session.start_time.isoformat()
-                session_dict['end_time'] = session.end_time.isoformat() if session.end_time else None
-                
-                # Convert turns
-                turns_serializable = []
-                for turn in session.turns:
-                    turn_dict = asdict(turn)
-                    turn_dict['timestamp'] = turn.timestamp.isoformat()
-                    turn_dict['phase'] = turn.phase.value
-                    turns_serializable.append(turn_dict)
-                session_dict['turns'] = turns_serializable
-                
-                # Convert phases
-                session_dict['phases_completed'] = [p.value for p in session.phases_completed]
-                
-                session_data = json.dumps(session_dict)
-                
-                cursor.execute("""
-                    INSERT OR REPLACE INTO conversation_sessions 
-                    (session_id, user_id, session_data, start_time, end_time)
-                    VALUES (?, ?, ?, ?, ?)
-                """, (session.session_id, session.user_id, session_data, 
-                     session.start_time, session.end_time))
-                
+                conn.execute(f"INSERT OR REPLACE INTO sessions ({SESSION_COLUMNS}) VALUES ({', '.join('?' * 15)})",
+                             self._session_row(session))
                 conn.commit()
+            return True
                 
         except Exception as e:
             log_error(f"Failed to persist session {session.session_id}: {e}")
+            return False
+    
+    def _persist_turn(self, session: ConversationSession, turn: ConversationTurn, turn_index: int):
+        """Append one turn and refresh the session header, independent of the session length"""
+        try:
+            with sqlite3.connect(self.database_path) as conn:
+                conn.execute(f"INSERT OR REPLACE INTO conversation_turns ({TURN_COLUMNS}) VALUES ({', '.join('?' * 15)})", (
+                    session.session_id,
+                    turn_index,
+                    turn.turn_id,
+                    turn.timestamp.isoformat(),
+                    turn.user_input,
+                    turn.system_response,
+                    turn.detected_language,
+                    turn.intent,
+                    turn.sentiment,
+                    turn.confidence,
+                    turn.topic,
+                    turn.phase.value,
+                    turn.voice_used,
+                    turn.response_time,
+                    turn.satisfaction_score
+                ))
+                conn.execute(f"INSERT OR REPLACE INTO sessions ({SESSION_COLUMNS}) VALUES ({', '.join('?' * 15)})",
+                             self._session_row(session))
+                conn.commit()
+                
+        except Exception as e:
+            log_error(f"Failed to persist turn {turn.turn_id}: {e}")
+    
+    def get_session_turns(self, session_id: str, offset: int = 0, limit: int = 50) -> List[ConversationTurn]:
+        """Page of persisted turns of a session, in turn order"""
+        with sqlite3.connect(self.database_path) as conn:
+            cursor = conn.execute(f"""
+                SELECT {TURN_COLUMNS} FROM conversation_turns
+                WHERE session_id = ? AND turn_index >= ? ORDER BY turn_index LIMIT ?
+            """, (session_id, offset, limit))
+            return [
+                ConversationTurn(
+                    turn_id=row[2],
+                    timestamp=datetime.fromisoformat(row[3]),
+                    user_input=row[4],
+                    system_response=row[5],
+                    detected_language=row[6],
+                    intent=row[7],
+                    sentiment=row[8],
+                    confidence=row[9],
+                    topic=row[10],
+                    phase=ConversationPhase(row[11]),
+                    voice_used=row[12],
+                    response_time=row[13] or 0.0,
+                    satisfaction_score=row[14]
+                )
+                for row in cursor.fetchall()
+            ]
+    
+    def load_session(self, session_id: str) -> Optional[ConversationSession]:
+        """Load a persisted session; its turns are read page by page when accessed"""
+        try:
+            with sqlite3.connect(self.database_path) as conn:
+                row = conn.execute(f"SELECT {SESSION_COLUMNS} FROM sessions WHERE session_id = ?",
+                                   (session_id,)).fetchone()
+            if row is None:
+                return None
+            
+            turns = LazyTurnList(
+                lambda offset, limit: self.get_session_turns(session_id, offset, limit),
+                count=row[13] or 0,
+                page_size=self.config["turn_page_size"]
+            )
+            return ConversationSession(
+                session_id=row[0],
+                user_id=row[1],
+                start_time=datetime.fromisoformat(row[2]),
+                end_time=datetime.fromisoformat(row[3]) if row[3] else None,
+                turns=turns,
+                primary_language=row[4],
+                languages_used=json.loads(row[5] or "[]"),
+                topics_discussed=json.loads(row[6] or "[]"),
+                phases_completed=[ConversationPhase(p) for p in json.loads(row[7] or "[]")],
+                overall_sentiment=row[8] or "neutral",
+                satisfaction_score=row[9],
+                business_outcome=row[10],
+                follow_up_required=bool(row[11]),
+                summary=row[12],
+                sentiment_total=row[14] or 0.0
+            )
+            
+        except Exception as e:
+            log_error(f"Failed to load session {session_id}: {e}")
+            return None
+    
+    def resume_conversation(self, session_id: str) -> bool:
+        """Reactivate a persisted session that was not ended (e.g. after a restart)"""
+        with self._lock:
+            if session_id in self.active_sessions:
+                return True
+            session = self.load_session(session_id)
+            if session is None or session.end_time is not None:
+                return False
+            self.active_sessions[session_id] = session
+            log_info(f"🔄 Resumed conversation session {session_id} ({len(session.turns)} turns)")
+            return True
     
     def _generate_session_summary(self, session_id: str) -> str:
         """Generate intelligent session summary"""
@@ -902,34 +1196,26 @@ class AdvancedConversationManager:
     
     def _update_analytics(self, session: ConversationSession):
         """Update conversation analytics"""
-        self.analytics["total_conversations"] += 1
-        
-        # Update language distribution
-        for lang in session.languages_used:
-            self.analytics["language_distribution"][lang] = \
-                self.analytics["language_distribution"].get(lang, 0) + 1
-        
-        # Update satisfaction trends
-        if session.satisfaction_score:
-            self.analytics["satisfaction_trends"].append({
-                "timestamp": session.end_time.isoformat(),
-                "score": session.satisfaction_score
-            })
+        # Conversation count, language distribution, satisfaction mean/trend/daily rollup
+        self.analytics.record_conversation(session.languages_used, session.satisfaction_score, session.end_time)
         
         # Persist analytics
         self._persist_analytics()
     
     def _persist_analytics(self):
-        """Persist analytics to database"""
+        """Persist the analytics metrics that changed since the last persist"""
+        changed = self.analytics.take_dirty()
+        if not changed:
+            return
         try:
             with sqlite3.connect(self.database_path) as conn:
                 cursor = conn.cursor()
                 
-                for metric_name, metric_data in self.analytics.items():
-                    cursor.execute("""
-                        INSERT OR REPLACE INTO analytics (metric_name, metric_data, updated_at)
-                        VALUES (?, ?, ?)
-                    """, (metric_name, json.dumps(metric_data), datetime.now()))
+                now = datetime.now()
+                cursor.executemany("""
+                    INSERT OR REPLACE INTO analytics (metric_name, metric_data, updated_at)
+                    VALUES (?, ?, ?)
+                """, [(metric_name, json.dumps(metric_data), now) for metric_name, metric_data in changed.items()])
                 
                 conn.commit()
                 
@@ -937,14 +1223,8 @@ class AdvancedConversationManager:
             log_error(f"Failed to persist analytics: {e}")
     
     def _cleanup_old_sessions(self):
-        """Clean up old active sessions"""
-        current_time = datetime.now()
-        timeout_threshold = current_time - timedelta(minutes=self.config["session_timeout_minutes"])
-        
-        expired_sessions = [
-            session_id for session_id, session in self.active_sessions.items()
-            if session.start_time < timeout_threshold
-        ]
+        """End sessions idle for session_timeout_minutes (due entries of the store's timer wheel)"""
+        expired_sessions = self.active_sessions.expire()
         
         for session_id in expired_sessions:
             log_info(f"⏰ Auto-ending expired session {session_id}")
@@ -961,29 +1241,28 @@ class AdvancedConversationManager:
             total_users = len(self.user_profiles)
             active_sessions_count = len(self.active_sessions)
             
+            analytics = self.analytics
+            
             # Language distribution
-            lang_dist = self.analytics.get("language_distribution", {})
-            total_lang_uses = sum(lang_dist.values())
+            lang_dist = dict(analytics.language_distribution)
+            total_lang_uses = analytics.language_total
             lang_percentages = {lang: (count/total_lang_uses)*100 
                               for lang, count in lang_dist.items()} if total_lang_uses > 0 else {}
             
             # User relationship distribution
-            relationship_dist = {}
-            for profile in self.user_profiles.values():
-                rel = profile.business_relationship
-                relationship_dist[rel] = relationship_dist.get(rel, 0) + 1
+            relationship_dist = dict(analytics.relationships)
             
             # Satisfaction trend
-            satisfaction_trend = self.analytics.get("satisfaction_trends", [])
-            avg_satisfaction = sum(s["score"] for s in satisfaction_trend) / max(len(satisfaction_trend), 1)
+            avg_satisfaction = analytics.satisfaction.mean
             
             return {
                 "overview": {
-                    "total_conversations": self.analytics.get("total_conversations", 0),
+                    "total_conversations": analytics.total_conversations,
                     "total_users": total_users,
                     "active_sessions": active_sessions_count,
                     "avg_satisfaction": avg_satisfaction
                 },
+                "session_store": self.active_sessions.get_stats(),
                 "language_analytics": {
                     "distribution": lang_dist,
                     "percentages": lang_percentages,
@@ -995,15 +1274,13 @@ class AdvancedConversationManager:
                 },
                 "topic_analytics": {
                     "total_topics": len(self.topic_tracker),
-                    "most_frequent": sorted(
-                        [(topic, info.frequency) for topic, info in self.topic_tracker.items()],
-                        key=lambda x: x[1], reverse=True
-                    )[:10]
+                    "most_frequent": analytics.topics.top()
                 },
                 "satisfaction_analytics": {
                     "average_score": avg_satisfaction,
-                    "trend_data": satisfaction_trend[-20:],  # Last 20 data points
-                    "total_ratings": len(satisfaction_trend)
+                    "trend_data": analytics.satisfaction_trend.last(20),  # Last 20 data points
+                    "daily": dict(analytics.satisfaction_trend.daily),
+                    "total_ratings": analytics.satisfaction.count
                 }
             }
     
@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+Active Session Store
+Bounded home for AdvancedConversationManager's live sessions: keeps the most
+recently active sessions in memory, spills idle ones to the database and
+expires sessions through a timer wheel instead of scanning them all
+"""
+
+import time
+from collections import OrderedDict
+from collections.abc import MutableMapping
+from typing import Any, Callable, Dict, Hashable, Iterator, List, Optional, Set
+
+
+class TimerWheel:
+    """
+    Hashed timing wheel: keys land in the slot of their deadline tick, and
+    advance() only visits the slots of ticks that have passed. Rescheduling
+    leaves the old slot entry behind; it is skipped or moved when visited.
+    """
+
+    def __init__(self, tick_seconds: float, wheel_size: int = 64, now: Optional[float] = None):
+        self.tick = max(0.001, float(tick_seconds))
+        self.slots: List[Set[Hashable]] = [set() for _ in range(max(1, wheel_size))]
+        self.deadlines: Dict[Hashable, float] = {}
+        self._current_tick = int((time.time() if now is None else now) / self.tick)
+
+    def __len__(self) -> int:
+        return len(self.deadlines)
+
+    def _slot_for(self, deadline: float) -> Set[Hashable]:
+        # A deadline inside the current tick is checked on the next advance
+        deadline_tick = max(int(deadline / self.tick), self._current_tick + 1)
+        return self.slots[deadline_tick % len(self.slots)]
+
+    def schedule(self, key: Hashable, deadline: float):
+        self.deadlines[key] = deadline
+        self._slot_for(deadline).add(key)
+
+    def cancel(self, key: Hashable):
+        self.deadlines.pop(key, None)
+
+    def advance(self, now: float) -> List[Hashable]:
+        """Pop and return keys whose deadline is at or before now"""
+        target_tick = int(now / self.tick)
+        # After a long pause one revolution visits every slot
+        steps = min(target_tick - self._current_tick, len(self.slots))
+        first_tick = target_tick - steps + 1
+        self._current_tick = target_tick
+        expired = []
+        for tick in range(first_tick, target_tick + 1):
+            slot = self.slots[tick % len(self.slots)]
+            keys = list(slot)
+            slot.clear()
+            for key in keys:
+                deadline = self.deadlines.get(key)
+                if deadline is None:
+                    continue  # Cancelled
+                if deadline <= now:
+                    del self.deadlines[key]
+                    expired.append(key)
+                else:
+                    self._slot_for(deadline).add(key)
+        return expired
+
+
+class ActiveSessionStore(MutableMapping):
+    """
+    Session id -> ConversationSession mapping with a memory budget.
+
+    Resident sessions are kept in last-activity order. When more than
+    `max_sessions` are resident, or they hold more than `max_resident_turns`
+    turns, the least recently active ones are handed to `spill` (which must
+    persist them and return True) and dropped from memory; only their id and
+    activity time stay behind. Looking a spilled session up rehydrates it via
+    `load`. Idle sessions come due through a TimerWheel after `idle_timeout`
+    seconds without activity.
+    """
+
+    def __init__(self,
+                 load: Callable[[str], Any],
+                 spill: Callable[[Any], bool],
+                 max_sessions: int = 100,
+                 max_resident_turns: int = 5000,
+                 idle_timeout: float = 3600.0,
+                 tick_seconds: float = 60.0):
+        self._load = load
+        self._spill = spill
+        self.max_sessions = max(1, int(max_sessions))
+        self.max_resident_turns = max(1, int(max_resident_turns))
+        self.idle_timeout = float(idle_timeout)
+        self._resident: "OrderedDict[str, Any]" = OrderedDict()
+        self._spilled: Dict[str, float] = {}  # session id -> last activity
+        self._last_activity: Dict[str, float] = {}
+        self._wheel = TimerWheel(tick_seconds, wheel_size=max(8, int(idle_timeout / max(tick_seconds, 0.001)) + 2))
+        self.stats = {'spilled': 0, 'rehydrated': 0, 'expired': 0, 'spill_failures': 0}
+
+    @staticmethod
+    def _turns_in_memory(session: Any) -> int:
+        turns = session.turns
+        return getattr(turns, 'loaded', len(turns))
+
+    # -------------------- Mapping protocol --------------------
+    def __getitem__(self, session_id: str) -> Any:
+        session = self._resident.get(session_id)
+        if session is not None:
+            self._resident.move_to_end(session_id)
+            return session
+        if session_id not in self._spilled:
+            raise KeyError(session_id)
+        session = self._load(session_id)
+        if session is None:
+            raise KeyError(session_id)
+        del self._spilled[session_id]
+        self._resident[session_id] = session
+        self.stats['rehydrated'] += 1
+        self._enforce_budget(keep=session_id)
+        return session
+
+    def __setitem__(self, session_id: str, session: Any):
+        self._spilled.pop(session_id, None)
+        self._resident[session_id] = session
+        self._resident.move_to_end(session_id)
+        self.touch(session_id)
+
+    def __delitem__(self, session_id: str):
+        if session_id in self._resident:
+            del self._resident[session_id]
+        elif session_id in self._spilled:
+            del self._spilled[session_id]
+        else:
+            raise KeyError(session_id)
+        self._last_activity.pop(session_id, None)
+        self._wheel.cancel(session_id)
+
+    def __contains__(self, session_id: object) -> bool:
+        return session_id in self._resident or session_id in self._spilled
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(list(self._resident) + list(self._spilled))
+
+    def __len__(self) -> int:
+        return len(self._resident) + len(self._spilled)
+
+    # -------------------- Activity, budget, expiry --------------------
+    def touch(self, session_id: str, now: Optional[float] = None):
+        """Record activity: most recently used, and expiry pushed back by idle_timeout"""
+        now = time.time() if now is None else now
+        self._last_activity[session_id] = now
+        self._wheel.schedule(session_id, now + self.idle_timeout)
+        if session_id in self._resident:
+            self._resident.move_to_end(session_id)
+            self._enforce_budget(keep=session_id)
+
+    def _enforce_budget(self, keep: Optional[str] = None):
+        resident_turns = sum(self._turns_in_memory(s) for s in self._resident.values())
+        for session_id in list(self._resident):
+            if len(self._resident) <= self.max_sessions and resident_turns <= self.max_resident_turns:
+                break
+            if session_id == keep:
+                continue
+            session = self._resident[session_id]
+            if not self._spill(session):
+                self.stats['spill_failures'] += 1
+                continue
+            del self._resident[session_id]
+            self._spilled[session_id] = self._last_activity.get(session_id, time.time())
+            resident_turns -= self._turns_in_memory(session)
+            self.stats['spilled'] += 1
+
+    def expire(self, now: Optional[float] = None) -> List[str]:
+        """Ids of sessions idle for idle_timeout; the caller ends (and removes) them"""
+        expired = [sid for sid in self._wheel.advance(time.time() if now is None else now) if sid in self]
+        self.stats['expired'] += len(expired)
+        return expired
+
+    def last_activity(self, session_id: str) -> Optional[float]:
+        return self._last_activity.get(session_id)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            'resident': len(self._resident),
+            'spilled_now': len(self._spilled),
+            'resident_turns': sum(self._turns_in_memory(s) for s in self._resident.values()),
+            'max_sessions': self.max_sessions,
+            'max_resident_turns': self.max_resident_turns,
+            'scheduled': len(self._wheel)
+        }
@@ -6,13 +6,62 @@ Consolidates all learning functionality with robust error handling
 
 import json
 import os
+import time
+import atexit
 from datetime import datetime
 from typing import Dict, Any, Optional, List, Tuple
 from pathlib import Path
 import threading
 from configs.config import config
 from utils.validator import safe_input, validate_teaching_input
-from nlp.processing.hindi_transliterator import transliterate_hindi, normalize_hindi_query, get_query_variations
+from nlp.processing.hindi_transliterator import (
+    transliterate_hindi, normalize_hindi_query, get_query_variations, canonical_query_key, get_transliterator
+)
+
+def _trigrams(text: str) -> set:
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+class _KnowledgeDict(dict):
+    """knowledge_base dict that counts key insertions/removals, so the match index can tell it is stale"""
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.version = 0
+    
+    def __setitem__(self, key, value):
+        if key not in self:
+            self.version += 1
+        super().__setitem__(key, value)
+    
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self.version += 1
+    
+    def pop(self, key, *default):
+        if key in self:
+            self.version += 1
+        return super().pop(key, *default)
+    
+    def popitem(self):
+        self.version += 1
+        return super().popitem()
+    
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self.version += 1
+        return super().setdefault(key, default)
+    
+    def update(self, *args, **kwargs):
+        self.version += 1
+        super().update(*args, **kwargs)
+    
+    def __ior__(self, other):
+        self.update(other)
+        return self
+    
+    def clear(self):
+        self.version += 1
+        super().clear()
 
 class LearningManagerError(Exception):
     """Custom exception for learning manager errors"""
@@ -34,9 +83,58 @@ class UnifiedLearningManager:
         self._access_count = 0
         self._last_cleanup = datetime.now()
         
+        # Fuzzy-match index over knowledge_base keys (see _rebuild_match_index)
+        self._match_source = None
+        self._match_version = -1  # knowledge_base.version the index reflects
+        self._match_keys: List[str] = []
+        self._match_ids: Dict[str, int] = {}
+        self._match_tokens: List[frozenset] = []
+        self._match_clean: List[str] = []
+        self._clean_ids: Dict[str, List[int]] = {}
+        self._token_ids: Dict[str, List[int]] = {}
+        self._trigram_ids: Dict[str, List[int]] = {}
+        self._canonical_ids: Dict[str, int] = {}  # canonical key -> first question with it
+        
+        # Write-behind journal: usage bumps and new/removed entries are appended to
+        # `<knowledge_file>.journal` by a background writer and folded into the JSON
+        # file on a timer, after `compact_batch_size` records, or at shutdown.
+        self.journal_file = f"{self.knowledge_file}.journal"
+        self._journal_lock = threading.Lock()
+        self._compact_lock = threading.Lock()
+        self._journal_wakeup = threading.Event()
+        self._pending_records: List[Dict[str, Any]] = []
+        self._pending_usage: Dict[str, int] = {}
+        self._journal_records = 0
+        self._compact_requested = False
+        self._last_compaction = time.monotonic()
+        self._flush_interval = config.get('learning', 'journal_flush_interval_sec', 1.0)
+        self._compact_interval = config.get('learning', 'compact_interval_sec', 300)
+        self._compact_batch_size = config.get('learning', 'compact_batch_size', 1000)
+        self._journal_fsync = config.get('learning', 'journal_fsync', False)
+        self._backup_interval = config.get('learning', 'backup_interval_sec', 3600)
+        self._last_backup = self._latest_backup_time()
+        
         # Initialize knowledge base with error recovery
         if not self._load_knowledge_base():
             self.logger.warning("Knowledge base initialization failed, starting with empty base")
+        elif self._replay_journal():
+            self._compact_journal()
+        self._rebuild_match_index()
+        
+        self._writer_stop = threading.Event()
+        self._writer_thread = threading.Thread(target=self._journal_writer_loop,
+                                               name="knowledge-journal", daemon=True)
+        self._writer_thread.start()
+        atexit.register(self._flush_journal)
+    
+    @property
+    def knowledge_base(self) -> Dict[str, Any]:
+        return self._knowledge_base
+    
+    @knowledge_base.setter
+    def knowledge_base(self, value: Dict[str, Any]):
+        # Every assigned dict is wrapped so writes from anywhere bump its version
+        self._knowledge_base = value if isinstance(value, _KnowledgeDict) else _KnowledgeDict(value)
     
     def _load_knowledge_base(self) -> bool:
         """Load knowledge base from file with error handling"""
@@ -66,11 +164,14 @@ class UnifiedLearningManager:
             self.knowledge_base = {}
             return False
     
-    def _save_knowledge_base(self) -> bool:
-        """Save knowledge base to file with error handling"""
+    def _save_knowledge_base(self, data: Optional[Dict[str, Any]] = None) -> bool:
+        """Save knowledge base (or a snapshot of it) to file with error handling"""
+        if data is None:
+            data = self.knowledge_base
         try:
-            # Create backup if enabled
-            if self.backup_enabled and os.path.exists(self.knowledge_file):
+            # Create backup if enabled (at most once per backup interval)
+            if (self.backup_enabled and os.path.exists(self.knowledge_file)
+                    and time.time() - self._last_backup >= self._backup_interval):
                 self._create_backup()
             
             # Ensure directory exists
@@ -79,7 +180,7 @@ class UnifiedLearningManager:
             # Write to temporary file first
             temp_file = f"{self.knowledge_file}.tmp"
             with open(temp_file, 'w', encoding='utf-8') as f:
-                json.dump(self.knowledge_base, f, ensure_ascii=False, indent=2)
+                json.dump(data, f, ensure_ascii=False, indent=2)
             
             # Atomic move
             if os.name == 'nt':  # Windows
@@ -89,7 +190,7 @@ class UnifiedLearningManager:
             else:  # Unix-like
                 os.rename(temp_file, self.knowledge_file)
             
-            self.logger.info(f"Knowledge base saved: {len(self.knowledge_base)} entries")
+            self.logger.info(f"Knowledge base saved: {len(data)} entries")
             return True
             
         except Exception as e:
@@ -113,6 +214,7 @@ class UnifiedLearningManager:
                 with open(backup_file, 'w', encoding='utf-8') as dst:
                     dst.write(src.read())
             
+            self._last_backup = time.time()
             self.logger.info(f"Backup created: {backup_file}")
             
             # Clean old backups (keep only last 5)
@@ -140,6 +242,153 @@ class UnifiedLearningManager:
         except Exception as e:
             self.logger.warning("Failed to cleanup old backups", exc_info=True)
     
+    def _latest_backup_time(self) -> float:
+        """Modification time of the newest backup file (0 if none)"""
+        try:
+            backup_dir = os.path.dirname(self.knowledge_file) or '.'
+            prefix = os.path.basename(self.knowledge_file) + '.backup_'
+            times = [os.path.getmtime(os.path.join(backup_dir, f))
+                     for f in os.listdir(backup_dir) if f.startswith(prefix)]
+            return max(times, default=0.0)
+        except OSError:
+            return 0.0
+    
+    # -------------------- Write-behind journal --------------------
+    # Records carry absolute values ({'op': 'add', 'q', 'entry'}, {'op': 'usage',
+    # 'q', 'count'}, {'op': 'del', 'q'}), so replaying a journal that was already
+    # folded into the JSON file (crash mid-compaction) is harmless.
+    
+    def _journal_record(self, record: Dict[str, Any]):
+        """Queue an add/del record for the background writer"""
+        with self._journal_lock:
+            self._pending_records.append(record)
+    
+    def _journal_usage(self, question: str, entry: Dict[str, Any]):
+        """Queue the current usage count of a question (coalesced per question)"""
+        with self._journal_lock:
+            self._pending_usage[question] = entry.get('usage_count', 0)
+        if len(self._pending_usage) >= self._compact_batch_size:
+            self._journal_wakeup.set()
+    
+    def _flush_journal(self, extra: Optional[List[Dict[str, Any]]] = None) -> bool:
+        """Append queued records (then `extra`) to the journal file"""
+        with self._journal_lock:
+            records = self._pending_records
+            records.extend({'op': 'usage', 'q': q, 'count': c} for q, c in self._pending_usage.items())
+            if extra:
+                records.extend(extra)
+            if not records:
+                return True
+            try:
+                with open(self.journal_file, 'a', encoding='utf-8') as f:
+                    f.write(''.join(json.dumps(r, ensure_ascii=False) + '\n' for r in records))
+                    f.flush()
+                    if self._journal_fsync:
+                        os.fsync(f.fileno())
+            except Exception:
+                # Keep queued records for the next attempt; `extra` is the caller's to handle
+                self._pending_records = records[:len(records) - len(extra or [])]
+                self._pending_usage = {}
+                self.logger.error("Failed to append to knowledge journal", exc_info=True)
+                return False
+            self._pending_records = []
+            self._pending_usage = {}
+            self._journal_records += len(records)
+            return True
+    
+    def _apply_journal_file(self, path: str) -> int:
+        """Apply journal records from path to knowledge_base; returns records applied"""
+        if not os.path.exists(path):
+            return 0
+        applied = 0
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    # Torn final line from a crash mid-append
+                    self.logger.warning(f"Skipping unreadable journal record in {path}")
+                    continue
+                op, question = record.get('op'), record.get('q')
+                if op == 'add':
+                    self.knowledge_base[question] = record['entry']
+                elif op == 'usage' and question in self.knowledge_base:
+                    self.knowledge_base[question]['usage_count'] = record['count']
+                elif op == 'del':
+                    self.knowledge_base.pop(question, None)
+                applied += 1
+        return applied
+    
+    def _replay_journal(self) -> bool:
+        """Fold journals left by a previous run into knowledge_base"""
+        try:
+            applied = self._apply_journal_file(f"{self.journal_file}.old")
+            applied += self._apply_journal_file(self.journal_file)
+            if applied:
+                self.logger.info(f"Replayed {applied} knowledge journal records")
+            return applied > 0
+        except Exception:
+            self.logger.error("Failed to replay knowledge journal", exc_info=True)
+            return False
+    
+    def _rotate_journal(self):
+        """Move the live journal aside so new records go to a fresh file"""
+        old_file = f"{self.journal_file}.old"
+        if not os.path.exists(self.journal_file):
+            return
+        if os.path.exists(old_file):
+            # A previous compaction failed: keep its records ahead of ours
+            with open(self.journal_file, 'r', encoding='utf-8') as src, \
+                    open(old_file, 'a', encoding='utf-8') as dst:
+                dst.write(src.read())
+            os.remove(self.journal_file)
+        else:
+            os.replace(self.journal_file, old_file)
+    
+    def _compact_journal(self) -> bool:
+        """Write a full snapshot to the knowledge file and drop folded journal records"""
+        with self._compact_lock:
+            with self.knowledge_lock:
+                if not self._flush_journal():
+                    return False
+                self._rotate_journal()
+                snapshot = {k: dict(v) for k, v in self.knowledge_base.items()}
+                self._journal_records = 0
+                self._compact_requested = False
+                self._last_compaction = time.monotonic()
+            if not self._save_knowledge_base(snapshot):
+                # Rotated records stay in .old and are replayed on the next load
+                return False
+            try:
+                old_file = f"{self.journal_file}.old"
+                if os.path.exists(old_file):
+                    os.remove(old_file)
+            except OSError as e:
+                self.logger.warning(f"Failed to remove compacted journal: {e}")
+            return True
+    
+    def _request_compaction(self):
+        self._compact_requested = True
+        self._journal_wakeup.set()
+    
+    def _journal_writer_loop(self):
+        """Background writer: flush queued records, compact when due"""
+        while not self._writer_stop.is_set():
+            self._journal_wakeup.wait(self._flush_interval)
+            self._journal_wakeup.clear()
+            try:
+                self._flush_journal()
+                due = (self._journal_records > 0
+                       and time.monotonic() - self._last_compaction >= self._compact_interval)
+                if self._compact_requested or due or self._journal_records >= self._compact_batch_size:
+                    self._compact_journal()
+            except Exception:
+                self.logger.error("Knowledge journal writer failed", exc_info=True)
+    
+    def flush(self) -> bool:
+        """Persist everything now: flush the journal and compact it into the knowledge file"""
+        return self._compact_journal()
+    
     def _backup_corrupted_file(self):
         """Backup corrupted knowledge file"""
         try:
@@ -185,15 +434,18 @@ class UnifiedLearningManager:
                     entry.update(metadata)
                 
                 # Store knowledge
-                self.knowledge_base[safe_question.lower().strip()] = entry
+                key = safe_question.lower().strip()
+                self.knowledge_base[key] = entry
+                self._index_question(key)
                 
-                # Save to file
-                if self._save_knowledge_base():
+                # Durable journal append (the JSON file is rewritten by compaction)
+                if self._flush_journal([{'op': 'add', 'q': key, 'entry': entry}]):
                     self.logger.info(f"LEARNING_EVENT: success=True, question='{safe_question}', answer='{safe_answer}'")
                     return True
                 else:
                     # Rollback on save failure
-                    del self.knowledge_base[safe_question.lower().strip()]
+                    del self.knowledge_base[key]
+                    self._rebuild_match_index()
                     return False
                     
         except Exception as e:
@@ -220,20 +472,38 @@ class UnifiedLearningManager:
             # Normalize and transliterate the query
             normalized_query = normalize_hindi_query(clean_query)
             query_lower = normalized_query.lower().strip()
+            canonical_key = canonical_query_key(clean_query)
             
-            self.logger.info(f"[SEARCH] Searching for: Original='{clean_query}', Normalized='{query_lower}'")
-            
-            # Generate query variations including transliterations
-            query_variations = get_query_variations(query_lower)
-            normalized_queries = self._normalize_hindi_query(query_lower)
-            
-            # Combine all variations
-            all_variations = [query_lower] + query_variations + normalized_queries
-            all_variations = list(dict.fromkeys(all_variations))  # Remove duplicates while preserving order
-            
-            self.logger.info(f"[NOTE] Query variations: {all_variations[:5]}")
+            self.logger.info(f"[SEARCH] Searching for: Original='{clean_query}', Normalized='{query_lower}', "
+                             f"Canonical='{canonical_key}'")
             
             with self.knowledge_lock:
+                # Stored questions are canonicalized at index time: one probe covers
+                # ka/ki/ke, rate/price and filler-word variants
+                self._ensure_match_index()
+                qid = self._canonical_ids.get(canonical_key) if canonical_key else None
+                direct = query_lower if query_lower in self.knowledge_base else (
+                    self._match_keys[qid] if qid is not None else None)
+                if direct is not None:
+                    entry = self.knowledge_base[direct]
+                    answer = entry['answer']
+                    self.logger.info(f"[OK] Found match for canonical key: '{direct}'")
+                    
+                    # Update usage count (journaled by the background writer)
+                    if update_usage:
+                        entry['usage_count'] = entry.get('usage_count', 0) + 1
+                        self._journal_usage(direct, entry)
+                    
+                    return answer
+                
+                # Query-time variations are only needed for the fuzzy fallback
+                query_variations = get_query_variations(query_lower)
+                normalized_queries = self._normalize_hindi_query(query_lower)
+                all_variations = [query_lower] + query_variations + normalized_queries
+                all_variations = list(dict.fromkeys(all_variations))  # Remove duplicates while preserving order
+                
+                self.logger.info(f"[NOTE] Query variations: {all_variations[:5]}")
+                
                 # Try all variations for direct match
                 for variation in all_variations:
                     if variation in self.knowledge_base:
@@ -241,10 +511,10 @@ class UnifiedLearningManager:
                         answer = entry['answer']
                         self.logger.info(f"[OK] Found match with variation: '{variation}'")
                         
-                        # Update usage count
+                        # Update usage count (journaled by the background writer)
                         if update_usage:
                             entry['usage_count'] = entry.get('usage_count', 0) + 1
-                            self._save_knowledge_base()
+                            self._journal_usage(variation, entry)
                         
                         return answer
                 
@@ -261,10 +531,10 @@ class UnifiedLearningManager:
                     answer = entry['answer']
                     self.logger.info(f"[OK] Found fuzzy match: '{best_match}'")
                     
-                    # Update usage count
+                    # Update usage count (journaled by the background writer)
                     if update_usage:
                         entry['usage_count'] = entry.get('usage_count', 0) + 1
-                        # Don't save immediately for fuzzy matches to avoid excessive I/O
+                        self._journal_usage(best_match, entry)
                     
                     return answer
                 
@@ -323,50 +593,137 @@ class UnifiedLearningManager:
         
         return variations[:8]  # Allow more variations for better matching
     
+    # -------------------- Fuzzy-match index --------------------
+    # Each knowledge_base key gets an id in dict insertion order, so "first key
+    # that matches" keeps meaning what it meant for the linear scan. Postings are
+    # id lists in ascending order: token -> ids, trigram of the lowercased key ->
+    # ids, lowercased key -> ids. The canonical key (canonical_query_key) of each
+    # question maps to the first id that has it. Insertions made through
+    # _index_question keep the index current; any other write to knowledge_base
+    # (a removal, a direct assignment) bumps its version and the next lookup rebuilds.
+    
+    def _rebuild_match_index(self):
+        """Rebuild the fuzzy-match index from knowledge_base"""
+        self._match_source = self.knowledge_base
+        self._match_version = self.knowledge_base.version
+        self._match_keys = []
+        self._match_ids = {}
+        self._match_tokens = []
+        self._match_clean = []
+        self._clean_ids = {}
+        self._token_ids = {}
+        self._trigram_ids = {}
+        self._canonical_ids = {}
+        questions = list(self.knowledge_base)
+        for question, canonical_key in zip(questions, get_transliterator().canonical_keys(questions)):
+            self._index_question(question, canonical_key)
+    
+    def _index_question(self, question: str, canonical_key: Optional[str] = None):
+        """Add a knowledge_base key to the fuzzy-match index (no-op if already indexed)"""
+        if self._match_source is not self.knowledge_base or question in self._match_ids:
+            return
+        if canonical_key is None:
+            canonical_key = canonical_query_key(question)
+        qid = len(self._match_keys)
+        question_clean = question.strip().lower()
+        question_words = frozenset(question.split())
+        self._match_keys.append(question)
+        self._match_ids[question] = qid
+        self._match_tokens.append(question_words)
+        self._match_clean.append(question_clean)
+        self._clean_ids.setdefault(question_clean, []).append(qid)
+        for word in question_words:
+            self._token_ids.setdefault(word, []).append(qid)
+        for gram in _trigrams(question_clean):
+            self._trigram_ids.setdefault(gram, []).append(qid)
+        if canonical_key:
+            self._canonical_ids.setdefault(canonical_key, qid)
+        if question in self.knowledge_base and self._match_version == self.knowledge_base.version - 1:
+            # Inserting this question was the only write since the index was current
+            self._match_version += 1
+    
+    def _ensure_match_index(self):
+        # knowledge_base may have been replaced or written outside the indexed paths
+        if self._match_source is not self.knowledge_base or self._match_version != self.knowledge_base.version:
+            self._rebuild_match_index()
+    
     def _find_best_match(self, query: str) -> Optional[str]:
         """Find best matching question using precise fuzzy logic"""
         try:
+            self._ensure_match_index()
             query_words = set(query.split())
             query_clean = query.strip().lower()
-            best_match = None
-            best_score = 0
+            query_len = len(query_clean)
+            
+            # Exact/substring matches return the first qualifying question
+            first = None
+            
+            # Exact match check (should have been caught earlier)
+            ids = self._clean_ids.get(query_clean)
+            if ids:
+                first = ids[0]
+            
+            if query_len > 3:
+                # Strict substring matching: query inside a question. Such a question
+                # holds every trigram of the query, so scan the rarest posting list.
+                postings = [self._trigram_ids.get(g) for g in _trigrams(query_clean)]
+                if all(postings):
+                    for qid in min(postings, key=len):
+                        if first is not None and qid >= first:
+                            break
+                        question_clean = self._match_clean[qid]
+                        # Only match if query is substantial part of question
+                        if query_clean in question_clean and query_len / len(question_clean) > 0.6:
+                            first = qid
+                            break
+                
+                # Question inside query: probe the query's substrings long enough to qualify
+                for length in range(4, query_len + 1):
+                    if not length / query_len > 0.6:
+                        continue
+                    for start in range(query_len - length + 1):
+                        ids = self._clean_ids.get(query_clean[start:start + length])
+                        if ids and (first is None or ids[0] < first):
+                            first = ids[0]
             
-            for question in self.knowledge_base.keys():
-                question_words = set(question.split())
-                question_clean = question.strip().lower()
-                
-                # Exact match check (should have been caught earlier)
-                if query_clean == question_clean:
-                    return question
-                
-                # Strict substring matching
-                if query_clean in question_clean and len(query_clean) > 3:
-                    # Only match if query is substantial part of question
-                    if len(query_clean) / len(question_clean) > 0.6:
-                        return question
-                
-                if question_clean in query_clean and len(question_clean) > 3:
-                    # Only match if question is substantial part of query
-                    if len(question_clean) / len(query_clean) > 0.6:
-                        return question
-                
-                # Word overlap scoring - much more strict
-                common_words = query_words.intersection(question_words)
-                if len(common_words) >= 2:  # At least 2 common words
-                    # Both coverage ratios must be high
-                    query_coverage = len(common_words) / len(query_words)
-                    question_coverage = len(common_words) / len(question_words)
-                    
-                    # Require high coverage on both sides
-                    if query_coverage >= 0.7 and question_coverage >= 0.7:
-                        score = (query_coverage + question_coverage) / 2
+            if first is not None:
+                return self._match_keys[first]
+            
+            # Word overlap scoring - much more strict
+            best_id = None
+            best_score = 0
+            n = len(query_words)
+            if n >= 2:
+                # Both coverage ratios must be >= 0.7, so a candidate shares at least
+                # `need` query words and therefore one of the n - need + 1 rarest.
+                need = max(2, next(c for c in range(n + 1) if c / n >= 0.7))
+                rare_words = sorted(query_words, key=lambda w: len(self._token_ids.get(w, ())))
+                seen = set()
+                for word in rare_words[:n - need + 1]:
+                    for qid in self._token_ids.get(word, ()):
+                        if best_score == 1.0 and qid > best_id:
+                            break  # a perfect score is only beaten by an earlier question
+                        if qid in seen:
+                            continue
+                        seen.add(qid)
+                        question_words = self._match_tokens[qid]
+                        common = len(query_words & question_words)
+                        if common < 2:  # At least 2 common words
+                            continue
+                        query_coverage = common / n
+                        question_coverage = common / len(question_words)
                         
-                        if score > best_score:
-                            best_score = score
-                            best_match = question
+                        # Require high coverage on both sides
+                        if query_coverage >= 0.7 and question_coverage >= 0.7:
+                            score = (query_coverage + question_coverage) / 2
+                            # Ties go to the earlier question, as in a linear scan
+                            if score > best_score or (score == best_score and qid < best_id):
+                                best_score = score
+                                best_id = qid
             
             # Lower threshold for better Hindi/Hinglish matching (60% or better)
-            if best_score >= 0.6:
+            if best_id is not None and best_score >= 0.6:
+                best_match = self._match_keys[best_id]
                 self.logger.info(f"[TARGET] Fuzzy match found: '{best_match}' with score {best_score:.2f}")
                 return best_match
             return None
@@ -483,15 +840,18 @@ class UnifiedLearningManager:
                         
                         # Add entry
                         self.knowledge_base[question] = entry
+                        self._index_question(question)
+                        self._journal_record({'op': 'add', 'q': question, 'entry': entry})
                         success_count += 1
                         
                     except Exception as e:
                         self.logger.warning(f"Failed to import entry: {question}", exc_info=True)
                         continue
                 
-                # Save updated knowledge base
+                # Persist updated knowledge base
                 if success_count > 0:
-                    self._save_knowledge_base()
+                    self._flush_journal()
+                    self._request_compaction()
             
             self.logger.info(f"Imported {success_count}/{total_count} knowledge entries")
             return success_count, total_count
@@ -535,11 +895,14 @@ class UnifiedLearningManager:
                     
                     for key in to_remove[:50]:  # Limit bulk removals
                         del self.knowledge_base[key]
+                        self._journal_record({'op': 'del', 'q': key})
                         removed += 1
+                    if removed:
+                        self._rebuild_match_index()
                 
                 if removed > 0:
                     self.logger.info(f"Periodic cleanup: removed {removed} unused entries")
-                    self._save_knowledge_base()
+                    self._request_compaction()
                 
                 self._last_cleanup = now
                 
@@ -559,12 +922,14 @@ class UnifiedLearningManager:
                 entries_to_keep = entries[-keep_count:]
                 
                 self.knowledge_base = {k: v for k, v in entries_to_keep}
+                for k, _ in entries[:len(entries) - keep_count]:
+                    self._journal_record({'op': 'del', 'q': k})
                 
                 removed = len(entries) - keep_count
                 self.logger.warning(f"Emergency cleanup: removed {removed} entries due to memory limit")
                 
-                # Force save
-                self._save_knowledge_base()
+            # Force save
+            self._request_compaction()
                 
         except Exception as e:
             self.logger.error(f"Emergency cleanup failed: {e}")
@@ -577,8 +942,11 @@ class UnifiedLearningManager:
             # Final memory check
             self._check_memory_usage()
             
-            # Final save
-            if self._save_knowledge_base():
+            # Stop the journal writer, then fold the journal into the knowledge file
+            self._writer_stop.set()
+            self._journal_wakeup.set()
+            self._writer_thread.join(timeout=5)
+            if self._compact_journal():
                 self.logger.info("[OK] Knowledge base saved successfully")
             else:
                 self.logger.error("[ERROR] Failed to save knowledge base during cleanup")
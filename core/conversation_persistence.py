@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+"""
+Unit-of-work persistence for the conversation manager.
+
+A turn stages its writes (turn row, context, user profile) in a UnitOfWork
+and hands it to ConversationPersistence, whose single writer thread applies
+every unit in the queue inside one transaction. Upserts of the same key are
+coalesced, so a profile saved twice in a burst is written once.
+
+Durability modes:
+- SYNC: commit() waits until the unit is committed (synchronous=FULL)
+- GROUP: commit() returns at once; the writer commits what has queued within
+  `group_commit_ms` of the first pending unit (WAL, synchronous=NORMAL)
+- PERIODIC: commit() returns at once; the writer commits every
+  `periodic_interval_sec`
+
+commit() returns a ticket; wait(ticket) blocks until it is written and
+`committed_ticket` is the newest ticket on disk. A crash can lose only units
+that were not yet committed. When `max_pending` units are waiting, commit()
+blocks for room (backpressure) unless the caller opts in to dropping the unit.
+"""
+
+import atexit
+import queue
+import sqlite3
+import threading
+import time
+from enum import Enum
+from typing import Any, Dict, Hashable, List, Optional, Sequence, Set, Tuple
+
+from utils.logger import log_error
+
+
+class DurabilityMode(Enum):
+    """When a committed unit of work reaches the database"""
+    SYNC = "sync"
+    GROUP = "group"
+    PERIODIC = "periodic"
+
+
+class UnitOfWork:
+    """Writes staged by one logical operation, applied atomically."""
+
+    def __init__(self):
+        self.inserts: List[Tuple[str, Sequence[Any]]] = []
+        self.upserts: Dict[Tuple[str, Hashable], Sequence[Any]] = {}
+
+    def insert(self, sql: str, params: Sequence[Any]):
+        self.inserts.append((sql, params))
+
+    def upsert(self, sql: str, key: Hashable, params: Sequence[Any]):
+        """Stage an INSERT OR REPLACE; a later upsert of the same key wins."""
+        self.upserts.pop((sql, key), None)
+        self.upserts[(sql, key)] = params
+
+    def __len__(self) -> int:
+        return len(self.inserts) + len(self.upserts)
+
+
+class ConversationPersistence:
+    """Background writer applying queued units of work in batched transactions."""
+
+    def __init__(self,
+                 db_path: str,
+                 durability: DurabilityMode = DurabilityMode.GROUP,
+                 group_commit_ms: int = 20,
+                 periodic_interval_sec: float = 1.0,
+                 max_pending: int = 10000):
+        self.db_path = db_path
+        self.durability = DurabilityMode(durability)
+        self.group_commit = max(0, int(group_commit_ms)) / 1000.0
+        self.periodic_interval = max(0.01, float(periodic_interval_sec))
+        # (ticket, UnitOfWork) items, or None to cut the commit window short
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=max(1, int(max_pending)))
+        self._ticket_lock = threading.Lock()
+        self._committed = threading.Condition()
+        self._next_ticket = 0
+        self.committed_ticket = 0
+        self.failed_tickets: Set[int] = set()
+        self._closed = False
+        self.stats = {'units': 0, 'queue_full': 0, 'transactions': 0, 'rows': 0, 'coalesced': 0, 'errors': 0,
+                      'last_commit_ms': 0.0}
+        self._conn: Optional[sqlite3.Connection] = None
+        self._thread = threading.Thread(target=self._run, name="conversation-persistence", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    # -------------------- Producer side --------------------
+    def commit(self, unit: UnitOfWork, wait: Optional[bool] = None, timeout: float = 10.0,
+               block: bool = True) -> int:
+        """
+        Queue a unit; returns its ticket (0 if nothing was queued).
+        A full queue applies backpressure: the call blocks up to `timeout` for
+        room, so call it off the event loop. block=False returns 0 at once
+        instead (counted in stats['queue_full']) and the unit is not queued.
+        wait=None waits up to `timeout` only in SYNC mode; async callers pass
+        False and wait() off the event loop.
+        """
+        if self._closed or not len(unit):
+            return 0
+        deadline = time.monotonic() + timeout
+        while True:
+            with self._ticket_lock:
+                # Tickets follow queue order, so committed_ticket covers every earlier unit
+                try:
+                    self._queue.put_nowait((self._next_ticket + 1, unit))
+                    self._next_ticket += 1
+                    ticket = self._next_ticket
+                    break
+                except queue.Full:
+                    if not block:
+                        self.stats['queue_full'] += 1
+                        return 0
+            # Wait for room without holding the ticket lock, so non-blocking callers never stall behind us
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                log_error(f"Conversation persistence queue still full after {timeout}s; unit not queued")
+                return 0
+            time.sleep(min(0.005, remaining))
+        self.stats['units'] += 1
+        if wait or (wait is None and self.durability is DurabilityMode.SYNC):
+            self.wait(ticket, timeout)
+        return ticket
+
+    def wait(self, ticket: int, timeout: Optional[float] = None) -> bool:
+        """Block until the unit with this ticket is written; False if it failed or timed out."""
+        with self._committed:
+            self._committed.wait_for(lambda: self.committed_ticket >= ticket or self._closed_and_idle(), timeout)
+            return self.committed_ticket >= ticket and ticket not in self.failed_tickets
+
+    def flush(self, timeout: float = 10.0) -> bool:
+        """Commit everything queued before this call."""
+        with self._ticket_lock:
+            ticket = self._next_ticket
+        if ticket <= self.committed_ticket:
+            return True
+        self._wake_writer()
+        return self.wait(ticket, timeout)
+
+    @property
+    def pending(self) -> int:
+        with self._ticket_lock:
+            return self._next_ticket - self.committed_ticket
+
+    def close(self, timeout: float = 10.0):
+        """Stop accepting units and commit what is queued."""
+        if self._closed:
+            return
+        self.flush(timeout)
+        self._closed = True
+        self._wake_writer()
+        self._thread.join(timeout)
+
+    def _wake_writer(self):
+        """Queue a marker that ends a group/periodic commit window early."""
+        try:
+            self._queue.put_nowait(None)
+        except queue.Full:
+            pass  # The writer has a full queue to drain and checks _closed after each batch
+
+    def _closed_and_idle(self) -> bool:
+        return self._closed and not self._thread.is_alive()
+
+    # -------------------- Writer thread --------------------
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.db_path, isolation_level=None)
+            self._conn.execute('PRAGMA journal_mode=WAL')
+            synchronous = 'FULL' if self.durability is DurabilityMode.SYNC else 'NORMAL'
+            self._conn.execute(f'PRAGMA synchronous={synchronous}')
+            self._conn.execute('PRAGMA busy_timeout=5000')
+        return self._conn
+
+    def _next_batch(self) -> List[Tuple[int, UnitOfWork]]:
+        """Block for the first unit, then gather what arrives within the commit window."""
+        if self.durability is DurabilityMode.PERIODIC:
+            window_end = time.monotonic() + self.periodic_interval
+            batch = []
+        else:
+            item = self._queue.get()
+            batch = [item] if item is not None else []
+            window_end = time.monotonic() + (self.group_commit if self.durability is DurabilityMode.GROUP else 0)
+            if item is None:
+                window_end = 0
+
+        while True:
+            remaining = window_end - time.monotonic()
+            try:
+                item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is None:
+                window_end = 0  # flush() / close(): take what is already queued and commit
+                continue
+            batch.append(item)
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._next_batch()
+            if batch:
+                self._write(batch)
+            if self._closed and self._queue.empty():
+                break
+        if self._conn is not None:
+            self._conn.close()
+        with self._committed:
+            self._committed.notify_all()
+
+    def _write(self, batch: List[Tuple[int, UnitOfWork]]):
+        try:
+            self._apply(batch)
+        except Exception as e:
+            self.stats['errors'] += 1
+            log_error(f"Failed to persist {len(batch)} conversation units: {e}")
+            if len(batch) > 1:
+                # Retry unit by unit so only the bad unit is lost
+                for item in batch:
+                    try:
+                        self._apply([item])
+                    except Exception as unit_error:
+                        self.failed_tickets.add(item[0])
+                        log_error(f"Dropped conversation unit {item[0]}: {unit_error}")
+            else:
+                self.failed_tickets.add(batch[0][0])
+
+        with self._committed:
+            self.committed_ticket = max(self.committed_ticket, batch[-1][0])
+            self._committed.notify_all()
+
+    def _apply(self, batch: List[Tuple[int, UnitOfWork]]):
+        """Write the units of a batch in one transaction."""
+        inserts: List[Tuple[str, Sequence[Any]]] = []
+        upserts: Dict[Tuple[str, Hashable], Sequence[Any]] = {}
+        staged = 0
+        for _, unit in batch:
+            inserts.extend(unit.inserts)
+            for key, params in unit.upserts.items():
+                upserts.pop(key, None)
+                upserts[key] = params
+            staged += len(unit)
+
+        # Consecutive statements with the same SQL go through one executemany
+        statements: List[Tuple[str, List[Sequence[Any]]]] = []
+        for sql, params in inserts + [(key[0], params) for key, params in upserts.items()]:
+            if statements and statements[-1][0] == sql:
+                statements[-1][1].append(params)
+            else:
+                statements.append((sql, [params]))
+
+        start = time.perf_counter()
+        conn = self._connect()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            for sql, rows in statements:
+                conn.executemany(sql, rows)
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        rows_written = len(inserts) + len(upserts)
+        self.stats['transactions'] += 1
+        self.stats['rows'] += rows_written
+        self.stats['coalesced'] += staged - rows_written
+        self.stats['last_commit_ms'] = round((time.perf_counter() - start) * 1000, 3)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {**self.stats, 'durability': self.durability.value, 'pending': self.pending,
+                'committed_ticket': self.committed_ticket, 'failed_units': len(self.failed_tickets)}
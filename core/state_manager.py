@@ -10,17 +10,22 @@ import json
 import sqlite3
 import time
 import threading
-from typing import Dict, List, Any, Optional, Tuple, Union, Set
+from typing import Dict, List, Any, Optional, Tuple, Union, Set, FrozenSet, Iterable
 from dataclasses import dataclass, asdict, field
 from datetime import datetime, timedelta
-from collections import deque, defaultdict
+from collections import deque, defaultdict, OrderedDict
 from pathlib import Path
 from enum import Enum
 import hashlib
+import heapq
+import bisect
+import itertools
 import re
 
 from utils.logger import log_info, log_error, log_warning
 from utils.performance_monitor import monitor_performance, MetricType, get_performance_monitor
+from core.conversation_persistence import ConversationPersistence, DurabilityMode, UnitOfWork
+from nlp.processing.lexicon import get_lexicon
 
 class ConversationState(Enum):
     """Current state of conversation"""
@@ -97,6 +102,110 @@ class ConversationContext:
     last_accessed: Optional[datetime] = None
     created_at: Optional[datetime] = None
 
+class ContextIndex:
+    """
+    Lookup structures over conversation contexts so retrieval scores only
+    contexts that can make the top results:
+    - token postings, built once per context from the same tokens the scorer
+      compares (json.dumps(data).lower().split())
+    - per ContextType, ids ordered by (-importance, insertion order)
+    - a min-heap on expiry_time, popped lazily by purge_expired
+    - ids in last-access order, for the recent-access bonus
+    Insertion order mirrors the order of the conversation_contexts dict.
+    """
+    
+    def __init__(self):
+        self._counter = itertools.count()
+        self.seq: Dict[str, int] = {}
+        self._tokens: Dict[str, FrozenSet[str]] = {}
+        self._postings: Dict[str, Set[str]] = defaultdict(set)
+        self._by_type: Dict[ContextType, List[Tuple[float, int, str]]] = defaultdict(list)
+        self._type_entry: Dict[str, Tuple[ContextType, Tuple[float, int, str]]] = {}
+        self._expiry: List[Tuple[datetime, int, str]] = []
+        self._expiry_of: Dict[str, datetime] = {}
+        self._recent: "OrderedDict[str, datetime]" = OrderedDict()
+    
+    def __len__(self) -> int:
+        return len(self._tokens)
+    
+    @staticmethod
+    def context_tokens(context: 'ConversationContext') -> FrozenSet[str]:
+        return frozenset(json.dumps(context.data).lower().split())
+    
+    def add(self, context: 'ConversationContext') -> None:
+        """Index a new context, or re-index a replaced one (keeping its position)."""
+        context_id = context.context_id
+        self._unindex(context_id)
+        seq = self.seq.setdefault(context_id, next(self._counter))
+        tokens = self.context_tokens(context)
+        self._tokens[context_id] = tokens
+        for token in tokens:
+            self._postings[token].add(context_id)
+        entry = (-context.importance, seq, context_id)
+        bisect.insort(self._by_type[context.context_type], entry)
+        self._type_entry[context_id] = (context.context_type, entry)
+        if context.expiry_time is not None:
+            self._expiry_of[context_id] = context.expiry_time
+            heapq.heappush(self._expiry, (context.expiry_time, seq, context_id))
+        if context.last_accessed is not None:
+            self.touch(context_id, context.last_accessed)
+    
+    def _unindex(self, context_id: str) -> None:
+        for token in self._tokens.pop(context_id, ()):
+            ids = self._postings.get(token)
+            if ids is not None:
+                ids.discard(context_id)
+                if not ids:
+                    del self._postings[token]
+        type_entry = self._type_entry.pop(context_id, None)
+        if type_entry is not None:
+            entries = self._by_type[type_entry[0]]
+            i = bisect.bisect_left(entries, type_entry[1])
+            if i < len(entries) and entries[i] == type_entry[1]:
+                del entries[i]
+        # Heap entries are left behind and skipped when popped
+        self._expiry_of.pop(context_id, None)
+    
+    def remove(self, context_id: str) -> None:
+        self._unindex(context_id)
+        self.seq.pop(context_id, None)
+        self._recent.pop(context_id, None)
+    
+    def touch(self, context_id: str, accessed: datetime) -> None:
+        self._recent[context_id] = accessed
+        self._recent.move_to_end(context_id)
+    
+    def purge_expired(self, now: datetime) -> List[str]:
+        """Drop and return ids whose expiry_time is before now."""
+        expired = []
+        while self._expiry and self._expiry[0][0] < now:
+            expiry_time, _, context_id = heapq.heappop(self._expiry)
+            if self._expiry_of.get(context_id) == expiry_time:
+                self.remove(context_id)
+                expired.append(context_id)
+        return expired
+    
+    def token_matches(self, tokens: Iterable[str]) -> Dict[str, int]:
+        """context id -> number of distinct tokens it shares with the input."""
+        counts: Dict[str, int] = defaultdict(int)
+        for token in set(tokens):
+            for context_id in self._postings.get(token, ()):
+                counts[context_id] += 1
+        return counts
+    
+    def top_by_importance(self, context_type: ContextType, k: int) -> List[str]:
+        return [entry[2] for entry in self._by_type.get(context_type, [])[:k]]
+    
+    def recently_accessed(self, since: datetime) -> List[str]:
+        """Ids accessed after `since` (the oldest accesses are trimmed as they age out)."""
+        while self._recent:
+            context_id, accessed = next(iter(self._recent.items()))
+            if accessed > since:
+                break
+            self._recent.popitem(last=False)
+        return [cid for cid, accessed in self._recent.items() if accessed > since]
+
+
 @dataclass
 class ConversationMemory:
     """Conversation memory structure"""
@@ -145,25 +254,25 @@ class MoodDetector:
             ]
         }
         
-        # Compile patterns
-        self.compiled_patterns = {}
-        for mood, patterns in self.mood_patterns.items():
-            self.compiled_patterns[mood] = [re.compile(pattern, re.IGNORECASE) for pattern in patterns]
+        # Compiled into the shared lexicon scan
+        get_lexicon().register_patterns(
+            'mood', {mood.value: patterns for mood, patterns in self.mood_patterns.items()},
+            flags=re.IGNORECASE, count=True
+        )
     
     def detect_mood(self, text: str, context: Dict[str, Any] = None) -> Tuple[UserMood, float]:
         """Detect user mood from text"""
-        mood_scores = defaultdict(float)
+        # Every mood starts at 0 so ties resolve in mood_patterns order
+        mood_scores = defaultdict(float, {mood: 0.0 for mood in self.mood_patterns})
         
         # Pattern matching
-        for mood, patterns in self.compiled_patterns.items():
-            for pattern in patterns:
-                matches = len(pattern.findall(text))
-                mood_scores[mood] += matches * 0.3
+        for hit in get_lexicon().scan(text).matches('mood'):
+            mood_scores[UserMood(hit.label)] += hit.count * 0.3
         
         # Context-based adjustments
         if context:
             # Previous mood influence
-            if 'previous_mood' in context and context['previous_mood'] != UserMood.NEUTRAL.value:
+            if context.get('previous_mood') not in (None, UserMood.NEUTRAL.value):
                 prev_mood = UserMood(context['previous_mood'])
                 mood_scores[prev_mood] += 0.2
             
@@ -287,20 +396,61 @@ class PersonalityAdapter:
         """Get guidelines for given personality"""
         return self.personality_profiles.get(personality, self.personality_profiles[PersonalityType.FRIENDLY])
 
+SAVE_USER_PROFILE_SQL = '''
+    INSERT OR REPLACE INTO user_profiles 
+    (user_id, name, preferred_language, communication_style, business_context, 
+     preferences, interaction_history, created_at, last_interaction, total_interactions)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+'''
+
+SAVE_CONVERSATION_TURN_SQL = '''
+    INSERT INTO conversation_turns 
+    (turn_id, session_id, user_id, user_input, bot_response, timestamp, 
+     language, mood, state, context_used, confidence, processing_time_ms)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+'''
+
+SAVE_CONVERSATION_CONTEXT_SQL = '''
+    INSERT OR REPLACE INTO conversation_contexts 
+    (context_id, context_type, data, importance, expiry_time, 
+     access_count, last_accessed, created_at)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+'''
+
+BUSINESS_DOMAIN_KEYWORDS = [
+    'switch', 'wire', 'light', 'fan', 'socket', 'mcb', 'electrical',
+    'price', 'cost', 'install', 'repair', 'service'
+]
+
+CONVERSATION_INTENT_PATTERNS = {
+    'pricing': [r'\b(?:price|cost|rate|kitna|paisa)\b'],
+    'technical_support': [r'\b(?:how to|install|setup|problem|issue|help)\b'],
+    'consultation': [r'\b(?:suggest|recommend|advice|batao|samjhao)\b'],
+    'negotiation': [r'\b(?:discount|offer|deal|kam|negotiate)\b']
+}
+
 class ContextAwareConversationManager:
     """Main conversation manager with context awareness"""
     
-    def __init__(self, db_path: str = "data/conversation.db"):
+    def __init__(self,
+                 db_path: str = "data/conversation.db",
+                 durability: DurabilityMode = DurabilityMode.GROUP,
+                 group_commit_ms: int = 20,
+                 periodic_interval_sec: float = 1.0):
         self.db_path = db_path
         
         # Core components
         self.mood_detector = MoodDetector()
+        get_lexicon().register_keywords('business_domain', {'electrical_business': BUSINESS_DOMAIN_KEYWORDS})
+        get_lexicon().register_patterns('conversation_intent', CONVERSATION_INTENT_PATTERNS, flags=re.IGNORECASE)
         self.personality_adapter = PersonalityAdapter()
         
         # Storage
         self.active_conversations = {}  # Session ID -> Conversation data
         self.user_profiles = {}  # User ID -> UserProfile
         self.conversation_contexts = {}  # Context ID -> ConversationContext
+        self._context_index = ContextIndex()  # Candidate lookup for _retrieve_relevant_context
+        self._turn_seq = itertools.count()  # Keeps turn ids unique within a millisecond
         self.conversation_memories = deque(maxlen=1000)  # Recent memories
         
         # State tracking
@@ -318,6 +468,14 @@ class ContextAwareConversationManager:
         # Initialize database
         self._initialize_database()
         
+        # Turn writes are staged per turn and committed by a background writer
+        self._persistence = ConversationPersistence(
+            db_path,
+            durability=durability,
+            group_commit_ms=group_commit_ms,
+            periodic_interval_sec=periodic_interval_sec
+        )
+        
         # Load existing data
         asyncio.create_task(self._load_existing_data())
         
@@ -447,6 +605,7 @@ class ContextAwareConversationManager:
                         created_at=datetime.fromisoformat(row[7]) if row[7] else None
                     )
                     self.conversation_contexts[context.context_id] = context
+                    self._context_index.add(context)
                 
                 # Load recent memories
                 cursor = conn.execute('''
@@ -483,10 +642,11 @@ class ContextAwareConversationManager:
         """Process a single conversation turn"""
         
         start_time = time.time()
+        unit = UnitOfWork()  # Everything this turn writes, committed together
         
         try:
             # Get or create user profile
-            user_profile = await self._get_or_create_user_profile(user_id)
+            user_profile = await self._get_or_create_user_profile(user_id, unit)
             
             # Detect user mood
             mood_context = {
@@ -517,7 +677,7 @@ class ContextAwareConversationManager:
             personality_guidelines = self.personality_adapter.get_personality_guidelines(optimal_personality)
             
             # Store conversation turn
-            turn_id = f"turn_{session_id}_{int(time.time() * 1000)}"
+            turn_id = f"turn_{session_id}_{int(time.time() * 1000)}_{next(self._turn_seq)}"
             processing_time = (time.time() - start_time) * 1000
             
             turn = ConversationTurn(
@@ -534,13 +694,16 @@ class ContextAwareConversationManager:
             )
             
             # Update conversation tracking
-            await self._update_conversation_tracking(session_id, user_id, turn)
+            await self._update_conversation_tracking(session_id, user_id, turn, unit)
             
             # Update user profile
-            await self._update_user_profile_interaction(user_profile, user_input, user_mood)
+            await self._update_user_profile_interaction(user_profile, user_input, user_mood, unit)
             
             # Store context if needed
-            await self._store_conversation_context(session_id, user_input, conversation_context)
+            await self._store_conversation_context(session_id, user_input, conversation_context, unit)
+            
+            # Persist the turn (waits only in SYNC durability mode)
+            persisted = bool(await self._commit_unit(unit))
             
             # Record performance
             self.response_times.append(processing_time)
@@ -557,7 +720,8 @@ class ContextAwareConversationManager:
                 'relevant_contexts': [asdict(ctx) for ctx in relevant_contexts],
                 'user_profile': asdict(user_profile),
                 'processing_time_ms': processing_time,
-                'language': user_profile.preferred_language
+                'language': user_profile.preferred_language,
+                'persisted': persisted
             }
             
             return response_data
@@ -574,7 +738,7 @@ class ContextAwareConversationManager:
                 'optimal_personality': PersonalityType.FRIENDLY.value
             }
     
-    async def _get_or_create_user_profile(self, user_id: str) -> UserProfile:
+    async def _get_or_create_user_profile(self, user_id: str, unit: Optional[UnitOfWork] = None) -> UserProfile:
         """Get existing user profile or create new one"""
         with self._lock:
             if user_id in self.user_profiles:
@@ -589,10 +753,13 @@ class ContextAwareConversationManager:
             
             self.user_profiles[user_id] = profile
             
-            # Save to database
-            asyncio.create_task(self._save_user_profile(profile))
-            
-            return profile
+            # Save to database (with the caller's turn, or committed on its own)
+            staged = unit if unit is not None else UnitOfWork()
+            self._stage_user_profile(profile, staged)
+        
+        if unit is None:
+            await self._commit_unit(staged)
+        return profile
     
     def _get_previous_mood(self, session_id: str) -> Optional[str]:
         """Get previous mood from session"""
@@ -659,54 +826,71 @@ class ContextAwareConversationManager:
         
         relevant_contexts = []
         input_lower = user_input.lower()
+        now = datetime.now()
+        index = self._context_index
+        
+        # Expired contexts are dropped as their heap entries come due
+        for context_id in index.purge_expired(now):
+            self.conversation_contexts.pop(context_id, None)
+        
+        # Context type relevance
+        type_relevance = {
+            ConversationState.GREETING: [ContextType.PERSONAL, ContextType.RELATIONAL],
+            ConversationState.INQUIRY: [ContextType.BUSINESS, ContextType.TECHNICAL],
+            ConversationState.NEGOTIATION: [ContextType.TRANSACTIONAL, ContextType.BUSINESS],
+            ConversationState.DISCUSSION: [ContextType.BUSINESS, ContextType.TECHNICAL],
+            ConversationState.CLARIFICATION: [ContextType.TECHNICAL, ContextType.BUSINESS]
+        }
+        relevant_types = type_relevance.get(conversation_state, [])
+        recent_since = now - timedelta(hours=1)
+        
+        # Candidates: contexts sharing a word with the input, recently used ones,
+        # and the 5 most important of each relevant type. Any other context
+        # scores at most 0.3 * importance, which the latter already match.
+        common_counts = index.token_matches(input_lower.split())
+        candidate_ids = set(common_counts)
+        candidate_ids.update(index.recently_accessed(recent_since))
+        for context_type in relevant_types:
+            candidate_ids.update(index.top_by_importance(context_type, 5))
         
         # Score contexts based on relevance
         context_scores = []
         
-        for context in self.conversation_contexts.values():
-            score = 0.0
-            
-            # Check if context has expired
-            if context.expiry_time and context.expiry_time < datetime.now():
+        for context_id in candidate_ids:
+            context = self.conversation_contexts.get(context_id)
+            if context is None:
                 continue
+            score = 0.0
             
             # Text similarity scoring (simplified)
-            context_text = json.dumps(context.data).lower()
-            common_words = set(input_lower.split()) & set(context_text.split())
+            common_words = common_counts.get(context_id, 0)
             if common_words:
-                score += len(common_words) * 0.1
+                score += common_words * 0.1
             
-            # Context type relevance
-            type_relevance = {
-                ConversationState.GREETING: [ContextType.PERSONAL, ContextType.RELATIONAL],
-                ConversationState.INQUIRY: [ContextType.BUSINESS, ContextType.TECHNICAL],
-                ConversationState.NEGOTIATION: [ContextType.TRANSACTIONAL, ContextType.BUSINESS],
-                ConversationState.DISCUSSION: [ContextType.BUSINESS, ContextType.TECHNICAL],
-                ConversationState.CLARIFICATION: [ContextType.TECHNICAL, ContextType.BUSINESS]
-            }
-            
-            if conversation_state in type_relevance and context.context_type in type_relevance[conversation_state]:
+            if context.context_type in relevant_types:
                 score += 0.3
             
             # Importance weighting
             score *= context.importance
             
             # Recent access bonus
-            if context.last_accessed and context.last_accessed > datetime.now() - timedelta(hours=1):
+            if context.last_accessed and context.last_accessed > recent_since:
                 score += 0.2
             
             context_scores.append((context, score))
         
-        # Sort by score and return top contexts
-        context_scores.sort(key=lambda x: x[1], reverse=True)
+        # Top 5 contexts by score (ties in storage order)
+        top_contexts = heapq.nsmallest(5, context_scores,
+                                       key=lambda x: (-x[1], index.seq.get(x[0].context_id, 0)))
         
-        for context, score in context_scores[:5]:  # Top 5 contexts
+        for context, score in top_contexts:
             if score > 0.1:  # Minimum relevance threshold
                 relevant_contexts.append(context)
                 
                 # Update access tracking
                 context.access_count += 1
-                context.last_accessed = datetime.now()
+                context.last_accessed = now
+                index.touch(context.context_id, now)
                 self.context_hits += 1
             else:
                 self.context_misses += 1
@@ -715,32 +899,19 @@ class ContextAwareConversationManager:
     
     def _extract_domain_from_input(self, user_input: str) -> str:
         """Extract domain from user input"""
-        business_keywords = [
-            'switch', 'wire', 'light', 'fan', 'socket', 'mcb', 'electrical',
-            'price', 'cost', 'install', 'repair', 'service'
-        ]
-        
-        if any(keyword in user_input.lower() for keyword in business_keywords):
+        if get_lexicon().scan(user_input).matches('business_domain'):
             return 'electrical_business'
         
         return 'general'
     
     def _extract_intent_from_input(self, user_input: str) -> str:
         """Extract intent from user input"""
-        intent_patterns = {
-            'pricing': [r'\b(?:price|cost|rate|kitna|paisa)\b'],
-            'technical_support': [r'\b(?:how to|install|setup|problem|issue|help)\b'],
-            'consultation': [r'\b(?:suggest|recommend|advice|batao|samjhao)\b'],
-            'negotiation': [r'\b(?:discount|offer|deal|kam|negotiate)\b']
-        }
-        
-        for intent, patterns in intent_patterns.items():
-            if any(re.search(pattern, user_input, re.IGNORECASE) for pattern in patterns):
-                return intent
-        
-        return 'general_inquiry'
+        # First intent in CONVERSATION_INTENT_PATTERNS order wins
+        hits = get_lexicon().scan(user_input).matches('conversation_intent')
+        return hits[0].label if hits else 'general_inquiry'
     
-    async def _update_conversation_tracking(self, session_id: str, user_id: str, turn: ConversationTurn):
+    async def _update_conversation_tracking(self, session_id: str, user_id: str, turn: ConversationTurn,
+                                            unit: Optional[UnitOfWork] = None):
         """Update conversation tracking data"""
         with self._lock:
             if session_id not in self.active_conversations:
@@ -769,9 +940,10 @@ class ContextAwareConversationManager:
             }
         
         # Save to database
-        await self._save_conversation_turn(turn, session_id, user_id)
+        await self._save_conversation_turn(turn, session_id, user_id, unit)
     
-    async def _update_user_profile_interaction(self, user_profile: UserProfile, user_input: str, user_mood: UserMood):
+    async def _update_user_profile_interaction(self, user_profile: UserProfile, user_input: str, user_mood: UserMood,
+                                               unit: Optional[UnitOfWork] = None):
         """Update user profile based on interaction"""
         user_profile.last_interaction = datetime.now()
         user_profile.total_interactions += 1
@@ -790,7 +962,7 @@ class ContextAwareConversationManager:
         await self._update_user_preferences(user_profile, user_input, user_mood)
         
         # Save updated profile
-        await self._save_user_profile(user_profile)
+        await self._save_user_profile(user_profile, unit)
     
     async def _update_user_preferences(self, user_profile: UserProfile, user_input: str, user_mood: UserMood):
         """Update user preferences based on interaction patterns"""
@@ -824,7 +996,8 @@ class ContextAwareConversationManager:
         else:
             user_profile.preferences['prefers_hinglish'] = True
     
-    async def _store_conversation_context(self, session_id: str, user_input: str, context: Dict[str, Any]):
+    async def _store_conversation_context(self, session_id: str, user_input: str, context: Dict[str, Any],
+                                          unit: Optional[UnitOfWork] = None):
         """Store conversation context for future reference"""
         
         # Determine context type
@@ -850,82 +1023,102 @@ class ContextAwareConversationManager:
         
         # Store context
         self.conversation_contexts[context_id] = conversation_context
+        self._context_index.add(conversation_context)
         
         # Save to database
-        await self._save_conversation_context(conversation_context)
+        await self._save_conversation_context(conversation_context, unit)
+    
+    async def _commit_unit(self, unit: UnitOfWork) -> int:
+        """
+        Hand a unit of work to the writer; returns its ticket, or 0 if it was not persisted.
+        A full queue applies backpressure off the event loop instead of dropping the unit;
+        in SYNC mode also wait (off the event loop) until it is on disk.
+        """
+        if not len(unit):
+            return 0
+        ticket = self._persistence.commit(unit, wait=False, block=False)
+        loop = asyncio.get_running_loop()
+        if not ticket:
+            ticket = await loop.run_in_executor(None, self._persistence.commit, unit, False)
+        if ticket and self._persistence.durability is DurabilityMode.SYNC:
+            if not await loop.run_in_executor(None, self._persistence.wait, ticket):
+                ticket = 0
+        if not ticket:
+            log_error("Conversation unit of work was not persisted")
+        return ticket
+    
+    def _stage_user_profile(self, user_profile: UserProfile, unit: UnitOfWork):
+        """Stage a user profile write in unit"""
+        unit.upsert(SAVE_USER_PROFILE_SQL, user_profile.user_id, (
+            user_profile.user_id,
+            user_profile.name,
+            user_profile.preferred_language,
+            user_profile.communication_style,
+            json.dumps(user_profile.business_context),
+            json.dumps(user_profile.preferences),
+            json.dumps(user_profile.interaction_history),
+            user_profile.created_at.isoformat() if user_profile.created_at else None,
+            user_profile.last_interaction.isoformat() if user_profile.last_interaction else None,
+            user_profile.total_interactions
+        ))
     
-    async def _save_user_profile(self, user_profile: UserProfile):
+    async def _save_user_profile(self, user_profile: UserProfile, unit: Optional[UnitOfWork] = None):
         """Save user profile to database"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                conn.execute('''
-                    INSERT OR REPLACE INTO user_profiles 
-                    (user_id, name, preferred_language, communication_style, business_context, 
-                     preferences, interaction_history, created_at, last_interaction, total_interactions)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ''', (
-                    user_profile.user_id,
-                    user_profile.name,
-                    user_profile.preferred_language,
-                    user_profile.communication_style,
-                    json.dumps(user_profile.business_context),
-                    json.dumps(user_profile.preferences),
-                    json.dumps(user_profile.interaction_history),
-                    user_profile.created_at.isoformat() if user_profile.created_at else None,
-                    user_profile.last_interaction.isoformat() if user_profile.last_interaction else None,
-                    user_profile.total_interactions
-                ))
+            staged = unit if unit is not None else UnitOfWork()
+            self._stage_user_profile(user_profile, staged)
+            if unit is None:
+                await self._commit_unit(staged)
         except Exception as e:
             log_error(f"Failed to save user profile: {e}")
     
-    async def _save_conversation_turn(self, turn: ConversationTurn, session_id: str, user_id: str):
+    async def _save_conversation_turn(self, turn: ConversationTurn, session_id: str, user_id: str,
+                                      unit: Optional[UnitOfWork] = None):
         """Save conversation turn to database"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                conn.execute('''
-                    INSERT INTO conversation_turns 
-                    (turn_id, session_id, user_id, user_input, bot_response, timestamp, 
-                     language, mood, state, context_used, confidence, processing_time_ms)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ''', (
-                    turn.turn_id,
-                    session_id,
-                    user_id,
-                    turn.user_input,
-                    turn.bot_response,
-                    turn.timestamp.isoformat(),
-                    turn.language,
-                    turn.mood.value,
-                    turn.state.value,
-                    json.dumps(turn.context_used),
-                    turn.confidence,
-                    turn.processing_time_ms
-                ))
+            staged = unit if unit is not None else UnitOfWork()
+            staged.insert(SAVE_CONVERSATION_TURN_SQL, (
+                turn.turn_id,
+                session_id,
+                user_id,
+                turn.user_input,
+                turn.bot_response,
+                turn.timestamp.isoformat(),
+                turn.language,
+                turn.mood.value,
+                turn.state.value,
+                json.dumps(turn.context_used),
+                turn.confidence,
+                turn.processing_time_ms
+            ))
+            if unit is None:
+                await self._commit_unit(staged)
         except Exception as e:
             log_error(f"Failed to save conversation turn: {e}")
     
-    async def _save_conversation_context(self, context: ConversationContext):
+    async def _save_conversation_context(self, context: ConversationContext, unit: Optional[UnitOfWork] = None):
         """Save conversation context to database"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                conn.execute('''
-                    INSERT OR REPLACE INTO conversation_contexts 
-                    (context_id, context_type, data, importance, expiry_time, 
-                     access_count, last_accessed, created_at)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                ''', (
-                    context.context_id,
-                    context.context_type.value,
-                    json.dumps(context.data),
-                    context.importance,
-                    context.expiry_time.isoformat() if context.expiry_time else None,
-                    context.access_count,
-                    context.last_accessed.isoformat() if context.last_accessed else None,
-                    context.created_at.isoformat() if context.created_at else None
-                ))
+            staged = unit if unit is not None else UnitOfWork()
+            staged.upsert(SAVE_CONVERSATION_CONTEXT_SQL, context.context_id, (
+                context.context_id,
+                context.context_type.value,
+                json.dumps(context.data),
+                context.importance,
+                context.expiry_time.isoformat() if context.expiry_time else None,
+                context.access_count,
+                context.last_accessed.isoformat() if context.last_accessed else None,
+                context.created_at.isoformat() if context.created_at else None
+            ))
+            if unit is None:
+                await self._commit_unit(staged)
         except Exception as e:
             log_error(f"Failed to save conversation context: {e}")
     
+    def flush_persistence(self, timeout: float = 10.0) -> bool:
+        """Block until every staged turn is committed"""
+        return self._persistence.flush(timeout)
+    
     def get_conversation_summary(self, session_id: str) -> Dict[str, Any]:
         """Get conversation summary for session"""
         if session_id not in self.active_conversations:
@@ -1003,6 +1196,7 @@ class ContextAwareConversationManager:
             'total_contexts': len(self.conversation_contexts),
             'avg_response_time_ms': avg_response_time,
             'context_hit_rate': context_hit_rate,
+            'persistence': self._persistence.get_stats(),
             'memory_usage': {
                 'active_conversations': len(self.active_conversations),
                 'conversation_memories': len(self.conversation_memories),
@@ -1014,6 +1208,10 @@ class ContextAwareConversationManager:
         """Clean up conversation manager resources"""
         log_info("🧹 Cleaning up Conversation Manager...")
         
+        # Commit staged turns before dropping in-memory state
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self._persistence.close)
+        
         # Clear active data
         with self._lock:
             self.active_conversations.clear()
@@ -26,6 +26,7 @@ except ImportError as e:
     TRANSFORMERS_AVAILABLE = False
 
 from utils.logger import log_info, log_error, log_warning
+from nlp.processing.lexicon import get_lexicon
 
 # Graceful fallback when langdetect isn't available
 # Ensure DetectorFactory and detect exist to prevent import-time errors in tests.
@@ -100,6 +101,51 @@ class AdvancedNLPEngine:
             'vi': 'Vietnamese', 'id': 'Indonesian', 'ms': 'Malay', 'tl': 'Filipino'
         }
         
+        # Intent patterns (can be expanded)
+        self.intent_patterns = {
+            'greeting': [
+                r'\b(hi|hello|hey|namaste|namaskar|adab|sat sri akal|vanakkam)\b',
+                r'\b(good morning|good afternoon|good evening)\b',
+                r'\b(kaise ho|kaisi ho|how are you|kya haal hai)\b',
+                r'(नमस्ते|नमस्कार|आदाब|हैलो|हाय)',
+                r'(गुड मॉर्निंग|शुभ प्रभात|शुभ संध्या)'
+            ],
+            'farewell': [
+                r'\b(bye|goodbye|alvida|ta ta|see you|khuda hafiz)\b',
+                r'\b(good night|subh ratri|shubh ratri)\b',
+                r'(अलविदा|टा टा|खुदा हाफिज|शुभ रात्रि|अच्छी रात)'
+            ],
+            'question': [
+                r'^(what|kya|kya hai|kaise|how|why|kyu|kyon|where|kaha|when|kab)',
+                r'\?$',  # Ends with question mark
+                r'\b(price|rate|cost|kitna|kitne|kaun|which)\b'
+            ],
+            'request': [
+                r'\b(please|kripaya|meherbani|help|madad|assist)\b',
+                r'\b(can you|could you|would you|kya aap)\b',
+                r'\b(tell me|batao|bataiye|explain|samjhao)\b'
+            ],
+            'appreciation': [
+                r'\b(thanks|thank you|dhanyawad|shukriya|bahut accha)\b',
+                r'\b(good|great|excellent|bahut badhiya|zabardast)\b',
+                r'(धन्यवाद|शुक्रिया|बहुत अच्छा|बहुत बढ़िया|ज़बरदस्त|वाह)',
+                r'(थैंक यू|थैंक्स|महान|शानदार|वंडरफुल)'
+            ],
+            'learning': [
+                r'\b(teach|sikha|sikhao|learn|seekh|batao)\b',
+                r'\b(how to|kaise karte|kya tarika)\b',
+                r'(सिखा|सिखाओ|सीख|बताओ|समझाओ|सीखना)',
+                r'(कैसे करते|क्या तरीका|मुझे सिखाओ|टीच मी)'
+            ],
+            'complaint': [
+                r'\b(problem|samasya|issue|dikkat|complaint|shikayat)\b',
+                r'\b(not working|kaam nahi kar|broken|kharab)\b',
+                r'(समस्या|दिक्कत|शिकायत|परेशानी|टेंशन|गड़बड़)',
+                r'(काम नहीं कर|खराब|टूट|बिगड़|गलत|बेकार)'
+            ]
+        }
+        get_lexicon().register_patterns('nlp_intent', self.intent_patterns, view='stripped')
+        
         # Initialize models in background
         self._initialize_models()
     
@@ -249,60 +295,13 @@ class AdvancedNLPEngine:
     
     def extract_intent(self, text: str) -> Dict[str, Any]:
         """Extract user intent from text"""
-        text_lower = text.lower().strip()
-        
-        # Intent patterns (can be expanded)
-        intent_patterns = {
-            'greeting': [
-                r'\b(hi|hello|hey|namaste|namaskar|adab|sat sri akal|vanakkam)\b',
-                r'\b(good morning|good afternoon|good evening)\b',
-                r'\b(kaise ho|kaisi ho|how are you|kya haal hai)\b',
-                r'(नमस्ते|नमस्कार|आदाब|हैलो|हाय)',
-                r'(गुड मॉर्निंग|शुभ प्रभात|शुभ संध्या)'
-            ],
-            'farewell': [
-                r'\b(bye|goodbye|alvida|ta ta|see you|khuda hafiz)\b',
-                r'\b(good night|subh ratri|shubh ratri)\b',
-                r'(अलविदा|टा टा|खुदा हाफिज|शुभ रात्रि|अच्छी रात)'
-            ],
-            'question': [
-                r'^(what|kya|kya hai|kaise|how|why|kyu|kyon|where|kaha|when|kab)',
-                r'\?$',  # Ends with question mark
-                r'\b(price|rate|cost|kitna|kitne|kaun|which)\b'
-            ],
-            'request': [
-                r'\b(please|kripaya|meherbani|help|madad|assist)\b',
-                r'\b(can you|could you|would you|kya aap)\b',
-                r'\b(tell me|batao|bataiye|explain|samjhao)\b'
-            ],
-            'appreciation': [
-                r'\b(thanks|thank you|dhanyawad|shukriya|bahut accha)\b',
-                r'\b(good|great|excellent|bahut badhiya|zabardast)\b',
-                r'(धन्यवाद|शुक्रिया|बहुत अच्छा|बहुत बढ़िया|ज़बरदस्त|वाह)',
-                r'(थैंक यू|थैंक्स|महान|शानदार|वंडरफुल)'
-            ],
-            'learning': [
-                r'\b(teach|sikha|sikhao|learn|seekh|batao)\b',
-                r'\b(how to|kaise karte|kya tarika)\b',
-                r'(सिखा|सिखाओ|सीख|बताओ|समझाओ|सीखना)',
-                r'(कैसे करते|क्या तरीका|मुझे सिखाओ|टीच मी)'
-            ],
-            'complaint': [
-                r'\b(problem|samasya|issue|dikkat|complaint|shikayat)\b',
-                r'\b(not working|kaam nahi kar|broken|kharab)\b',
-                r'(समस्या|दिक्कत|शिकायत|परेशानी|टेंशन|गड़बड़)',
-                r'(काम नहीं कर|खराब|टूट|बिगड़|गलत|बेकार)'
-            ]
-        }
-        
         detected_intents = []
         confidence_scores = {}
         
-        for intent, patterns in intent_patterns.items():
-            for pattern in patterns:
-                if re.search(pattern, text_lower):
-                    detected_intents.append(intent)
-                    confidence_scores[intent] = confidence_scores.get(intent, 0) + 0.3
+        # One scan shared with the other turn-level detectors; patterns see the lowercased, stripped text
+        for hit in get_lexicon().scan(text).matches('nlp_intent'):
+            detected_intents.append(hit.label)
+            confidence_scores[hit.label] = confidence_scores.get(hit.label, 0) + 0.3
         
         if not detected_intents:
             return {"intent": "general", "confidence": 0.5, "entities": []}
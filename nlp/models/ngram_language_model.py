@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Character n-gram Naive Bayes language model
+Compact multinomial NB over character n-grams of Latin/Devanagari words,
+trained offline (nlp/training/train_language_ngram.py) and shipped as a
+small .npz. A batch of texts is scored with one matrix multiply.
+"""
+
+import re
+import threading
+from collections import Counter
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from utils.logger import log_info, log_warning
+
+DEFAULT_MODEL_PATH = Path(__file__).with_name("language_ngram.npz")
+
+_WORD_RE = re.compile(r"[^\W\d_]+")  # Letters only; digits and punctuation separate words
+
+
+def word_ngrams(word: str, ngram_range: Tuple[int, int] = (1, 4)) -> List[str]:
+    """Character n-grams of one lowercased word, padded with spaces on both sides"""
+    low, high = ngram_range
+    padded = f" {word} "
+    return [padded[i:i + n] for n in range(low, high + 1) for i in range(len(padded) - n + 1)]
+
+
+def text_ngrams(text: str, ngram_range: Tuple[int, int] = (1, 4)) -> List[str]:
+    """Character n-grams of every word in the text"""
+    grams = []
+    for word in _WORD_RE.findall(text.lower()):
+        grams.extend(word_ngrams(word, ngram_range))
+    return grams
+
+
+class CharNgramLanguageModel:
+    """Multinomial Naive Bayes over a fixed n-gram vocabulary"""
+
+    def __init__(self, vocabulary: Sequence[str], log_prob: np.ndarray, log_prior: np.ndarray,
+                 classes: Sequence[str], ngram_range: Tuple[int, int] = (1, 4), evidence_cap: int = 12,
+                 cache_size: int = 8192):
+        self.vocabulary = list(vocabulary)
+        self.index: Dict[str, int] = {gram: i for i, gram in enumerate(self.vocabulary)}
+        self.log_prob = np.asarray(log_prob, dtype=np.float32)  # (vocabulary, classes)
+        self.log_prior = np.asarray(log_prior, dtype=np.float32)  # (classes,)
+        self.classes = list(classes)
+        self.ngram_range = (int(ngram_range[0]), int(ngram_range[1]))
+        # Longer texts count as this many n-grams: plain NB posteriors saturate
+        # at 1.0 after a few words, which would make the margin meaningless
+        self.evidence_cap = int(evidence_cap)
+        # Chat vocabulary repeats heavily, so n-gram ids are cached per word
+        self._word_ids = lru_cache(maxsize=cache_size)(self._lookup_word_ids)
+
+    # -------------------- Training / storage --------------------
+    @classmethod
+    def train(cls, texts: Iterable[str], labels: Iterable[str], max_features: int = 4000,
+              alpha: float = 0.5, ngram_range: Tuple[int, int] = (1, 4)) -> "CharNgramLanguageModel":
+        texts, labels = list(texts), list(labels)
+        classes = sorted(set(labels))
+        per_class = {c: Counter() for c in classes}
+        doc_freq = Counter()
+        for text, label in zip(texts, labels):
+            grams = text_ngrams(text, ngram_range)
+            per_class[label].update(grams)
+            doc_freq.update(set(grams))
+
+        vocabulary = [gram for gram, _ in sorted(doc_freq.items(), key=lambda kv: (-kv[1], kv[0]))[:max_features]]
+        counts = np.array([[per_class[c][gram] for c in classes] for gram in vocabulary], dtype=np.float64)
+        log_prob = np.log(counts + alpha) - np.log(counts.sum(axis=0) + alpha * len(vocabulary))
+        label_counts = Counter(labels)
+        log_prior = np.log(np.array([label_counts[c] for c in classes], dtype=np.float64) / len(labels))
+        return cls(vocabulary, log_prob, log_prior, classes, ngram_range)
+
+    def save(self, path) -> None:
+        np.savez_compressed(path, vocabulary=np.array(self.vocabulary), log_prob=self.log_prob,
+                            log_prior=self.log_prior, classes=np.array(self.classes),
+                            ngram_range=np.array(self.ngram_range), evidence_cap=np.array(self.evidence_cap))
+
+    @classmethod
+    def load(cls, path) -> "CharNgramLanguageModel":
+        with np.load(path, allow_pickle=False) as data:
+            return cls(data["vocabulary"].tolist(), data["log_prob"], data["log_prior"],
+                       data["classes"].tolist(), tuple(data["ngram_range"].tolist()), int(data["evidence_cap"]))
+
+    # -------------------- Scoring --------------------
+    def _lookup_word_ids(self, word: str) -> Tuple[int, ...]:
+        index = self.index
+        return tuple(index[gram] for gram in word_ngrams(word, self.ngram_range) if gram in index)
+
+    def featurize(self, texts: Sequence[str]) -> np.ndarray:
+        """(texts, vocabulary) n-gram count matrix; unknown n-grams are ignored"""
+        width = len(self.vocabulary)
+        flat = []
+        for row, text in enumerate(texts):
+            offset = row * width
+            for word in _WORD_RE.findall(text.lower()):
+                flat.extend(offset + i for i in self._word_ids(word))
+        counts = np.bincount(np.asarray(flat, dtype=np.intp), minlength=len(texts) * width)
+        return counts.reshape(len(texts), width).astype(np.float32)
+
+    def predict_proba(self, texts: Sequence[str]) -> np.ndarray:
+        """(texts, classes) posterior probabilities"""
+        features = self.featurize(texts)
+        evidence = np.minimum(1.0, self.evidence_cap / np.maximum(features.sum(axis=1, keepdims=True), 1.0))
+        scores = (features @ self.log_prob) * evidence + self.log_prior
+        scores -= scores.max(axis=1, keepdims=True)
+        probs = np.exp(scores)
+        return probs / probs.sum(axis=1, keepdims=True)
+
+    def classify(self, texts: Sequence[str]) -> List[Tuple[str, float, float]]:
+        """(label, probability, margin over the runner-up) per text"""
+        if not texts:
+            return []
+        probs = self.predict_proba(texts)
+        order = np.argsort(-probs, axis=1)
+        results = []
+        for row, ranked in enumerate(order):
+            best = probs[row, ranked[0]]
+            second = probs[row, ranked[1]] if len(ranked) > 1 else 0.0
+            results.append((self.classes[ranked[0]], float(best), float(best - second)))
+        return results
+
+
+# Global instance
+_language_model = None
+_language_model_failed = False
+_language_model_lock = threading.Lock()
+
+def get_language_model(path=None) -> Optional[CharNgramLanguageModel]:
+    """Get the shipped language model, or None if it cannot be loaded"""
+    global _language_model, _language_model_failed
+    with _language_model_lock:
+        if _language_model is None and not _language_model_failed:
+            model_path = Path(path) if path else DEFAULT_MODEL_PATH
+            try:
+                _language_model = CharNgramLanguageModel.load(model_path)
+                log_info(f"Loaded n-gram language model ({len(_language_model.vocabulary)} n-grams, "
+                         f"classes {_language_model.classes})")
+            except (OSError, KeyError, ValueError) as e:
+                log_warning(f"N-gram language model unavailable ({model_path}): {e}")
+                _language_model_failed = True
+        return _language_model
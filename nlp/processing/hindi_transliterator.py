@@ -4,13 +4,26 @@ Hindi to Hinglish Transliteration Module
 Converts Devanagari script to Latin script for better query matching
 """
 
-import re
-from typing import Dict, List, Optional
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional
+
+_END = ''  # Trie key holding the transliteration of the path so far
+
+# Canonical query keys: words folded together, and filler words dropped
+CANONICAL_WORDS = {
+    'rate': 'price', 'cost': 'price', 'value': 'price', 'daam': 'price', 'dam': 'price',
+    'kimt': 'price', 'kimat': 'price', 'keemat': 'price', 'keemt': 'price',
+    'kyaa': 'kya', 'kiya': 'kya', 'hain': 'hai', 'he': 'hai', 'hae': 'hai',
+    'kitne': 'kitna', 'kitni': 'kitna', 'kitnee': 'kitna', 'kitan': 'kitna',
+    'btao': 'batao', 'bataiye': 'batao', 'bataye': 'batao',
+}
+CANONICAL_FILLERS = frozenset({'ka', 'ki', 'ke', 'kya', 'hai', 'kitna', 'batao'})
+_CANONICAL_PUNCTUATION = '?!.,।'
 
 class HindiTransliterator:
     """Transliterate Hindi (Devanagari) text to Hinglish (Latin script)"""
     
-    def __init__(self):
+    def __init__(self, cache_size: int = 8192):
         # Comprehensive Hindi to Hinglish mapping
         self.mapping = {
             # Vowels
@@ -52,34 +65,77 @@ class HindiTransliterator:
             'रुपये': 'rupees', 'पैसे': 'paise'
         }
         
-        # Create regex pattern for multi-char sequences (sort by length for correct matching)
-        multi_char = {k: v for k, v in self.mapping.items() if len(k) > 1}
-        self.multi_pattern = '|'.join(sorted(multi_char.keys(), key=len, reverse=True))
+        # Longest-match trie over every mapping key: one left-to-right pass per token
+        self.trie = {}
+        for hindi, english in self.mapping.items():
+            node = self.trie
+            for char in hindi:
+                node = node.setdefault(char, {})
+            node[_END] = english
+        
+        # Tokens repeat heavily across queries and knowledge entries
+        self._cached_token = lru_cache(maxsize=cache_size)(self._transliterate_token)
+        
+    def _transliterate_token(self, token: str) -> str:
+        """Transliterate one whitespace-free token, taking the longest mapping key at each position"""
+        if token.isascii():
+            return token
         
+        out = []
+        i, n = 0, len(token)
+        while i < n:
+            node = self.trie.get(token[i])
+            match_end, match_value = i, None
+            j = i
+            while node is not None:
+                j += 1
+                if _END in node:
+                    match_end, match_value = j, node[_END]
+                if j >= n:
+                    break
+                node = node.get(token[j])
+            if match_end > i:
+                out.append(match_value)
+                i = match_end
+            else:
+                out.append(token[i])
+                i += 1
+        return ''.join(out)
+    
     def transliterate(self, text: str) -> str:
         """Convert Hindi text to Hinglish"""
         if not text:
             return ""
         
-        result = text
-        
-        # First, replace multi-character sequences
-        if self.multi_pattern:
-            result = re.sub(
-                self.multi_pattern,
-                lambda m: self.mapping[m.group()],
-                result
-            )
-        
-        # Then replace single characters
-        for hindi, english in self.mapping.items():
-            if len(hindi) == 1:
-                result = result.replace(hindi, english)
-        
-        # Clean up multiple spaces
-        result = ' '.join(result.split())
-        
-        return result.strip()
+        # No mapping key contains whitespace, so tokens transliterate independently;
+        # joining the non-empty ones also cleans up multiple spaces
+        return ' '.join(filter(None, map(self._cached_token, text.split())))
+    
+    def transliterate_batch(self, texts: Iterable[str]) -> List[str]:
+        """Transliterate many texts (e.g. a whole knowledge base) sharing the token cache"""
+        return [self.transliterate(text) for text in texts]
+    
+    def canonical_key(self, text: str) -> str:
+        """
+        Order-preserving key under which spelling and phrasing variants of a
+        question coincide: lowercased, Devanagari transliterated, ka/ki/ke and
+        kya/hai/kitna/batao dropped, rate/cost/kimat folded into price
+        """
+        words = []
+        for token in self.transliterate(text.lower()).split():
+            word = token.strip(_CANONICAL_PUNCTUATION)
+            word = CANONICAL_WORDS.get(word, word)
+            if word and word not in CANONICAL_FILLERS:
+                words.append(word)
+        return ' '.join(words)
+    
+    def canonical_keys(self, texts: Iterable[str]) -> List[str]:
+        """canonical_key for many texts (e.g. every stored question) sharing the token cache"""
+        return [self.canonical_key(text) for text in texts]
+    
+    def cache_info(self):
+        """Hit/miss statistics of the token cache"""
+        return self._cached_token.cache_info()
     
     def generate_variations(self, text: str) -> List[str]:
         """Generate variations of the transliterated text"""
@@ -172,6 +228,14 @@ def transliterate_hindi(text: str) -> str:
     """Convenience function to transliterate Hindi text"""
     return get_transliterator().transliterate(text)
 
+def transliterate_hindi_batch(texts: Iterable[str]) -> List[str]:
+    """Convenience function to transliterate many texts at once"""
+    return get_transliterator().transliterate_batch(texts)
+
+def canonical_query_key(query: str) -> str:
+    """Convenience function to reduce a query or stored question to its canonical key"""
+    return get_transliterator().canonical_key(query)
+
 def normalize_hindi_query(query: str) -> str:
     """Convenience function to normalize Hindi/Hinglish query"""
     return get_transliterator().normalize_query(query)
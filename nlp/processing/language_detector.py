@@ -9,8 +9,8 @@ import asyncio
 import re
 import json
 import time
-from typing import Dict, List, Any, Optional, Tuple, Union
-from dataclasses import dataclass, asdict
+from typing import Callable, Dict, List, Any, Optional, Tuple, Union
+from dataclasses import dataclass, asdict, fields, MISSING
 from datetime import datetime
 from collections import defaultdict, Counter
 from enum import Enum
@@ -65,18 +65,74 @@ class LanguageSegment:
     script_type: ScriptType
     is_transliterated: bool = False
 
-@dataclass
+class Deferred:
+    """Zero-argument computation stored in a lazy field until the field is first read
+
+    If the computation raises, the error is logged and fallback is used instead,
+    so a failing stage never surfaces at the caller's attribute read.
+    """
+    __slots__ = ('compute', 'fallback', 'name')
+    
+    def __init__(self, compute: Callable[[], Any], fallback: Any = None, name: str = "stage"):
+        self.compute = compute
+        self.fallback = fallback
+        self.name = name
+    
+    def resolve(self) -> Any:
+        try:
+            return self.compute()
+        except Exception as e:
+            log_error(f"Multilingual {self.name} failed: {e}")
+            return self.fallback
+
+class LazyField:
+    """Dataclass field that may be given a Deferred; it is evaluated on first read and memoized"""
+    
+    def __init__(self, default: Any = MISSING):
+        self.default = default
+    
+    def __set_name__(self, owner, name):
+        self.slot = f"_lazy_{name}"
+    
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            if self.default is MISSING:
+                raise AttributeError(self.slot)  # Tells dataclass the field has no default
+            return self.default
+        value = obj.__dict__[self.slot]
+        if isinstance(value, Deferred):
+            value = obj.__dict__[self.slot] = value.resolve()
+        return value
+    
+    def __set__(self, obj, value):
+        obj.__dict__[self.slot] = value
+
+@dataclass(repr=False)
 class MultilingualAnalysis:
-    """Complete multilingual analysis result"""
+    """Complete multilingual analysis result
+
+    segments, is_code_switching, transliterated_text and translated_text are
+    computed on first access (or up front with analyze_text(concurrent=True)).
+    """
     original_text: str
     primary_language: LanguageCode
     confidence: float
-    segments: List[LanguageSegment]
-    is_code_switching: bool
-    transliterated_text: Optional[str] = None
-    translated_text: Optional[str] = None
+    segments: List[LanguageSegment] = LazyField()
+    is_code_switching: bool = LazyField()
+    transliterated_text: Optional[str] = LazyField(None)
+    translated_text: Optional[str] = LazyField(None)
     context_hints: Dict[str, Any] = None
     processing_time_ms: float = 0.0
+    
+    def __repr__(self) -> str:
+        # Pending stages show as <deferred> instead of being computed (asyncio reprs task results)
+        parts = []
+        for field in fields(self):
+            if isinstance(self.__dict__.get(f"_lazy_{field.name}"), Deferred):
+                parts.append(f"{field.name}=<deferred>")
+            else:
+                parts.append(f"{field.name}={getattr(self, field.name)!r}")
+        return f"{type(self).__name__}({', '.join(parts)})"
 
 class HinglishDetector:
     """Advanced Hinglish and code-switching detection"""
@@ -239,87 +295,126 @@ class AdvancedMultilingualProcessor:
             log_warning(f"NLTK initialization failed: {e}")
     
     @monitor_performance("multilingual_processor")
-    async def analyze_text(self, text: str, context: Dict[str, Any] = None) -> MultilingualAnalysis:
-        """Perform comprehensive multilingual analysis"""
+    async def analyze_text(self, text: str, context: Dict[str, Any] = None,
+                           concurrent: bool = False) -> MultilingualAnalysis:
+        """Perform comprehensive multilingual analysis
+
+        Only primary detection and context hints run here; the other stages
+        run when their field is read, or all at once in worker threads when
+        concurrent=True.
+        """
         
         start_time = time.time()
         
         try:
-            # Basic validation
-            if not text or not text.strip():
-                return MultilingualAnalysis(
-                    original_text=text,
-                    primary_language=LanguageCode.UNKNOWN,
-                    confidence=0.0,
-                    segments=[],
-                    is_code_switching=False,
-                    processing_time_ms=0.0
-                )
-            
-            text = text.strip()
-            
-            # Detect primary language
-            primary_language, primary_confidence = await self._detect_primary_language(text)
+            analysis = self._build_analysis(text, {})
+            if concurrent:
+                await self._resolve_concurrently(analysis)
+            self._record_analysis(analysis, start_time)
+            return analysis
             
+        except Exception as e:
+            log_error(f"Multilingual analysis failed: {e}")
+            return self._empty_analysis(text, (time.time() - start_time) * 1000)
+    
+    async def analyze_many(self, texts: List[str], context: Dict[str, Any] = None,
+                           concurrent: bool = False) -> List[MultilingualAnalysis]:
+        """Analyze a batch of texts; language detection of repeated texts and sentences is shared"""
+        
+        detections = {}  # Text or sentence -> (language, confidence) for the whole batch
+        analyses = []
+        for text in texts:
+            start_time = time.time()
+            try:
+                analysis = self._build_analysis(text, detections)
+                self._record_analysis(analysis, start_time)
+            except Exception as e:
+                log_error(f"Multilingual analysis failed: {e}")
+                analysis = self._empty_analysis(text, (time.time() - start_time) * 1000)
+            analyses.append(analysis)
+        
+        if concurrent:
+            await asyncio.gather(*(self._resolve_concurrently(analysis) for analysis in analyses))
+        return analyses
+    
+    def _build_analysis(self, text: str, detections: Dict[str, Tuple[LanguageCode, float]]) -> MultilingualAnalysis:
+        """Primary language and context hints now; segments, transliteration and translation deferred"""
+        
+        # Basic validation
+        if not text or not text.strip():
+            return self._empty_analysis(text, 0.0)
+        
+        text = text.strip()
+        
+        # Detect primary language
+        primary_language, primary_confidence = self._detect_cached(text, detections)
+        
+        analysis = MultilingualAnalysis(
+            original_text=text,
+            primary_language=primary_language,
+            confidence=primary_confidence,
             # Segment text by language
-            segments = await self._segment_by_language(text)
-            
+            segments=Deferred(lambda: self._segment_by_language(text, detections), [], "segmentation"),
             # Determine if code-switching is present
-            is_code_switching = self._detect_code_switching(segments)
-            
+            is_code_switching=Deferred(lambda: self._detect_code_switching(analysis.segments),
+                                       False, "code-switching detection"),
             # Generate transliteration if needed
-            transliterated_text = None
-            if primary_language == LanguageCode.HINGLISH:
-                transliterated_text = await self._transliterate_hinglish(text)
-            
+            transliterated_text=(Deferred(lambda: self._transliterate_hinglish(text), None, "transliteration")
+                                 if primary_language == LanguageCode.HINGLISH else None),
             # Generate translation if requested
-            translated_text = None
-            if self.enable_translation and primary_language != LanguageCode.ENGLISH:
-                translated_text = await self._translate_to_english(text)
-            
+            translated_text=(Deferred(lambda: self._translate_to_english(text), None, "translation")
+                             if self.enable_translation and primary_language != LanguageCode.ENGLISH else None),
             # Extract context hints
-            context_hints = self._extract_context_hints(text, segments)
-            
-            # Update conversation history
-            self._update_language_history(primary_language)
-            
-            processing_time = (time.time() - start_time) * 1000
-            
-            # Record performance metrics
-            monitor = get_performance_monitor()
-            monitor.record_metric(
-                MetricType.RESPONSE_TIME, 
-                processing_time,
-                "multilingual_processor",
-                {"language": primary_language.value, "segments": len(segments)}
-            )
-            
-            return MultilingualAnalysis(
-                original_text=text,
-                primary_language=primary_language,
-                confidence=primary_confidence,
-                segments=segments,
-                is_code_switching=is_code_switching,
-                transliterated_text=transliterated_text,
-                translated_text=translated_text,
-                context_hints=context_hints,
-                processing_time_ms=processing_time
-            )
-            
-        except Exception as e:
-            log_error(f"Multilingual analysis failed: {e}")
-            processing_time = (time.time() - start_time) * 1000
-            
-            return MultilingualAnalysis(
-                original_text=text,
-                primary_language=LanguageCode.UNKNOWN,
-                confidence=0.0,
-                segments=[],
-                is_code_switching=False,
-                processing_time_ms=processing_time
-            )
+            context_hints=self._extract_context_hints(text)
+        )
+        
+        # Update conversation history
+        self._update_language_history(primary_language)
+        
+        return analysis
+    
+    async def _resolve_concurrently(self, analysis: MultilingualAnalysis):
+        """Evaluate the deferred stages of an analysis in worker threads at the same time"""
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(
+            loop.run_in_executor(None, lambda: analysis.segments),
+            loop.run_in_executor(None, lambda: analysis.transliterated_text),
+            loop.run_in_executor(None, lambda: analysis.translated_text)
+        )
+    
+    def _record_analysis(self, analysis: MultilingualAnalysis, start_time: float):
+        """Stamp processing time and aggregate the response-time metric in memory"""
+        analysis.processing_time_ms = (time.time() - start_time) * 1000
+        
+        # Record performance metrics
+        monitor = get_performance_monitor()
+        monitor.aggregate_metric(
+            MetricType.RESPONSE_TIME,
+            analysis.processing_time_ms,
+            "multilingual_processor",
+            {"language": analysis.primary_language.value}
+        )
+    
+    def _empty_analysis(self, text: str, processing_time_ms: float) -> MultilingualAnalysis:
+        """Result for empty input or a failed analysis"""
+        return MultilingualAnalysis(
+            original_text=text,
+            primary_language=LanguageCode.UNKNOWN,
+            confidence=0.0,
+            segments=[],
+            is_code_switching=False,
+            processing_time_ms=processing_time_ms
+        )
+    
+    def _detect_cached(self, text: str,
+                       detections: Dict[str, Tuple[LanguageCode, float]]) -> Tuple[LanguageCode, float]:
+        """_detect_primary_language, memoized in the caller's detections dict"""
+        result = detections.get(text)
+        if result is None:
+            result = detections[text] = self._detect_primary_language(text)
+        return result
     
-    async def _detect_primary_language(self, text: str) -> Tuple[LanguageCode, float]:
+    def _detect_primary_language(self, text: str) -> Tuple[LanguageCode, float]:
         """Detect the primary language of text"""
         
         # Check for Hinglish first
@@ -372,7 +467,8 @@ class AdvancedMultilingualProcessor:
         
         return LanguageCode.UNKNOWN, 0.0
     
-    async def _segment_by_language(self, text: str) -> List[LanguageSegment]:
+    def _segment_by_language(self, text: str,
+                             detections: Optional[Dict[str, Tuple[LanguageCode, float]]] = None) -> List[LanguageSegment]:
         """Segment text by language boundaries"""
         
         segments = []
@@ -395,7 +491,7 @@ class AdvancedMultilingualProcessor:
             current_pos = end_pos
             
             # Detect language for this segment
-            lang, confidence = await self._detect_primary_language(sentence)
+            lang, confidence = self._detect_cached(sentence, detections if detections is not None else {})
             
             # Detect script type
             script_type = self.hinglish_detector.detect_script_type(sentence)
@@ -451,7 +547,7 @@ class AdvancedMultilingualProcessor:
         
         return False
     
-    async def _transliterate_hinglish(self, text: str) -> str:
+    def _transliterate_hinglish(self, text: str) -> str:
         """Transliterate Hinglish to more readable form"""
         
         # Simple transliteration mappings
@@ -483,7 +579,7 @@ class AdvancedMultilingualProcessor:
         
         return ' '.join(transliterated_words)
     
-    async def _translate_to_english(self, text: str) -> Optional[str]:
+    def _translate_to_english(self, text: str) -> Optional[str]:
         """Translate text to English"""
         
         if not self.translator:
@@ -520,7 +616,7 @@ class AdvancedMultilingualProcessor:
                 # Remove oldest entries
                 keys_to_remove = list(self.translation_cache.keys())[:100]
                 for key in keys_to_remove:
-                    del self.translation_cache[key]
+                    self.translation_cache.pop(key, None)  # Concurrent stages may evict the same key
             
             return result
             
@@ -528,7 +624,7 @@ class AdvancedMultilingualProcessor:
             log_warning(f"Translation failed: {e}")
             return None
     
-    def _extract_context_hints(self, text: str, segments: List[LanguageSegment]) -> Dict[str, Any]:
+    def _extract_context_hints(self, text: str) -> Dict[str, Any]:
         """Extract contextual hints from the text"""
         
         hints = {
@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""
+Shared Lexicon Engine
+One compiled scan per message for every keyword and pattern set used in turn
+processing (mood, intents, business domain, electrical products).
+
+All literals of all registered sets are folded into a single trie-shaped
+regex that is run once over the lowercased message. Keyword rules are
+answered directly from that pass; pattern rules are only run (with their
+original regex, so results are unchanged) when one of their literals was
+seen. Registering more keywords grows the trie, not the number of passes.
+"""
+
+import re
+import threading
+from collections import OrderedDict
+from typing import Dict, FrozenSet, List, NamedTuple, Optional, Pattern, Set, Tuple
+
+# Characters that re.IGNORECASE equates with an ASCII letter but str.lower() does not
+_CASELESS_ODDITIES = ('ı', 'ſ')  # dotless i, long s
+_REGEX_METACHARS = set('.^$*+?{}[]()|')
+
+
+class LexiconHit(NamedTuple):
+    """A rule that matched: its label, keyword or pattern, and match count"""
+    label: str
+    term: str
+    count: int
+
+
+class _Rule(NamedTuple):
+    category: str
+    label: str
+    term: str
+    literals: Optional[Tuple[str, ...]]  # None: no literal could be extracted, always run
+    regex: Optional[Pattern]  # None for keyword rules
+    view: str
+    count: bool
+
+
+def _literal(alternative: str) -> Optional[str]:
+    """Unescape a regex alternative that is a plain literal, else None"""
+    chars = []
+    i = 0
+    while i < len(alternative):
+        ch = alternative[i]
+        if ch == '\\':
+            if i + 1 >= len(alternative) or alternative[i + 1].isalnum():
+                return None  # \d, \s, \b inside the literal...
+            chars.append(alternative[i + 1])
+            i += 2
+            continue
+        if ch in _REGEX_METACHARS:
+            return None
+        chars.append(ch)
+        i += 1
+    return ''.join(chars) or None
+
+
+def required_literals(pattern: str) -> Optional[Tuple[str, ...]]:
+    """
+    Lowercased literals of which at least one occurs in any match of
+    `pattern`, for patterns of the form \\b(?:a|b|c)\\b, ^(a|b), \\?$ and
+    the like. Returns None when the pattern is not such an alternation.
+    """
+    body = re.sub(r'^(?:\\b|\^)+', '', pattern)
+    body = re.sub(r'(?:\\b|(?<!\\)\$)+$', '', body)
+    if body.startswith('(') and body.endswith(')') and '(' not in body[1:-1] and ')' not in body[1:-1]:
+        body = body[1:-1]
+        if body.startswith('?:'):
+            body = body[2:]
+    literals = []
+    for alternative in body.split('|'):
+        literal = _literal(alternative)
+        if literal is None:
+            return None
+        literals.append(literal.lower())
+    return tuple(literals)
+
+
+def _trie_pattern(words: List[str]) -> str:
+    """Regex matching the longest of `words` that starts at the current position"""
+    trie: Dict[str, dict] = {}
+    for word in words:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[''] = {}
+
+    def build(node: Dict[str, dict]) -> str:
+        branches = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ''
+        alternation = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        # Greedy optional: the longer word wins, the shorter one is the fallback
+        return '(?:' + alternation + ')?' if '' in node else alternation
+
+    return build(trie)
+
+
+class _CompiledLexicon:
+    """Immutable snapshot of the registered rules plus the combined scanner"""
+
+    def __init__(self, categories: "OrderedDict[str, List[_Rule]]"):
+        self.rules: List[_Rule] = [rule for rules in categories.values() for rule in rules]
+        self.category_rules: Dict[str, List[int]] = {}
+        self.always: Set[int] = set()
+        self.ignorecase: Set[int] = set()
+        by_literal: Dict[str, Set[int]] = {}
+        for rule_id, rule in enumerate(self.rules):
+            self.category_rules.setdefault(rule.category, []).append(rule_id)
+            if rule.regex is not None and rule.regex.flags & re.IGNORECASE:
+                self.ignorecase.add(rule_id)
+            if rule.literals is None:
+                self.always.add(rule_id)
+                continue
+            for literal in rule.literals:
+                by_literal.setdefault(literal, set()).add(rule_id)
+
+        # The scanner reports the longest literal at each position; every
+        # shorter literal starting there is a prefix of it
+        self.closure: Dict[str, FrozenSet[int]] = {}
+        for literal in by_literal:
+            rule_ids: Set[int] = set()
+            for end in range(1, len(literal) + 1):
+                rule_ids.update(by_literal.get(literal[:end], ()))
+            self.closure[literal] = frozenset(rule_ids)
+        self.scanner: Optional[Pattern] = (
+            re.compile('(?=(' + _trie_pattern(list(by_literal)) + '))') if by_literal else None
+        )
+
+    def candidates(self, lowered: str) -> Set[int]:
+        found: Set[int] = set()
+        if self.scanner is not None:
+            for literal in set(self.scanner.findall(lowered)):
+                found.update(self.closure[literal])
+        found.update(self.always)
+        if not lowered.isascii() and any(ch in lowered for ch in _CASELESS_ODDITIES):
+            found.update(self.ignorecase)
+        return found
+
+
+class LexiconHits:
+    """Result of one scan; pattern rules of a category are checked on first access"""
+
+    def __init__(self, text: str, compiled: _CompiledLexicon):
+        self._compiled = compiled
+        self._views = {'text': text, 'lower': text.lower()}
+        self._views['stripped'] = self._views['lower'].strip()
+        self._candidates = compiled.candidates(self._views['lower'])
+        self._results: Dict[str, List[LexiconHit]] = {}
+
+    def matches(self, category: str) -> List[LexiconHit]:
+        """Matched rules of `category` in registration order"""
+        results = self._results.get(category)
+        if results is not None:
+            return results
+        results = []
+        for rule_id in self._compiled.category_rules.get(category, ()):
+            if rule_id not in self._candidates:
+                continue
+            rule = self._compiled.rules[rule_id]
+            if rule.regex is None:
+                results.append(LexiconHit(rule.label, rule.term, 1))
+                continue
+            view = self._views[rule.view]
+            count = len(rule.regex.findall(view)) if rule.count else int(rule.regex.search(view) is not None)
+            if count:
+                results.append(LexiconHit(rule.label, rule.term, count))
+        self._results[category] = results
+        return results
+
+    def counts(self, category: str) -> Dict[str, int]:
+        """Label -> summed match count, in registration order"""
+        totals: Dict[str, int] = {}
+        for hit in self.matches(category):
+            totals[hit.label] = totals.get(hit.label, 0) + hit.count
+        return totals
+
+
+class LexiconEngine:
+    """
+    Registry of keyword and pattern sets sharing one scan per message.
+
+    Pattern rules keep their own semantics: `view` selects the string they
+    run against ('text', 'lower' or 'stripped' = lowercased and stripped)
+    and `count` chooses findall counts over a yes/no search. Registering a
+    category again replaces it.
+    """
+
+    def __init__(self, cache_size: int = 256):
+        self._categories: "OrderedDict[str, List[_Rule]]" = OrderedDict()
+        self._compiled: Optional[_CompiledLexicon] = None
+        self._recent: "OrderedDict[str, LexiconHits]" = OrderedDict()
+        self._cache_size = cache_size
+        self._lock = threading.RLock()
+
+    def register_patterns(self, category: str, patterns: Dict[str, List[str]],
+                          flags: int = 0, view: str = 'text', count: bool = False):
+        rules = [_Rule(category, label, pattern, required_literals(pattern), re.compile(pattern, flags), view, count)
+                 for label, label_patterns in patterns.items() for pattern in label_patterns]
+        self._set_category(category, rules)
+
+    def register_keywords(self, category: str, keywords: Dict[str, List[str]]):
+        """Substring keywords, matched case-insensitively like `keyword.lower() in text.lower()`"""
+        rules = [_Rule(category, label, keyword, (keyword.lower(),), None, 'lower', False)
+                 for label, label_keywords in keywords.items() for keyword in label_keywords if keyword]
+        self._set_category(category, rules)
+
+    def _set_category(self, category: str, rules: List[_Rule]):
+        with self._lock:
+            if self._categories.get(category) == rules:
+                return
+            self._categories[category] = rules
+            self._compiled = None
+            self._recent.clear()
+
+    def scan(self, text: str) -> LexiconHits:
+        """Hits for `text`; consumers looking at the same message share the scan"""
+        with self._lock:
+            hits = self._recent.get(text)
+            if hits is not None:
+                self._recent.move_to_end(text)
+                return hits
+            if self._compiled is None:
+                self._compiled = _CompiledLexicon(self._categories)
+            compiled = self._compiled
+        hits = LexiconHits(text, compiled)
+        with self._lock:
+            if compiled is self._compiled:
+                self._recent[text] = hits
+                while len(self._recent) > self._cache_size:
+                    self._recent.popitem(last=False)
+        return hits
+
+    def get_stats(self) -> Dict[str, int]:
+        with self._lock:
+            compiled = self._compiled or _CompiledLexicon(self._categories)
+            return {
+                'categories': len(self._categories),
+                'rules': len(compiled.rules),
+                'literals': len(compiled.closure),
+                'unindexed_rules': len(compiled.always),
+                'cached_scans': len(self._recent)
+            }
+
+
+# Global instance
+_lexicon = None
+
+def get_lexicon() -> LexiconEngine:
+    """Get global lexicon engine instance"""
+    global _lexicon
+    if _lexicon is None:
+        _lexicon = LexiconEngine()
+    return _lexicon
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Train the character n-gram language model shipped as nlp/models/language_ngram.npz
+
+Classes: 'en' (English), 'hi' (Hindi, in Devanagari or romanized Hinglish)
+and 'other' (other Latin-script languages, which the detector escalates).
+The corpus is generated from shop-conversation templates below; the
+held-out evaluation set lives in scripts/bench_language_detection.py.
+Usage:
+  python nlp/training/train_language_ngram.py [--output PATH]
+"""
+
+import argparse
+import random
+import sys
+from pathlib import Path
+from typing import List, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
+
+from nlp.models.ngram_language_model import CharNgramLanguageModel, DEFAULT_MODEL_PATH  # noqa: E402
+
+PRODUCTS = ["switch", "wire", "cable", "mcb", "socket", "fan", "ceiling fan", "led bulb", "tube light",
+            "inverter", "battery", "stabilizer", "geyser", "extension board", "holder", "plug", "regulator",
+            "exhaust fan", "panel light", "copper wire", "modular switch", "doorbell", "ups", "meter"]
+BRANDS = ["havells", "anchor", "polycab", "finolex", "legrand", "crompton", "bajaj", "syska", "philips", "luminous"]
+PRODUCTS_HI = ["स्विच", "वायर", "तार", "केबल", "पंखा", "बल्ब", "सॉकेट", "इनवर्टर", "बैटरी", "गीजर", "एमसीबी", "होल्डर"]
+
+ENGLISH = [
+    "what is the price of {p}", "how much does the {b} {p} cost", "do you have {p} in stock",
+    "i need a {p} for my bedroom", "can you install the {p} tomorrow", "my {p} is not working",
+    "please send me a quotation for {p}", "which {p} would you recommend", "is there any discount on {p}",
+    "the {p} you sold me stopped working yesterday", "can i get a warranty on this {p}",
+    "when will the {b} {p} be available", "i want to buy two {p} and one {p2}", "how long does delivery take",
+    "thank you so much for your help", "where is your shop located", "what time do you open on sunday",
+    "could you tell me the difference between these two", "that sounds good, please go ahead",
+    "i will come to the shop in the evening", "do you accept card payments", "hello, is anyone there",
+    "good morning, i have a question", "the light keeps flickering in the kitchen", "my bill was too high this month",
+    "can your electrician visit my house today", "which brand is better for {p}", "is the {p} waterproof",
+    "i would like to return this {p}", "no thanks, that is all for now", "okay, see you later",
+    "how many watts does this {p} use", "what size of {p} do i need for a small room", "send the bill on whatsapp",
+]
+HINGLISH = [
+    "{p} ka rate kya hai", "{b} {p} kitne ka hai", "bhai {p} ka price batao", "mujhe {p} chahiye",
+    "{p} lagwana hai ghar mein", "mera {p} kharab ho gaya hai", "{p} ka quotation bhej do",
+    "kaun sa {p} accha rahega", "{p} pe koi discount milega kya", "kal wala {p} chal nahi raha",
+    "is {p} ki warranty kitni hai", "{b} {p} kab tak aayega", "do {p} aur ek {p2} dena",
+    "delivery kitne din mein hogi", "bahut bahut shukriya bhai", "aapki dukaan kahan par hai",
+    "sunday ko dukaan khuli rehti hai kya", "in dono mein kya fark hai", "theek hai, kar do",
+    "main shaam ko aata hoon", "card se payment ho jayega kya", "koi hai kya dukaan pe",
+    "namaste ji, ek sawal tha", "kitchen ki light baar baar jal bujh rahi hai", "is mahine bijli ka bill zyada aaya",
+    "electrician aaj ghar aa sakta hai kya", "{p} ke liye kaun sa brand sahi hai", "ye {p} paani mein kharab to nahi hoga",
+    "ye {p} wapas karna hai", "nahi bas itna hi chahiye", "accha theek hai, baad mein milte hain",
+    "is {p} mein kitne watt lagte hain", "chhote kamre ke liye kitna bada {p} chahiye", "bill whatsapp pe bhej dena",
+    "aur {p} ka kya bhav chal raha hai", "jaldi batao yaar", "haan ji bilkul", "abhi stock mein hai ya nahi",
+]
+HINDI = [
+    "{ph} का दाम क्या है", "{ph} कितने का है", "मुझे {ph} चाहिए", "मेरा {ph} खराब हो गया है",
+    "{ph} लगवाना है", "क्या {ph} पर छूट मिलेगी", "आपकी दुकान कहाँ है", "बहुत धन्यवाद",
+    "{ph} की वारंटी कितनी है", "कल तक {ph} भेज दीजिए", "ठीक है, कर दीजिए", "नमस्ते, एक सवाल है",
+]
+OTHER = [
+    "cuánto cuesta este interruptor", "necesito un cable para mi casa", "muchas gracias por su ayuda",
+    "dónde está la tienda", "el ventilador no funciona", "tiene bombillas en stock",
+    "combien coûte cet interrupteur", "j'ai besoin d'un câble pour ma maison", "merci beaucoup pour votre aide",
+    "où se trouve le magasin", "le ventilateur ne marche pas", "avez-vous des ampoules en stock",
+    "wie viel kostet dieser schalter", "ich brauche ein kabel für mein haus", "vielen dank für ihre hilfe",
+    "wo ist das geschäft", "der ventilator funktioniert nicht", "haben sie glühbirnen auf lager",
+    "quanto costa questo interruttore", "ho bisogno di un cavo per casa mia", "grazie mille per l'aiuto",
+    "dove si trova il negozio", "il ventilatore non funziona", "avete lampadine disponibili",
+    "quanto custa este interruptor", "preciso de um cabo para minha casa", "muito obrigado pela ajuda",
+    "onde fica a loja", "o ventilador não funciona", "vocês têm lâmpadas em estoque",
+]
+
+# Everyday vocabulary, sampled into short word sequences so the model sees
+# more than the templates above (short, informal turns are the hard cases)
+COMMON_EN = """the a an is are was were be been have has had do does did will would can could should
+may might must i you he she we they it my your our their this that these those what which who when where
+why how yes no not okay ok thanks thank please sorry hello hi hey bye good great fine bad better best
+new old big small more less much many some any all every one two three first last next today tomorrow
+yesterday now later soon morning evening night week month year time day price cost cheap expensive
+money pay paid bill order deliver delivery shop store buy sell need want like know think see come go
+get give take make send call check help work working broken fix repair install replace light power
+electric electricity house home room kitchen bathroom office wall door window with without from into
+about after before because but and or if then also just only very really still again here there""".split()
+COMMON_HI = """main mera meri mere mujhe hum hamara aap aapka aapki tum tumhara woh wo yeh ye kya kaun
+kahan kab kaise kyun kitna kitne kitni hai hain tha thi the ho hoga hogi hoon raha rahi rahe kar karo
+karna karke kiya kijiye diya dena de do lo lena le liya chahiye chaiye milega milegi mil jayega jaega
+nahi nahin na mat haan han ji bhai bhaiya yaar dost accha acha theek thik sahi galat bahut zyada kam
+thoda sab kuch koi aur ya lekin par pe mein me se ko ka ki ke tak bhi hi abhi kal aaj parson subah
+shaam raat din hafta mahina saal paisa paise rupaye daam bhav sasta mehenga dukaan ghar kamra bijli
+batti pankha taar jaldi dheere phir wapas naya purana bada chhota achha kharab chalu band lagana
+lagwana badalna dikhao batao bolo suno samjha samajh gaya gayi aaya aayi jao aao chalo ruko dekho""".split()
+OTHER_WORDS = """el la los las un una es son está están muy pero porque para por con sin qué cómo dónde
+cuándo gracias hola adiós bueno malo casa tienda precio dinero hoy mañana le les des une est sont
+très mais pour avec sans quoi comment où quand merci bonjour au revoir bon mauvais maison magasin
+prix argent aujourd hui demain der die das ein eine ist sind sehr aber weil für mit ohne was wie
+wo wann danke hallo tschüss gut schlecht haus laden preis geld heute morgen il lo gli della sono
+molto però perché per senza cosa come dove quando grazie ciao buono cattivo negozio prezzo soldi
+oggi domani os um uma são muito mas porque sem onde obrigado olá tchau bom ruim loja preço dinheiro
+hoje amanhã""".split()
+
+
+def word_sequence(rng: random.Random, words: List[str]) -> str:
+    return " ".join(rng.choice(words) for _ in range(rng.randint(1, 7)))
+
+def build_corpus(samples_per_class: int = 1500, seed: int = 13) -> Tuple[List[str], List[str]]:
+    rng = random.Random(seed)
+    texts, labels = [], []
+
+    def fill(template: str) -> str:
+        return template.format(p=rng.choice(PRODUCTS), p2=rng.choice(PRODUCTS), b=rng.choice(BRANDS),
+                               ph=rng.choice(PRODUCTS_HI))
+
+    for label, templates in (("en", ENGLISH), ("hi", HINGLISH)):
+        for _ in range(samples_per_class):
+            texts.append(fill(rng.choice(templates)))
+            labels.append(label)
+    for _ in range(samples_per_class // 4):
+        texts.append(fill(rng.choice(HINDI)))
+        labels.append("hi")
+    for _ in range(samples_per_class // 2):
+        texts.append(rng.choice(OTHER))
+        labels.append("other")
+    for label, words in (("en", COMMON_EN), ("hi", COMMON_HI), ("other", OTHER_WORDS)):
+        for _ in range(samples_per_class // 2):
+            texts.append(word_sequence(rng, words))
+            labels.append(label)
+    return texts, labels
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--output", default=str(DEFAULT_MODEL_PATH), help="where to write the .npz")
+    ap.add_argument("--max-features", type=int, default=6000)
+    args = ap.parse_args()
+
+    texts, labels = build_corpus()
+    model = CharNgramLanguageModel.train(texts, labels, max_features=args.max_features)
+    model.save(args.output)
+    train_accuracy = sum(label == predicted for label, (predicted, _, _) in zip(labels, model.classify(texts)))
+    print(f"trained on {len(texts)} texts: {len(model.vocabulary)} n-grams, classes {model.classes}, "
+          f"train accuracy {train_accuracy / len(texts):.3f} -> {args.output}")
+
+
+if __name__ == "__main__":
+    main()
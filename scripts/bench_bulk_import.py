@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Knowledge import benchmark: per-row add_knowledge vs the streaming bulk pipeline.
+
+- Writes a synthetic Hinglish knowledge file (JSON, JSONL or CSV) with N rows
+- Times the previous import (json.load + add_knowledge per row) on --legacy-rows
+  of them, since it is too slow to run on the full file
+- Times LearningManager.import_knowledge_file (streaming parse, chunked
+  executemany, one FTS rebuild) on the whole file
+Usage:
+  python scripts/bench_bulk_import.py --rows 100000 --format jsonl
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.knowledge_store import KnowledgeStore  # noqa: E402
+from src.learning import LearningManager  # noqa: E402
+
+PRODUCTS = ["switch", "wire", "mcb", "fan", "bulb", "socket", "led", "tube light", "extension board", "plug"]
+BRANDS = ["anchor", "havells", "polycab", "finolex", "legrand", "crompton", "bajaj", "philips", "syska", "orient"]
+
+
+def make_record(i: int) -> dict:
+    p = PRODUCTS[i % len(PRODUCTS)]
+    b = BRANDS[(i // len(PRODUCTS)) % len(BRANDS)]
+    return {'input': f"{b} {p} {i} ka price", 'response': f"{b} {p} model {i}: {i % 900 + 100} rupees",
+            'category': 'pricing', 'domain': 'shop', 'source': 'bench'}
+
+
+def write_file(path: Path, rows: int, fmt: str) -> None:
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        if fmt == 'jsonl':
+            for i in range(rows):
+                f.write(json.dumps(make_record(i)) + '\n')
+        elif fmt == 'csv':
+            writer = csv.DictWriter(f, fieldnames=list(make_record(0)))
+            writer.writeheader()
+            writer.writerows(make_record(i) for i in range(rows))
+        else:
+            json.dump([make_record(i) for i in range(rows)], f)
+
+
+def legacy_import(ks: KnowledgeStore, rows: int) -> float:
+    """The previous path: one add_knowledge (connection commit + trigger fire) per row."""
+    start = time.perf_counter()
+    for i in range(rows):
+        ks.add_knowledge(make_record(i))
+    return time.perf_counter() - start
+
+
+def run_benchmark(rows: int, fmt: str, legacy_rows: int) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / f"knowledge.{fmt}"
+        write_file(path, rows, fmt)
+
+        legacy_ks = KnowledgeStore(str(Path(tmp) / "legacy.db"), async_conversation_log=False)
+        legacy = legacy_import(legacy_ks, legacy_rows)
+        legacy_ks.close()
+
+        ks = KnowledgeStore(str(Path(tmp) / "bulk.db"), async_conversation_log=False)
+        lm = LearningManager(ks)
+        lm._rebuild_semantic_index_async = lambda domain: None  # measure the load only
+        start = time.perf_counter()
+        inserted, total = lm.import_knowledge_file(str(path), domain='shop')
+        bulk = time.perf_counter() - start
+        found = bool(ks.search_fulltext(make_record(rows // 2)['input'], domain='shop'))
+        ks.close()
+
+    print(f"=== Bulk Import Benchmark ({rows} rows, {fmt}) ===")
+    print(f"per-row add       : {legacy_rows / legacy:,.0f} rows/sec ({legacy_rows} rows, "
+          f"~{rows * legacy / legacy_rows:.1f} s for the full file)")
+    print(f"bulk pipeline     : {inserted / bulk:,.0f} rows/sec ({inserted}/{total} rows in {bulk:.2f} s)")
+    print(f"speedup           : {(rows * legacy / legacy_rows) / bulk:.1f}x")
+    print(f"FTS searchable    : {found}")
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rows", type=int, default=100000, help="rows in the import file")
+    ap.add_argument("--format", choices=["json", "jsonl", "csv"], default="jsonl", help="import file format")
+    ap.add_argument("--legacy-rows", type=int, default=5000, help="rows to time on the per-row path")
+    args = ap.parse_args()
+
+    run_benchmark(args.rows, args.format, args.legacy_rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Context retrieval benchmark: linear scan vs ContextIndex in ContextAwareConversationManager.
+
+- Fills two managers with the same N synthetic contexts (mixed types,
+  importance, expired / recently used entries)
+- Runs the same turns through the previous linear _retrieve_relevant_context
+  and the indexed one, checking both return the same contexts
+Usage:
+  python scripts/bench_context_retrieval.py --contexts 10000 --queries 500
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from core.state_manager import (  # noqa: E402
+    ContextAwareConversationManager, ContextType, ConversationContext, ConversationState,
+)
+
+COMMON = ["price", "rate", "kitne", "ka", "hai", "batao", "chahiye", "mein"]
+WORDS = [f"{brand} {product} {size}"
+         for brand in ["anchor", "havells", "polycab", "finolex", "legrand", "crompton", "bajaj", "syska"]
+         for product in ["switch", "wire", "mcb", "fan", "bulb", "socket", "led", "regulator", "plug", "board"]
+         for size in ["6a", "16a", "32a", "9w", "12w", "1.5mm", "2.5mm", "4mm"]]
+STATES = [ConversationState.GREETING, ConversationState.INQUIRY, ConversationState.NEGOTIATION,
+          ConversationState.DISCUSSION, ConversationState.CLARIFICATION]
+
+
+class LinearScanManager(ContextAwareConversationManager):
+    """Previous O(contexts) retrieval, kept for comparison."""
+
+    async def _retrieve_relevant_context(self, user_input, user_profile, conversation_state):
+        relevant_contexts = []
+        input_lower = user_input.lower()
+        context_scores = []
+        for context in self.conversation_contexts.values():
+            score = 0.0
+            if context.expiry_time and context.expiry_time < datetime.now():
+                continue
+            context_text = json.dumps(context.data).lower()
+            common_words = set(input_lower.split()) & set(context_text.split())
+            if common_words:
+                score += len(common_words) * 0.1
+            type_relevance = {
+                ConversationState.GREETING: [ContextType.PERSONAL, ContextType.RELATIONAL],
+                ConversationState.INQUIRY: [ContextType.BUSINESS, ContextType.TECHNICAL],
+                ConversationState.NEGOTIATION: [ContextType.TRANSACTIONAL, ContextType.BUSINESS],
+                ConversationState.DISCUSSION: [ContextType.BUSINESS, ContextType.TECHNICAL],
+                ConversationState.CLARIFICATION: [ContextType.TECHNICAL, ContextType.BUSINESS]
+            }
+            if conversation_state in type_relevance and context.context_type in type_relevance[conversation_state]:
+                score += 0.3
+            score *= context.importance
+            if context.last_accessed and context.last_accessed > datetime.now() - timedelta(hours=1):
+                score += 0.2
+            context_scores.append((context, score))
+        context_scores.sort(key=lambda x: x[1], reverse=True)
+        for context, score in context_scores[:5]:
+            if score > 0.1:
+                relevant_contexts.append(context)
+                context.access_count += 1
+                context.last_accessed = datetime.now()
+                self.context_hits += 1
+            else:
+                self.context_misses += 1
+        return relevant_contexts
+
+
+def make_contexts(count: int) -> List[ConversationContext]:
+    rng = random.Random(3)
+    now = datetime.now()
+    types = list(ContextType)
+    contexts = []
+    for i in range(count):
+        text = f"{rng.choice(WORDS)} {rng.choice(COMMON)} {rng.choice(COMMON)}"
+        expired = rng.random() < 0.2
+        contexts.append(ConversationContext(
+            context_id=f"ctx_{i}",
+            context_type=rng.choice(types),
+            data={'user_input': text, 'domain': 'electrical_business', 'intent': 'price_inquiry',
+                  'session_id': f"s{i % 300}", 'timestamp': now.isoformat()},
+            importance=round(rng.uniform(0.3, 1.0), 2),
+            expiry_time=now + (timedelta(hours=-1) if expired else timedelta(hours=24)),
+            last_accessed=now - timedelta(minutes=rng.randint(0, 600)) if rng.random() < 0.05 else None,
+            created_at=now,
+        ))
+    return contexts
+
+
+async def run_benchmark(count: int, queries: int) -> None:
+    rng = random.Random(5)
+    turns = [(f"{rng.choice(WORDS)} {rng.choice(COMMON)}", rng.choice(STATES))
+             for _ in range(queries)]
+    with tempfile.TemporaryDirectory() as tmp:
+        linear = LinearScanManager(db_path=str(Path(tmp) / "linear.db"))
+        indexed = ContextAwareConversationManager(db_path=str(Path(tmp) / "indexed.db"))
+        await asyncio.sleep(0)  # let the (empty) startup loads run first
+        for manager in (linear, indexed):
+            for context in make_contexts(count):
+                manager.conversation_contexts[context.context_id] = context
+                manager._context_index.add(context)
+
+        start = time.perf_counter()
+        linear_ids = [[c.context_id for c in await linear._retrieve_relevant_context(q, None, st)]
+                      for q, st in turns]
+        linear_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        indexed_ids = [[c.context_id for c in await indexed._retrieve_relevant_context(q, None, st)]
+                       for q, st in turns]
+        indexed_time = time.perf_counter() - start
+
+    mismatches = sum(1 for a, b in zip(linear_ids, indexed_ids) if a != b)
+    print(f"=== Context Retrieval Benchmark ({count} contexts) ===")
+    print(f"queries           : {queries} ({sum(1 for ids in indexed_ids if ids)} with contexts)")
+    print(f"linear scan       : {linear_time * 1000 / queries:.3f} ms/turn")
+    print(f"context index     : {indexed_time * 1000 / queries:.3f} ms/turn")
+    if indexed_time > 0:
+        print(f"speedup           : {linear_time / indexed_time:.1f}x")
+    print(f"mismatches        : {mismatches}")
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--contexts", type=int, nargs="+", default=[10000], help="stored context counts")
+    ap.add_argument("--queries", type=int, default=300, help="turns per size")
+    args = ap.parse_args()
+
+    for count in args.contexts:
+        asyncio.run(run_benchmark(count, args.queries))
+
+
+if __name__ == "__main__":
+    main()
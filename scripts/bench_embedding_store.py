@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Cold semantic-index build benchmark: with vs without the persistent embedding store.
+
+- Generates N synthetic Hinglish knowledge inputs
+- Times SemanticIndex.build with every row re-encoded (no store)
+- Times the first build that populates the store, then a "restart" build served from it
+Usage:
+  python scripts/bench_embedding_store.py --rows 50000 --model all-MiniLM-L6-v2
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import List, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src import embedding_store  # noqa: E402
+from src.semantic_index import SemanticIndex  # noqa: E402
+
+PRODUCTS = ["switch", "wire", "mcb", "fan", "bulb", "socket", "led", "tube light", "extension board", "plug"]
+TEMPLATES = ["{p} ka price kya hai {n}", "{p} ki rate batao {n}", "{p} kitne ka hai {n}", "{n} {p} available hai kya"]
+
+
+def make_items(rows: int) -> List[Tuple[int, str]]:
+    items = []
+    for i in range(rows):
+        p = PRODUCTS[i % len(PRODUCTS)]
+        t = TEMPLATES[(i // len(PRODUCTS)) % len(TEMPLATES)]
+        items.append((i + 1, t.format(p=p, n=i)))
+    return items
+
+
+def timed_build(si: SemanticIndex, items: List[Tuple[int, str]], domain: str) -> float:
+    start = time.perf_counter()
+    si.build(items, domain)
+    return time.perf_counter() - start
+
+
+def run_benchmark(rows: int, model: str) -> None:
+    items = make_items(rows)
+    with tempfile.TemporaryDirectory() as tmp:
+        index_dir = str(Path(tmp) / "vector_index")
+        store_dir = str(Path(tmp) / "embeddings")
+
+        # Load the model once up front so only encoding/indexing is measured
+        plain = SemanticIndex(base_dir=index_dir, model_name=model, use_embedding_store=False)
+        plain._ensure_model()
+        no_store = timed_build(plain, items, "bench_plain")
+
+        cached = SemanticIndex(base_dir=index_dir, model_name=model, embedding_dir=store_dir)
+        populate = timed_build(cached, items, "bench_store")
+
+        # Simulated restart: drop in-memory stores so the next build reopens from disk
+        embedding_store._embedding_stores.clear()
+        warm = timed_build(cached, items, "bench_store")
+        misses = embedding_store.get_embedding_store(model, store_dir).stats['misses']
+
+    print("=== Embedding Store Cold Build Benchmark ===")
+    print(f"rows              : {rows}")
+    print(f"model             : {model}")
+    print(f"no store     (s)  : {no_store:.2f}")
+    print(f"store, first (s)  : {populate:.2f}")
+    print(f"store, warm  (s)  : {warm:.2f}  (model calls for {misses} rows)")
+    if warm > 0:
+        print(f"speedup           : {no_store / warm:.1f}x")
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rows", type=int, default=10000, help="number of knowledge rows")
+    ap.add_argument("--model", type=str, default="all-MiniLM-L6-v2", help="sentence-transformers model")
+    args = ap.parse_args()
+
+    run_benchmark(args.rows, args.model)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Fuzzy-match benchmark: linear scan vs inverted index in UnifiedLearningManager.
+
+- Builds a synthetic Hinglish knowledge base with N questions
+- Runs the same queries through the previous linear _find_best_match and the
+  indexed one, checking that both pick the same question
+Usage:
+  python scripts/bench_fuzzy_match.py --entries 10000 100000 --queries 500
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from core.adaptation_engine import UnifiedLearningManager  # noqa: E402
+
+PRODUCTS = ["switch", "wire", "mcb", "fan", "bulb", "socket", "led", "tube light", "extension board",
+            "plug", "regulator", "holder", "meter", "inverter", "battery", "cable", "panel", "geyser"]
+BRANDS = ["anchor", "havells", "polycab", "finolex", "legrand", "crompton", "bajaj", "philips", "syska", "orient"]
+TEMPLATES = ["{b} {p} ka price {n}", "{b} {p} ki rate kya hai {n}", "{p} {n} {b} kitne ka hai",
+             "{b} {p} {n} available hai kya", "{n} amp {b} {p} ka rate"]
+
+
+def make_questions(entries: int) -> List[str]:
+    questions = []
+    for i in range(entries):
+        p = PRODUCTS[i % len(PRODUCTS)]
+        b = BRANDS[(i // len(PRODUCTS)) % len(BRANDS)]
+        t = TEMPLATES[(i // (len(PRODUCTS) * len(BRANDS))) % len(TEMPLATES)]
+        questions.append(t.format(b=b, p=p, n=i))
+    return questions
+
+
+def make_queries(questions: List[str], count: int) -> List[str]:
+    rng = random.Random(7)
+    queries = []
+    for i in range(count):
+        q = rng.choice(questions)
+        words = q.split()
+        kind = i % 4
+        if kind == 0:
+            queries.append(q[1:])                      # substring of a question
+        elif kind == 1:
+            queries.append(" ".join(words[:-1] + ["batao"]))  # word overlap
+        elif kind == 2:
+            queries.append(" ".join(reversed(words)))  # same words, other order
+        else:
+            queries.append(f"{rng.choice(PRODUCTS)} ka warranty {rng.randint(0, 10 ** 6)}")  # miss
+    return queries
+
+
+def linear_find_best_match(knowledge_base: Dict[str, dict], query: str) -> Optional[str]:
+    """The previous O(entries) implementation, kept for comparison."""
+    query_words = set(query.split())
+    query_clean = query.strip().lower()
+    best_match = None
+    best_score = 0
+    for question in knowledge_base.keys():
+        question_words = set(question.split())
+        question_clean = question.strip().lower()
+        if query_clean == question_clean:
+            return question
+        if query_clean in question_clean and len(query_clean) > 3:
+            if len(query_clean) / len(question_clean) > 0.6:
+                return question
+        if question_clean in query_clean and len(question_clean) > 3:
+            if len(question_clean) / len(query_clean) > 0.6:
+                return question
+        common_words = query_words.intersection(question_words)
+        if len(common_words) >= 2:
+            query_coverage = len(common_words) / len(query_words)
+            question_coverage = len(common_words) / len(question_words)
+            if query_coverage >= 0.7 and question_coverage >= 0.7:
+                score = (query_coverage + question_coverage) / 2
+                if score > best_score:
+                    best_score = score
+                    best_match = question
+    if best_score >= 0.6:
+        return best_match
+    return None
+
+
+def run_benchmark(entries: int, queries: int) -> None:
+    logger = logging.getLogger("bench")
+    logger.setLevel(logging.WARNING)
+    questions = make_questions(entries)
+    qs = make_queries(questions, queries)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        lm = UnifiedLearningManager(logger, knowledge_file=str(Path(tmp) / "knowledge.json"))
+        start = time.perf_counter()
+        lm.knowledge_base = {q: {'answer': f"answer {i}", 'usage_count': 0} for i, q in enumerate(questions)}
+        lm._rebuild_match_index()
+        build = time.perf_counter() - start
+
+        start = time.perf_counter()
+        linear = [linear_find_best_match(lm.knowledge_base, q) for q in qs]
+        linear_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        indexed = [lm._find_best_match(q) for q in qs]
+        indexed_time = time.perf_counter() - start
+
+    mismatches = sum(1 for a, b in zip(linear, indexed) if a != b)
+    print(f"=== Fuzzy Match Benchmark ({entries} entries) ===")
+    print(f"queries           : {queries} ({sum(1 for m in indexed if m)} matched)")
+    print(f"index build (s)   : {build:.2f}")
+    print(f"linear scan       : {linear_time * 1000 / queries:.3f} ms/query")
+    print(f"inverted index    : {indexed_time * 1000 / queries:.3f} ms/query")
+    if indexed_time > 0:
+        print(f"speedup           : {linear_time / indexed_time:.1f}x")
+    print(f"mismatches        : {mismatches}")
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--entries", type=int, nargs="+", default=[10000, 100000], help="knowledge base sizes")
+    ap.add_argument("--queries", type=int, default=200, help="queries per size")
+    args = ap.parse_args()
+
+    for entries in args.entries:
+        run_benchmark(entries, args.queries)
+
+
+if __name__ == "__main__":
+    main()
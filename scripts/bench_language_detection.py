@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Language detection benchmark: full ensemble on every turn vs the tiered detector.
+
+- Held-out English / Hinglish / Hindi turns (written separately from the
+  training templates in nlp/training/train_language_ngram.py) plus a few
+  other languages, which the tiered detector should escalate
+- Reports per-call latency, accuracy on en/hi and how often each tier answers
+Usage:
+  python scripts/bench_language_detection.py --rounds 20
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+from typing import List, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from enhanced_language_detection import EnhancedLanguageDetector  # noqa: E402
+
+HELD_OUT: List[Tuple[str, str]] = [
+    ("Is the shop open during Diwali week?", "en"),
+    ("My neighbour recommended your store", "en"),
+    ("The fuse blew again after the storm last night", "en"),
+    ("Could you check whether the earthing in my flat is proper?", "en"),
+    ("We are renovating the office and need twenty sockets", "en"),
+    ("Please keep two rolls of wire aside for me", "en"),
+    ("What warranty comes with the solar panel?", "en"),
+    ("The fan makes a humming noise at low speed", "en"),
+    ("Do you repair old table lamps?", "en"),
+    ("I paid online, please confirm the payment", "en"),
+    ("Thanks, the electrician did a great job", "en"),
+    ("Which one is more energy efficient?", "en"),
+    ("Great, I will pick it up on Saturday", "en"),
+    ("Sorry, I meant the bigger model", "en"),
+    ("Can I get a GST invoice for this purchase?", "en"),
+    ("diwali ke time dukaan khuli rahegi kya", "hi"),
+    ("padosi ne aapki dukaan ka naam bataya tha", "hi"),
+    ("kal raat toofan ke baad fuse phir ud gaya", "hi"),
+    ("mere flat ki earthing check kar doge kya", "hi"),
+    ("office ka kaam chal raha hai, bees socket lagenge", "hi"),
+    ("do bundle taar mere liye rakh lena", "hi"),
+    ("solar panel ke saath kitni guarantee milti hai", "hi"),
+    ("pankha dheere chalne par awaaz karta hai", "hi"),
+    ("purane table lamp theek karte ho kya", "hi"),
+    ("maine online paisa bhej diya hai, dekh lo", "hi"),
+    ("shukriya, mistri ne badhiya kaam kiya", "hi"),
+    ("inme se kaunsa bijli kam khata hai", "hi"),
+    ("thik hai, shanivar ko le jaunga", "hi"),
+    ("maaf karna, mera matlab bada wala tha", "hi"),
+    ("is kharid ka pakka bill mil jayega kya", "hi"),
+    ("दिवाली पर दुकान खुली रहेगी क्या", "hi"),
+    ("कल रात फ्यूज फिर से उड़ गया", "hi"),
+    ("पंखा धीमी स्पीड पर आवाज़ करता है", "hi"),
+    ("मैंने ऑनलाइन पैसे भेज दिए हैं", "hi"),
+    ("बिजली वाले ने बढ़िया काम किया, धन्यवाद", "hi"),
+    ("¿La tienda abre los domingos?", "other"),
+    ("Le fusible a encore sauté cette nuit", "other"),
+    ("Können Sie morgen vorbeikommen?", "other"),
+    ("Il ventilatore fa rumore a bassa velocità", "other"),
+    ("Paguei pela internet, pode confirmar?", "other"),
+]
+
+
+class EnsembleOnlyDetector(EnhancedLanguageDetector):
+    """Previous behaviour (every turn through the ensemble), kept for comparison."""
+
+    def __init__(self):
+        super().__init__()
+        self.language_model = None
+        self.settings['script_fast_path_share'] = 2.0  # Never reached: no script fast path
+
+
+def accuracy(results, cases) -> float:
+    scored = [(result.detected_language, expected) for result, (_, expected) in zip(results, cases)
+              if expected != "other"]
+    return sum(got == expected for got, expected in scored) / len(scored)
+
+
+async def time_single(detector: EnhancedLanguageDetector, rounds: int) -> tuple:
+    results = []
+    start = time.perf_counter()
+    for _ in range(rounds):
+        results = [await detector.detect_language_advanced(text) for text, _ in HELD_OUT]
+    return (time.perf_counter() - start) / (rounds * len(HELD_OUT)), results
+
+
+async def run_benchmark(rounds: int) -> None:
+    legacy, tiered = EnsembleOnlyDetector(), EnhancedLanguageDetector()
+    legacy_time, legacy_results = await time_single(legacy, rounds)
+    tiered_time, tiered_results = await time_single(tiered, rounds)
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        batch_results = await tiered.detect_language_batch([text for text, _ in HELD_OUT])
+    batch_time = (time.perf_counter() - start) / (rounds * len(HELD_OUT))
+
+    tiers = Counter(result.method_used.value for result in tiered_results)
+    other_escalated = sum(1 for result, (_, expected) in zip(tiered_results, HELD_OUT)
+                          if expected == "other" and result.method_used.value not in ("script", "ngram"))
+    mismatches = sum(1 for a, b in zip(tiered_results, batch_results)
+                     if (a.detected_language, a.method_used) != (b.detected_language, b.method_used))
+    print("=== Language Detection Benchmark ===")
+    print(f"held-out turns    : {len(HELD_OUT)} x {rounds} rounds")
+    print(f"ensemble only     : {legacy_time * 1e6:.1f} us/call, en/hi accuracy {accuracy(legacy_results, HELD_OUT):.3f}")
+    print(f"tiered            : {tiered_time * 1e6:.1f} us/call, en/hi accuracy {accuracy(tiered_results, HELD_OUT):.3f}")
+    print(f"tiered batch      : {batch_time * 1e6:.1f} us/text")
+    print(f"answered by tier  : {dict(tiers)}")
+    print(f"other escalated   : {other_escalated}/{sum(1 for _, e in HELD_OUT if e == 'other')}")
+    print(f"mismatches        : {mismatches}")
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rounds", type=int, default=20, help="passes over the held-out set")
+    args = ap.parse_args()
+    asyncio.run(run_benchmark(args.rounds))
+
+
+if __name__ == "__main__":
+    main()
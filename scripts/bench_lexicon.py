@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Turn-level NLP benchmark: separate regex/keyword scans vs the shared lexicon scan.
+
+- Runs every detector a turn touches (mood, conversation intent, business
+  domain, NLP intent, electrical intent, product mentions) on the same
+  synthetic Hinglish / Hindi / English messages
+- "separate" is the previous per-pattern code, "lexicon" the current
+  consumers; both must return identical results
+Usage:
+  python scripts/bench_lexicon.py --turns 5000
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+import re
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from core.state_manager import (  # noqa: E402
+    BUSINESS_DOMAIN_KEYWORDS, CONVERSATION_INTENT_PATTERNS, ContextAwareConversationManager, UserMood,
+)
+from nlp.advanced_nlp import AdvancedNLPEngine  # noqa: E402
+from nlp.processing.lexicon import get_lexicon  # noqa: E402
+from src.electrical_business_enhancer import ElectricalBusinessEnhancer  # noqa: E402
+
+OPENERS = ["", "hello ", "namaste ", "bhai ", "sir ", "नमस्ते ", "hi, ", "what ", "kya ", "please "]
+BODIES = [
+    "{p} ka rate kitna hai", "{p} kitne ka milega", "mujhe {p} chahiye", "{p} install karna hai",
+    "{p} not working, problem hai", "how to fix {p}", "{p} ki warranty kitni hai", "{p} का दाम क्या है",
+    "{p} खराब हो गया", "suggest a good {p}", "{p} pe discount milega?", "shop timing kya hai",
+    "thank you, {p} badhiya hai", "urgent!! {p} chahiye abhi", "{p} 16a ya 32a, which is better?",
+    "kal {p} le jaunga, ok done", "{p} mein 2.5mm wire lagega?", "बिजली चली गई, inverter batao",
+]
+PRODUCTS = ["switch", "modular switch", "wire", "copper wire", "mcb", "ceiling fan", "led bulb", "tube light",
+            "socket", "3 pin socket", "inverter", "stabilizer", "geyser", "स्विच", "पंखा", "बल्ब", "cable", "ups"]
+CLOSERS = ["", "?", " 👍", " please", " jaldi", "!!", " ??", " 😠", " bye"]
+
+
+def make_messages(count: int) -> List[str]:
+    rng = random.Random(11)
+    return [
+        f"{rng.choice(OPENERS)}{rng.choice(BODIES).format(p=rng.choice(PRODUCTS))}{rng.choice(CLOSERS)} #{i}"
+        for i in range(count)
+    ]
+
+
+class SeparateScans:
+    """Previous detectors, one regex or keyword loop per set, kept for comparison."""
+
+    def __init__(self, manager: ContextAwareConversationManager, nlp: AdvancedNLPEngine,
+                 enhancer: ElectricalBusinessEnhancer):
+        self.mood_patterns = {mood: [re.compile(p, re.IGNORECASE) for p in patterns]
+                              for mood, patterns in manager.mood_detector.mood_patterns.items()}
+        self.nlp = nlp
+        self.enhancer = enhancer
+
+    def mood_scores(self, text: str) -> Dict[UserMood, float]:
+        mood_scores = defaultdict(float)
+        for mood, patterns in self.mood_patterns.items():
+            for pattern in patterns:
+                mood_scores[mood] += len(pattern.findall(text)) * 0.3
+        return dict(mood_scores)
+
+    def domain(self, text: str) -> str:
+        if any(keyword in text.lower() for keyword in BUSINESS_DOMAIN_KEYWORDS):
+            return 'electrical_business'
+        return 'general'
+
+    def intent(self, text: str) -> str:
+        for intent, patterns in CONVERSATION_INTENT_PATTERNS.items():
+            if any(re.search(pattern, text, re.IGNORECASE) for pattern in patterns):
+                return intent
+        return 'general_inquiry'
+
+    def nlp_intent(self, text: str) -> Dict[str, Any]:
+        text_lower = text.lower().strip()
+        detected_intents = []
+        confidence_scores = {}
+        for intent, patterns in self.nlp.intent_patterns.items():
+            for pattern in patterns:
+                if re.search(pattern, text_lower):
+                    detected_intents.append(intent)
+                    confidence_scores[intent] = confidence_scores.get(intent, 0) + 0.3
+        if not detected_intents:
+            return {"intent": "general", "confidence": 0.5, "entities": []}
+        primary_intent = max(detected_intents, key=lambda x: confidence_scores.get(x, 0))
+        return {
+            "intent": primary_intent,
+            "confidence": min(confidence_scores.get(primary_intent, 0.5), 1.0),
+            "all_intents": detected_intents,
+            "entities": self.nlp.extract_entities(text)
+        }
+
+    def electrical_scores(self, text: str) -> Dict[str, float]:
+        text_lower = text.lower()
+        scores = {}
+        for intent, patterns in self.enhancer.enhanced_patterns.items():
+            score = 0
+            for pattern in patterns:
+                if re.search(pattern, text_lower):
+                    score += 0.3
+            if score > 0:
+                scores[intent] = score
+        return scores
+
+    def products(self, text: str) -> List[Dict[str, Any]]:
+        identified_products = []
+        text_lower = text.lower()
+        for category, products in self.enhancer.product_categories.items():
+            for product in products:
+                if product.lower() in text_lower:
+                    if not any(p['product'] == product for p in identified_products):
+                        identified_products.append({
+                            "product": product,
+                            "category": category,
+                            "confidence": 0.8 if len(product) > 3 else 0.6
+                        })
+        return identified_products
+
+    def turn(self, text: str) -> tuple:
+        return (self.mood_scores(text), self.domain(text), self.intent(text), self.nlp_intent(text),
+                self.electrical_scores(text), self.products(text))
+
+
+class SharedScan:
+    """Current detectors, all served from one lexicon scan per message."""
+
+    def __init__(self, manager: ContextAwareConversationManager, nlp: AdvancedNLPEngine,
+                 enhancer: ElectricalBusinessEnhancer):
+        self.manager = manager
+        self.nlp = nlp
+        self.enhancer = enhancer
+
+    def mood_scores(self, text: str) -> Dict[UserMood, float]:
+        mood_scores = defaultdict(float, {mood: 0.0 for mood in self.manager.mood_detector.mood_patterns})
+        for hit in get_lexicon().scan(text).matches('mood'):
+            mood_scores[UserMood(hit.label)] += hit.count * 0.3
+        return dict(mood_scores)
+
+    def turn(self, text: str) -> tuple:
+        return (self.mood_scores(text), self.manager._extract_domain_from_input(text),
+                self.manager._extract_intent_from_input(text), self.nlp.extract_intent(text),
+                self.enhancer._electrical_intent_scores(text), self.enhancer.identify_products(text))
+
+
+async def run_benchmark(turns: int) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        manager = ContextAwareConversationManager(db_path=str(Path(tmp) / "conversation.db"))
+        await asyncio.sleep(0)  # let the (empty) startup loads run first
+        nlp = AdvancedNLPEngine()
+        enhancer = ElectricalBusinessEnhancer()
+        separate = SeparateScans(manager, nlp, enhancer)
+        shared = SharedScan(manager, nlp, enhancer)
+        messages = make_messages(turns)
+        get_lexicon().scan("warm up")
+
+        start = time.perf_counter()
+        separate_results = [separate.turn(text) for text in messages]
+        separate_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        shared_results = [shared.turn(text) for text in messages]
+        shared_time = time.perf_counter() - start
+        await manager.cleanup()
+
+    mismatches = sum(1 for a, b in zip(separate_results, shared_results) if a != b)
+    stats = get_lexicon().get_stats()
+    print("=== Turn-level NLP Benchmark ===")
+    print(f"turns             : {turns}")
+    print(f"lexicon           : {stats['rules']} rules, {stats['literals']} literals, "
+          f"{stats['unindexed_rules']} rules always checked")
+    print(f"separate scans    : {separate_time * 1e6 / turns:.1f} us/turn")
+    print(f"shared lexicon    : {shared_time * 1e6 / turns:.1f} us/turn")
+    if shared_time > 0:
+        print(f"speedup           : {separate_time / shared_time:.1f}x")
+    print(f"mismatches        : {mismatches}")
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--turns", type=int, default=5000, help="messages to process")
+    args = ap.parse_args()
+    asyncio.run(run_benchmark(args.turns))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Multilingual analysis benchmark: eager stages + per-call metric task vs lazy fields + aggregated metrics.
+
+- Analyzes N synthetic Hinglish / English / Hindi turns where the caller
+  only reads the primary language (the common case)
+- Also times analyze_many over the same turns and reports how many
+  metric rows each approach writes
+Usage:
+  python scripts/bench_multilingual_analysis.py --texts 5000
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from nlp.processing.language_detector import AdvancedMultilingualProcessor, MultilingualAnalysis  # noqa: E402
+from utils.performance_monitor import MetricType, get_performance_monitor  # noqa: E402
+
+WORDS = ["Switch", "ka", "price", "kya", "hai?", "Wire", "kitne", "rupees", "mein", "milta", "Please", "tell",
+         "me", "about", "MCB", "installation.", "Main", "ek", "shop", "khol", "raha", "hun.", "Thank", "you,",
+         "ji.", "Bahut", "accha", "What", "is", "the", "rate", "of", "copper", "wire?", "मैं", "एक", "दुकान", "है।"]
+
+
+class EagerProcessor(AdvancedMultilingualProcessor):
+    """Previous analyze_text (every stage computed, one metric task per call), kept for comparison."""
+
+    async def analyze_text(self, text, context=None, concurrent=False) -> MultilingualAnalysis:
+        start_time = time.time()
+        analysis = self._build_analysis(text, {})
+        for name in ("segments", "is_code_switching", "transliterated_text", "translated_text"):
+            getattr(analysis, name)
+        analysis.processing_time_ms = (time.time() - start_time) * 1000
+        get_performance_monitor().record_metric(MetricType.RESPONSE_TIME, analysis.processing_time_ms,
+                                                "multilingual_processor",
+                                                {"language": analysis.primary_language.value,
+                                                 "segments": len(analysis.segments)})
+        return analysis
+
+
+def make_texts(count: int) -> List[str]:
+    rng = random.Random(4)
+    return [" ".join(rng.choice(WORDS) for _ in range(rng.randint(1, 12))) for _ in range(count)]
+
+
+def table_rows(db_path: str, table: str) -> int:
+    with sqlite3.connect(db_path) as conn:
+        return conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+
+
+async def run_benchmark(count: int) -> None:
+    texts = make_texts(count)
+    monitor = get_performance_monitor()
+    old, new = EagerProcessor(enable_translation=False), AdvancedMultilingualProcessor(enable_translation=False)
+
+    start = time.perf_counter()
+    old_results = [await old.analyze_text(text) for text in texts]
+    await asyncio.sleep(0)  # Let the queued metric writes run
+    while len(asyncio.all_tasks()) > 1:
+        await asyncio.sleep(0.01)
+    old_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    new_results = [await new.analyze_text(text) for text in texts]
+    new_time = time.perf_counter() - start
+    start = time.perf_counter()
+    batch_results = await new.analyze_many(texts)
+    batch_time = time.perf_counter() - start
+    flushed = monitor.flush_aggregates()
+
+    mismatches = sum(1 for a, b, c in zip(old_results, new_results, batch_results)
+                     if not (a.primary_language == b.primary_language == c.primary_language
+                             and a.segments == b.segments == c.segments
+                             and a.transliterated_text == b.transliterated_text == c.transliterated_text))
+    print("=== Multilingual Analysis Benchmark ===")
+    print(f"texts             : {count}")
+    print(f"eager + task/call : {old_time * 1e6 / count:.1f} us/text "
+          f"({table_rows(monitor.db_path, 'metrics')} metric rows)")
+    print(f"lazy + aggregated : {new_time * 1e6 / count:.1f} us/text ({flushed} aggregate rows)")
+    print(f"analyze_many      : {batch_time * 1e6 / count:.1f} us/text")
+    print(f"mismatches        : {mismatches}")
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--texts", type=int, default=5000, help="turns to analyze")
+    args = ap.parse_args()
+    os.chdir(tempfile.mkdtemp())  # The monitor writes data/performance.db relative to the cwd
+    asyncio.run(run_benchmark(args.texts))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: per-call sqlite3.connect vs pooled KnowledgeStore connections.
+
+- Seeds a temporary knowledge DB with N rows
+- Times M lookups by id opening a fresh connection per call (previous behaviour)
+- Times the same lookups through KnowledgeStore's thread-local pooled connections
+Usage:
+  python scripts/bench_sqlite_pool.py --rows 10000 --iters 20000
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.knowledge_store import KnowledgeStore  # noqa: E402
+
+
+def per_call_lookup(db_path: str, knowledge_id: int):
+    with sqlite3.connect(db_path) as conn:
+        conn.row_factory = sqlite3.Row
+        row = conn.execute("SELECT * FROM knowledge WHERE id = ?", (knowledge_id,)).fetchone()
+        if row:
+            item = dict(row)
+            if item['metadata']:
+                item.update(json.loads(item['metadata']))
+            return item
+        return None
+
+
+def run_benchmark(rows: int, iters: int) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = str(Path(tmp) / "bench.db")
+        ks = KnowledgeStore(db_path)
+        with ks._write_conn() as conn:
+            conn.executemany(
+                "INSERT INTO knowledge (input, response, domain, created_at, metadata) VALUES (?, ?, 'shop', ?, ?)",
+                [(f"item {i} ka price", f"{i} rupees", "2025-01-01T00:00:00", json.dumps({"source": "bench"}))
+                 for i in range(rows)],
+            )
+        ids = [random.randint(1, rows) for _ in range(iters)]
+
+        start = time.perf_counter()
+        for kid in ids:
+            per_call_lookup(db_path, kid)
+        per_call = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for kid in ids:
+            ks.get_knowledge_by_id(kid)
+        pooled = time.perf_counter() - start
+        ks.close()
+
+    print("=== SQLite Connection Pool Benchmark ===")
+    print(f"rows              : {rows}")
+    print(f"lookups           : {iters}")
+    print(f"per-call connect  : {per_call * 1e6 / iters:.1f} us/lookup")
+    print(f"pooled            : {pooled * 1e6 / iters:.1f} us/lookup")
+    print(f"speedup           : {per_call / pooled:.1f}x")
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rows", type=int, default=10000, help="rows to seed")
+    ap.add_argument("--iters", type=int, default=20000, help="number of lookups")
+    args = ap.parse_args()
+
+    run_benchmark(args.rows, args.iters)
+
+
+if __name__ == "__main__":
+    main()
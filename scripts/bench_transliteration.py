@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Transliteration benchmark: alternation + per-character str.replace vs the trie with token cache.
+
+- Transliterates N synthetic Hindi / Hinglish queries the way find_answer
+  does (normalize_query, then generate_variations)
+- Also times transliterate_batch over a knowledge base of the same size
+Usage:
+  python scripts/bench_transliteration.py --queries 20000
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import re
+import sys
+import time
+from pathlib import Path
+from typing import List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from nlp.processing.hindi_transliterator import HindiTransliterator  # noqa: E402
+
+PRODUCTS = ["स्विच", "वायर", "सॉकेट", "बल्ब", "फैन", "इनवर्टर", "केबल", "एमसीबी", "गीजर", "पंखा",
+            "switch", "wire", "mcb", "fan"]
+TAILS = ["का प्राइस कितना है", "का रेट", "की कीमत", "कितने का है", "का दाम बताओ", "ka rate kya hai",
+         "मिलेगा क्या", "चाहिए", "price", "में कितने रुपये लगेंगे"]
+BRANDS = ["", "हैवेल्स ", "एंकर ", "पॉलीकैब ", "havells ", "anchor "]
+
+
+class ReplaceLoopTransliterator(HindiTransliterator):
+    """Previous transliterate(), kept for comparison."""
+
+    def __init__(self):
+        super().__init__()
+        multi_char = {k: v for k, v in self.mapping.items() if len(k) > 1}
+        self.multi_pattern = '|'.join(sorted(multi_char.keys(), key=len, reverse=True))
+
+    def transliterate(self, text: str) -> str:
+        if not text:
+            return ""
+        result = re.sub(self.multi_pattern, lambda m: self.mapping[m.group()], text)
+        for hindi, english in self.mapping.items():
+            if len(hindi) == 1:
+                result = result.replace(hindi, english)
+        return ' '.join(result.split()).strip()
+
+
+def make_queries(count: int) -> List[str]:
+    rng = random.Random(9)
+    return [f"{rng.choice(BRANDS)}{rng.choice(PRODUCTS)} {rng.choice(TAILS)} {rng.randint(1, 50)}"
+            for _ in range(count)]
+
+
+def time_queries(translit: HindiTransliterator, queries: List[str]) -> tuple:
+    start = time.perf_counter()
+    results = []
+    for query in queries:
+        normalized = translit.normalize_query(query)
+        results.append((normalized, translit.generate_variations(normalized)))
+    return time.perf_counter() - start, results
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--queries", type=int, default=20000, help="queries to normalize")
+    args = ap.parse_args()
+
+    queries = make_queries(args.queries)
+    old, new = ReplaceLoopTransliterator(), HindiTransliterator()
+    old_time, old_results = time_queries(old, queries)
+    new_time, new_results = time_queries(new, queries)
+
+    start = time.perf_counter()
+    old_batch = [old.transliterate(q) for q in queries]
+    old_batch_time = time.perf_counter() - start
+    cold = HindiTransliterator()
+    start = time.perf_counter()
+    new_batch = cold.transliterate_batch(queries)
+    new_batch_time = time.perf_counter() - start
+
+    mismatches = sum(1 for a, b in zip(old_results, new_results) if a != b)
+    mismatches += sum(1 for a, b in zip(old_batch, new_batch) if a != b)
+    info = new.cache_info()
+    print("=== Transliteration Benchmark ===")
+    print(f"queries           : {args.queries}")
+    print(f"replace loop      : {old_time * 1e6 / args.queries:.1f} us/query")
+    print(f"trie + cache      : {new_time * 1e6 / args.queries:.1f} us/query "
+          f"(token cache {info.hits} hits / {info.misses} misses)")
+    print(f"batch (cold)      : {old_batch_time * 1000:.1f} ms -> {new_batch_time * 1000:.1f} ms")
+    print(f"mismatches        : {mismatches}")
+
+
+if __name__ == "__main__":
+    main()
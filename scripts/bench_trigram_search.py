@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Miss-latency benchmark: LIKE full-table scan vs trigram FTS5 index.
+
+- Seeds a temporary knowledge DB with N rows
+- Times misspelled / unknown queries through the previous LIKE fallback
+  (one `input LIKE ? OR response LIKE ?` pair per word)
+- Times the same queries through search_fulltext, which now falls back to the
+  trigram index instead of scanning
+Usage:
+  python scripts/bench_trigram_search.py --rows 10000 100000 --queries 200
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.knowledge_store import KnowledgeStore  # noqa: E402
+
+PRODUCTS = ["switch", "wire", "mcb", "fan", "bulb", "socket", "led", "tube light", "extension board",
+            "plug", "regulator", "holder", "meter", "inverter", "battery", "cable", "panel", "geyser"]
+BRANDS = ["anchor", "havells", "polycab", "finolex", "legrand", "crompton", "bajaj", "philips", "syska", "orient"]
+MISSES = ["swich ka price", "wyre ki rate", "regulater kitne ka", "havels fan", "invertor battery",
+          "warranty kitni hai", "delivery kab hogi", "polycb cable"]
+
+
+def like_search(ks: KnowledgeStore, query: str, domain: str, limit: int) -> List[dict]:
+    """The previous LIKE fallback, kept for comparison."""
+    words = [w for w in query.lower().split() if len(w) > 1]
+    clauses = " OR ".join("(lower(input) LIKE ? OR lower(response) LIKE ?)" for _ in words)
+    params: List[str] = []
+    for w in words:
+        params += [f"%{w}%", f"%{w}%"]
+    sql = f"SELECT * FROM knowledge WHERE domain = ? AND ({clauses}) LIMIT ?"
+    return [dict(r) for r in ks._read_conn().execute(sql, [domain, *params, limit]).fetchall()]
+
+
+def run_benchmark(rows: int, queries: int) -> None:
+    rng = random.Random(11)
+    qs = [f"{rng.choice(MISSES)} {rng.randint(10 ** 6, 10 ** 7)}" for _ in range(queries)]
+    with tempfile.TemporaryDirectory() as tmp:
+        ks = KnowledgeStore(str(Path(tmp) / "bench.db"))
+        with ks._write_conn() as conn:
+            conn.executemany(
+                "INSERT INTO knowledge (input, response, domain, created_at, metadata) VALUES (?, ?, 'shop', ?, ?)",
+                [(f"{BRANDS[i % len(BRANDS)]} {PRODUCTS[i % len(PRODUCTS)]} {i} ka price",
+                  f"{PRODUCTS[i % len(PRODUCTS)]} model {i}: {i % 900 + 100} rupees",
+                  "2025-01-01T00:00:00", json.dumps({"source": "bench"}))
+                 for i in range(rows)],
+            )
+        if not ks._trigram_enabled:
+            print("SQLite built without the trigram tokenizer; nothing to compare.")
+            ks.close()
+            return
+
+        start = time.perf_counter()
+        like_hits = sum(1 for q in qs if like_search(ks, q, 'shop', 5))
+        like_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        tri_hits = sum(1 for q in qs if ks.search_fulltext(q, domain='shop', limit=5))
+        tri_time = time.perf_counter() - start
+        ks.close()
+
+    print(f"=== Trigram Search Miss Benchmark ({rows} rows) ===")
+    print(f"queries           : {queries}")
+    print(f"LIKE scan         : {like_time * 1000 / queries:.3f} ms/query ({like_hits} with rows)")
+    print(f"trigram FTS5      : {tri_time * 1000 / queries:.3f} ms/query ({tri_hits} with rows)")
+    if tri_time > 0:
+        print(f"speedup           : {like_time / tri_time:.1f}x")
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rows", type=int, nargs="+", default=[10000, 100000], help="knowledge base sizes")
+    ap.add_argument("--queries", type=int, default=200, help="queries per size")
+    args = ap.parse_args()
+
+    for rows in args.rows:
+        run_benchmark(rows, args.queries)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Concurrency load test for the Adaptive Chatbot API under uvicorn.
+
+- Sends a fixed number of /chat requests at increasing client concurrency
+- Reports throughput (req/s), p50/p95 latency and 429 (backpressure) counts per level
+Usage:
+  API_RATE_LIMIT=1000000 uvicorn src.web_api:app --workers 1 --port 8000
+  python scripts/load_test.py --host http://127.0.0.1:8000 --levels 1,2,4,8,16,32 --requests 400
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Tuple
+
+import requests
+
+from perf_bench import percentile
+
+QUERIES = [
+    "switch ka price",
+    "wire ki rate kya hai",
+    "mcb kitne ka hai",
+    "fan ka daam",
+    "led bulb price",
+    "socket available hai",
+]
+
+
+def _worker(host: str, endpoint: str, count: int, offset: int) -> List[Tuple[float, int]]:
+    s = requests.Session()
+    out: List[Tuple[float, int]] = []
+    for i in range(count):
+        q = QUERIES[(offset + i) % len(QUERIES)]
+        body = {"message": q} if endpoint == "/chat" else {"query": q, "top_k": 5}
+        start = time.perf_counter()
+        try:
+            status = s.post(f"{host}{endpoint}", json=body, timeout=30).status_code
+        except Exception:
+            status = 0
+        out.append(((time.perf_counter() - start) * 1000.0, status))
+    return out
+
+
+def run_level(host: str, endpoint: str, concurrency: int, total: int) -> Dict[str, float]:
+    per_client = max(1, total // concurrency)
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        futures = [pool.submit(_worker, host, endpoint, per_client, c) for c in range(concurrency)]
+        results = [r for f in futures for r in f.result()]
+    elapsed = time.perf_counter() - start
+    ok = [ms for ms, st in results if st == 200]
+    return {
+        "concurrency": concurrency,
+        "requests": len(results),
+        "ok": len(ok),
+        "rejected_429": sum(1 for _, st in results if st == 429),
+        "errors": sum(1 for _, st in results if st not in (200, 429)),
+        "throughput_rps": len(ok) / elapsed if elapsed else 0.0,
+        "p50_ms": percentile(ok, 50),
+        "p95_ms": percentile(ok, 95),
+        "avg_ms": statistics.mean(ok) if ok else 0.0,
+    }
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--host", type=str, default="http://127.0.0.1:8000", help="API host")
+    ap.add_argument("--endpoint", type=str, default="/chat", choices=["/chat", "/knowledge/search"])
+    ap.add_argument("--levels", type=str, default="1,2,4,8,16,32", help="comma-separated client counts")
+    ap.add_argument("--requests", type=int, default=400, help="requests per concurrency level")
+    args = ap.parse_args()
+
+    # Warmup
+    _worker(args.host, args.endpoint, 10, 0)
+
+    print("=== Load Test ===")
+    print(f"host: {args.host}  endpoint: {args.endpoint}")
+    print(f"{'clients':>8} {'ok':>6} {'429':>5} {'err':>5} {'req/s':>9} {'p50 ms':>8} {'p95 ms':>8}")
+    for level in [int(x) for x in args.levels.split(",") if x.strip()]:
+        r = run_level(args.host, args.endpoint, level, args.requests)
+        print(f"{r['concurrency']:>8} {r['ok']:>6} {r['rejected_429']:>5} {r['errors']:>5} "
+              f"{r['throughput_rps']:>9.1f} {r['p50_ms']:>8.2f} {r['p95_ms']:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
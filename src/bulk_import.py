@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Streaming readers for knowledge import files.
+
+iter_knowledge_file yields one dict per record without loading the file:
+- .jsonl / .ndjson: one JSON object per line
+- .csv: header row naming the columns (input, response, category, domain,
+  confidence, tags, source, validation_status)
+- .json: a top-level array of objects, decoded element by element
+
+The records feed KnowledgeStore.bulk_add_knowledge.
+"""
+
+from __future__ import annotations
+import csv
+import json
+import logging
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional, TextIO
+
+logger = logging.getLogger(__name__)
+
+_READ_SIZE = 1 << 16
+_FORMATS = {'.json': 'json', '.jsonl': 'jsonl', '.ndjson': 'jsonl', '.csv': 'csv'}
+
+
+def detect_format(path: str) -> str:
+    """Import format from the file extension ('json' when unknown)."""
+    return _FORMATS.get(Path(path).suffix.lower(), 'json')
+
+
+def _iter_jsonl(f: TextIO) -> Iterator[Dict[str, Any]]:
+    for line_no, line in enumerate(f, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError as e:
+            logger.warning(f"Skipping malformed JSONL line {line_no}: {e}")
+            continue
+        if isinstance(record, dict):
+            yield record
+
+
+def _iter_csv(f: TextIO) -> Iterator[Dict[str, Any]]:
+    for record in csv.DictReader(f):
+        # Empty cells mean "use the default", not an empty value
+        yield {k.strip(): v for k, v in record.items() if k and v not in (None, '')}
+
+
+def _iter_json_array(f: TextIO) -> Iterator[Dict[str, Any]]:
+    """Decode `[{...}, {...}]` one element at a time with a bounded buffer."""
+    decoder = json.JSONDecoder()
+    buf = ''
+    pos = 0
+    started = False
+    eof = False
+
+    def fill() -> bool:
+        nonlocal buf, pos, eof
+        chunk = f.read(_READ_SIZE)
+        if not chunk:
+            eof = True
+            return False
+        buf = buf[pos:] + chunk
+        pos = 0
+        return True
+
+    while True:
+        # Skip whitespace and separators
+        while True:
+            while pos < len(buf) and buf[pos] in ' \t\r\n,':
+                pos += 1
+            if pos < len(buf) or not fill():
+                break
+        if pos >= len(buf):
+            if started:
+                raise ValueError("Unexpected end of JSON array")
+            return
+        if not started:
+            if buf[pos] != '[':
+                raise ValueError("Expected a JSON array of knowledge objects")
+            started = True
+            pos += 1
+            continue
+        if buf[pos] == ']':
+            return
+        while True:
+            try:
+                record, end = decoder.raw_decode(buf, pos)
+                break
+            except json.JSONDecodeError:
+                # Element spans the buffer boundary: read more and retry
+                if eof or not fill():
+                    raise
+        pos = end
+        if isinstance(record, dict):
+            yield record
+
+
+def iter_knowledge_file(path: str, fmt: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+    """Yield knowledge records from a JSON, JSONL or CSV file."""
+    fmt = (fmt or detect_format(path)).lower()
+    newline = '' if fmt == 'csv' else None
+    with open(path, 'r', encoding='utf-8', newline=newline) as f:
+        if fmt == 'jsonl':
+            yield from _iter_jsonl(f)
+        elif fmt == 'csv':
+            yield from _iter_csv(f)
+        elif fmt == 'json':
+            yield from _iter_json_array(f)
+        else:
+            raise ValueError(f"Unsupported import format: {fmt}")
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Group-commit writer for the conversations table.
+
+KnowledgeStore.log_conversation only enqueues the row; a background thread
+drains the bounded queue and inserts up to `batch_size` rows per transaction,
+at the latest `flush_interval_ms` after the first queued row. When the queue
+is full the caller waits up to `put_timeout` seconds, then the row is dropped
+and counted. close() (also registered with atexit) drains what is queued.
+"""
+
+from __future__ import annotations
+import queue
+import atexit
+import logging
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+ConversationRow = Tuple[str, str, str, Optional[str], str, str, Optional[str]]
+
+INSERT_CONVERSATION_SQL = (
+    "INSERT INTO conversations "
+    "(session_id, message_type, message, response, domain, timestamp, metadata) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?)"
+)
+
+
+class ConversationLogWriter:
+    """Bounded queue + background thread batching conversation inserts."""
+
+    def __init__(self,
+                 connect: Callable[[], sqlite3.Connection],
+                 batch_size: int = 200,
+                 flush_interval_ms: int = 50,
+                 max_queue: int = 10000,
+                 put_timeout: float = 1.0):
+        self._connect = connect
+        self.batch_size = max(1, int(batch_size))
+        self.flush_interval = max(0, int(flush_interval_ms)) / 1000.0
+        self.put_timeout = put_timeout
+        # Rows, or threading.Event markers posted by flush()
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=max(1, int(max_queue)))
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._closed = False
+        self.stats = {'enqueued': 0, 'written': 0, 'dropped': 0, 'batches': 0, 'errors': 0}
+
+    # -------------------- Producer side --------------------
+    def _ensure_started(self) -> None:
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None and not self._closed:
+                self._thread = threading.Thread(target=self._run, name="conversation-log", daemon=True)
+                self._thread.start()
+                atexit.register(self.close)
+
+    def submit(self, row: ConversationRow) -> bool:
+        """Queue one row; False if the writer is closed or the queue stayed full."""
+        if self._closed:
+            return False
+        self._ensure_started()
+        try:
+            self._queue.put(row, timeout=self.put_timeout)
+        except queue.Full:
+            self.stats['dropped'] += 1
+            logger.warning("Conversation log queue full; dropping row")
+            return False
+        self.stats['enqueued'] += 1
+        return True
+
+    @property
+    def pending(self) -> int:
+        return self._queue.qsize()
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Block until every row queued before this call is committed."""
+        if self._thread is None or not self._thread.is_alive():
+            return self._queue.empty()
+        marker = threading.Event()
+        try:
+            self._queue.put(marker, timeout=timeout)
+        except queue.Full:
+            return False
+        return marker.wait(timeout)
+
+    def close(self, timeout: float = 10.0) -> None:
+        """Stop accepting rows and drain the queue."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            thread = self._thread
+        if thread is not None and thread.is_alive():
+            try:
+                self._queue.put(None, timeout=timeout)
+            except queue.Full:
+                pass
+            thread.join(timeout)
+        if thread is None or not thread.is_alive():
+            # Not started, or stopped: write leftovers from the calling thread
+            leftovers: List[Any] = []
+            while True:
+                try:
+                    leftovers.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            self._write([r for r in leftovers if isinstance(r, tuple)])
+            for r in leftovers:
+                if isinstance(r, threading.Event):
+                    r.set()
+
+    # -------------------- Writer thread --------------------
+    def _run(self) -> None:
+        stop = False
+        while not stop:
+            item = self._queue.get()
+            batch: List[ConversationRow] = []
+            markers: List[threading.Event] = []
+            deadline = time.monotonic() + self.flush_interval
+            while True:
+                if item is None:
+                    stop = True
+                elif isinstance(item, threading.Event):
+                    # Commit what we have so the flush() caller sees it
+                    markers.append(item)
+                    break
+                else:
+                    batch.append(item)
+                if stop or len(batch) >= self.batch_size:
+                    break
+                remaining = deadline - time.monotonic()
+                try:
+                    item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+            if stop:
+                # Drain whatever was queued behind the stop signal
+                while True:
+                    try:
+                        rest = self._queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    if isinstance(rest, threading.Event):
+                        markers.append(rest)
+                    elif rest is not None:
+                        batch.append(rest)
+            self._write(batch)
+            for marker in markers:
+                marker.set()
+
+    def _write(self, batch: List[ConversationRow]) -> None:
+        if not batch:
+            return
+        try:
+            conn = self._connect()
+            with conn:
+                conn.executemany(INSERT_CONVERSATION_SQL, batch)
+            self.stats['written'] += len(batch)
+            self.stats['batches'] += 1
+        except Exception as e:
+            self.stats['errors'] += 1
+            logger.error(f"Error writing {len(batch)} conversation rows: {e}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {**self.stats, 'pending': self.pending, 'batch_size': self.batch_size,
+                'flush_interval_ms': int(self.flush_interval * 1000)}
@@ -14,6 +14,8 @@ from typing import Any, Dict, List, Optional, Tuple, Union, Callable
 import queue
 import weakref
 import gc
+import logging
+from pathlib import Path
 
 try:
     import aiosqlite
@@ -82,7 +84,11 @@ class QueryMetrics:
     error_message: Optional[str] = None
 
 class ConnectionPool:
-    """Advanced connection pool with health monitoring"""
+    """Advanced connection pool with health monitoring
+
+    Deprecated: kept only for the DatabaseOptimizer / database_transaction API.
+    New stores should use ThreadLocalConnectionPool.
+    """
     
     def __init__(self, 
                  database_path: str,
@@ -377,6 +383,103 @@ class ConnectionPool:
                 except queue.Empty:
                     break
 
+class ThreadLocalConnectionPool:
+    """Reusable per-thread SQLite connections for request-path stores.
+
+    Each thread gets its own long-lived connection, so PRAGMAs are applied once
+    per connection and sqlite3's prepared-statement cache stays warm across
+    calls. Connections use sqlite3.Row and work as `with pool.connection() as conn:`
+    transaction scopes (commit/rollback without closing).
+
+    This replaces ConnectionPool on the request path: its checkout/return model
+    costs a queue round-trip per query and leaks a connection on any missed
+    return, and its 5s monitor thread and print() logging don't belong in the
+    serving process.
+    """
+
+    def __init__(self,
+                 database_path: str,
+                 pragmas: Tuple[str, ...] = (),
+                 read_only: bool = False,
+                 cached_statements: int = 256,
+                 connection_timeout: float = 30.0):
+        self.database_path = database_path
+        self.pragmas = tuple(pragmas)
+        self.read_only = read_only
+        self.cached_statements = cached_statements
+        self.connection_timeout = connection_timeout
+
+        self._local = threading.local()
+        self._connections: Dict[int, sqlite3.Connection] = {}
+        self._lock = threading.Lock()
+        self._created = 0
+        self._reused = 0
+
+    def _create_connection(self) -> sqlite3.Connection:
+        if self.read_only:
+            uri = Path(self.database_path).resolve().as_uri() + "?mode=ro"
+            connection = sqlite3.connect(uri, uri=True, timeout=self.connection_timeout,
+                                         cached_statements=self.cached_statements,
+                                         check_same_thread=False)
+        else:
+            connection = sqlite3.connect(self.database_path, timeout=self.connection_timeout,
+                                         cached_statements=self.cached_statements,
+                                         check_same_thread=False)
+        connection.row_factory = sqlite3.Row
+        for pragma in self.pragmas:
+            # journal_mode is a property of the database file; read-only handles can't set it
+            if self.read_only and "journal_mode" in pragma:
+                continue
+            try:
+                connection.execute(pragma)
+            except sqlite3.Error as e:
+                logging.warning(f"Failed to apply {pragma}: {e}")
+        if self.read_only:
+            connection.execute("PRAGMA query_only=1")
+        return connection
+
+    def connection(self) -> sqlite3.Connection:
+        """Return the calling thread's connection, opening it on first use."""
+        connection = getattr(self._local, "connection", None)
+        if connection is not None:
+            self._reused += 1
+            return connection
+        connection = self._create_connection()
+        self._local.connection = connection
+        with self._lock:
+            self._prune_dead_threads()
+            self._connections[threading.get_ident()] = connection
+            self._created += 1
+        return connection
+
+    def _prune_dead_threads(self) -> None:
+        alive = {t.ident for t in threading.enumerate()}
+        for ident in [i for i in self._connections if i not in alive]:
+            try:
+                self._connections.pop(ident).close()
+            except Exception:
+                pass
+
+    def close_all(self) -> None:
+        """Close every connection handed out by this pool."""
+        with self._lock:
+            for connection in self._connections.values():
+                try:
+                    connection.close()
+                except Exception:
+                    pass
+            self._connections.clear()
+        self._local = threading.local()
+
+    def get_pool_statistics(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "open_connections": len(self._connections),
+                "connections_created": self._created,
+                "connections_reused": self._reused,
+                "read_only": self.read_only,
+            }
+
 class DatabaseOptimizer:
     """Main database optimization system"""
     
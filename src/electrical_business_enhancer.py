@@ -19,6 +19,12 @@ except ImportError as e:
     print(f"⚠️ Some modules unavailable: {e}")
     NLP_AVAILABLE = False
 
+try:
+    from nlp.processing.lexicon import get_lexicon
+    LEXICON_AVAILABLE = True
+except ImportError:
+    LEXICON_AVAILABLE = False
+
 class ElectricalBusinessEnhancer:
     """Domain-specific enhancements for electrical business chatbot"""
     
@@ -27,6 +33,11 @@ class ElectricalBusinessEnhancer:
         self.business_knowledge = self._initialize_electrical_knowledge()
         self.enhanced_patterns = self._load_electrical_patterns()
         self.product_categories = self._load_product_categories()
+        self.lexicon = get_lexicon() if LEXICON_AVAILABLE else None
+        if self.lexicon:
+            # Shares one scan per message with the NLP engine and conversation manager
+            self.lexicon.register_patterns('electrical_intent', self.enhanced_patterns, view='lower')
+            self.lexicon.register_keywords('electrical_product', self.product_categories)
         
     def _initialize_electrical_knowledge(self) -> Dict[str, Any]:
         """Initialize electrical business knowledge base"""
@@ -156,17 +167,11 @@ class ElectricalBusinessEnhancer:
         
         # Get base intent from NLP engine
         base_intent = self.nlp_engine.extract_intent(text)
-        text_lower = text.lower()
         
         # Check for electrical business specific intents
         electrical_intents = {}
         
-        for intent, patterns in self.enhanced_patterns.items():
-            score = 0
-            for pattern in patterns:
-                if re.search(pattern, text_lower):
-                    score += 0.3
-            
+        for intent, score in self._electrical_intent_scores(text).items():
             if score > 0:
                 electrical_intents[intent] = min(score, 1.0)
         
@@ -192,21 +197,40 @@ class ElectricalBusinessEnhancer:
             "electrical_intents": electrical_intents
         }
     
+    def _electrical_intent_scores(self, text: str) -> Dict[str, float]:
+        """Intent -> 0.3 per matching pattern, in enhanced_patterns order"""
+        scores = {}
+        if self.lexicon:
+            for hit in self.lexicon.scan(text).matches('electrical_intent'):
+                scores[hit.label] = scores.get(hit.label, 0) + 0.3
+            return scores
+        
+        text_lower = text.lower()
+        for intent, patterns in self.enhanced_patterns.items():
+            for pattern in patterns:
+                if re.search(pattern, text_lower):
+                    scores[intent] = scores.get(intent, 0) + 0.3
+        return scores
+    
     def identify_products(self, text: str) -> List[Dict[str, Any]]:
         """Identify electrical products mentioned in text"""
         identified_products = []
         text_lower = text.lower()
         
-        for category, products in self.product_categories.items():
-            for product in products:
-                if product.lower() in text_lower:
-                    # Check if not already identified
-                    if not any(p['product'] == product for p in identified_products):
-                        identified_products.append({
-                            "product": product,
-                            "category": category,
-                            "confidence": 0.8 if len(product) > 3 else 0.6
-                        })
+        if self.lexicon:
+            mentioned = [(hit.label, hit.term) for hit in self.lexicon.scan(text).matches('electrical_product')]
+        else:
+            mentioned = [(category, product) for category, products in self.product_categories.items()
+                         for product in products if product.lower() in text_lower]
+        
+        for category, product in mentioned:
+            # Check if not already identified
+            if not any(p['product'] == product for p in identified_products):
+                identified_products.append({
+                    "product": product,
+                    "category": category,
+                    "confidence": 0.8 if len(product) > 3 else 0.6
+                })
         
         return identified_products
     
@@ -326,7 +350,7 @@ class ElectricalBusinessEnhancer:
             else:
                 return "मैं electrical business के बारे में आपकी help कर सकता हूँ। Products, prices, services के बारे में पूछिए।"
     
-    def add_electrical_knowledge(self, learning_manager: UnifiedLearningManager, force_add: bool = False):
+    def add_electrical_knowledge(self, learning_manager: "UnifiedLearningManager", force_add: bool = False):
         """Add electrical knowledge to learning manager"""
         try:
             added_count = 0
@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""
+Persistent embedding store shared by the semantic index, optimized retrieval
+and the free AI models manager.
+
+Vectors live in a memory-mapped float32 matrix (vectors.f32); a small SQLite
+table maps sha256(model_name, text) -> row. Texts that were embedded once are
+never sent through the model again, so a cold start over an unchanged
+knowledge base needs no inference at all.
+
+Several processes (API workers) may share one store: rows are allocated
+inside a SQLite write transaction, and rows other processes added are
+picked up before a text is treated as missing.
+"""
+
+from __future__ import annotations
+import re
+import sqlite3
+import hashlib
+import logging
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class EmbeddingStore:
+    """Append-only, content-addressed embedding cache for one model."""
+
+    def __init__(self,
+                 model_name: str,
+                 base_dir: str = "data/embeddings",
+                 initial_capacity: int = 1024):
+        self.model_name = model_name
+        self.dir = Path(base_dir) / re.sub(r'[^A-Za-z0-9_.-]+', '_', model_name)
+        self.dir.mkdir(parents=True, exist_ok=True)
+        self.vectors_path = self.dir / "vectors.f32"
+        self.db_path = self.dir / "index.db"
+        self.initial_capacity = initial_capacity
+
+        self._lock = threading.RLock()
+        self._rows: Dict[str, int] = {}
+        self._next_row = 0  # Rows below this are loaded into _rows (allocation is dense)
+        self._dim: Optional[int] = None
+        self._capacity = 0
+        self._mm: Optional[np.memmap] = None
+        self.stats = {'hits': 0, 'misses': 0}
+        self._open()
+
+    # -------------------- Storage --------------------
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path)
+        conn.execute("PRAGMA journal_mode=WAL;")
+        conn.execute("PRAGMA synchronous=NORMAL;")
+        return conn
+
+    def _open(self) -> None:
+        with self._connect() as conn:
+            conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+            conn.execute("CREATE TABLE IF NOT EXISTS rows (hash TEXT PRIMARY KEY, row INTEGER NOT NULL)")
+            conn.commit()
+            # Rows before dim: the first rows commit together with dim, so any rows seen here have one
+            self._load_new_rows(conn)
+            found = conn.execute("SELECT value FROM meta WHERE key = 'dim'").fetchone()
+            self._dim = int(found[0]) if found else None
+        stored = 0
+        if self._dim and self.vectors_path.exists():
+            stored = self.vectors_path.stat().st_size // (4 * self._dim)
+        if stored < self._next_row:
+            # Index points past the matrix (missing or truncated file): start over
+            logger.warning(f"Embedding store {self.dir} is inconsistent; resetting it.")
+            self._reset()
+        elif stored:
+            self._remap()
+        logger.info(f"Embedding store opened: {self.dir} ({len(self._rows)} vectors)")
+
+    def _reset(self) -> None:
+        with self._connect() as conn:
+            conn.execute("DELETE FROM rows")
+            conn.commit()
+        self._rows.clear()
+        self._next_row = 0
+        self._capacity = 0
+        self._mm = None
+        if self.vectors_path.exists():
+            self.vectors_path.unlink()
+
+    def _load_new_rows(self, conn: sqlite3.Connection) -> None:
+        """Pick up rows committed (by any process) since the last load."""
+        found = conn.execute("SELECT hash, row FROM rows WHERE row >= ?", (self._next_row,)).fetchall()
+        if found:
+            self._rows.update(found)
+            self._next_row = max(self._next_row, max(row for _, row in found) + 1)
+
+    def _remap(self) -> None:
+        """Map the whole matrix file again if another process (or we) grew it."""
+        if not self._dim or not self.vectors_path.exists():
+            return
+        capacity = self.vectors_path.stat().st_size // (4 * self._dim)
+        if capacity > self._capacity or (self._mm is None and capacity):
+            if self._mm is not None:
+                self._mm.flush()
+            self._capacity = capacity
+            self._mm = np.memmap(self.vectors_path, dtype=np.float32, mode='r+',
+                                 shape=(self._capacity, self._dim))
+
+    def _ensure_capacity(self, required: int) -> None:
+        # Called with the database write lock held, so no other process is growing the file
+        self._remap()
+        if required <= self._capacity:
+            return
+        new_capacity = max(required, self._capacity * 2, self.initial_capacity)
+        with open(self.vectors_path, 'ab') as f:
+            f.truncate(new_capacity * self._dim * 4)
+        self._remap()
+
+    def _refresh(self) -> None:
+        """Load rows other processes added since we last looked."""
+        with self._connect() as conn:
+            if self._dim is None:
+                found = conn.execute("SELECT value FROM meta WHERE key = 'dim'").fetchone()
+                self._dim = int(found[0]) if found else None
+            self._load_new_rows(conn)
+        self._remap()
+
+    def _key(self, text: str) -> str:
+        return hashlib.sha256(f"{self.model_name}\x00{text}".encode('utf-8')).hexdigest()
+
+    # -------------------- Public API --------------------
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    @property
+    def dim(self) -> Optional[int]:
+        return self._dim
+
+    def put_many(self, texts: Sequence[str], vectors: Any) -> None:
+        """Persist vectors for texts (already-stored texts are skipped)."""
+        vectors = np.asarray(vectors, dtype=np.float32)
+        if vectors.ndim == 1:
+            vectors = vectors.reshape(1, -1)
+        with self._lock:
+            if self._dim is not None and vectors.shape[1] != self._dim:
+                raise ValueError(f"Embedding dim {vectors.shape[1]} does not match store dim {self._dim}")
+            if not any(self._key(text) not in self._rows for text in texts):
+                return
+
+            conn = self._connect()
+            try:
+                # The write lock serializes row allocation across processes
+                conn.isolation_level = None
+                conn.execute("BEGIN IMMEDIATE")
+                found = conn.execute("SELECT value FROM meta WHERE key = 'dim'").fetchone()
+                if found is None:
+                    conn.execute("INSERT INTO meta (key, value) VALUES ('dim', ?)", (str(vectors.shape[1]),))
+                elif int(found[0]) != vectors.shape[1]:
+                    raise ValueError(f"Embedding dim {vectors.shape[1]} does not match store dim {found[0]}")
+                self._dim = int(vectors.shape[1])
+                self._load_new_rows(conn)
+
+                new_keys: List[str] = []
+                new_vecs: List[int] = []
+                seen = set()
+                for i, text in enumerate(texts):
+                    key = self._key(text)
+                    if key in self._rows or key in seen:
+                        continue
+                    seen.add(key)
+                    new_keys.append(key)
+                    new_vecs.append(i)
+                if not new_keys:
+                    conn.execute("ROLLBACK")
+                    return
+
+                start = conn.execute("SELECT COALESCE(MAX(row) + 1, 0) FROM rows").fetchone()[0]
+                self._ensure_capacity(start + len(new_keys))
+                self._mm[start:start + len(new_keys)] = vectors[new_vecs]
+                # Vectors hit the file before the index references them
+                self._mm.flush()
+                assignments = [(key, start + j) for j, key in enumerate(new_keys)]
+                conn.executemany("INSERT INTO rows (hash, row) VALUES (?, ?)", assignments)
+                conn.execute("COMMIT")
+            except BaseException:
+                if conn.in_transaction:
+                    conn.execute("ROLLBACK")
+                raise
+            finally:
+                conn.close()
+            self._rows.update(assignments)
+            self._next_row = max(self._next_row, start + len(new_keys))
+
+    def get_many(self, texts: Sequence[str]) -> List[Optional[np.ndarray]]:
+        """Return stored vectors (or None) for each text."""
+        with self._lock:
+            if any(self._key(text) not in self._rows for text in texts):
+                self._refresh()
+            out: List[Optional[np.ndarray]] = []
+            for text in texts:
+                row = self._rows.get(self._key(text))
+                out.append(np.array(self._mm[row]) if row is not None else None)
+            return out
+
+    def get_or_encode(self, texts: Sequence[str], encode_fn: Callable[[List[str]], Any]) -> np.ndarray:
+        """Return a (len(texts), dim) float32 matrix, encoding only texts not yet stored."""
+        texts = list(texts)
+        with self._lock:
+            rows = [self._rows.get(self._key(t)) for t in texts]
+            if None in rows:
+                self._refresh()  # Another worker may have embedded them already
+                rows = [self._rows.get(self._key(t)) for t in texts]
+        missing = list(dict.fromkeys(t for t, r in zip(texts, rows) if r is None))
+        self.stats['hits'] += len(texts) - sum(1 for r in rows if r is None)
+        self.stats['misses'] += len(missing)
+        if missing:
+            self.put_many(missing, encode_fn(missing))
+            with self._lock:
+                rows = [self._rows[self._key(t)] for t in texts]
+        if not texts:
+            return np.zeros((0, self._dim or 0), dtype=np.float32)
+        with self._lock:
+            return np.array(self._mm[rows], dtype=np.float32)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'model_name': self.model_name,
+            'vectors': len(self._rows),
+            'capacity': self._capacity,
+            'dim': self._dim,
+            **self.stats,
+        }
+
+
+# Global stores keyed by (base_dir, model_name)
+_embedding_stores: Dict[tuple, EmbeddingStore] = {}
+_embedding_stores_lock = threading.Lock()
+
+
+def get_embedding_store(model_name: str, base_dir: str = "data/embeddings") -> EmbeddingStore:
+    """Get or create the process-wide embedding store for model_name."""
+    key = (str(Path(base_dir)), model_name)
+    store = _embedding_stores.get(key)
+    if store is None:
+        with _embedding_stores_lock:
+            store = _embedding_stores.get(key)
+            if store is None:
+                store = EmbeddingStore(model_name, base_dir=base_dir)
+                _embedding_stores[key] = store
+    return store
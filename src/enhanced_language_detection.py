@@ -12,6 +12,7 @@ from dataclasses import dataclass
 from enum import Enum
 import unicodedata
 from collections import defaultdict, Counter
+from functools import lru_cache
 import asyncio
 
 try:
@@ -38,6 +39,12 @@ try:
 except ImportError:
     POLYGLOT_AVAILABLE = False
 
+try:
+    from nlp.models.ngram_language_model import get_language_model
+    NGRAM_MODEL_AVAILABLE = True
+except ImportError:
+    NGRAM_MODEL_AVAILABLE = False
+
 try:
     from logger import log_info, log_error, log_warning
 except ImportError:
@@ -47,6 +54,8 @@ except ImportError:
 
 class DetectionMethod(Enum):
     """Language detection methods"""
+    SCRIPT = "script"
+    NGRAM = "ngram"
     HEURISTIC = "heuristic"
     LANGDETECT = "langdetect" 
     TEXTBLOB = "textblob"
@@ -85,9 +94,25 @@ class LanguageContext:
     location_context: Optional[str]
     time_context: Optional[str]
 
+@lru_cache(maxsize=4096)
+def _char_script(char: str) -> str:
+    """Script name of a letter (simplified for the scripts we map to languages)"""
+    name = unicodedata.name(char, '')
+    if not name:
+        return 'Unknown'
+    for marker, script_name in (('DEVANAGARI', 'Devanagari'), ('ARABIC', 'Arabic'), ('LATIN', 'Latin'),
+                                ('CYRILLIC', 'Cyrillic'), ('CJK', 'Han'), ('IDEOGRAPH', 'Han'),
+                                ('HIRAGANA', 'Hiragana'), ('KATAKANA', 'Katakana'), ('HANGUL', 'Hangul')):
+        if marker in name:
+            return script_name
+    return name.split()[0]
+
 class ScriptDetector:
     """Advanced script detection for better language identification"""
     
+    # Scripts that settle the language on their own (tier 1 of the detector)
+    FAST_PATH_SCRIPTS = {'Devanagari': 'hi', 'Hangul': 'ko', 'Hiragana': 'ja', 'Katakana': 'ja'}
+    
     def __init__(self):
         # Unicode script mappings
         self.script_language_mappings = {
@@ -137,26 +162,7 @@ class ScriptDetector:
         
         for char in text:
             if char.isalpha():
-                script_name = unicodedata.name(char, '').split()[0] if unicodedata.name(char, '') else 'Unknown'
-                # Simplify script names
-                if 'DEVANAGARI' in unicodedata.name(char, ''):
-                    script_name = 'Devanagari'
-                elif 'ARABIC' in unicodedata.name(char, ''):
-                    script_name = 'Arabic'
-                elif 'LATIN' in unicodedata.name(char, ''):
-                    script_name = 'Latin'
-                elif 'CYRILLIC' in unicodedata.name(char, ''):
-                    script_name = 'Cyrillic'
-                elif 'CJK' in unicodedata.name(char, '') or 'IDEOGRAPH' in unicodedata.name(char, ''):
-                    script_name = 'Han'
-                elif 'HIRAGANA' in unicodedata.name(char, ''):
-                    script_name = 'Hiragana'
-                elif 'KATAKANA' in unicodedata.name(char, ''):
-                    script_name = 'Katakana'
-                elif 'HANGUL' in unicodedata.name(char, ''):
-                    script_name = 'Hangul'
-                
-                script_counts[script_name] += 1
+                script_counts[_char_script(char)] += 1
                 total_chars += 1
         
         if total_chars == 0:
@@ -170,6 +176,13 @@ class ScriptDetector:
         
         return script_percentages
     
+    def fast_path_language(self, script_info: Dict[str, float], min_share: float = 0.9) -> Optional[Tuple[str, float]]:
+        """(language, share) when one single-language script makes up min_share of the letters"""
+        for script, share in script_info.items():
+            if share >= min_share and script in self.FAST_PATH_SCRIPTS:
+                return self.FAST_PATH_SCRIPTS[script], share
+        return None
+    
     def suggest_languages_from_scripts(self, script_info: Dict[str, float]) -> List[Tuple[str, float]]:
         """Suggest possible languages based on detected scripts"""
         language_scores = defaultdict(float)
@@ -268,9 +281,15 @@ class EnhancedLanguageDetector:
             'context_weight': 0.2,
             'ensemble_method': 'weighted_vote',
             'enable_context_learning': True,
-            'segment_detection_enabled': True
+            'segment_detection_enabled': True,
+            'script_fast_path_share': 0.9,  # Tier 1: share of letters in a single-language script
+            'model_margin_threshold': 0.6,  # Tier 2: n-gram model margin needed to skip the ensemble
+            'model_languages': ('en', 'hi')
         }
         
+        # Tier 2 model (None without numpy or the shipped .npz; every text then escalates)
+        self.language_model = get_language_model() if NGRAM_MODEL_AVAILABLE else None
+        
         # Context tracking
         self.language_contexts = {}  # user_id -> LanguageContext
         self.detection_history = []  # List of recent detections
@@ -304,71 +323,169 @@ class EnhancedLanguageDetector:
             text = text.strip()
             
             # Get or create context
-            if user_id and user_id in self.language_contexts:
-                user_context = self.language_contexts[user_id]
-            elif context:
-                user_context = context
-            else:
-                user_context = LanguageContext([], [], [], None, None, None)
+            user_context = self._get_user_context(user_id, context)
             
-            # Step 1: Script-based detection
+            # Tiers 1-2: script fast path, then the n-gram model
             script_info = self.script_detector.detect_scripts(text)
-            script_suggestions = self.script_detector.suggest_languages_from_scripts(script_info)
+            final_result = self._fast_tier_results([text], [script_info])[0]
             
-            # Step 2: Multiple detection methods
-            detection_results = {}
-            
-            # Heuristic detection
-            heuristic_results = self.heuristic_detector.detect_language(text)
-            detection_results[DetectionMethod.HEURISTIC] = heuristic_results
-            
-            # LangDetect library
-            if LANGDETECT_AVAILABLE:
-                langdetect_results = await self._detect_with_langdetect(text)
-                detection_results[DetectionMethod.LANGDETECT] = langdetect_results
+            # Tier 3: full ensemble, only when neither tier is confident
+            if final_result is None:
+                final_result = await self._ensemble_tier(text, user_context, script_info)
             
-            # TextBlob detection
-            if TEXTBLOB_AVAILABLE:
-                textblob_results = await self._detect_with_textblob(text)
-                detection_results[DetectionMethod.TEXTBLOB] = textblob_results
-            
-            # Polyglot detection
-            if POLYGLOT_AVAILABLE:
-                polyglot_results = await self._detect_with_polyglot(text)
-                detection_results[DetectionMethod.POLYGLOT] = polyglot_results
-            
-            # Step 3: Context-aware adjustment
-            if user_context and self.settings['enable_context_learning']:
-                context_adjustments = self._apply_context_adjustments(detection_results, user_context)
-                detection_results[DetectionMethod.CONTEXT] = context_adjustments
-            
-            # Step 4: Ensemble method to combine results
-            final_result = await self._ensemble_detection(
-                detection_results, script_suggestions, text, user_context
-            )
-            
-            # Step 5: Mixed language detection
-            if self.settings['segment_detection_enabled']:
-                segments = await self._detect_language_segments(text)
-                final_result.detected_segments = segments
-                final_result.is_mixed_language = len(set(seg[1] for seg in segments)) > 1
-            
-            # Step 6: Update context and metrics
-            self._update_detection_context(user_id, final_result, text)
-            self._update_performance_metrics(final_result)
-            
-            final_result.processing_time = time.time() - start_time
-            final_result.script_info = script_info
-            
-            log_info(f"🔍 Language detected: {final_result.detected_language} "
-                    f"({final_result.confidence:.2f} confidence, {final_result.method_used.value})")
-            
-            return final_result
+            return self._finalize_result(final_result, user_id, text, script_info, start_time)
             
         except Exception as e:
             log_error(f"Language detection failed: {e}")
             return self._create_error_result(start_time, str(e))
     
+    async def detect_language_batch(self, texts: List[str],
+                                    user_id: Optional[str] = None) -> List[LanguageDetectionResult]:
+        """Detect the language of many texts; the n-gram tier scores them in one pass"""
+        
+        if not texts:
+            return []
+        
+        batch_start = time.time()
+        stripped = [text.strip() if text else '' for text in texts]
+        script_infos = [self.script_detector.detect_scripts(text) for text in stripped]
+        try:
+            fast_results = self._fast_tier_results(stripped, script_infos)
+        except Exception as e:
+            log_warning(f"Fast language tiers failed, escalating batch: {e}")
+            fast_results = [None] * len(stripped)
+        tier_share = (time.time() - batch_start) / len(stripped)  # Amortized cost of tiers 1-2
+        
+        results = []
+        for text, fast_result, script_info in zip(stripped, fast_results, script_infos):
+            start_time = time.time() - tier_share
+            if not text:
+                results.append(self._create_default_result(start_time))
+                continue
+            try:
+                if fast_result is None:
+                    user_context = self._get_user_context(user_id)
+                    fast_result = await self._ensemble_tier(text, user_context, script_info)
+                results.append(self._finalize_result(fast_result, user_id, text, script_info, start_time))
+            except Exception as e:
+                log_error(f"Language detection failed: {e}")
+                results.append(self._create_error_result(start_time, str(e)))
+        return results
+    
+    def _get_user_context(self, user_id: Optional[str],
+                          context: Optional[LanguageContext] = None) -> LanguageContext:
+        """Stored context for the user, else the given one, else an empty context"""
+        if user_id and user_id in self.language_contexts:
+            return self.language_contexts[user_id]
+        if context:
+            return context
+        return LanguageContext([], [], [], None, None, None)
+    
+    async def _ensemble_tier(self, text: str, user_context: LanguageContext,
+                             script_info: Dict[str, float]) -> LanguageDetectionResult:
+        """Script suggestions, every available detector, context and segments combined"""
+        
+        # Step 1: Script-based detection
+        script_suggestions = self.script_detector.suggest_languages_from_scripts(script_info)
+        
+        # Step 2: Multiple detection methods
+        detection_results = {}
+        
+        # Heuristic detection
+        heuristic_results = self.heuristic_detector.detect_language(text)
+        detection_results[DetectionMethod.HEURISTIC] = heuristic_results
+        
+        # LangDetect library
+        if LANGDETECT_AVAILABLE:
+            langdetect_results = await self._detect_with_langdetect(text)
+            detection_results[DetectionMethod.LANGDETECT] = langdetect_results
+        
+        # TextBlob detection
+        if TEXTBLOB_AVAILABLE:
+            textblob_results = await self._detect_with_textblob(text)
+            detection_results[DetectionMethod.TEXTBLOB] = textblob_results
+        
+        # Polyglot detection
+        if POLYGLOT_AVAILABLE:
+            polyglot_results = await self._detect_with_polyglot(text)
+            detection_results[DetectionMethod.POLYGLOT] = polyglot_results
+        
+        # Step 3: Context-aware adjustment
+        if user_context and self.settings['enable_context_learning']:
+            context_adjustments = self._apply_context_adjustments(detection_results, user_context)
+            detection_results[DetectionMethod.CONTEXT] = context_adjustments
+        
+        # Step 4: Ensemble method to combine results
+        final_result = await self._ensemble_detection(
+            detection_results, script_suggestions, text, user_context
+        )
+        
+        # Step 5: Mixed language detection
+        if self.settings['segment_detection_enabled']:
+            segments = await self._detect_language_segments(text)
+            final_result.detected_segments = segments
+            final_result.is_mixed_language = len(set(seg[1] for seg in segments)) > 1
+        
+        return final_result
+    
+    def _fast_tier_results(self, texts: List[str],
+                           script_infos: List[Dict[str, float]]) -> List[Optional[LanguageDetectionResult]]:
+        """Tier 1 (script) and tier 2 (n-gram model) results; None where the text must escalate"""
+        
+        results: List[Optional[LanguageDetectionResult]] = [None] * len(texts)
+        pending = []
+        for i, (text, script_info) in enumerate(zip(texts, script_infos)):
+            if not text or not script_info:
+                continue
+            fast_path = self.script_detector.fast_path_language(
+                script_info, self.settings['script_fast_path_share'])
+            if fast_path:
+                results[i] = self._create_tier_result(text, fast_path[0], fast_path[1], DetectionMethod.SCRIPT,
+                                                      [], script_info)
+            elif self.language_model is not None and set(script_info) <= {'Latin', 'Devanagari'}:
+                pending.append(i)
+        
+        if pending:
+            classified = self.language_model.classify([texts[i] for i in pending])
+            for i, (language, probability, margin) in zip(pending, classified):
+                if (language in self.settings['model_languages']
+                        and margin >= self.settings['model_margin_threshold']):
+                    results[i] = self._create_tier_result(texts[i], language, probability, DetectionMethod.NGRAM,
+                                                          [], script_infos[i])
+        return results
+    
+    def _create_tier_result(self, text: str, language: str, confidence: float, method: DetectionMethod,
+                            alternatives: List[Tuple[str, float]],
+                            script_info: Dict[str, float]) -> LanguageDetectionResult:
+        """Result for a text settled by the script or n-gram tier"""
+        return LanguageDetectionResult(
+            detected_language=language,
+            confidence=confidence,
+            confidence_level=self._determine_confidence_level(confidence),
+            method_used=method,
+            alternative_languages=alternatives,
+            is_mixed_language=len(script_info) > 1,
+            detected_segments=[(text, language, confidence)],
+            script_info=script_info,
+            processing_time=0.0
+        )
+    
+    def _finalize_result(self, final_result: LanguageDetectionResult, user_id: Optional[str], text: str,
+                         script_info: Dict[str, float], start_time: float) -> LanguageDetectionResult:
+        """Update context and metrics for a detection and stamp its timing"""
+        
+        # Step 6: Update context and metrics
+        self._update_detection_context(user_id, final_result, text)
+        self._update_performance_metrics(final_result)
+        
+        final_result.processing_time = time.time() - start_time
+        final_result.script_info = script_info
+        
+        log_info(f"🔍 Language detected: {final_result.detected_language} "
+                f"({final_result.confidence:.2f} confidence, {final_result.method_used.value})")
+        
+        return final_result
+    
     async def _detect_with_langdetect(self, text: str) -> List[Tuple[str, float]]:
         """Detect language using langdetect library"""
         try:
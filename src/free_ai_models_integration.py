@@ -44,6 +44,16 @@ except ImportError:
     def log_error(msg): print(f"ERROR - {msg}")
     def log_warning(msg): print(f"WARNING - {msg}")
 
+try:
+    from embedding_store import get_embedding_store
+    EMBEDDING_STORE_AVAILABLE = True
+except ImportError:
+    try:
+        from .embedding_store import get_embedding_store
+        EMBEDDING_STORE_AVAILABLE = True
+    except ImportError:
+        EMBEDDING_STORE_AVAILABLE = False
+
 class ModelType(Enum):
     """Types of AI models"""
     CONVERSATIONAL = "conversational"
@@ -911,7 +921,14 @@ class FreeAIModelsManager:
             model = self.models[model_id]
             
             if SENTENCE_TRANSFORMERS_AVAILABLE and isinstance(model, SentenceTransformer):
-                embeddings = model.encode(text)
+                store = self._get_embedding_store(model_id)
+                if store is not None:
+                    texts = [text] if isinstance(text, str) else list(text)
+                    embeddings = store.get_or_encode(texts, model.encode)
+                    if isinstance(text, str):
+                        embeddings = embeddings[0]
+                else:
+                    embeddings = model.encode(text)
             else:
                 # Fallback using regular transformers
                 tokenizer = self.tokenizers[model_id]
@@ -959,6 +976,16 @@ class FreeAIModelsManager:
                 metadata={"error": str(e)}
             )
     
+    def _get_embedding_store(self, model_id: str):
+        """Persistent embedding store for model_id (None if unavailable)."""
+        if not EMBEDDING_STORE_AVAILABLE:
+            return None
+        try:
+            return get_embedding_store(model_id)
+        except Exception as e:
+            log_warning(f"Embedding store unavailable for {model_id}: {e}")
+            return None
+    
     async def enhanced_nlu_analysis(self, text: str, context: Optional[Dict] = None) -> Dict[str, Any]:
         """Comprehensive NLU analysis using multiple models"""
         
@@ -1231,4 +1258,4 @@ if __name__ == "__main__":
         print("\n✅ Free AI Models Integration test completed")
     
     # Run the test
-    asyncio.run(test_ai_models())
\ No newline at end of file
+    asyncio.run(test_ai_models())
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+In-memory read snapshots of the knowledge database.
+
+A KnowledgeSnapshot is an immutable copy of the DB file taken with the SQLite
+backup API into a named shared-cache memory database, plus every knowledge
+row pre-decoded (metadata merged) into a dict keyed by id. Readers get
+thread-local connections to the copy, so searches never touch the file or
+its locks, and full listings (by domain, all rows) are sorted once per
+snapshot.
+
+SnapshotManager keeps the current snapshot and replaces it copy-on-write:
+writers bump a version counter, a background thread builds a new snapshot
+from the committed file state (at most once per `min_interval` seconds) and
+swaps the reference. Readers already holding the old snapshot finish on it;
+it is freed when the last reference goes away.
+"""
+
+from __future__ import annotations
+import os
+import time
+import logging
+import sqlite3
+import itertools
+import threading
+from typing import Any, Callable, Dict, Hashable, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+_snapshot_ids = itertools.count()
+
+
+def _copy_item(item: Dict[str, Any]) -> Dict[str, Any]:
+    # Metadata values are JSON: copying list/dict values one level deep is enough for tags & co.
+    return {k: v.copy() if isinstance(v, (list, dict)) else v for k, v in item.items()}
+
+
+class KnowledgeSnapshot:
+    """Immutable in-memory copy of the knowledge DB at one version."""
+
+    def __init__(self,
+                 db_path: str,
+                 version: int,
+                 decode: Callable[[sqlite3.Row], Dict[str, Any]]):
+        self.version = version
+        self.uri = f"file:knowledge_snapshot_{os.getpid()}_{next(_snapshot_ids)}?mode=memory&cache=shared"
+        start = time.perf_counter()
+        # Keeps the memory database alive for the snapshot's lifetime
+        self._anchor = sqlite3.connect(self.uri, uri=True, check_same_thread=False)
+        source = sqlite3.connect(db_path)
+        try:
+            source.backup(self._anchor)
+        finally:
+            source.close()
+        self._anchor.row_factory = sqlite3.Row
+        self.items: Dict[int, Dict[str, Any]] = {
+            row['id']: decode(row) for row in self._anchor.execute("SELECT * FROM knowledge")
+        }
+        self.build_seconds = time.perf_counter() - start
+        self._local = threading.local()
+        # Ordered id lists of listing queries, computed once per snapshot
+        self._listings: Dict[Hashable, List[int]] = {}
+
+    def connection(self) -> sqlite3.Connection:
+        """Read-only connection to the copy for the calling thread."""
+        conn = getattr(self._local, "connection", None)
+        if conn is None:
+            conn = sqlite3.connect(self.uri, uri=True, check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA query_only=1")
+            self._local.connection = conn
+        return conn
+
+    def get(self, knowledge_id: int) -> Optional[Dict[str, Any]]:
+        """Copy of the decoded row (callers may mutate what they get)."""
+        item = self.items.get(knowledge_id)
+        return _copy_item(item) if item is not None else None
+
+    def listing(self, key: Hashable, sql: str, params: Sequence[Any] = ()) -> List[Dict[str, Any]]:
+        """Rows for an `SELECT id ...` listing query; the id order is memoized under key."""
+        ids = self._listings.get(key)
+        if ids is None:
+            ids = [row[0] for row in self.connection().execute(sql, params)]
+            self._listings[key] = ids
+        return [_copy_item(self.items[i]) for i in ids]
+
+
+class SnapshotManager:
+    """Current snapshot plus the background copy-on-write refresher."""
+
+    def __init__(self,
+                 db_path: str,
+                 decode: Callable[[sqlite3.Row], Dict[str, Any]],
+                 min_interval: float = 0.5,
+                 on_publish: Optional[Callable[[KnowledgeSnapshot], None]] = None):
+        self.db_path = db_path
+        self.decode = decode
+        self.min_interval = min_interval
+        self.on_publish = on_publish
+        self.version = 0
+        self.stats = {'refreshes': 0, 'last_build_ms': 0.0, 'errors': 0}
+        self._refresh_lock = threading.Lock()
+        self._version_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stop = threading.Event()
+        self.current: KnowledgeSnapshot = self._build()
+        self._thread = threading.Thread(target=self._run, name="knowledge-snapshot", daemon=True)
+        self._thread.start()
+
+    def _build(self) -> KnowledgeSnapshot:
+        version = self.version
+        snapshot = KnowledgeSnapshot(self.db_path, version, self.decode)
+        self.stats['refreshes'] += 1
+        self.stats['last_build_ms'] = round(snapshot.build_seconds * 1000, 2)
+        return snapshot
+
+    def mark_dirty(self) -> int:
+        """Record a committed write; the refresher picks it up. Returns the new version."""
+        with self._version_lock:
+            self.version += 1
+            version = self.version
+        self._wakeup.set()
+        return version
+
+    def refresh(self) -> KnowledgeSnapshot:
+        """Build and publish a snapshot now if the current one is stale."""
+        with self._refresh_lock:
+            if self.current.version != self.version:
+                try:
+                    self.current = self._build()
+                except Exception as e:
+                    self.stats['errors'] += 1
+                    logger.error(f"Knowledge snapshot refresh failed: {e}")
+                else:
+                    if self.on_publish is not None:
+                        self.on_publish(self.current)
+            return self.current
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self._wakeup.wait()
+            self._wakeup.clear()
+            if self._stop.is_set():
+                break
+            # Let a burst of writes settle into one copy
+            self._stop.wait(self.min_interval)
+            self.refresh()
+
+    def close(self) -> None:
+        self._stop.set()
+        self._wakeup.set()
+        self._thread.join(timeout=5)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {**self.stats, 'version': self.version, 'snapshot_version': self.current.version,
+                'rows': len(self.current.items)}
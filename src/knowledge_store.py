@@ -2,42 +2,264 @@
 Knowledge Store - SQLite-based persistent storage for chatbot knowledge
 """
 
+import math
+import re
+import time
+import threading
 import sqlite3
 import json
 import logging
-from datetime import datetime
-from typing import List, Dict, Any, Optional, Tuple
+from datetime import datetime, timedelta
+from typing import List, Dict, Any, Optional, Set, Tuple, Callable, Iterable
 from pathlib import Path
 
+from .database_optimizer import ThreadLocalConnectionPool
+from .conversation_log import ConversationLogWriter, INSERT_CONVERSATION_SQL
+from .knowledge_snapshot import SnapshotManager
+
+# Applied once to every pooled connection (read-write and read-only)
+KNOWLEDGE_DB_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    # Cache size in pages; set ~64MB (assuming 4096-byte pages -> -16384 pages)
+    "PRAGMA cache_size=-16384",
+    "PRAGMA mmap_size=268435456",  # 256MB
+)
+
+
+
+def _meta_expr(key: str, column: str = "metadata") -> str:
+    """
+    SQL expression for one metadata field. Queries must use this exact text
+    so the planner matches the expression indexes built from it.
+    """
+    return f"(CASE WHEN json_valid({column}) THEN json_extract({column}, '$.{key}') END)"
+
+
+# Tags of a metadata JSON value (an array, or a single string) as json_each rows
+_TAGS_OF = "json_each(CASE WHEN json_valid({col}) THEN {col} ELSE '{{}}' END, '$.tags')"
+
+# Schema migrations, applied in order on open; PRAGMA user_version records the last one
+SCHEMA_MIGRATIONS: Tuple[Tuple[int, Tuple[str, ...]], ...] = (
+    (1, (
+        "CREATE INDEX IF NOT EXISTS idx_conversations_session_ts ON conversations(session_id, timestamp)",
+        "CREATE INDEX IF NOT EXISTS idx_conversations_timestamp ON conversations(timestamp)",
+    )),
+    # Indexed metadata: expression indexes for validation_status/source, a tag table kept by triggers
+    (2, (
+        f"CREATE INDEX IF NOT EXISTS idx_knowledge_validation_status "
+        f"ON knowledge({_meta_expr('validation_status')}, domain, created_at)",
+        f"CREATE INDEX IF NOT EXISTS idx_knowledge_source ON knowledge({_meta_expr('source')}, domain)",
+        "CREATE TABLE IF NOT EXISTS knowledge_tags ("
+        "  tag TEXT NOT NULL, knowledge_id INTEGER NOT NULL, PRIMARY KEY (tag, knowledge_id)"
+        ") WITHOUT ROWID",
+        "CREATE INDEX IF NOT EXISTS idx_knowledge_tags_id ON knowledge_tags(knowledge_id)",
+        "CREATE TRIGGER IF NOT EXISTS knowledge_tags_ai AFTER INSERT ON knowledge BEGIN\n"
+        "  INSERT OR IGNORE INTO knowledge_tags(tag, knowledge_id)\n"
+        f"  SELECT value, new.id FROM {_TAGS_OF.format(col='new.metadata')} WHERE value IS NOT NULL;\n"
+        "END;",
+        "CREATE TRIGGER IF NOT EXISTS knowledge_tags_ad AFTER DELETE ON knowledge BEGIN\n"
+        "  DELETE FROM knowledge_tags WHERE knowledge_id = old.id;\n"
+        "END;",
+        "CREATE TRIGGER IF NOT EXISTS knowledge_tags_au AFTER UPDATE OF metadata ON knowledge BEGIN\n"
+        "  DELETE FROM knowledge_tags WHERE knowledge_id = old.id;\n"
+        "  INSERT OR IGNORE INTO knowledge_tags(tag, knowledge_id)\n"
+        f"  SELECT value, new.id FROM {_TAGS_OF.format(col='new.metadata')} WHERE value IS NOT NULL;\n"
+        "END;",
+        "INSERT OR IGNORE INTO knowledge_tags(tag, knowledge_id) "
+        f"SELECT t.value, k.id FROM knowledge k, {_TAGS_OF.format(col='k.metadata')} t WHERE t.value IS NOT NULL",
+    )),
+)
+
+
+INSERT_KNOWLEDGE_SQL = """
+    INSERT OR REPLACE INTO knowledge
+    (input, response, category, domain, confidence, created_at,
+     updated_at, usage_count, metadata)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+# Metadata keys stored in the JSON metadata column
+KNOWLEDGE_METADATA_KEYS = ('tags', 'source', 'validation_status')
+
+
+# Word tokens for FTS5 MATCH expressions (each is quoted, so user text can't inject syntax)
+_FTS_TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+
+# Words with no product meaning ("switch ka price kya hai"): left out of the
+# FTS AND query and of fuzzy scoring, unless a query has nothing else
+QUERY_FILLER_WORDS = frozenset({
+    'ka', 'ki', 'ke', 'ko', 'se', 'me', 'mein', 'kya', 'hai', 'hain', 'kitna', 'kitne', 'kitni',
+    'batao', 'bhai', 'ji', 'the', 'a', 'an', 'is', 'of', 'what', 'whats',
+})
+# Price words shared by many rows: a quarter of the weight of a product word in fuzzy scoring
+GENERIC_QUERY_WORDS = frozenset({'price', 'rate', 'cost', 'daam', 'dam', 'kimat', 'keemat', 'kimt', 'value', 'much'})
+_GENERIC_WORD_WEIGHT = 0.25
+
+
+def _content_words(text: str) -> List[str]:
+    """Distinct lowercased words of text without fillers (all words if only fillers)."""
+    words = list(dict.fromkeys(_FTS_TOKEN_RE.findall((text or '').lower())))
+    return [w for w in words if w not in QUERY_FILLER_WORDS] or words
+
+
+def _fts_and_query(text: str) -> Optional[str]:
+    """All-content-words FTS5 query for unicode61 (quoted tokens, implicit AND)."""
+    return ' '.join(f'"{t}"' for t in _content_words(text)) or None
+
+
+def _trigram_terms(text: str) -> List[str]:
+    """Distinct trigrams of the words (3+ chars) in text."""
+    terms: Dict[str, None] = {}
+    for word in _FTS_TOKEN_RE.findall((text or '').lower()):
+        for i in range(len(word) - 2):
+            terms[word[i:i + 3]] = None
+    return list(terms)
+
+
+def _has_digit(word: str) -> bool:
+    return any(c.isdigit() for c in word)
+
+
+def _padded_trigrams(word: str) -> Set[str]:
+    """Trigrams of " word ", so short words and word edges count when scoring."""
+    padded = f" {word} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
 
 class KnowledgeStore:
     """
     Handles persistent storage and retrieval of chatbot knowledge using SQLite.
     """
     
-    def __init__(self, db_path: str = "data/knowledge.db"):
-        """Initialize the knowledge store with database connection."""
+    def __init__(self,
+                 db_path: str = "data/knowledge.db",
+                 async_conversation_log: bool = True,
+                 conversation_batch_size: int = 200,
+                 conversation_flush_ms: int = 50,
+                 conversation_queue_size: int = 10000,
+                 read_snapshot: bool = False,
+                 snapshot_refresh_sec: float = 0.5):
+        """
+        Initialize the knowledge store with database connection.
+        
+        With async_conversation_log, log_conversation only queues the row and a
+        background writer commits up to conversation_batch_size rows per
+        transaction, at most conversation_flush_ms after they were queued.
+        
+        With read_snapshot, knowledge reads are served from an in-memory copy
+        of the database (see knowledge_snapshot) that is rebuilt in the
+        background at most every snapshot_refresh_sec after a write, so reads
+        may lag writes by about that long.
+        """
         self.db_path = Path(db_path)
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
         
+        # One reusable connection per thread; the search path uses read-only connections
+        self._writer_pool = ThreadLocalConnectionPool(str(self.db_path), pragmas=KNOWLEDGE_DB_PRAGMAS)
+        # Set by _init_database when the trigram tokenizer (SQLite >= 3.34) is available
+        self._trigram_enabled = False
+        # Capped document frequencies of query trigrams, used to pick selective terms
+        # and to weight query words by rarity; cleared (with the row count) on add/delete
+        self._trigram_df: Dict[str, int] = {}
+        self._row_count: Optional[int] = None
         self._init_database()
+        self._reader_pool = ThreadLocalConnectionPool(str(self.db_path), pragmas=KNOWLEDGE_DB_PRAGMAS,
+                                                      read_only=True)
+        # Called as listener(event, row) after a committed add/delete/update
+        self._change_listeners: List[Callable[[str, Dict[str, Any]], None]] = []
+        self._snapshots: Optional[SnapshotManager] = None
+        # (snapshot version, event, row) held back until a snapshot containing the write is published
+        self._pending_events: List[Tuple[int, str, Dict[str, Any]]] = []
+        self._events_lock = threading.Lock()
+        if read_snapshot:
+            self._snapshots = SnapshotManager(str(self.db_path), self._decode_row, snapshot_refresh_sec,
+                                              on_publish=self._on_snapshot_published)
+        self._conversation_log: Optional[ConversationLogWriter] = None
+        if async_conversation_log:
+            self._conversation_log = ConversationLogWriter(
+                self._write_conn,
+                batch_size=conversation_batch_size,
+                flush_interval_ms=conversation_flush_ms,
+                max_queue=conversation_queue_size,
+            )
         logging.info(f"KnowledgeStore initialized with database: {self.db_path}")
     
+    def _write_conn(self) -> sqlite3.Connection:
+        """Pooled read-write connection for the calling thread."""
+        return self._writer_pool.connection()
+    
+    def _read_conn(self) -> sqlite3.Connection:
+        """
+        Read-only connection for the calling thread (search/lookup path): the
+        current in-memory snapshot in read-snapshot mode, else the pooled file reader.
+        """
+        if self._snapshots is not None:
+            return self._snapshots.current.connection()
+        return self._reader_pool.connection()
+    
+    def refresh_snapshot(self) -> bool:
+        """Publish a snapshot of all committed writes now (read-snapshot mode only)."""
+        if self._snapshots is None:
+            return False
+        return self._snapshots.refresh().version == self._snapshots.version
+    
+    def get_snapshot_stats(self) -> Optional[Dict[str, Any]]:
+        return self._snapshots.get_stats() if self._snapshots is not None else None
+    
+    def close(self) -> None:
+        """Flush queued conversation rows and close all pooled connections."""
+        if self._conversation_log is not None:
+            self._conversation_log.close()
+        if self._snapshots is not None:
+            self._snapshots.close()
+        self._reader_pool.close_all()
+        self._writer_pool.close_all()
+    
+    def add_change_listener(self, listener: Callable[[str, Dict[str, Any]], None]) -> None:
+        """Register a callback for committed 'add', 'delete', 'update' and 'bulk' events."""
+        self._change_listeners.append(listener)
+    
+    def _notify_change(self, event: str, row: Dict[str, Any]) -> None:
+        if self._snapshots is not None:
+            # Listeners (e.g. the response cache) must not see a change before readers can
+            with self._events_lock:
+                self._pending_events.append((self._snapshots.mark_dirty(), event, row))
+            return
+        self._deliver_change(event, row)
+    
+    def _on_snapshot_published(self, snapshot: Any) -> None:
+        with self._events_lock:
+            ready = [e for e in self._pending_events if e[0] <= snapshot.version]
+            self._pending_events = [e for e in self._pending_events if e[0] > snapshot.version]
+        for _, event, row in ready:
+            self._deliver_change(event, row)
+    
+    def _deliver_change(self, event: str, row: Dict[str, Any]) -> None:
+        if event != 'update':
+            self._trigram_df.clear()
+            self._row_count = None
+        for listener in list(self._change_listeners):
+            try:
+                listener(event, row)
+            except Exception as e:
+                logging.warning(f"Knowledge change listener failed: {e}")
+    
+    def get_pool_statistics(self) -> Dict[str, Any]:
+        """Connection pool statistics for the writer and reader pools."""
+        return {
+            'writer': self._writer_pool.get_pool_statistics(),
+            'reader': self._reader_pool.get_pool_statistics(),
+        }
+    
     def _init_database(self) -> None:
         """Initialize the database schema with WAL and optional FTS5."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._write_conn() as conn:
                 cursor = conn.cursor()
-
-                # Pragmas for performance and durability
-                try:
-                    cursor.execute("PRAGMA journal_mode=WAL;")
-                    cursor.execute("PRAGMA synchronous=NORMAL;")
-                    cursor.execute("PRAGMA temp_store=MEMORY;")
-                    # Cache size in pages; set ~64MB (assuming 4096-byte pages -> -16384 pages)
-                    cursor.execute("PRAGMA cache_size=-16384;")
-                except Exception as pe:
-                    logging.warning(f"Failed to set SQLite pragmas: {pe}")
+                # WAL/cache/mmap pragmas are applied by the pool to every connection it opens
                 
                 # Create knowledge table
                 cursor.execute("""
@@ -113,6 +335,46 @@ class KnowledgeStore:
                 except sqlite3.OperationalError as fe:
                     logging.warning(f"FTS5 not available or failed to initialize: {fe}")
                 
+                # Trigram FTS5 table for substring/misspelling matches (replaces LIKE scans)
+                try:
+                    existed = cursor.execute(
+                        "SELECT 1 FROM sqlite_master WHERE name = 'knowledge_trigram'"
+                    ).fetchone() is not None
+                    cursor.execute(
+                        "CREATE VIRTUAL TABLE IF NOT EXISTS knowledge_trigram USING fts5(\n"
+                        "  input,\n"
+                        "  response,\n"
+                        "  content='knowledge',\n"
+                        "  content_rowid='id',\n"
+                        "  tokenize='trigram'\n"
+                        ");"
+                    )
+                    # Triggers to keep the trigram index in sync
+                    cursor.execute(
+                        "CREATE TRIGGER IF NOT EXISTS knowledge_tri_ai AFTER INSERT ON knowledge BEGIN\n"
+                        "  INSERT INTO knowledge_trigram(rowid, input, response) VALUES (new.id, new.input, new.response);\n"
+                        "END;"
+                    )
+                    cursor.execute(
+                        "CREATE TRIGGER IF NOT EXISTS knowledge_tri_ad AFTER DELETE ON knowledge BEGIN\n"
+                        "  INSERT INTO knowledge_trigram(knowledge_trigram, rowid, input, response) VALUES('delete', old.id, old.input, old.response);\n"
+                        "END;"
+                    )
+                    cursor.execute(
+                        "CREATE TRIGGER IF NOT EXISTS knowledge_tri_au AFTER UPDATE OF input, response ON knowledge BEGIN\n"
+                        "  INSERT INTO knowledge_trigram(knowledge_trigram, rowid, input, response) VALUES('delete', old.id, old.input, old.response);\n"
+                        "  INSERT INTO knowledge_trigram(rowid, input, response) VALUES (new.id, new.input, new.response);\n"
+                        "END;"
+                    )
+                    if not existed:
+                        # Index rows that predate the table
+                        cursor.execute("INSERT INTO knowledge_trigram(knowledge_trigram) VALUES('rebuild');")
+                    self._trigram_enabled = True
+                except sqlite3.OperationalError as te:
+                    self._trigram_enabled = False
+                    logging.warning(f"FTS5 trigram tokenizer not available, keeping LIKE fallback: {te}")
+                
+                self._migrate(cursor)
                 conn.commit()
                 # Best-effort: ensure FTS content is synchronized with base table
                 try:
@@ -125,13 +387,24 @@ class KnowledgeStore:
             logging.error(f"Error initializing database: {e}")
             raise
 
+    def _migrate(self, cursor: sqlite3.Cursor) -> None:
+        """Apply SCHEMA_MIGRATIONS newer than the database's user_version."""
+        version = cursor.execute("PRAGMA user_version").fetchone()[0]
+        for target, statements in SCHEMA_MIGRATIONS:
+            if target <= version:
+                continue
+            for statement in statements:
+                cursor.execute(statement)
+            cursor.execute(f"PRAGMA user_version = {int(target)}")
+            logging.info(f"Knowledge DB migrated to schema version {target}")
+
     def ensure_fts_sync(self) -> None:
         """
         Ensure FTS virtual table contains the same rows as the base table.
         This handles cases where FTS was created after rows already existed.
         """
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._write_conn() as conn:
                 cur = conn.cursor()
                 try:
                     # Attempt FTS5 rebuild from content table
@@ -162,45 +435,138 @@ class KnowledgeStore:
             True if successfully added, False otherwise
         """
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._write_conn() as conn:
                 cursor = conn.cursor()
-                
-                # Prepare metadata
-                metadata = {}
-                for key in ['tags', 'source', 'validation_status']:
-                    if key in knowledge:
-                        metadata[key] = knowledge[key]
-                
-                cursor.execute("""
-                    INSERT OR REPLACE INTO knowledge
-                    (input, response, category, domain, confidence, created_at,
-                     updated_at, usage_count, metadata)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    knowledge['input'],
-                    knowledge['response'],
-                    knowledge.get('category', 'general'),
-                    knowledge.get('domain', 'general'),
-                    knowledge.get('confidence', 1.0),
-                    knowledge.get('created_at', datetime.now().isoformat()),
-                    datetime.now().isoformat(),
-                    knowledge.get('usage_count', 0),
-                    json.dumps(metadata) if metadata else None
-                ))
-                
+                cursor.execute(INSERT_KNOWLEDGE_SQL, self._knowledge_params(knowledge))
                 conn.commit()
                 logging.debug(f"Added knowledge: {knowledge['input'][:50]}...")
-                return True
+            self._notify_change('add', {
+                'id': cursor.lastrowid,
+                'input': knowledge['input'],
+                'response': knowledge['response'],
+                'domain': knowledge.get('domain', 'general'),
+            })
+            return True
                 
         except Exception as e:
             logging.error(f"Error adding knowledge: {e}")
             return False
     
+    @staticmethod
+    def _knowledge_params(knowledge: Dict[str, Any],
+                          now: Optional[str] = None,
+                          domain: str = 'general') -> Tuple[Any, ...]:
+        """INSERT_KNOWLEDGE_SQL parameters for a knowledge dict."""
+        now = now or datetime.now().isoformat()
+        metadata = {key: knowledge[key] for key in KNOWLEDGE_METADATA_KEYS if key in knowledge}
+        return (
+            knowledge['input'],
+            knowledge['response'],
+            knowledge.get('category', 'general'),
+            knowledge.get('domain', domain),
+            knowledge.get('confidence', 1.0),
+            knowledge.get('created_at', now),
+            now,
+            knowledge.get('usage_count', 0),
+            json.dumps(metadata) if metadata else None
+        )
+    
+    def _fts_triggers(self, conn: sqlite3.Connection) -> List[Tuple[str, str]]:
+        """(name, sql) of the triggers keeping knowledge_fts/knowledge_trigram in sync."""
+        rows = conn.execute(
+            "SELECT name, sql FROM sqlite_master WHERE type = 'trigger' AND tbl_name = 'knowledge'"
+        ).fetchall()
+        return [(r[0], r[1]) for r in rows
+                if 'knowledge_fts' in r[1] or 'knowledge_trigram' in r[1]]
+    
+    def bulk_add_knowledge(self,
+                           records: Iterable[Dict[str, Any]],
+                           domain: str = "general",
+                           chunk_size: int = 5000,
+                           progress: Optional[Callable[[int], None]] = None) -> Dict[str, Any]:
+        """
+        Load many knowledge records in one transaction.
+        
+        Records are consumed lazily and written with chunked executemany. Loads
+        larger than one chunk drop the FTS triggers for their duration and
+        rebuild knowledge_fts/knowledge_trigram once at the end, inside the same
+        transaction. Records without input/response are skipped. Listeners get
+        a single 'bulk' event instead of one 'add' per row.
+        
+        Returns:
+            Dict with inserted/skipped counts, domains, seconds and rows_per_sec
+        """
+        start = time.perf_counter()
+        now = datetime.now().isoformat()
+        records = iter(records)
+        stats: Dict[str, Any] = {'inserted': 0, 'skipped': 0, 'domains': []}
+        domains: Dict[str, None] = {}
+        
+        def next_chunk() -> List[Tuple[Any, ...]]:
+            chunk = []
+            for record in records:
+                try:
+                    text_in = str(record.get('input') or '').strip()
+                    text_out = str(record.get('response') or '').strip()
+                    if not text_in or not text_out:
+                        raise ValueError("input and response are required")
+                    knowledge = {**record, 'input': text_in, 'response': text_out,
+                                 'confidence': float(record.get('confidence', 1.0)),
+                                 'usage_count': int(record.get('usage_count', 0))}
+                    chunk.append(self._knowledge_params(knowledge, now, domain))
+                except (AttributeError, TypeError, ValueError):
+                    stats['skipped'] += 1
+                    continue
+                if len(chunk) >= chunk_size:
+                    break
+            return chunk
+        
+        try:
+            conn = self._write_conn()
+            chunk = next_chunk()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                deferred = self._fts_triggers(conn) if len(chunk) >= chunk_size else []
+                for name, _ in deferred:
+                    conn.execute(f'DROP TRIGGER IF EXISTS "{name}"')
+                while chunk:
+                    conn.executemany(INSERT_KNOWLEDGE_SQL, chunk)
+                    stats['inserted'] += len(chunk)
+                    domains.update((row[3], None) for row in chunk)
+                    if progress:
+                        progress(stats['inserted'])
+                    chunk = next_chunk()
+                if deferred:
+                    for _, sql in deferred:
+                        conn.execute(sql)
+                    for table in ('knowledge_fts', 'knowledge_trigram'):
+                        if any(table in sql for _, sql in deferred):
+                            conn.execute(f"INSERT INTO {table}({table}) VALUES('rebuild')")
+                conn.commit()
+            except BaseException:
+                conn.rollback()
+                raise
+        except Exception as e:
+            logging.error(f"Bulk knowledge import failed: {e}")
+            stats.update(inserted=0, error=str(e))
+        
+        elapsed = time.perf_counter() - start
+        stats['domains'] = list(domains) if stats['inserted'] else []
+        stats['seconds'] = round(elapsed, 3)
+        stats['rows_per_sec'] = round(stats['inserted'] / elapsed, 1) if elapsed > 0 else 0.0
+        if stats['inserted']:
+            self._notify_change('bulk', {'domains': stats['domains'], 'count': stats['inserted']})
+        return stats
+    
     def get_knowledge_by_domain(self, domain: str) -> List[Dict[str, Any]]:
         """Get all knowledge entries for a specific domain."""
+        if self._snapshots is not None:
+            return self._snapshots.current.listing(
+                ('domain', domain),
+                "SELECT id FROM knowledge WHERE domain = ? ORDER BY usage_count DESC, created_at DESC",
+                (domain,))
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                conn.row_factory = sqlite3.Row
+            with self._read_conn() as conn:
                 cursor = conn.cursor()
                 
                 cursor.execute("""
@@ -209,38 +575,27 @@ class KnowledgeStore:
                     ORDER BY usage_count DESC, created_at DESC
                 """, (domain,))
                 
-                results = []
-                for row in cursor.fetchall():
-                    knowledge = dict(row)
-                    if knowledge['metadata']:
-                        try:
-                            metadata = json.loads(knowledge['metadata'])
-                            knowledge.update(metadata)
-                        except:
-                            pass
-                    results.append(knowledge)
-                
-                return results
+                return [self._row_to_item(row) for row in cursor.fetchall()]
                 
         except Exception as e:
             logging.error(f"Error getting knowledge by domain: {e}")
             return []
     
     def search_by_keywords(self, keywords: List[str], domain: str = None) -> List[Dict[str, Any]]:
-        """Search knowledge by keywords (FTS5 if available, otherwise LIKE)."""
+        """Search knowledge by keywords (FTS5 + trigram fuzzy if available, otherwise LIKE)."""
         try:
             # Try FTS5 first using joined MATCH query
             query_text = ' '.join(keywords)
             fts_results = self.search_fulltext(query_text, domain=domain, limit=10)
-            if fts_results:
+            if fts_results or self._trigram_enabled:
                 return fts_results
         except Exception as _:
             # Ignore and fallback to LIKE
             pass
         
+        # LIKE scan: only reached when FTS5/trigram search is unavailable
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                conn.row_factory = sqlite3.Row
+            with self._read_conn() as conn:
                 cursor = conn.cursor()
                 
                 # Build search query
@@ -293,7 +648,7 @@ class KnowledgeStore:
     def update_usage_count(self, knowledge_id: int) -> bool:
         """Update the usage count for a knowledge entry."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._write_conn() as conn:
                 cursor = conn.cursor()
                 
                 cursor.execute("""
@@ -304,7 +659,9 @@ class KnowledgeStore:
                 """, (datetime.now().isoformat(), knowledge_id))
                 
                 conn.commit()
-                return cursor.rowcount > 0
+            if self._snapshots is not None:
+                self._snapshots.mark_dirty()
+            return cursor.rowcount > 0
                 
         except Exception as e:
             logging.error(f"Error updating usage count: {e}")
@@ -313,13 +670,16 @@ class KnowledgeStore:
     def delete_knowledge(self, knowledge_id: int) -> bool:
         """Delete a knowledge entry."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._write_conn() as conn:
                 cursor = conn.cursor()
                 
                 cursor.execute("DELETE FROM knowledge WHERE id = ?", (knowledge_id,))
                 conn.commit()
-                
-                return cursor.rowcount > 0
+            
+            deleted = cursor.rowcount > 0
+            if deleted:
+                self._notify_change('delete', {'id': knowledge_id})
+            return deleted
                 
         except Exception as e:
             logging.error(f"Error deleting knowledge: {e}")
@@ -327,25 +687,15 @@ class KnowledgeStore:
     
     def get_knowledge_by_id(self, knowledge_id: int) -> Optional[Dict[str, Any]]:
         """Get a specific knowledge entry by ID."""
+        if self._snapshots is not None:
+            return self._snapshots.current.get(knowledge_id)
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                conn.row_factory = sqlite3.Row
+            with self._read_conn() as conn:
                 cursor = conn.cursor()
                 
                 cursor.execute("SELECT * FROM knowledge WHERE id = ?", (knowledge_id,))
                 row = cursor.fetchone()
-                
-                if row:
-                    knowledge = dict(row)
-                    if knowledge['metadata']:
-                        try:
-                            metadata = json.loads(knowledge['metadata'])
-                            knowledge.update(metadata)
-                        except:
-                            pass
-                    return knowledge
-                
-                return None
+                return self._row_to_item(row) if row else None
                 
         except Exception as e:
             logging.error(f"Error getting knowledge by ID: {e}")
@@ -353,9 +703,11 @@ class KnowledgeStore:
     
     def get_all_knowledge(self) -> List[Dict[str, Any]]:
         """Get all knowledge entries."""
+        if self._snapshots is not None:
+            return self._snapshots.current.listing(
+                'all', "SELECT id FROM knowledge ORDER BY domain, category, created_at DESC")
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                conn.row_factory = sqlite3.Row
+            with self._read_conn() as conn:
                 cursor = conn.cursor()
                 
                 cursor.execute("""
@@ -363,18 +715,7 @@ class KnowledgeStore:
                     ORDER BY domain, category, created_at DESC
                 """)
                 
-                results = []
-                for row in cursor.fetchall():
-                    knowledge = dict(row)
-                    if knowledge['metadata']:
-                        try:
-                            metadata = json.loads(knowledge['metadata'])
-                            knowledge.update(metadata)
-                        except:
-                            pass
-                    results.append(knowledge)
-                
-                return results
+                return [self._row_to_item(row) for row in cursor.fetchall()]
                 
         except Exception as e:
             logging.error(f"Error getting all knowledge: {e}")
@@ -384,8 +725,8 @@ class KnowledgeStore:
         """Return list of (id, input) for building semantic indexes."""
         items: List[Tuple[int, str]] = []
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                conn.row_factory = sqlite3.Row
+            # Always the file: index syncs must see writes the snapshot may not have yet
+            with self._reader_pool.connection() as conn:
                 cursor = conn.cursor()
                 if domain:
                     cursor.execute("SELECT id, input FROM knowledge WHERE domain = ? ORDER BY id ASC", (domain,))
@@ -400,7 +741,7 @@ class KnowledgeStore:
     def get_stats(self) -> Dict[str, Any]:
         """Get statistics about the knowledge store."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._read_conn() as conn:
                 cursor = conn.cursor()
                 
                 # Total entries
@@ -449,26 +790,25 @@ class KnowledgeStore:
 
     # -------------------- Metadata utilities --------------------
     def update_metadata(self, knowledge_id: int, updates: Dict[str, Any]) -> bool:
-        """Merge update keys into the metadata JSON for a knowledge row."""
+        """Merge update keys into the metadata JSON for a knowledge row (one json_set UPDATE)."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                conn.row_factory = sqlite3.Row
+            paths: List[Any] = []
+            for key, value in (updates or {}).items():
+                if '"' in key:
+                    raise ValueError(f"Invalid metadata key: {key!r}")
+                paths += [f'$."{key}"', json.dumps(value)]
+            set_expr = "CASE WHEN json_valid(metadata) THEN metadata ELSE '{}' END"
+            if paths:
+                set_expr = f"json_set({set_expr}, {', '.join(['?, json(?)'] * (len(paths) // 2))})"
+            with self._write_conn() as conn:
                 cursor = conn.cursor()
-                cursor.execute("SELECT metadata FROM knowledge WHERE id = ?", (knowledge_id,))
-                row = cursor.fetchone()
-                if not row:
-                    return False
-                current_meta = {}
-                if row["metadata"]:
-                    try:
-                        current_meta = json.loads(row["metadata"]) or {}
-                    except Exception:
-                        current_meta = {}
-                current_meta.update(updates or {})
-                cursor.execute("UPDATE knowledge SET metadata = ?, updated_at = ? WHERE id = ?",
-                               (json.dumps(current_meta), datetime.now().isoformat(), knowledge_id))
+                cursor.execute(f"UPDATE knowledge SET metadata = {set_expr}, updated_at = ? WHERE id = ?",
+                               (*paths, datetime.now().isoformat(), knowledge_id))
                 conn.commit()
-                return cursor.rowcount > 0
+            updated = cursor.rowcount > 0
+            if updated:
+                self._notify_change('update', {'id': knowledge_id, 'metadata': updates})
+            return updated
         except Exception as e:
             logging.error(f"Error updating metadata: {e}")
             return False
@@ -477,154 +817,318 @@ class KnowledgeStore:
         """Set validation_status in metadata for the given knowledge row."""
         return self.update_metadata(knowledge_id, {"validation_status": status})
 
-    def get_pending_knowledge(self, domain: Optional[str] = None, limit: int = 100) -> List[Dict[str, Any]]:
-        """Return rows whose metadata indicates validation_status == 'pending'."""
+    def find_knowledge(self,
+                       domain: Optional[str] = None,
+                       validation_status: Optional[str] = None,
+                       source: Optional[str] = None,
+                       tag: Optional[str] = None,
+                       limit: int = 100) -> List[Dict[str, Any]]:
+        """
+        List rows by metadata fields, newest first.
+        
+        validation_status and source are served by expression indexes, tag by
+        the knowledge_tags table.
+        """
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                conn.row_factory = sqlite3.Row
-                cursor = conn.cursor()
-                if domain:
-                    cursor.execute(
-                        """
-                        SELECT * FROM knowledge 
-                        WHERE domain = ? AND metadata LIKE '%"validation_status": "pending"%'
-                        ORDER BY created_at DESC LIMIT ?
-                        """,
-                        (domain, limit)
-                    )
-                else:
-                    cursor.execute(
-                        """
-                        SELECT * FROM knowledge 
-                        WHERE metadata LIKE '%"validation_status": "pending"%'
-                        ORDER BY created_at DESC LIMIT ?
-                        """,
-                        (limit,)
-                    )
-                results: List[Dict[str, Any]] = []
-                for row in cursor.fetchall():
-                    item = dict(row)
-                    if item.get('metadata'):
-                        try:
-                            md = json.loads(item['metadata'])
-                            item.update(md)
-                        except Exception:
-                            pass
-                    results.append(item)
-                return results
+            sql = "SELECT k.* FROM knowledge k"
+            where: List[str] = []
+            params: List[Any] = []
+            if tag is not None:
+                sql += " JOIN knowledge_tags t ON t.knowledge_id = k.id AND t.tag = ?"
+                params.append(tag)
+            if validation_status is not None:
+                where.append(f"{_meta_expr('validation_status', 'k.metadata')} = ?")
+                params.append(validation_status)
+            if source is not None:
+                where.append(f"{_meta_expr('source', 'k.metadata')} = ?")
+                params.append(source)
+            if domain:
+                where.append("k.domain = ?")
+                params.append(domain)
+            if where:
+                sql += " WHERE " + " AND ".join(where)
+            sql += " ORDER BY k.created_at DESC LIMIT ?"
+            params.append(limit)
+            with self._read_conn() as conn:
+                return [self._row_to_item(row) for row in conn.execute(sql, params).fetchall()]
         except Exception as e:
-            logging.error(f"Error getting pending knowledge: {e}")
+            logging.error(f"Error listing knowledge by metadata: {e}")
             return []
 
-    def search_fulltext(self, query_text: str, domain: Optional[str] = None, limit: int = 10) -> List[Dict[str, Any]]:
-        """Full-text search using FTS5 if available, with safe fallbacks (LIKE) when no hits."""
+    def get_pending_knowledge(self, domain: Optional[str] = None, limit: int = 100) -> List[Dict[str, Any]]:
+        """Return rows whose metadata indicates validation_status == 'pending'."""
+        return self.find_knowledge(domain=domain, validation_status='pending', limit=limit)
+
+    def _row_to_item(self, row: sqlite3.Row) -> Dict[str, Any]:
+        """Knowledge row as a dict with metadata merged in (pre-decoded in snapshot mode)."""
+        if self._snapshots is not None:
+            item = self._snapshots.current.get(row['id'])
+            if item is not None:
+                return item
+        return self._decode_row(row)
+
+    @staticmethod
+    def _decode_row(row: sqlite3.Row) -> Dict[str, Any]:
+        item = dict(row)
+        if item.get('metadata'):
+            try:
+                md = json.loads(item['metadata'])
+                item.update(md)
+            except Exception:
+                pass
+        return item
+
+    def search_fulltext(self,
+                        query_text: str,
+                        domain: Optional[str] = None,
+                        limit: int = 10,
+                        fuzzy: bool = True) -> List[Dict[str, Any]]:
+        """
+        Full-text search: all query words via FTS5 (bm25-ranked); when that finds
+        nothing and `fuzzy` is set, a ranked trigram match (see search_fuzzy).
+        LIKE is only used when the trigram tokenizer is unavailable.
+        """
         results: List[Dict[str, Any]] = []
         # 1) Try FTS5 (if available)
-        try:
-            with sqlite3.connect(self.db_path) as conn:
-                conn.row_factory = sqlite3.Row
-                cursor = conn.cursor()
-                sql = (
-                    "SELECT k.*, k.id as kid FROM knowledge_fts f "
-                    "JOIN knowledge k ON k.id = f.rowid "
-                    "WHERE f MATCH ?"
-                )
-                params: List[Any] = [query_text]
-                if domain:
-                    sql += " AND k.domain = ?"
-                    params.append(domain)
-                try:
-                    sql_ranked = sql + " ORDER BY bm25(f) LIMIT ?"
-                    params_ranked = params + [limit]
-                    cursor.execute(sql_ranked, params_ranked)
-                except sqlite3.OperationalError:
-                    # Fallback without bm25 function
-                    sql_plain = sql + " LIMIT ?"
-                    params_plain = params + [limit]
-                    cursor.execute(sql_plain, params_plain)
-                for row in cursor.fetchall():
-                    item = dict(row)
-                    if item.get('metadata'):
-                        try:
-                            md = json.loads(item['metadata'])
-                            item.update(md)
-                        except Exception:
-                            pass
-                    results.append(item)
-        except sqlite3.OperationalError as e:
-            logging.debug(f"FTS search unavailable: {e}")
-        except Exception as e:
-            logging.error(f"Error in FTS search: {e}")
+        match = _fts_and_query(query_text)
+        if match:
+            try:
+                with self._read_conn() as conn:
+                    cursor = conn.cursor()
+                    sql = (
+                        "SELECT k.*, k.id as kid FROM knowledge_fts "
+                        "JOIN knowledge k ON k.id = knowledge_fts.rowid "
+                        "WHERE knowledge_fts MATCH ?"
+                    )
+                    params: List[Any] = [match]
+                    if domain:
+                        sql += " AND k.domain = ?"
+                        params.append(domain)
+                    sql += " ORDER BY bm25(knowledge_fts) LIMIT ?"
+                    params.append(limit)
+                    cursor.execute(sql, params)
+                    results = [self._row_to_item(row) for row in cursor.fetchall()]
+            except sqlite3.OperationalError as e:
+                logging.debug(f"FTS search unavailable: {e}")
+            except Exception as e:
+                logging.error(f"Error in FTS search: {e}")
+
+        # 2) Misspellings/partial words: trigram index
+        if not results and fuzzy and self._trigram_enabled:
+            return self.search_fuzzy(query_text, domain=domain, limit=limit)
 
-        # 2) If FTS yielded no results, fallback to LIKE keywords search
-        if not results:
+        # 3) No trigram tokenizer: legacy LIKE keywords scan
+        if not results and fuzzy:
             try:
                 words = [w for w in (query_text or '').split() if len(w) > 1]
                 if words:
-                    with sqlite3.connect(self.db_path) as conn:
-                        conn.row_factory = sqlite3.Row
+                    with self._read_conn() as conn:
                         cursor = conn.cursor()
                         keyword_conditions = []
-                        params: List[Any] = []
+                        params = []
                         for w in words:
                             keyword_conditions.append("(input LIKE ? OR response LIKE ?)")
                             params.extend([f"%{w}%", f"%{w}%"])
-                        sql_like = f"SELECT * FROM knowledge WHERE {' OR '.join(keyword_conditions)}"
+                        sql_like = f"SELECT * FROM knowledge WHERE ({' OR '.join(keyword_conditions)})"
                         if domain:
                             sql_like += " AND domain = ?"
                             params.append(domain)
                         sql_like += " ORDER BY usage_count DESC, id DESC LIMIT ?"
                         params.append(limit)
                         cursor.execute(sql_like, params)
-                        for row in cursor.fetchall():
-                            item = dict(row)
-                            if item.get('metadata'):
-                                try:
-                                    md = json.loads(item['metadata'])
-                                    item.update(md)
-                                except Exception:
-                                    pass
-                            results.append(item)
+                        results = [self._row_to_item(row) for row in cursor.fetchall()]
             except Exception as e:
                 logging.debug(f"LIKE fallback failed: {e}")
 
         return results
+
+    def search_fuzzy(self,
+                     query_text: str,
+                     domain: Optional[str] = None,
+                     limit: int = 10,
+                     min_overlap: float = 0.4,
+                     candidates: int = 50) -> List[Dict[str, Any]]:
+        """
+        Ranked substring/misspelling search over the trigram index.
+
+        Rows sharing one of the query's selective trigrams are ranked by bm25
+        (input weighted over response); the top `candidates` are re-scored per
+        query word: the share of the word's trigrams found in their input (or,
+        discounted, their response), weighted by the word's rarity (IDF) and
+        down-weighted for price words, fillers left out. A row must match the
+        rarest content word (not a number) at `min_overlap` or better, so "fan ka price" never
+        answers with "switch ka price"; rows scoring below `min_overlap` are
+        dropped. Adds `_score`.
+        """
+        if not self._trigram_enabled:
+            return []
+        words = [w for w in _content_words(query_text) if len(w) >= 3]
+        if not words:
+            return []
+        try:
+            with self._read_conn() as conn:
+                selective, df = self._selective_trigrams(conn, query_text)
+                if not selective:
+                    return []
+                weights, required = self._word_weights(conn, words, df)
+                if required is None:
+                    return []  # The rarest word is in no row at all
+                match = ' OR '.join('"' + t.replace('"', '""') + '"' for t in selective)
+                sql = (
+                    "SELECT k.* FROM knowledge_trigram "
+                    "JOIN knowledge k ON k.id = knowledge_trigram.rowid "
+                    "WHERE knowledge_trigram MATCH ?"
+                )
+                params: List[Any] = [match]
+                if domain:
+                    sql += " AND k.domain = ?"
+                    params.append(domain)
+                sql += " ORDER BY bm25(knowledge_trigram, 2.0, 1.0) LIMIT ?"
+                params.append(max(candidates, limit))
+                rows = conn.execute(sql, params).fetchall()
+        except sqlite3.OperationalError as e:
+            logging.debug(f"Trigram search unavailable: {e}")
+            return []
+
+        word_trigrams = {w: _padded_trigrams(w) for w in words if not _has_digit(w)}
+        # A number no candidate contains (an order id, say) is left out rather than sinking every score
+        numbers = [w for w in words if w not in word_trigrams]
+        if numbers:
+            row_tokens = [set(_FTS_TOKEN_RE.findall(f"{row['input']} {row['response']}".lower())) for row in rows]
+            words = [w for w in words if w in word_trigrams or any(w in tokens for tokens in row_tokens)]
+            if required not in words:
+                return []
+        total_weight = sum(weights[w] for w in words)
+
+        def score_text(text: str) -> float:
+            tokens = set(_FTS_TOKEN_RE.findall(text.lower()))
+            grams: Set[str] = set()
+            for word in tokens:
+                grams |= _padded_trigrams(word)
+            # Numbers (model numbers, sizes) match exactly or not at all
+            shares = {w: (len(word_trigrams[w] & grams) / len(word_trigrams[w]) if w in word_trigrams
+                          else float(w in tokens)) for w in words}
+            if shares[required] < min_overlap:
+                return 0.0
+            return sum(weights[w] * shares[w] for w in words) / total_weight
+
+        scored = []
+        for rank, row in enumerate(rows):
+            score = max(score_text(row['input'] or ''), 0.8 * score_text(row['response'] or ''))
+            if score >= min_overlap:
+                scored.append((-score, rank, row))
+        scored.sort(key=lambda x: (x[0], x[1]))
+
+        results: List[Dict[str, Any]] = []
+        for neg_score, _, row in scored[:limit]:
+            item = self._row_to_item(row)
+            item['_score'] = round(-neg_score, 4)
+            results.append(item)
+        return results
+
+    def _word_weights(self,
+                      conn: sqlite3.Connection,
+                      words: List[str],
+                      df: Dict[str, int]) -> Tuple[Dict[str, float], Optional[str]]:
+        """
+        (IDF weight per query word, rarest content word). A word's document
+        frequency is that of its rarest trigram present in the index; the
+        rarest word is None when it has no indexed trigram at all.
+        """
+        if self._row_count is None:
+            self._row_count = conn.execute("SELECT count(*) FROM knowledge").fetchone()[0]
+        n = self._row_count
+        word_df = {w: min((df[t] for t in _trigram_terms(w) if df.get(t)), default=0) for w in words}
+        weights = {}
+        for word in words:
+            idf = math.log((n - word_df[word] + 0.5) / (word_df[word] + 0.5) + 1.0)
+            weights[word] = idf * (_GENERIC_WORD_WEIGHT if word in GENERIC_QUERY_WORDS else 1.0)
+        content = [w for w in words if w not in GENERIC_QUERY_WORDS and not _has_digit(w)] or words
+        rarest = min(content, key=lambda w: word_df[w])
+        return weights, (rarest if word_df[rarest] else None)
+    
+    def _selective_trigrams(self,
+                            conn: sqlite3.Connection,
+                            query_text: str,
+                            budget: int = 5000) -> Tuple[List[str], Dict[str, int]]:
+        """
+        Trigrams to rank candidates by: the rarest one of each query word
+        (unless even that is in more than `budget` rows), then the rarest
+        remaining ones while their postings add up to at most `budget` rows.
+        Ranking an OR over trigrams such as "pri" would score nearly every row.
+        Also returns the (capped) document frequency of every indexed query trigram.
+        """
+        df: Dict[str, int] = {}
+        selected: Dict[str, None] = {}
+        for word in _content_words(query_text):
+            present = []
+            for term in _trigram_terms(word):
+                count = self._trigram_df.get(term)
+                if count is None:
+                    count = conn.execute(
+                        "SELECT count(*) FROM (SELECT 1 FROM knowledge_trigram WHERE knowledge_trigram MATCH ? LIMIT ?)",
+                        ('"' + term.replace('"', '""') + '"', budget + 1),
+                    ).fetchone()[0]
+                    if len(self._trigram_df) >= 50000:
+                        self._trigram_df.clear()
+                    self._trigram_df[term] = count
+                if count:
+                    df[term] = count
+                    present.append(term)
+            rarest = min(present, key=df.get, default=None)
+            if rarest is not None and df[rarest] <= budget:
+                selected[rarest] = None
+        if not selected and df:
+            selected[min(df, key=df.get)] = None
+        total = sum(df[t] for t in selected)
+        for term in sorted(df, key=df.get):
+            if term in selected:
+                continue
+            if total + df[term] > budget:
+                break
+            selected[term] = None
+            total += df[term]
+        return list(selected), df
     
     def log_conversation(self, session_id: str, message_type: str, 
                         message: str, response: str = None, 
                         domain: str = "general", metadata: Dict = None) -> bool:
-        """Log a conversation turn."""
+        """Log a conversation turn (queued for the group-commit writer when enabled)."""
+        row = (
+            session_id,
+            message_type,
+            message,
+            response,
+            domain,
+            datetime.now().isoformat(),
+            json.dumps(metadata) if metadata else None
+        )
+        if self._conversation_log is not None:
+            return self._conversation_log.submit(row)
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                
-                cursor.execute("""
-                    INSERT INTO conversations 
-                    (session_id, message_type, message, response, domain, timestamp, metadata)
-                    VALUES (?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    session_id,
-                    message_type,
-                    message,
-                    response,
-                    domain,
-                    datetime.now().isoformat(),
-                    json.dumps(metadata) if metadata else None
-                ))
-                
-                conn.commit()
+            with self._write_conn() as conn:
+                conn.execute(INSERT_CONVERSATION_SQL, row)
                 return True
                 
         except Exception as e:
             logging.error(f"Error logging conversation: {e}")
             return False
     
+    def flush_conversation_log(self, timeout: float = 5.0) -> bool:
+        """Wait until every queued conversation row is committed."""
+        if self._conversation_log is None:
+            return True
+        return self._conversation_log.flush(timeout)
+    
     def get_conversation_history(self, session_id: str = None, 
                                limit: int = 100) -> List[Dict[str, Any]]:
         """Get conversation history."""
+        if self._conversation_log is not None and self._conversation_log.pending:
+            # Read-your-writes for rows still sitting in the queue
+            self._conversation_log.flush()
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                conn.row_factory = sqlite3.Row
+            # Conversations are not part of the knowledge snapshot
+            with self._reader_pool.connection() as conn:
                 cursor = conn.cursor()
                 
                 if session_id:
@@ -658,25 +1162,38 @@ class KnowledgeStore:
             logging.error(f"Error getting conversation history: {e}")
             return []
     
-    def cleanup_old_conversations(self, days: int = 30) -> int:
-        """Clean up old conversation logs."""
+    def cleanup_old_conversations(self, days: int = 30, bucket_hours: int = 24) -> int:
+        """
+        Clean up conversation logs older than `days`.
+        
+        Deletes oldest-first in `bucket_hours`-wide timestamp ranges, one short
+        transaction per bucket, so each DELETE is an index range scan on
+        idx_conversations_timestamp and never holds the write lock for long.
+        """
         try:
-            cutoff_date = datetime.now().replace(microsecond=0)
-            cutoff_date = cutoff_date.replace(day=cutoff_date.day - days)
+            cutoff = (datetime.now() - timedelta(days=days)).isoformat()
+            bucket = timedelta(hours=max(1, bucket_hours))
+            deleted_count = 0
+            with self._write_conn() as conn:
+                oldest = conn.execute("SELECT MIN(timestamp) FROM conversations").fetchone()[0]
+                start = oldest
+                while start is not None and start < cutoff:
+                    try:
+                        end = min((datetime.fromisoformat(start) + bucket).isoformat(), cutoff)
+                    except ValueError:
+                        # Unparseable timestamp: finish with a single range delete
+                        end = cutoff
+                    with conn:
+                        deleted_count += conn.execute(
+                            "DELETE FROM conversations WHERE timestamp >= ? AND timestamp < ?",
+                            (start, end),
+                        ).rowcount
+                    start = conn.execute(
+                        "SELECT MIN(timestamp) FROM conversations WHERE timestamp >= ?", (end,)
+                    ).fetchone()[0]
             
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                
-                cursor.execute("""
-                    DELETE FROM conversations 
-                    WHERE timestamp < ?
-                """, (cutoff_date.isoformat(),))
-                
-                deleted_count = cursor.rowcount
-                conn.commit()
-                
-                logging.info(f"Cleaned up {deleted_count} old conversation entries")
-                return deleted_count
+            logging.info(f"Cleaned up {deleted_count} old conversation entries")
+            return deleted_count
                 
         except Exception as e:
             logging.error(f"Error cleaning up conversations: {e}")
@@ -4,11 +4,12 @@ Learning mechanism for the Adaptive Chatbot
 
 import json
 import logging
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Optional, Tuple, Iterable
 from datetime import datetime
 import re
 
 from .knowledge_store import KnowledgeStore
+from .bulk_import import iter_knowledge_file
 import threading
 
 
@@ -22,48 +23,52 @@ class LearningManager:
         """Initialize the learning manager."""
         self.knowledge_store = knowledge_store
         self.pending_knowledge = []  # Knowledge waiting for validation
+        self._semantic_indexer = None  # Created lazily on first index update
+        self._indexer_lock = threading.Lock()
         
-    def import_knowledge_file(self, filepath: str, domain: str = "general") -> Tuple[int, int]:
+    def import_knowledge_file(self, filepath: str, domain: str = "general",
+                              fmt: Optional[str] = None) -> Tuple[int, int]:
         """
-        Import knowledge from a JSON file.
+        Import knowledge from a JSON, JSONL or CSV file.
+        
+        The file is streamed into KnowledgeStore.bulk_add_knowledge (see
+        import_records), so memory stays flat however large it is.
         
         Args:
-            filepath: Path to the JSON file
-            domain: Domain to assign to imported knowledge
+            filepath: Path to the file
+            domain: Domain for records that don't name one
+            fmt: 'json', 'jsonl' or 'csv' (default: from the extension)
             
         Returns:
             Tuple of (success_count, total_count)
         """
         try:
-            with open(filepath, 'r', encoding='utf-8') as f:
-                knowledge_list = json.load(f)
-            
-            success_count = 0
-            total_count = len(knowledge_list)
-            
-            for knowledge in knowledge_list:
-                # Ensure domain is set
-                knowledge['domain'] = knowledge.get('domain', domain)
-                knowledge['created_at'] = datetime.now().isoformat()
-                
-                if self.knowledge_store.add_knowledge(knowledge):
-                    success_count += 1
-                else:
-                    logging.warning(f"Failed to import: {knowledge.get('input', 'Unknown')}")
-            
-            logging.info(f"Imported {success_count}/{total_count} knowledge entries from {filepath}")
-            # Trigger background semantic index rebuild for this domain when any entries imported
-            if success_count > 0:
-                try:
-                    self._rebuild_semantic_index_async(domain)
-                except Exception as _:
-                    pass
-            return success_count, total_count
+            stats = self.import_records(iter_knowledge_file(filepath, fmt), domain=domain)
+            logging.info(f"Imported {stats['inserted']}/{stats['inserted'] + stats['skipped']} knowledge entries "
+                         f"from {filepath} ({stats['rows_per_sec']:.0f} rows/sec)")
+            return stats['inserted'], stats['inserted'] + stats['skipped']
             
         except Exception as e:
             logging.error(f"Error importing knowledge file: {e}")
             return 0, 0
     
+    def import_records(self, records: Iterable[Dict[str, Any]], domain: str = "general",
+                       chunk_size: int = 5000) -> Dict[str, Any]:
+        """
+        Bulk-load knowledge records and schedule one semantic index update per
+        imported domain.
+        
+        Returns:
+            KnowledgeStore.bulk_add_knowledge stats (inserted, skipped, rows_per_sec, ...)
+        """
+        stats = self.knowledge_store.bulk_add_knowledge(records, domain=domain, chunk_size=chunk_size)
+        for dom in stats['domains']:
+            try:
+                self._rebuild_semantic_index_async(dom)
+            except Exception as _:
+                pass
+        return stats
+    
     def teach_chatbot(self, user_input: str, expected_response: str, 
                      category: str = "learned", domain: str = "general", 
                      confidence: float = 1.0) -> bool:
@@ -355,19 +360,32 @@ class LearningManager:
         return False
 
     # -------------------- Semantic index integration --------------------
+    def _get_semantic_indexer(self):
+        """Return the shared debounced indexer (None if the semantic extras are missing)."""
+        if self._semantic_indexer is None:
+            with self._indexer_lock:
+                if self._semantic_indexer is None:
+                    # Lazy import to avoid hard dependency when user doesn't install extras
+                    from .semantic_index import BackgroundIndexer  # type: ignore
+                    self._semantic_indexer = BackgroundIndexer(self.knowledge_store.get_inputs_for_domain)
+        return self._semantic_indexer
+
     def _rebuild_semantic_index_async(self, domain: str) -> None:
-        """Rebuild semantic index for a domain in a background thread (best-effort)."""
-        t = threading.Thread(target=self._rebuild_semantic_index, args=(domain,), daemon=True)
-        t.start()
+        """Schedule a debounced, incremental index update for a domain (best-effort).
+
+        Requests for the same domain are coalesced, so a 500-item batch_teach
+        results in one background sync that only encodes the new rows.
+        """
+        try:
+            self._get_semantic_indexer().schedule(domain)
+        except Exception as e:
+            logging.debug(f"Semantic index update skipped for '{domain}': {e}")
 
     def _rebuild_semantic_index(self, domain: str) -> None:
         try:
-            # Lazy import to avoid hard dependency when user doesn't install extras
             from .semantic_index import SemanticIndex  # type: ignore
             si = SemanticIndex()
-            # Pull all inputs for the domain
-            items = self.knowledge_store.get_inputs_for_domain(domain)
-            if items:
-                si.build(items, domain)
+            # Pull all inputs for the domain; sync re-encodes only new/changed rows
+            si.sync(self.knowledge_store.get_inputs_for_domain(domain), domain)
         except Exception as e:
             logging.debug(f"Semantic index rebuild skipped/failed for '{domain}': {e}")
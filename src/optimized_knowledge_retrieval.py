@@ -33,7 +33,22 @@ try:
 except ImportError:
     SENTENCE_TRANSFORMERS_AVAILABLE = False
 
-from logger import log_info, log_error, log_warning
+try:
+    from logger import log_info, log_error, log_warning
+except ImportError:
+    def log_info(msg): print(f"INFO - {msg}")
+    def log_error(msg): print(f"ERROR - {msg}")
+    def log_warning(msg): print(f"WARNING - {msg}")
+
+try:
+    from embedding_store import get_embedding_store
+    EMBEDDING_STORE_AVAILABLE = True
+except ImportError:
+    try:
+        from .embedding_store import get_embedding_store
+        EMBEDDING_STORE_AVAILABLE = True
+    except ImportError:
+        EMBEDDING_STORE_AVAILABLE = False
 
 @dataclass
 class QueryResult:
@@ -169,11 +184,28 @@ class OptimizedKnowledgeRetrieval:
         self.embedding_model = None
         self._model_loading = False
         
+        # Persistent content-hash embedding store (survives restarts)
+        self.embedding_store = None
+        if EMBEDDING_STORE_AVAILABLE:
+            try:
+                self.embedding_store = get_embedding_store(embedding_model)
+            except Exception as e:
+                log_warning(f"Embedding store unavailable: {e}")
+        
         # FAISS index for vector search
         self.faiss_index = None
         self.knowledge_vectors = {}  # id -> vector mapping
         self.knowledge_entries = {}  # id -> KnowledgeEntry mapping
         
+        # Positional mirrors of the FAISS rows (row -> entry id, filter attributes)
+        # so hits map back in O(1) and filters run as NumPy masks
+        self._row_ids: List[str] = []
+        self._row_domain: List[int] = []
+        self._row_category: List[int] = []
+        self._row_importance: List[float] = []
+        self._attr_codes: Dict[str, Dict[Any, int]] = {'domain': {}, 'category': {}}
+        self._row_arrays: Optional[Dict[str, np.ndarray]] = None
+        
         # Threading
         self._executor = ThreadPoolExecutor(max_workers=max_workers)
         self._index_lock = threading.RLock()
@@ -377,10 +409,20 @@ class OptimizedKnowledgeRetrieval:
             # Generate embeddings for uncached texts
             new_embeddings = None
             if uncached_texts:
-                new_embeddings = await asyncio.get_event_loop().run_in_executor(
-                    self._executor,
-                    lambda: self.embedding_model.encode(uncached_texts, convert_to_numpy=True, show_progress_bar=False)
-                )
+                def encode(batch: List[str]) -> np.ndarray:
+                    return self.embedding_model.encode(batch, convert_to_numpy=True, show_progress_bar=False)
+                
+                if self.embedding_store is not None:
+                    # Only texts never embedded before reach the model
+                    new_embeddings = await asyncio.get_event_loop().run_in_executor(
+                        self._executor,
+                        lambda: self.embedding_store.get_or_encode(uncached_texts, encode)
+                    )
+                else:
+                    new_embeddings = await asyncio.get_event_loop().run_in_executor(
+                        self._executor,
+                        lambda: encode(uncached_texts)
+                    )
                 
                 # Cache new embeddings
                 for text, embedding, index in zip(uncached_texts, new_embeddings, uncached_indices):
@@ -432,6 +474,7 @@ class OptimizedKnowledgeRetrieval:
             
             # Store mapping
             self.knowledge_vectors = {entry_id: i for i, entry_id in enumerate(entry_ids)}
+            self._reset_rows(entry_ids)
             
             log_info(f"🚀 FAISS index built: {len(embeddings)} vectors, dimension {dimension}")
             
@@ -439,6 +482,60 @@ class OptimizedKnowledgeRetrieval:
             log_error(f"Failed to build FAISS index: {e}")
             self.faiss_index = None
     
+    # -------------------- FAISS row mirrors --------------------
+    def _attr_code(self, name: str, value: Any) -> int:
+        codes = self._attr_codes[name]
+        code = codes.get(value)
+        if code is None:
+            code = len(codes)
+            codes[value] = code
+        return code
+    
+    def _append_row(self, entry_id: str):
+        entry = self.knowledge_entries.get(entry_id)
+        metadata = (entry.metadata if entry else None) or {}
+        self._row_ids.append(entry_id)
+        self._row_domain.append(self._attr_code('domain', metadata.get('domain', 'general')))
+        self._row_category.append(self._attr_code('category', metadata.get('category')))
+        self._row_importance.append(entry.importance_score if entry else 0.0)
+        self._row_arrays = None
+    
+    def _reset_rows(self, entry_ids: List[str]):
+        self._row_ids = []
+        self._row_domain = []
+        self._row_category = []
+        self._row_importance = []
+        for entry_id in entry_ids:
+            self._append_row(entry_id)
+    
+    def _get_row_arrays(self) -> Dict[str, np.ndarray]:
+        # Materialized lazily; appends invalidate the cached arrays
+        arrays = self._row_arrays
+        if arrays is None:
+            arrays = {
+                'domain': np.asarray(self._row_domain, dtype=np.int32),
+                'category': np.asarray(self._row_category, dtype=np.int32),
+                'importance': np.asarray(self._row_importance, dtype=np.float32),
+            }
+            self._row_arrays = arrays
+        return arrays
+    
+    def _filter_mask(self, rows: np.ndarray, filters: Optional[Dict[str, Any]]) -> np.ndarray:
+        """Vectorized _apply_filters over FAISS rows"""
+        mask = np.ones(len(rows), dtype=bool)
+        if not filters:
+            return mask
+        arrays = self._get_row_arrays()
+        for key, value in filters.items():
+            if key in ('domain', 'category'):
+                code = self._attr_codes[key].get(value)
+                if code is None:
+                    return np.zeros(len(rows), dtype=bool)
+                mask &= arrays[key][rows] == code
+            elif key == 'min_importance':
+                mask &= arrays['importance'][rows] >= value
+        return mask
+    
     def _get_embedding_cache_key(self, text: str) -> str:
         """Generate cache key for embedding"""
         return hashlib.md5(f"{self.embedding_model_name}:{text}".encode()).hexdigest()
@@ -525,68 +622,43 @@ class OptimizedKnowledgeRetrieval:
             if query_embedding is None:
                 return []
             
-            query_vector = query_embedding[0].astype('float32')
-            
-            # Search FAISS index
-            with self._index_lock:
-                scores, indices = self.faiss_index.search(
-                    query_vector.reshape(1, -1), 
-                    min(top_k * 2, len(self.knowledge_entries))  # Get more candidates
-                )
+            query_vector = query_embedding[0].astype('float32').reshape(1, -1)
+            total_rows = len(self._row_ids)
+            if total_rows == 0:
+                return []
             
-            self.stats['faiss_searches'] += 1
+            # Expected filter pass rate sizes the first fetch; selective filters over-fetch more
+            selectivity = 1.0
+            if filters:
+                selectivity = float(self._filter_mask(np.arange(total_rows), filters).mean())
+                if selectivity == 0.0:
+                    return []
+            fetch = min(total_rows, int(np.ceil(top_k * 2 / selectivity)))
             
-            # Convert to results
             results = []
-            seen_responses = set()  # Avoid duplicate responses
-            
-            for score, idx in zip(scores[0], indices[0]):
-                if idx == -1:  # FAISS returns -1 for invalid indices
-                    continue
-                
-                # Get knowledge entry
-                entry_id = None
-                for eid, vector_idx in self.knowledge_vectors.items():
-                    if vector_idx == idx:
-                        entry_id = eid
-                        break
-                
-                if not entry_id or entry_id not in self.knowledge_entries:
-                    continue
+            while True:
+                # Search FAISS index
+                with self._index_lock:
+                    scores, indices = self.faiss_index.search(query_vector, fetch)
+                self.stats['faiss_searches'] += 1
+                results = self._collect_results(scores[0], indices[0], top_k, filters)
                 
-                entry = self.knowledge_entries[entry_id]
-                
-                # Apply filters
-                if filters and not self._apply_filters(entry, filters):
-                    continue
-                
-                # Check minimum similarity threshold
-                confidence = float(score)  # FAISS returns cosine similarity
-                if confidence < self.similarity_threshold:
-                    continue
-                
-                # Avoid duplicates
-                if entry.response_text in seen_responses:
-                    continue
-                seen_responses.add(entry.response_text)
-                
-                # Create result
-                result = QueryResult(
-                    text=entry.response_text,
-                    confidence=confidence,
-                    source_id=entry_id,
-                    metadata=entry.metadata or {},
-                    processing_time=0.0  # Will be set later
-                )
-                
-                results.append(result)
-                
-                # Update access statistics
-                entry.access_count += 1
-                entry.last_accessed = datetime.now()
-                
-                if len(results) >= top_k:
+                returned = int((indices[0] >= 0).sum())
+                exhausted = fetch >= total_rows or returned < fetch
+                # Hits come back best-first: once the tail drops below the threshold, stop
+                below_threshold = returned > 0 and scores[0][returned - 1] < self.similarity_threshold
+                if len(results) >= top_k or exhausted or below_threshold:
                     break
+                # Re-estimate the pass rate from this round and fetch enough for the rest
+                passed = max(len(results), 1)
+                fetch = min(total_rows, max(fetch * 2, int(np.ceil(fetch * top_k / passed))))
+            
+            # Update access statistics
+            now = datetime.now()
+            for result in results:
+                entry = self.knowledge_entries[result.source_id]
+                entry.access_count += 1
+                entry.last_accessed = now
             
             return results
             
@@ -594,6 +666,43 @@ class OptimizedKnowledgeRetrieval:
             log_error(f"Semantic search failed: {e}")
             return []
     
+    def _collect_results(self,
+                         scores: np.ndarray,
+                         indices: np.ndarray,
+                         top_k: int,
+                         filters: Dict[str, Any] = None) -> List[QueryResult]:
+        """Map FAISS hits to results: threshold and filters as masks, then dedupe by response"""
+        # FAISS returns -1 for invalid indices; confidence is the cosine similarity
+        mask = (indices >= 0) & (indices < len(self._row_ids)) & (scores >= self.similarity_threshold)
+        rows = indices[mask]
+        row_scores = scores[mask]
+        if filters and len(rows):
+            keep = self._filter_mask(rows, filters)
+            rows = rows[keep]
+            row_scores = row_scores[keep]
+        
+        results = []
+        seen_responses = set()  # Avoid duplicate responses
+        for row, score in zip(rows.tolist(), row_scores.tolist()):
+            entry_id = self._row_ids[row]
+            entry = self.knowledge_entries.get(entry_id)
+            if entry is None:
+                continue
+            if entry.response_text in seen_responses:
+                continue
+            seen_responses.add(entry.response_text)
+            
+            results.append(QueryResult(
+                text=entry.response_text,
+                confidence=score,
+                source_id=entry_id,
+                metadata=entry.metadata or {},
+                processing_time=0.0  # Will be set later
+            ))
+            if len(results) >= top_k:
+                break
+        return results
+    
     async def _fulltext_search(self, query: str, top_k: int, filters: Dict[str, Any] = None) -> List[QueryResult]:
         """Perform full-text search using SQLite FTS"""
         
@@ -795,6 +904,7 @@ class OptimizedKnowledgeRetrieval:
                 current_size = self.faiss_index.ntotal
                 self.faiss_index.add(embedding.reshape(1, -1).astype('float32'))
                 self.knowledge_vectors[entry_id] = current_size
+                self._append_row(entry_id)
                 
         except Exception as e:
             log_error(f"Failed to add to FAISS index: {e}")
@@ -861,6 +971,7 @@ class OptimizedKnowledgeRetrieval:
         # Clear memory structures
         self.knowledge_entries.clear()
         self.knowledge_vectors.clear()
+        self._reset_rows([])
         
         log_info("✅ Knowledge retrieval cleanup completed")
 
@@ -0,0 +1,409 @@
+#!/usr/bin/env python3
+"""
+Two-tier response cache for /chat.
+
+Entries are keyed by (normalize_hindi_query(message), domain). Tier 1 is an
+in-process LRU; tier 2 is an optional SQLite file shared by all uvicorn
+workers on the host. KnowledgeStore change events drop only the entries a
+write can affect:
+
+- add: entries for the same domain (or no domain) sharing a content word or
+  trigram with the new row's input/response - the FTS match condition, fillers
+  like 'ka' ignored - plus entries
+  answered by the semantic index or the fallback reply in that domain
+- delete / metadata update: entries whose answer came from that row
+- bulk import: every entry in the imported domains (and entries with no domain)
+
+Invalidations are also appended to a log in the shared tier; a background
+thread in each worker applies the others' entries every `sync_interval`
+seconds, so get() stays a pure in-memory lookup. Answers are only
+written to the shared tier if the log has not moved since they were computed.
+"""
+
+from __future__ import annotations
+import json
+import re
+import time
+import uuid
+import logging
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, FrozenSet, Optional, Tuple
+
+from .database_optimizer import ThreadLocalConnectionPool
+from .knowledge_store import QUERY_FILLER_WORDS
+
+try:
+    from nlp.processing.hindi_transliterator import normalize_hindi_query
+    NORMALIZER_AVAILABLE = True
+except Exception:
+    NORMALIZER_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+CacheKey = Tuple[str, Optional[str]]
+
+_WORD_RE = re.compile(r'\w+', re.UNICODE)
+
+SHARED_CACHE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA busy_timeout=2000",
+)
+
+
+def _normalize(message: str) -> str:
+    if NORMALIZER_AVAILABLE:
+        return normalize_hindi_query(message)
+    return ' '.join(message.lower().split())
+
+
+def _query_words(*texts: str) -> FrozenSet[str]:
+    # Terms a new row must contain to be found by search_fulltext: short words
+    # as-is, longer words as the trigrams the fuzzy (trigram FTS) pass matches on.
+    # Fillers ('ka', 'hai', ...) are skipped like in its AND and fuzzy passes;
+    # nearly every row contains them, so they would match every add.
+    terms = set()
+    for t in texts:
+        words = _WORD_RE.findall(t.lower())
+        for w in [w for w in words if w not in QUERY_FILLER_WORDS] or words:
+            if len(w) <= 3:
+                if len(w) > 1:
+                    terms.add(w)
+            else:
+                terms.update(w[i:i + 3] for i in range(len(w) - 2))
+    return frozenset(terms)
+
+
+@dataclass(frozen=True)
+class CachedResponse:
+    reply: str
+    source: str
+    knowledge_id: Optional[int]
+    domain: Optional[str]
+    words: FrozenSet[str]
+
+    def affected_by_add(self, domain: Optional[str], text: str) -> bool:
+        """Could a new row (domain, lowercased input+response) change this answer?"""
+        if self.domain is not None and domain != self.domain:
+            return False
+        if self.source not in ('fts', 'like'):
+            # Semantic/fallback answers can be displaced by any row in the domain
+            return True
+        return any(w in text for w in self.words)
+
+
+class ResponseCache:
+    """In-process LRU with an optional shared SQLite tier."""
+
+    def __init__(self,
+                 max_entries: int = 1024,
+                 shared_path: Optional[str] = None,
+                 max_shared_entries: int = 50000,
+                 sync_interval: float = 0.5,
+                 log_retention: float = 3600.0):
+        self.max_entries = max_entries
+        self.max_shared_entries = max_shared_entries
+        self.sync_interval = sync_interval
+        self.log_retention = log_retention
+        self._lru: "OrderedDict[CacheKey, CachedResponse]" = OrderedDict()
+        self._lock = threading.Lock()
+        # Bumped on every invalidation; puts computed under an older generation are dropped
+        self.generation = 0
+        self.stats = {'hits': 0, 'shared_hits': 0, 'misses': 0, 'evictions': 0,
+                      'shared_evictions': 0, 'invalidations': 0}
+
+        self._origin = uuid.uuid4().hex
+        self._last_seq = 0
+        self._sync_stop = threading.Event()
+        self._sync_thread: Optional[threading.Thread] = None
+        self._shared: Optional[ThreadLocalConnectionPool] = None
+        if shared_path:
+            try:
+                self._shared = ThreadLocalConnectionPool(shared_path, pragmas=SHARED_CACHE_PRAGMAS)
+                self._init_shared()
+            except Exception as e:
+                logger.warning(f"Shared response cache disabled ({shared_path}): {e}")
+                self._shared = None
+        if self._shared is not None and sync_interval > 0:
+            # sync_interval <= 0: no thread, the owner calls sync_remote() itself
+            self._sync_thread = threading.Thread(target=self._sync_loop, name="response-cache-sync", daemon=True)
+            self._sync_thread.start()
+
+    # -------------------- Shared tier --------------------
+    def _init_shared(self) -> None:
+        with self._shared.connection() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS responses (
+                    norm TEXT NOT NULL,
+                    domain TEXT NOT NULL,
+                    reply TEXT NOT NULL,
+                    source TEXT NOT NULL,
+                    knowledge_id INTEGER,
+                    words TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    PRIMARY KEY (norm, domain)
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_kid ON responses(knowledge_id)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_created ON responses(created_at)")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS invalidations (
+                    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                    origin TEXT NOT NULL,
+                    kind TEXT NOT NULL,
+                    knowledge_id INTEGER,
+                    domain TEXT,
+                    text TEXT,
+                    created_at REAL NOT NULL
+                )
+            """)
+            conn.commit()
+            self._last_seq = self._max_seq(conn)
+
+    @staticmethod
+    def _max_seq(conn: Any) -> int:
+        row = conn.execute("SELECT MAX(seq) FROM invalidations").fetchone()
+        return int(row[0] or 0)
+
+    def shared_seq(self) -> Optional[int]:
+        """Latest shared invalidation seq; take it before computing an answer and pass it to put()."""
+        if self._shared is None:
+            return None
+        try:
+            with self._shared.connection() as conn:
+                return self._max_seq(conn)
+        except Exception as e:
+            logger.debug(f"Shared response cache read failed: {e}")
+            return None
+
+    @staticmethod
+    def _shared_domain(domain: Optional[str]) -> str:
+        # NULLs are distinct in a PRIMARY KEY, so "no domain" is stored as ''
+        return domain or ''
+
+    def _sync_loop(self) -> None:
+        while not self._sync_stop.wait(self.sync_interval):
+            self.sync_remote()
+
+    def sync_remote(self) -> None:
+        """Apply invalidations logged by other workers since the last sync (blocking SQLite read)."""
+        if self._shared is None:
+            return
+        try:
+            with self._shared.connection() as conn:
+                rows = conn.execute(
+                    "SELECT seq, kind, knowledge_id, domain, text FROM invalidations "
+                    "WHERE seq > ? AND origin != ? ORDER BY seq",
+                    (self._last_seq, self._origin),
+                ).fetchall()
+                if not rows:
+                    self._last_seq = max(self._last_seq, self._max_seq(conn))
+                    return
+        except Exception as e:
+            logger.debug(f"Response cache sync failed: {e}")
+            return
+        for row in rows:
+            if row['kind'] == 'add':
+                self._drop_local(lambda e: e.affected_by_add(row['domain'], row['text'] or ''))
+            elif row['kind'] == 'domain':
+                self._drop_local(lambda e: e.domain is None or e.domain == row['domain'])
+            else:
+                kid = row['knowledge_id']
+                self._drop_local(lambda e: e.knowledge_id == kid)
+            self._last_seq = row['seq']
+
+    # -------------------- Lookups --------------------
+    def make_key(self, message: str, domain: Optional[str]) -> CacheKey:
+        return (_normalize(message), domain)
+
+    def get(self, key: CacheKey) -> Optional[CachedResponse]:
+        """In-process lookup; no I/O, so it is safe on the event loop."""
+        with self._lock:
+            entry = self._lru.get(key)
+            if entry is not None:
+                self._lru.move_to_end(key)
+                self.stats['hits'] += 1
+            return entry
+
+    def get_shared(self, key: CacheKey) -> Optional[CachedResponse]:
+        """Shared-tier lookup; counts a miss when neither tier has the key."""
+        if self._shared is not None:
+            try:
+                with self._shared.connection() as conn:
+                    row = conn.execute(
+                        "SELECT reply, source, knowledge_id, words FROM responses WHERE norm = ? AND domain = ?",
+                        (key[0], self._shared_domain(key[1])),
+                    ).fetchone()
+            except Exception as e:
+                logger.debug(f"Shared response cache read failed: {e}")
+                row = None
+            if row is not None:
+                entry = CachedResponse(reply=row['reply'], source=row['source'],
+                                       knowledge_id=row['knowledge_id'], domain=key[1],
+                                       words=frozenset(json.loads(row['words'])))
+                self._put_local(key, entry)
+                self.stats['shared_hits'] += 1
+                return entry
+        self.stats['misses'] += 1
+        return None
+
+    def put(self,
+            key: CacheKey,
+            message: str,
+            reply: str,
+            source: str,
+            knowledge_id: Optional[int],
+            generation: int,
+            shared_seq: Optional[int] = None) -> None:
+        """
+        Store an answer computed while `generation` (and shared invalidation
+        `shared_seq`, from shared_seq()) was current. The answer is dropped if
+        this process or any worker sharing the tier invalidated since then.
+        """
+        if generation != self.generation:
+            return
+        entry = CachedResponse(reply=reply, source=source, knowledge_id=knowledge_id,
+                               domain=key[1], words=_query_words(message, key[0]))
+        if self._shared is not None and not self._put_shared(key, entry, shared_seq):
+            return
+        self._put_local(key, entry, generation)
+
+    def _put_shared(self, key: CacheKey, entry: CachedResponse, shared_seq: Optional[int]) -> bool:
+        """Insert into the shared tier; False if the invalidation log moved past shared_seq."""
+        try:
+            with self._shared.connection() as conn:
+                # Hold the write lock across the check and the insert: invalidations
+                # are logged under the same lock, so none can slip in between
+                conn.execute("BEGIN IMMEDIATE")
+                if shared_seq is not None and self._max_seq(conn) != shared_seq:
+                    return False
+                conn.execute(
+                    "INSERT OR REPLACE INTO responses (norm, domain, reply, source, knowledge_id, words, created_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (key[0], self._shared_domain(key[1]), entry.reply, entry.source, entry.knowledge_id,
+                     json.dumps(sorted(entry.words)), time.time()),
+                )
+                # FIFO bound on the shared tier
+                excess = conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0] - self.max_shared_entries
+                if excess > 0:
+                    conn.execute("DELETE FROM responses WHERE rowid IN "
+                                 "(SELECT rowid FROM responses ORDER BY created_at LIMIT ?)", (excess,))
+                    self.stats['shared_evictions'] += excess
+        except Exception as e:
+            logger.debug(f"Shared response cache write failed: {e}")
+        return True
+
+    def _put_local(self, key: CacheKey, entry: CachedResponse, generation: Optional[int] = None) -> None:
+        with self._lock:
+            # Re-checked under the lock: an invalidation may have run since put() first checked
+            if generation is not None and generation != self.generation:
+                return
+            self._lru[key] = entry
+            self._lru.move_to_end(key)
+            while len(self._lru) > self.max_entries:
+                self._lru.popitem(last=False)
+                self.stats['evictions'] += 1
+
+    # -------------------- Invalidation --------------------
+    def _drop_local(self, predicate: Callable[[CachedResponse], bool]) -> int:
+        with self._lock:
+            stale = [k for k, e in self._lru.items() if predicate(e)]
+            for k in stale:
+                del self._lru[k]
+            self.generation += 1
+            self.stats['invalidations'] += len(stale)
+            return len(stale)
+
+    def _log_invalidation(self, conn: Any, kind: str, knowledge_id: Optional[int],
+                          domain: Optional[str], text: Optional[str]) -> None:
+        now = time.time()
+        conn.execute(
+            "INSERT INTO invalidations (origin, kind, knowledge_id, domain, text, created_at) VALUES (?, ?, ?, ?, ?, ?)",
+            (self._origin, kind, knowledge_id, domain, text, now),
+        )
+        conn.execute("DELETE FROM invalidations WHERE created_at < ?", (now - self.log_retention,))
+
+    def invalidate_added(self, domain: Optional[str], input_text: str, response_text: str) -> None:
+        """Drop entries a newly added (or replaced) row could answer differently."""
+        text = f"{input_text}\n{response_text}".lower()
+        self._drop_local(lambda e: e.affected_by_add(domain, text))
+        if self._shared is None:
+            return
+        try:
+            with self._shared.connection() as conn:
+                rows = conn.execute(
+                    "SELECT norm, domain, source, words FROM responses WHERE domain IN (?, '')",
+                    (self._shared_domain(domain),),
+                ).fetchall()
+                stale = []
+                for r in rows:
+                    entry = CachedResponse(reply='', source=r['source'], knowledge_id=None,
+                                           domain=r['domain'] or None, words=frozenset(json.loads(r['words'])))
+                    if entry.affected_by_add(domain, text):
+                        stale.append((r['norm'], r['domain']))
+                conn.executemany("DELETE FROM responses WHERE norm = ? AND domain = ?", stale)
+                self._log_invalidation(conn, 'add', None, domain, text)
+                conn.commit()
+        except Exception as e:
+            logger.warning(f"Shared response cache invalidation failed: {e}")
+
+    def invalidate_row(self, knowledge_id: int) -> None:
+        """Drop entries answered by knowledge_id (deleted or updated row)."""
+        self._drop_local(lambda e: e.knowledge_id == knowledge_id)
+        if self._shared is None:
+            return
+        try:
+            with self._shared.connection() as conn:
+                conn.execute("DELETE FROM responses WHERE knowledge_id = ?", (knowledge_id,))
+                self._log_invalidation(conn, 'row', knowledge_id, None, None)
+                conn.commit()
+        except Exception as e:
+            logger.warning(f"Shared response cache invalidation failed: {e}")
+
+    def invalidate_domain(self, domain: Optional[str]) -> None:
+        """Drop every entry a bulk load into domain could affect."""
+        self._drop_local(lambda e: e.domain is None or e.domain == domain)
+        if self._shared is None:
+            return
+        try:
+            with self._shared.connection() as conn:
+                conn.execute("DELETE FROM responses WHERE domain IN (?, '')", (self._shared_domain(domain),))
+                self._log_invalidation(conn, 'domain', None, domain, None)
+                conn.commit()
+        except Exception as e:
+            logger.warning(f"Shared response cache invalidation failed: {e}")
+
+    def on_knowledge_change(self, event: str, row: Dict[str, Any]) -> None:
+        """KnowledgeStore change listener."""
+        if event == 'add':
+            self.invalidate_added(row.get('domain'), row.get('input') or '', row.get('response') or '')
+        elif event == 'bulk':
+            for domain in row.get('domains') or ():
+                self.invalidate_domain(domain)
+        elif row.get('id') is not None:
+            self.invalidate_row(int(row['id']))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._lru.clear()
+            self.generation += 1
+
+    def close(self) -> None:
+        self._sync_stop.set()
+        if self._sync_thread is not None:
+            self._sync_thread.join(timeout=5)
+        if self._shared is not None:
+            self._shared.close_all()
+
+    def get_stats(self) -> Dict[str, Any]:
+        lookups = self.stats['hits'] + self.stats['shared_hits'] + self.stats['misses']
+        hits = self.stats['hits'] + self.stats['shared_hits']
+        return {
+            **self.stats,
+            'entries': len(self._lru),
+            'max_entries': self.max_entries,
+            'shared': self._shared is not None,
+            'hit_rate': round(hits / lookups, 4) if lookups else 0.0,
+        }
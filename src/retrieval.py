@@ -4,12 +4,12 @@ Hybrid retrieval orchestrator: FTS5 first, then semantic (hnswlib) fallback.
 """
 from __future__ import annotations
 import logging
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Sequence, Union
 
 from .knowledge_store import KnowledgeStore
 
 try:
-    from .semantic_index import SemanticIndex
+    from .semantic_index import get_semantic_index_pool
     SEM_AVAILABLE = True
 except Exception:
     SEM_AVAILABLE = False
@@ -17,60 +17,119 @@ except Exception:
 logger = logging.getLogger(__name__)
 
 
-def hybrid_search(ks: KnowledgeStore,
-                  query: str,
-                  domain: Optional[str] = None,
-                  top_k: int = 5,
-                  min_semantic_similarity: float = 0.65) -> List[Dict[str, Any]]:
-    """
-    Perform hybrid search: FTS5 first, then semantic fallback (if available).
-    Returns a list of knowledge rows (dicts). Adds `_source` and `_score` keys.
-    """
-    # 1) FTS first
-    fts = ks.search_fulltext(query, domain=domain, limit=top_k)
+def _fts_rows(ks: KnowledgeStore, query: str, domain: Optional[str], limit: int) -> List[Dict[str, Any]]:
     results: List[Dict[str, Any]] = []
-    for row in fts:
+    for row in ks.search_fulltext(query, domain=domain, limit=limit):
         row_copy = dict(row)
         row_copy['_source'] = 'fts'
         row_copy['_score'] = None
         results.append(row_copy)
-    if len(results) >= top_k:
+    return results
+
+
+def semantic_search_batch(ks: KnowledgeStore,
+                          queries: Sequence[str],
+                          domains: Sequence[Optional[str]],
+                          top_k: int = 5,
+                          min_semantic_similarity: Union[float, Sequence[float]] = 0.65
+                          ) -> List[List[Dict[str, Any]]]:
+    """
+    Semantic lookup for many queries with a single embedding batch.
+    Returns one list of knowledge rows (with `_source`/`_score`) per query;
+    lists are empty when the semantic index is unavailable.
+    """
+    out: List[List[Dict[str, Any]]] = [[] for _ in queries]
+    if not SEM_AVAILABLE or not queries:
+        return out
+    if isinstance(min_semantic_similarity, (int, float)):
+        thresholds = [float(min_semantic_similarity)] * len(queries)
+    else:
+        thresholds = list(min_semantic_similarity)
+    # Resident pool: index + model stay loaded, rebuilds are hot-swapped
+    pool = get_semantic_index_pool()
+    if not pool.available():
+        return out
+    sem = pool.search_batch(list(queries), [d or 'general' for d in domains], top_k=top_k)
+    for i, hits in enumerate(sem):
+        for kid, sim in hits:
+            if sim < thresholds[i]:
+                continue
+            row = ks.get_knowledge_by_id(kid)
+            if row:
+                row['_source'] = 'semantic'
+                row['_score'] = sim
+                out[i].append(row)
+    return out
+
+
+def _merge_results(results: List[Dict[str, Any]], top_k: int) -> List[Dict[str, Any]]:
+    # Deduplicate by id, keep best
+    seen: Dict[Any, Dict[str, Any]] = {}
+    for r in results:
+        rid = r.get('id')
+        if rid in seen:
+            # Keep fts over semantic or higher score
+            prev = seen[rid]
+            if prev.get('_source') == 'semantic' and r.get('_source') == 'fts':
+                seen[rid] = r
+            elif (r.get('_score') or 0) > (prev.get('_score') or 0):
+                seen[rid] = r
+        else:
+            seen[rid] = r
+    deduped = list(seen.values())
+    # Sort: fts first, then semantic by score desc
+    deduped.sort(key=lambda x: (0 if x.get('_source') == 'fts' else 1, -(x.get('_score') or 0)))
+    return deduped[:top_k]
+
+
+def hybrid_search_batch(ks: KnowledgeStore,
+                        queries: Sequence[str],
+                        domains: Optional[Sequence[Optional[str]]] = None,
+                        top_k: int = 5,
+                        min_semantic_similarity: Union[float, Sequence[float]] = 0.65
+                        ) -> List[List[Dict[str, Any]]]:
+    """
+    Hybrid search for many queries. Each query gets one FTS pass on the
+    calling thread's pooled connection; queries that FTS cannot fill are
+    sent to the semantic index together so they share one encode batch.
+    """
+    if domains is None:
+        domains = [None] * len(queries)
+    if isinstance(min_semantic_similarity, (int, float)):
+        thresholds = [float(min_semantic_similarity)] * len(queries)
+    else:
+        thresholds = list(min_semantic_similarity)
+
+    # 1) FTS first
+    results = [_fts_rows(ks, q, d, top_k) for q, d in zip(queries, domains)]
+    pending = [i for i, rows in enumerate(results) if len(rows) < top_k]
+    if not pending:
         return results
 
     # 2) Semantic fallback
-    if SEM_AVAILABLE:
-        try:
-            si = SemanticIndex()
-            if si.available():
-                sem = si.search(query, domain or 'general', top_k=top_k)
-                # Filter by similarity threshold and fetch rows
-                for kid, sim in sem:
-                    if sim < min_semantic_similarity:
-                        continue
-                    row = ks.get_knowledge_by_id(kid)
-                    if row:
-                        row['_source'] = 'semantic'
-                        row['_score'] = sim
-                        results.append(row)
-                # Deduplicate by id, keep best
-                seen = {}
-                deduped: List[Dict[str, Any]] = []
-                for r in results:
-                    rid = r.get('id')
-                    if rid in seen:
-                        # Keep fts over semantic or higher score
-                        prev = seen[rid]
-                        if prev.get('_source') == 'semantic' and r.get('_source') == 'fts':
-                            seen[rid] = r
-                        elif r.get('_score', 0) > prev.get('_score', 0):
-                            seen[rid] = r
-                    else:
-                        seen[rid] = r
-                deduped = list(seen.values())
-                # Sort: fts first, then semantic by score desc
-                deduped.sort(key=lambda x: (0 if x.get('_source') == 'fts' else 1, -(x.get('_score') or 0)))
-                return deduped[:top_k]
-        except Exception as e:
-            logger.warning(f"Semantic fallback failed: {e}")
+    try:
+        sem = semantic_search_batch(ks,
+                                    [queries[i] for i in pending],
+                                    [domains[i] for i in pending],
+                                    top_k=top_k,
+                                    min_semantic_similarity=[thresholds[i] for i in pending])
+    except Exception as e:
+        logger.warning(f"Semantic fallback failed: {e}")
+        return [rows[:top_k] for rows in results]
+    for i, rows in zip(pending, sem):
+        if rows:
+            results[i] = _merge_results(results[i] + rows, top_k)
+    return results
 
-    return results[:top_k]
+
+def hybrid_search(ks: KnowledgeStore,
+                  query: str,
+                  domain: Optional[str] = None,
+                  top_k: int = 5,
+                  min_semantic_similarity: float = 0.65) -> List[Dict[str, Any]]:
+    """
+    Perform hybrid search: FTS5 first, then semantic fallback (if available).
+    Returns a list of knowledge rows (dicts). Adds `_source` and `_score` keys.
+    """
+    return hybrid_search_batch(ks, [query], [domain], top_k=top_k,
+                               min_semantic_similarity=min_semantic_similarity)[0]
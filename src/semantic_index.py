@@ -2,14 +2,21 @@
 """
 Optional Semantic Index using hnswlib for fast vector search on Windows.
 Falls back gracefully if hnswlib or sentence-transformers are unavailable.
+
+Serving code should go through `get_semantic_index_pool()`, which keeps each
+domain's index and the embedding model resident and hot-swaps rebuilt indexes.
 """
 
 from __future__ import annotations
 import os
 import json
+import time
+import hashlib
 import logging
+import threading
+from dataclasses import dataclass
 from pathlib import Path
-from typing import List, Tuple, Optional, Dict
+from typing import Any, Callable, List, Tuple, Optional, Dict, Sequence
 
 try:
     import hnswlib  # type: ignore
@@ -25,8 +32,40 @@ except Exception:
 
 import numpy as np
 
+try:
+    from .embedding_store import get_embedding_store
+    EMBEDDING_STORE_AVAILABLE = True
+except Exception:
+    EMBEDDING_STORE_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
+# Embedding models are large; share one instance per model name across the process
+_models: Dict[str, Any] = {}
+_models_lock = threading.Lock()
+
+
+def _get_model(model_name: str) -> Any:
+    """Return the process-wide SentenceTransformer for model_name (loaded once)."""
+    if not ST_AVAILABLE:
+        raise RuntimeError("sentence-transformers not available. Install it to use semantic index.")
+    model = _models.get(model_name)
+    if model is None:
+        with _models_lock:
+            model = _models.get(model_name)
+            if model is None:
+                logger.info(f"Loading embedding model: {model_name}")
+                model = SentenceTransformer(model_name)
+                _models[model_name] = model
+    return model
+
+
+def _write_json_atomic(path: Path, data: Dict[str, Any]) -> None:
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+    os.replace(tmp, path)
+
 
 class SemanticIndex:
     """Lightweight semantic index wrapper using hnswlib + sentence-transformers."""
@@ -36,22 +75,23 @@ class SemanticIndex:
                  model_name: str = "all-MiniLM-L6-v2",
                  ef_search: int = 64,
                  M: int = 32,
-                 ef_construction: int = 200):
+                 ef_construction: int = 200,
+                 use_embedding_store: bool = True,
+                 embedding_dir: str = "data/embeddings"):
         self.base_dir = Path(base_dir)
         self.model_name = model_name
         self.ef_search = ef_search
         self.M = M
         self.ef_construction = ef_construction
+        self.use_embedding_store = use_embedding_store and EMBEDDING_STORE_AVAILABLE
+        self.embedding_dir = embedding_dir
         self.model: Optional[SentenceTransformer] = None
         if not self.base_dir.exists():
             self.base_dir.mkdir(parents=True, exist_ok=True)
 
     def _ensure_model(self) -> None:
-        if not ST_AVAILABLE:
-            raise RuntimeError("sentence-transformers not available. Install it to use semantic index.")
         if self.model is None:
-            logger.info(f"Loading embedding model: {self.model_name}")
-            self.model = SentenceTransformer(self.model_name)
+            self.model = _get_model(self.model_name)
 
     def _domain_paths(self, domain: str) -> Tuple[Path, Path, Path]:
         ddir = self.base_dir / domain
@@ -63,6 +103,44 @@ class SemanticIndex:
     def available(self) -> bool:
         return HNSW_AVAILABLE and ST_AVAILABLE
 
+    def _read_meta(self, domain: str) -> Dict[str, Any]:
+        _, meta_path, _ = self._domain_paths(domain)
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                return json.load(f) or {}
+        except Exception:
+            return {}
+
+    def _read_hashes(self, domain: str) -> Dict[int, str]:
+        """Return {id: text hash} for the rows currently live in the domain index."""
+        _, _, map_path = self._domain_paths(domain)
+        try:
+            with open(map_path, 'r', encoding='utf-8') as f:
+                data = json.load(f) or {}
+            return {int(k): v for k, v in (data.get('hashes') or {}).items()}
+        except Exception:
+            return {}
+
+    @staticmethod
+    def _text_hash(text: str) -> str:
+        return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+    def _encode_raw(self, texts: List[str]) -> np.ndarray:
+        self._ensure_model()
+        return self.model.encode(texts, batch_size=64, convert_to_numpy=True, show_progress_bar=False)
+
+    def _encode(self, texts: List[str]) -> np.ndarray:
+        """Encode texts into L2-normalized float32 vectors (reusing stored embeddings)."""
+        if self.use_embedding_store:
+            # Model is only loaded if some text has never been embedded before
+            embs = get_embedding_store(self.model_name, self.embedding_dir).get_or_encode(texts, self._encode_raw)
+        else:
+            embs = self._encode_raw(texts)
+        embs = np.asarray(embs, dtype=np.float32)
+        # Normalize for cosine similarity
+        norms = np.linalg.norm(embs, axis=1, keepdims=True) + 1e-10
+        return embs / norms
+
     def build(self, items: List[Tuple[int, str]], domain: str) -> bool:
         """Build or rebuild index for domain from (id, text) items."""
         if not HNSW_AVAILABLE:
@@ -71,41 +149,144 @@ class SemanticIndex:
         if not items:
             logger.info(f"No items to index for domain '{domain}'.")
             return False
-        self._ensure_model()
         ids = [i for i, _ in items]
         texts = [t for _, t in items]
-        # Compute embeddings
-        embs = self.model.encode(texts, batch_size=64, convert_to_numpy=True, show_progress_bar=False)
-        # Normalize for cosine similarity
-        norms = np.linalg.norm(embs, axis=1, keepdims=True) + 1e-10
-        embs = embs / norms
+        embs = self._encode(texts)
         dim = embs.shape[1]
 
-        # Prepare paths
-        index_path, meta_path, map_path = self._domain_paths(domain)
-        index_path.parent.mkdir(parents=True, exist_ok=True)
-
         # Create index
         p = hnswlib.Index(space='cosine', dim=dim)
         p.init_index(max_elements=len(ids), ef_construction=self.ef_construction, M=self.M)
         p.add_items(embs, ids)
         p.set_ef(self.ef_search)
-        # Save
-        p.save_index(str(index_path))
-        with open(meta_path, 'w', encoding='utf-8') as f:
-            json.dump({
-                'dim': dim,
-                'ef_search': self.ef_search,
-                'M': self.M,
-                'ef_construction': self.ef_construction,
-                'model_name': self.model_name,
-                'count': len(ids)
-            }, f, ensure_ascii=False, indent=2)
-        with open(map_path, 'w', encoding='utf-8') as f:
-            json.dump({'ids': ids}, f, ensure_ascii=False)
+        hashes = {i: self._text_hash(t) for i, t in items}
+        self._save(domain, p, dim, hashes)
         logger.info(f"Built semantic index for domain '{domain}' with {len(ids)} items.")
         return True
 
+    def _save(self, domain: str, p: Any, dim: int, hashes: Dict[int, str]) -> int:
+        """Persist index, mapping and meta; returns the new generation."""
+        index_path, meta_path, map_path = self._domain_paths(domain)
+        index_path.parent.mkdir(parents=True, exist_ok=True)
+        # Save via temp files + rename so resident readers never see a half-written index.
+        # meta.json is replaced last: its mtime/generation is what the pool watches.
+        generation = int(self._read_meta(domain).get('generation', 0)) + 1
+        tmp_index = index_path.with_suffix(".bin.tmp")
+        p.save_index(str(tmp_index))
+        os.replace(tmp_index, index_path)
+        tmp_map = map_path.with_suffix(".json.tmp")
+        with open(tmp_map, 'w', encoding='utf-8') as f:
+            json.dump({'ids': sorted(hashes), 'hashes': {str(k): v for k, v in hashes.items()}}, f, ensure_ascii=False)
+        os.replace(tmp_map, map_path)
+        _write_json_atomic(meta_path, {
+            'dim': dim,
+            'ef_search': self.ef_search,
+            'M': self.M,
+            'ef_construction': self.ef_construction,
+            'model_name': self.model_name,
+            'count': len(hashes),
+            'max_elements': int(p.get_max_elements()),
+            'generation': generation,
+        })
+        _notify_pools(self.base_dir, domain)
+        return generation
+
+    def _open_for_update(self, domain: str) -> Optional[Tuple[Any, int, Dict[int, str]]]:
+        """Load a private, writable copy of the domain index (None if it must be rebuilt)."""
+        meta = self._read_meta(domain)
+        if meta.get('model_name', self.model_name) != self.model_name:
+            return None
+        _, _, map_path = self._domain_paths(domain)
+        if not map_path.exists():
+            return None
+        hashes = self._read_hashes(domain)
+        if not hashes and int(meta.get('count', -1)) != 0:
+            # Indexes written before per-row hashes were tracked can't be diffed
+            return None
+        p = self._load_index(domain)
+        if p is None:
+            return None
+        return p, int(meta.get('dim', 384)), hashes
+
+    @staticmethod
+    def resize_index(p: Any, required: int) -> None:
+        """Grow index capacity geometrically so repeated adds don't resize every time."""
+        capacity = int(p.get_max_elements())
+        if required > capacity:
+            p.resize_index(max(required, int(capacity * 1.5) + 16))
+
+    def add_items(self, items: List[Tuple[int, str]], domain: str) -> bool:
+        """Add or update (id, text) items in the domain index, encoding only those rows."""
+        return self.apply_changes(domain, upserts=items, deletes=[])
+
+    def mark_deleted(self, ids: List[int], domain: str) -> bool:
+        """Remove ids from the domain index without rebuilding it."""
+        return self.apply_changes(domain, upserts=[], deletes=ids)
+
+    def apply_changes(self, domain: str,
+                      upserts: List[Tuple[int, str]],
+                      deletes: List[int]) -> bool:
+        """Apply incremental upserts/deletes; falls back to a full build when no index exists."""
+        if not HNSW_AVAILABLE:
+            return False
+        opened = self._open_for_update(domain)
+        if opened is None:
+            index_path, _, _ = self._domain_paths(domain)
+            if upserts and not index_path.exists():
+                return self.build(list(upserts), domain)
+            logger.info(f"Semantic index for '{domain}' can't be updated incrementally; full rebuild required.")
+            return False
+        p, dim, hashes = opened
+        changed = [(i, t) for i, t in upserts if hashes.get(i) != self._text_hash(t)]
+        removed = [i for i in deletes if i in hashes]
+        if not changed and not removed:
+            return True
+        for i in removed:
+            try:
+                p.mark_deleted(i)
+            except RuntimeError:
+                pass  # already deleted
+            hashes.pop(i, None)
+        if changed:
+            self.resize_index(p, int(p.get_current_count()) + len(changed))
+            # Re-adding an existing (or deleted) label replaces its vector in place
+            p.add_items(self._encode([t for _, t in changed]), [i for i, _ in changed])
+            for i, t in changed:
+                hashes[i] = self._text_hash(t)
+        generation = self._save(domain, p, dim, hashes)
+        logger.info(f"Updated semantic index for '{domain}': {len(changed)} upserted, "
+                    f"{len(removed)} deleted (generation {generation}).")
+        return True
+
+    def clear(self, domain: str) -> bool:
+        """Empty the domain index (and its row hashes) after every row was deleted."""
+        if not HNSW_AVAILABLE:
+            return False
+        index_path, _, _ = self._domain_paths(domain)
+        if not index_path.exists():
+            return True
+        dim = int(self._read_meta(domain).get('dim', 384))
+        p = hnswlib.Index(space='cosine', dim=dim)
+        p.init_index(max_elements=1, ef_construction=self.ef_construction, M=self.M)
+        p.set_ef(self.ef_search)
+        generation = self._save(domain, p, dim, {})
+        logger.info(f"Cleared semantic index for '{domain}' (generation {generation}).")
+        return True
+
+    def sync(self, items: List[Tuple[int, str]], domain: str) -> bool:
+        """Bring the domain index in line with the given full (id, text) list, re-encoding only changed rows."""
+        if not items:
+            return self.clear(domain)
+        hashes = self._read_hashes(domain)
+        current = {i for i, _ in items}
+        if hashes and len(current) < len(hashes) // 2:
+            # Mostly-deleted index: a compact rebuild beats a tombstone-heavy graph
+            return self.build(items, domain)
+        deletes = [i for i in hashes if i not in current]
+        if self.apply_changes(domain, upserts=items, deletes=deletes):
+            return True
+        return self.build(items, domain)
+
     def _load_index(self, domain: str) -> Optional[hnswlib.Index]:  # type: ignore
         if not HNSW_AVAILABLE:
             return None
@@ -124,21 +305,294 @@ class SemanticIndex:
             logger.error(f"Failed to load semantic index for '{domain}': {e}")
             return None
 
+    def search(self, query: str, domain: str, top_k: int = 5) -> List[Tuple[int, float]]:
+        """Return list of (id, similarity) for query (served from the resident pool)."""
+        pool = get_semantic_index_pool(str(self.base_dir), self.model_name, self.ef_search)
+        return pool.search(query, domain, top_k=top_k)
+
+
+@dataclass
+class _ResidentIndex:
+    """A loaded hnswlib index plus the on-disk stamp it was loaded from."""
+    index: Any
+    mtime_ns: int
+    generation: int
+    count: int
+    checked_at: float
+
+
+class SemanticIndexPool:
+    """
+    Process-wide cache of loaded per-domain hnswlib indexes.
+
+    Readers take the current index reference without locking. At most every
+    `check_interval` seconds a reader stats the domain's meta.json; when a
+    rebuild is detected one thread loads the new index and swaps it in with a
+    single dict assignment while other readers keep using the previous one.
+    """
+
+    def __init__(self,
+                 base_dir: str = "data/vector_index",
+                 model_name: str = "all-MiniLM-L6-v2",
+                 ef_search: int = 64,
+                 check_interval: float = 2.0):
+        self._si = SemanticIndex(base_dir=base_dir, model_name=model_name, ef_search=ef_search)
+        self.model_name = model_name
+        self.check_interval = check_interval
+        self._entries: Dict[str, _ResidentIndex] = {}
+        self._load_locks: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+        self.stats = {'loads': 0, 'swaps': 0, 'searches': 0}
+
+    def available(self) -> bool:
+        return self._si.available()
+
+    def _domain_lock(self, domain: str) -> threading.Lock:
+        with self._lock:
+            lock = self._load_locks.get(domain)
+            if lock is None:
+                lock = threading.Lock()
+                self._load_locks[domain] = lock
+            return lock
+
+    def _stamp(self, domain: str) -> Optional[int]:
+        index_path, meta_path, _ = self._si._domain_paths(domain)
+        try:
+            if not index_path.exists():
+                return None
+            return meta_path.stat().st_mtime_ns
+        except OSError:
+            return None
+
+    def get(self, domain: str) -> Optional[Any]:
+        """Return the resident index for domain, loading or hot-swapping it if needed."""
+        entry = self._get_entry(domain)
+        return entry.index if entry is not None else None
+
+    def _get_entry(self, domain: str) -> Optional[_ResidentIndex]:
+        entry = self._entries.get(domain)
+        now = time.monotonic()
+        if entry is not None and now - entry.checked_at < self.check_interval:
+            return entry
+        lock = self._domain_lock(domain)
+        if entry is not None:
+            # Someone else is already reloading: keep serving the current index
+            if not lock.acquire(blocking=False):
+                return entry
+        else:
+            lock.acquire()
+        try:
+            current = self._entries.get(domain)
+            stamp = self._stamp(domain)
+            if current is not None and (stamp is None or stamp == current.mtime_ns):
+                current.checked_at = now
+                return current
+            if stamp is None:
+                return None
+            index = self._si._load_index(domain)
+            if index is None:
+                return current
+            meta = self._si._read_meta(domain)
+            loaded = _ResidentIndex(
+                index=index,
+                mtime_ns=stamp,
+                generation=int(meta.get('generation', 0)),
+                count=int(meta.get('count', index.get_current_count())),
+                checked_at=now,
+            )
+            self._entries[domain] = loaded
+            self.stats['loads'] += 1
+            if current is not None:
+                self.stats['swaps'] += 1
+                logger.info(f"Hot-swapped semantic index for '{domain}' (generation {meta.get('generation', 0)}).")
+            return loaded
+        finally:
+            lock.release()
+
+    def invalidate(self, domain: Optional[str] = None) -> None:
+        """Force the next reader of domain (or all domains) to re-check the on-disk stamp."""
+        for d, entry in list(self._entries.items()):
+            if domain is None or d == domain:
+                entry.checked_at = float('-inf')
+
     def search(self, query: str, domain: str, top_k: int = 5) -> List[Tuple[int, float]]:
         """Return list of (id, similarity) for query."""
+        return self.search_batch([query], [domain], top_k=top_k)[0]
+
+    def search_batch(self,
+                     queries: Sequence[str],
+                     domains: Sequence[str],
+                     top_k: int = 5) -> List[List[Tuple[int, float]]]:
+        """
+        Return (id, similarity) lists for many queries at once.
+
+        All queries are encoded in a single model.encode call; each domain's
+        index is then queried once with the matrix of its queries.
+        """
+        results: List[List[Tuple[int, float]]] = [[] for _ in queries]
+        if not queries:
+            return results
         if not HNSW_AVAILABLE:
             logger.debug("hnswlib not available; semantic search skipped.")
-            return []
-        self._ensure_model()
-        p = self._load_index(domain)
-        if p is None:
-            logger.info(f"No semantic index for domain '{domain}'. Build it first.")
-            return []
-        q = self.model.encode([query], convert_to_numpy=True)
+            return results
+        by_domain: Dict[str, List[int]] = {}
+        for i, domain in enumerate(domains):
+            by_domain.setdefault(domain, []).append(i)
+        entries: Dict[str, _ResidentIndex] = {}
+        for domain in by_domain:
+            entry = self._get_entry(domain)
+            if entry is None:
+                logger.info(f"No semantic index for domain '{domain}'. Build it first.")
+            elif entry.count > 0:
+                entries[domain] = entry
+        if not entries:
+            return results
+
+        wanted = [i for d in entries for i in by_domain[d]]
+        model = _get_model(self.model_name)
+        q = model.encode([queries[i] for i in wanted], convert_to_numpy=True)
+        q = np.asarray(q, dtype=np.float32)
         q = q / (np.linalg.norm(q, axis=1, keepdims=True) + 1e-10)
-        labels, distances = p.knn_query(q, k=max(1, top_k))
-        results: List[Tuple[int, float]] = []
-        for lbl, dist in zip(labels[0], distances[0]):
-            sim = float(1.0 - dist)  # cosine similarity = 1 - distance
-            results.append((int(lbl), sim))
+        row_of = {i: r for r, i in enumerate(wanted)}
+        for domain, entry in entries.items():
+            idxs = by_domain[domain]
+            # hnswlib raises when k exceeds the live (non-deleted) element count
+            k = min(max(1, top_k), entry.count)
+            labels, distances = entry.index.knn_query(q[[row_of[i] for i in idxs]], k=k)
+            for i, lbls, dists in zip(idxs, labels, distances):
+                # cosine similarity = 1 - distance
+                results[i] = [(int(lbl), float(1.0 - dist)) for lbl, dist in zip(lbls, dists)]
+        self.stats['searches'] += len(wanted)
         return results
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            'domains': {d: {'generation': e.generation, 'count': e.count} for d, e in self._entries.items()},
+        }
+
+
+# Global pools keyed by (base_dir, model_name)
+_index_pools: Dict[Tuple[str, str], SemanticIndexPool] = {}
+_index_pools_lock = threading.Lock()
+
+
+def get_semantic_index_pool(base_dir: str = "data/vector_index",
+                            model_name: str = "all-MiniLM-L6-v2",
+                            ef_search: int = 64) -> SemanticIndexPool:
+    """Get or create the process-wide index pool for base_dir/model_name."""
+    key = (str(Path(base_dir)), model_name)
+    pool = _index_pools.get(key)
+    if pool is None:
+        with _index_pools_lock:
+            pool = _index_pools.get(key)
+            if pool is None:
+                pool = SemanticIndexPool(base_dir=base_dir, model_name=model_name, ef_search=ef_search)
+                _index_pools[key] = pool
+    return pool
+
+
+def _notify_pools(base_dir: Path, domain: str) -> None:
+    """Tell in-process pools over base_dir that domain was rebuilt."""
+    for (pool_dir, _), pool in list(_index_pools.items()):
+        if pool_dir == str(Path(base_dir)):
+            pool.invalidate(domain)
+
+
+class _DomainIndexer:
+    """Debounced worker thread that keeps one domain's index in sync."""
+
+    def __init__(self, domain: str, run: Callable[[str], None], debounce: float, max_delay: float):
+        self.domain = domain
+        self._run = run
+        self.debounce = debounce
+        self.max_delay = max_delay
+        self._cond = threading.Condition()
+        self._requested = 0
+        self._completed = 0
+        self._stopping = False
+        self._thread = threading.Thread(target=self._loop, daemon=True, name=f"semantic-indexer-{domain}")
+        self._thread.start()
+
+    def request(self) -> None:
+        with self._cond:
+            self._requested += 1
+            self._cond.notify_all()
+
+    def _loop(self) -> None:
+        while True:
+            with self._cond:
+                while self._requested == self._completed and not self._stopping:
+                    self._cond.wait()
+                if self._requested == self._completed:
+                    return
+                # Absorb the burst: wait until quiet for `debounce` or `max_delay` has passed
+                first = time.monotonic()
+                seen = self._requested
+                while not self._stopping:
+                    remaining = self.max_delay - (time.monotonic() - first)
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(min(self.debounce, remaining))
+                    if self._requested == seen:
+                        break
+                    seen = self._requested
+                target = self._requested
+            try:
+                self._run(self.domain)
+            except Exception as e:
+                logger.debug(f"Semantic index sync failed for '{self.domain}': {e}")
+            with self._cond:
+                self._completed = target
+                self._cond.notify_all()
+
+    def wait_idle(self, timeout: Optional[float] = None) -> bool:
+        with self._cond:
+            return self._cond.wait_for(lambda: self._completed >= self._requested, timeout)
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        with self._cond:
+            self._stopping = True
+            self._cond.notify_all()
+        self._thread.join(timeout)
+
+
+class BackgroundIndexer:
+    """
+    Coalesces index update requests into one debounced sync per domain.
+
+    `fetch_items(domain)` returns the domain's full (id, text) list; each sync
+    diffs it against the stored row hashes so only new/changed rows are encoded.
+    """
+
+    def __init__(self,
+                 fetch_items: Callable[[str], List[Tuple[int, str]]],
+                 index: Optional[SemanticIndex] = None,
+                 debounce: float = 1.0,
+                 max_delay: float = 10.0):
+        self.fetch_items = fetch_items
+        self.index = index or SemanticIndex()
+        self.debounce = debounce
+        self.max_delay = max_delay
+        self._workers: Dict[str, _DomainIndexer] = {}
+        self._lock = threading.Lock()
+
+    def _sync(self, domain: str) -> None:
+        self.index.sync(self.fetch_items(domain), domain)
+
+    def schedule(self, domain: str) -> None:
+        """Request a sync of domain; bursts of requests collapse into one run."""
+        with self._lock:
+            worker = self._workers.get(domain)
+            if worker is None:
+                worker = _DomainIndexer(domain, self._sync, self.debounce, self.max_delay)
+                self._workers[domain] = worker
+        worker.request()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Block until every scheduled sync has finished."""
+        return all(w.wait_idle(timeout) for w in list(self._workers.values()))
+
+    def shutdown(self, timeout: Optional[float] = 5.0) -> None:
+        for w in list(self._workers.values()):
+            w.stop(timeout)
@@ -6,21 +6,32 @@ Run with: uvicorn src.web_api:app --host 0.0.0.0 --port 8000
 from __future__ import annotations
 from fastapi import FastAPI, HTTPException, Request
 from pydantic import BaseModel
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Callable, Hashable, Sequence, Set, Tuple
+import asyncio
+import functools
+import logging
+import os
+import threading
 import time
 import uuid
 import re
+from concurrent.futures import ThreadPoolExecutor
 from fastapi.middleware.cors import CORSMiddleware
 
 from .config import Config
 from .knowledge_store import KnowledgeStore
 from .learning import LearningManager
+from .response_cache import ResponseCache
 
 # Hybrid retrieval (FTS then semantic)
 try:
-    from .retrieval import hybrid_search
+    from .retrieval import hybrid_search, hybrid_search_batch, semantic_search_batch
 except Exception:
     hybrid_search = None  # type: ignore
+    hybrid_search_batch = None  # type: ignore
+    semantic_search_batch = None  # type: ignore
+
+logger = logging.getLogger(__name__)
 
 app = FastAPI(title="Adaptive Chatbot API", version="1.0.0")
 
@@ -109,13 +120,142 @@ async def metrics() -> Dict[str, Any]:
             "samples": len(arr),
         },
         "window": int(_metrics["max_samples"]),
+        "executor": {
+            "workers": _EXECUTOR_WORKERS,
+            "queue_limit": _EXECUTOR_QUEUE,
+            "inflight": int(_executor_state["inflight"]),
+            "rejected_total": int(_executor_state["rejected_total"]),
+        },
+        "coalescing": {
+            "inflight_keys": len(_inflight_calls),
+            "coalesced_total": int(_coalesce_state["coalesced_total"]),
+        },
+        "chat_cache": _chat_cache.get_stats(),
+        "knowledge_snapshot": _ks.get_snapshot_stats(),
     }
 
 # Singletons
 _cfg = Config()
-_ks = KnowledgeStore(_cfg.database_path)
+# API_READ_SNAPSHOT=1 serves knowledge reads from an in-memory copy refreshed after writes
+_ks = KnowledgeStore(
+    _cfg.database_path,
+    read_snapshot=os.environ.get("API_READ_SNAPSHOT", "0") == "1",
+    snapshot_refresh_sec=float(os.environ.get("API_SNAPSHOT_REFRESH_SEC", "0.5")),
+)
 _lm = LearningManager(_ks)
 
+# /chat response cache: in-process LRU, plus a SQLite tier shared by workers when
+# API_CHAT_CACHE_DB is set. Knowledge writes invalidate affected entries.
+_chat_cache = ResponseCache(
+    max_entries=int(os.environ.get("API_CHAT_CACHE_SIZE", "1024")),
+    shared_path=os.environ.get("API_CHAT_CACHE_DB") or None,
+)
+_ks.add_change_listener(_chat_cache.on_knowledge_change)
+
+# ---------------------- Blocking work executor ----------------------
+# SQLite queries and embedding inference are synchronous; run them on a bounded
+# pool so the event loop keeps accepting requests. Admission is capped at
+# workers + queue; beyond that requests are rejected with 429 instead of piling up.
+_EXECUTOR_WORKERS: int = int(os.environ.get("API_EXECUTOR_WORKERS", "8"))
+_EXECUTOR_QUEUE: int = int(os.environ.get("API_EXECUTOR_QUEUE", "64"))
+_executor = ThreadPoolExecutor(max_workers=_EXECUTOR_WORKERS, thread_name_prefix="api-worker")
+_executor_lock = threading.Lock()
+_executor_state: Dict[str, int] = {"inflight": 0, "rejected_total": 0}
+
+
+class ServerBusy(HTTPException):
+    """429 raised when the blocking-work executor is saturated."""
+
+    def __init__(self) -> None:
+        super().__init__(status_code=429, detail="Server busy, retry shortly", headers={"Retry-After": "1"})
+
+
+async def _run_blocking(fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """Run fn on the bounded executor; raise ServerBusy when the queue is full."""
+    with _executor_lock:
+        if _executor_state["inflight"] >= _EXECUTOR_WORKERS + _EXECUTOR_QUEUE:
+            _executor_state["rejected_total"] += 1
+            raise ServerBusy()
+        _executor_state["inflight"] += 1
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_executor, functools.partial(fn, *args, **kwargs))
+    finally:
+        with _executor_lock:
+            _executor_state["inflight"] -= 1
+
+
+@app.on_event("shutdown")
+def _shutdown_executor() -> None:
+    _executor.shutdown(wait=True)
+
+
+# ---------------------- In-flight request coalescing ----------------------
+# Identical queries that arrive while one is already being computed await the
+# same future instead of queueing another executor job. Only touched from the
+# event loop thread, so no lock is needed.
+_inflight_calls: Dict[Hashable, asyncio.Future] = {}
+_coalesce_state: Dict[str, int] = {"coalesced_total": 0}
+_compute_tasks: Set[asyncio.Task] = set()  # Strong refs until each computation finishes
+_MAX_BATCH_ITEMS: int = int(os.environ.get("API_MAX_BATCH_ITEMS", "64"))
+
+
+def _settle_owned(owned: List[Hashable], futures: Dict[Hashable, asyncio.Future], task: asyncio.Task) -> None:
+    """Resolve the futures of keys computed by task and release them from _inflight_calls."""
+    error = None if task.cancelled() else task.exception()
+    for i, key in enumerate(owned):
+        fut = futures[key]
+        if _inflight_calls.get(key) is fut:
+            del _inflight_calls[key]
+        if fut.done():
+            continue
+        if task.cancelled():
+            fut.cancel()
+        elif error is not None:
+            fut.set_exception(error)
+            fut.exception()  # mark retrieved; waiters still see it
+        else:
+            fut.set_result(task.result()[i])
+
+
+async def _run_coalesced(keys: Sequence[Hashable],
+                         compute: Callable[[List[Hashable]], List[Any]]) -> List[Any]:
+    """
+    Resolve one result per key. Keys already in flight are joined; the rest
+    are computed together by a single blocking compute(keys) call on the executor.
+    """
+    loop = asyncio.get_running_loop()
+    waiting: Dict[Hashable, asyncio.Future] = {}
+    owned: List[Hashable] = []
+    for key in dict.fromkeys(keys):
+        fut = _inflight_calls.get(key)
+        if fut is None:
+            fut = loop.create_future()
+            _inflight_calls[key] = fut
+            owned.append(key)
+        else:
+            _coalesce_state["coalesced_total"] += 1
+        waiting[key] = fut
+
+    if owned:
+        # The computation runs as its own task so cancelling the owning request
+        # does not cancel it for joined waiters; the futures resolve from its completion
+        task = loop.create_task(_run_blocking(compute, owned))
+        _compute_tasks.add(task)
+        task.add_done_callback(_compute_tasks.discard)
+        task.add_done_callback(functools.partial(_settle_owned, owned, {key: waiting[key] for key in owned}))
+
+    # shield: a cancelled client must not cancel the shared future for others
+    return [await asyncio.shield(waiting[key]) for key in keys]
+
+
+def _threshold_for(domain: Optional[str]) -> float:
+    """Semantic similarity threshold (per-domain override)."""
+    th = _cfg.retrieval_similarity_threshold
+    if domain and isinstance(_cfg.retrieval_similarity_thresholds, dict):
+        th = _cfg.retrieval_similarity_thresholds.get(domain, th)
+    return th
+
 
 class SearchRequest(BaseModel):
     query: str
@@ -141,6 +281,14 @@ class ChatResponse(BaseModel):
     reply: str
     source: str
 
+
+class SearchBatchRequest(BaseModel):
+    items: List[SearchRequest]
+
+
+class ChatBatchRequest(BaseModel):
+    items: List[ChatRequest]
+
 class TeachRequest(BaseModel):
     input: str
     response: str
@@ -157,35 +305,53 @@ class TeachBulkRequest(BaseModel):
 async def health() -> Dict[str, Any]:
     try:
         # Simple DB check
-        _ = _ks.get_stats()
+        _ = await _run_blocking(_ks.get_stats)
         return {"status": "ok"}
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@app.post("/knowledge/search", response_model=List[SearchResponseItem])
-async def knowledge_search(req: SearchRequest):
-    if not req.query or not req.query.strip():
-        return []
-    # Threshold selection (per-domain override)
-    th = _cfg.retrieval_similarity_threshold
-    if req.domain and isinstance(_cfg.retrieval_similarity_thresholds, dict):
-        th = _cfg.retrieval_similarity_thresholds.get(req.domain, th)
-
+def _search_rows(query: str, domain: Optional[str], top_k: int, th: float) -> List[Dict[str, Any]]:
+    """Blocking retrieval for /knowledge/search (runs on the executor)."""
     # Use hybrid if available; else FTS/LIKE
     if hybrid_search is not None:
-        rows = hybrid_search(_ks, req.query, domain=req.domain, top_k=req.top_k, min_semantic_similarity=th)
-    else:
-        # Fallback to FTS then LIKE
-        try:
-            rows = _ks.search_fulltext(req.query, domain=req.domain, limit=req.top_k)
-            rows = [{**r, '_source': 'fts', '_score': None} for r in rows]
-        except Exception:
-            words = [w for w in req.query.split() if len(w) > 1]
-            rows = _ks.search_by_keywords(words, domain=req.domain)[:req.top_k]
-            rows = [{**r, '_source': 'like', '_score': None} for r in rows]
+        return hybrid_search(_ks, query, domain=domain, top_k=top_k, min_semantic_similarity=th)
+    # Fallback to FTS then LIKE
+    try:
+        rows = _ks.search_fulltext(query, domain=domain, limit=top_k)
+        return [{**r, '_source': 'fts', '_score': r.get('_score')} for r in rows]
+    except Exception:
+        words = [w for w in query.split() if len(w) > 1]
+        rows = _ks.search_by_keywords(words, domain=domain)[:top_k]
+        return [{**r, '_source': 'like', '_score': None} for r in rows]
+
+
+def _search_rows_batch(keys: List[Tuple[str, str, Optional[str], int, float]]) -> List[List[Dict[str, Any]]]:
+    """Blocking retrieval for many ("search", query, domain, top_k, th) keys."""
+    if hybrid_search_batch is None:
+        return [_search_rows(*key[1:]) for key in keys]
+    out: List[List[Dict[str, Any]]] = [[] for _ in keys]
+    by_top_k: Dict[int, List[int]] = {}
+    for i, key in enumerate(keys):
+        by_top_k.setdefault(key[3], []).append(i)
+    for top_k, idxs in by_top_k.items():
+        rows = hybrid_search_batch(_ks,
+                                   [keys[i][1] for i in idxs],
+                                   [keys[i][2] for i in idxs],
+                                   top_k=top_k,
+                                   min_semantic_similarity=[keys[i][4] for i in idxs])
+        for i, r in zip(idxs, rows):
+            out[i] = r
+    return out
+
+
+def _search_key(req: SearchRequest) -> Tuple[str, str, Optional[str], int, float]:
+    return ("search", req.query, req.domain, req.top_k, _threshold_for(req.domain))
 
-    # Serialize
+
+def _serialize_rows(rows: List[Dict[str, Any]]) -> List[SearchResponseItem]:
     out: List[SearchResponseItem] = []
     for r in rows:
         out.append(SearchResponseItem(
@@ -199,30 +365,122 @@ async def knowledge_search(req: SearchRequest):
     return out
 
 
+@app.post("/knowledge/search", response_model=List[SearchResponseItem])
+async def knowledge_search(req: SearchRequest):
+    if not req.query or not req.query.strip():
+        return []
+    rows = (await _run_coalesced([_search_key(req)], _search_rows_batch))[0]
+    return _serialize_rows(rows)
+
+
+@app.post("/knowledge/search/batch", response_model=List[List[SearchResponseItem]])
+async def knowledge_search_batch(req: SearchBatchRequest):
+    if len(req.items) > _MAX_BATCH_ITEMS:
+        raise HTTPException(status_code=413, detail=f"Batch exceeds {_MAX_BATCH_ITEMS} items")
+    # Empty queries answer [] like the single endpoint
+    idxs = [i for i, it in enumerate(req.items) if it.query and it.query.strip()]
+    out: List[List[SearchResponseItem]] = [[] for _ in req.items]
+    if idxs:
+        found = await _run_coalesced([_search_key(req.items[i]) for i in idxs], _search_rows_batch)
+        for i, rows in zip(idxs, found):
+            out[i] = _serialize_rows(rows)
+    return out
+
+
+_FALLBACK_REPLY = ChatResponse(reply="Mujhe iska jawab nahi pata. Kya aap thoda detail batayenge?", source='fallback')
+
+
+def _chat_replies(keys: List[Tuple[str, str, Optional[str], str]]) -> List[ChatResponse]:
+    """
+    Blocking retrieval for many ("chat", normalized, domain, message) keys
+    (runs on the executor). Checks the shared cache tier, then answers the rest.
+    """
+    generation, shared_seq = _chat_cache.generation, _chat_cache.shared_seq()
+    replies: List[Optional[ChatResponse]] = [None] * len(keys)
+    answer_ids: List[Optional[int]] = [None] * len(keys)
+    for i, (_, norm, domain, _message) in enumerate(keys):
+        cached = _chat_cache.get_shared((norm, domain))
+        if cached is not None:
+            replies[i] = ChatResponse(reply=cached.reply, source=cached.source)
+    todo = [i for i, r in enumerate(replies) if r is None]
+
+    # Try knowledge base first: one FTS pass per message on this thread's connection
+    for i in todo:
+        _, _, domain, message = keys[i]
+        try:
+            rows = _ks.search_fulltext(message, domain=domain, limit=1)
+            if rows:
+                replies[i] = ChatResponse(reply=str(rows[0].get('response', '')), source='fts')
+                answer_ids[i] = rows[0].get('id')
+        except Exception:
+            pass
+
+    # Semantic fallback for the misses, encoded as one batch
+    misses = [i for i in todo if replies[i] is None]
+    if misses and semantic_search_batch is not None:
+        try:
+            found = semantic_search_batch(_ks,
+                                          [keys[i][3] for i in misses],
+                                          [keys[i][2] for i in misses],
+                                          top_k=1,
+                                          min_semantic_similarity=[_threshold_for(keys[i][2]) for i in misses])
+            for i, rows in zip(misses, found):
+                if rows:
+                    replies[i] = ChatResponse(reply=str(rows[0].get('response', '')),
+                                              source=rows[0].get('_source') or 'hybrid')
+                    answer_ids[i] = rows[0].get('id')
+        except Exception as e:
+            logger.warning(f"Semantic fallback failed: {e}")
+
+    # Final fallback
+    for i in todo:
+        reply = replies[i] or _FALLBACK_REPLY
+        replies[i] = reply
+        _, norm, domain, message = keys[i]
+        _chat_cache.put((norm, domain), message, reply.reply, reply.source, answer_ids[i], generation,
+                        shared_seq)
+    return replies
+
+
+def _chat_key(message: str, domain: Optional[str]) -> Tuple[str, str, Optional[str], str]:
+    # Coalesce on the cache key; the first message's raw text drives retrieval
+    norm, domain = _chat_cache.make_key(message, domain)
+    return ("chat", norm, domain, message)
+
+
+async def _cached_chat(items: List[ChatRequest]) -> List[ChatResponse]:
+    keys = [_chat_key(it.message, it.domain) for it in items]
+    replies: List[Optional[ChatResponse]] = []
+    for key in keys:
+        cached = _chat_cache.get(key[1:3])
+        replies.append(ChatResponse(reply=cached.reply, source=cached.source) if cached else None)
+    todo = [i for i, r in enumerate(replies) if r is None]
+    if todo:
+        # Coalesce on ("chat", norm, domain) so spelling variants share one computation
+        by_cache_key = {keys[i][:3]: keys[i] for i in todo}
+        found = await _run_coalesced([keys[i][:3] for i in todo],
+                                     lambda ks: _chat_replies([by_cache_key[k] for k in ks]))
+        for i, reply in zip(todo, found):
+            replies[i] = reply
+    return replies
+
+
 @app.post("/chat", response_model=ChatResponse)
 async def chat(req: ChatRequest):
     if not req.message or not req.message.strip():
         raise HTTPException(status_code=400, detail="Empty message")
+    return (await _cached_chat([req]))[0]
 
-    # Try knowledge base first
-    try:
-        rows = _ks.search_fulltext(req.message, domain=req.domain, limit=1)
-        if rows:
-            return ChatResponse(reply=str(rows[0].get('response', '')), source='fts')
-    except Exception:
-        pass
-
-    # Fallback to hybrid if available
-    if hybrid_search is not None:
-        th = _cfg.retrieval_similarity_threshold
-        if req.domain and isinstance(_cfg.retrieval_similarity_thresholds, dict):
-            th = _cfg.retrieval_similarity_thresholds.get(req.domain, th)
-        rows = hybrid_search(_ks, req.message, domain=req.domain, top_k=1, min_semantic_similarity=th)
-        if rows:
-            return ChatResponse(reply=str(rows[0].get('response', '')), source=rows[0].get('_source') or 'hybrid')
 
-    # Final fallback
-    return ChatResponse(reply="Mujhe iska jawab nahi pata. Kya aap thoda detail batayenge?", source='fallback')
+@app.post("/chat/batch", response_model=List[ChatResponse])
+async def chat_batch(req: ChatBatchRequest):
+    if len(req.items) > _MAX_BATCH_ITEMS:
+        raise HTTPException(status_code=413, detail=f"Batch exceeds {_MAX_BATCH_ITEMS} items")
+    if any(not it.message or not it.message.strip() for it in req.items):
+        raise HTTPException(status_code=400, detail="Empty message")
+    if not req.items:
+        return []
+    return await _cached_chat(req.items)
 
 
 # ---------------------- Threshold management ----------------------
@@ -256,26 +514,34 @@ async def set_thresholds(payload: Thresholds):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def _teach(req: TeachRequest) -> bool:
+    """Blocking teach + optional validation status update (runs on the executor)."""
+    ok = _lm.teach_chatbot(
+        user_input=req.input,
+        expected_response=req.response,
+        category=req.category or "learned",
+        domain=req.domain or "general",
+        confidence=req.confidence or 1.0
+    )
+    if ok and req.validation_status:
+        # If caller wants to mark as pending/approved, update metadata
+        # We need the id to do this precisely; as a pragmatic approach,
+        # attempt to find the row via exact input+domain match.
+        rows = _ks.search_by_keywords([req.input], domain=req.domain)
+        for r in rows:
+            if r.get('input') == req.input and r.get('domain') == req.domain:
+                _ks.set_validation_status(int(r['id']), req.validation_status)
+                break
+    return bool(ok)
+
+
 @app.post("/knowledge/teach")
 async def knowledge_teach(req: TeachRequest) -> Dict[str, Any]:
     try:
-        ok = _lm.teach_chatbot(
-            user_input=req.input,
-            expected_response=req.response,
-            category=req.category or "learned",
-            domain=req.domain or "general",
-            confidence=req.confidence or 1.0
-        )
-        if ok and req.validation_status:
-            # If caller wants to mark as pending/approved, update metadata
-            # We need the id to do this precisely; as a pragmatic approach,
-            # attempt to find the row via exact input+domain match.
-            rows = _ks.search_by_keywords([req.input], domain=req.domain)
-            for r in rows:
-                if r.get('input') == req.input and r.get('domain') == req.domain:
-                    _ks.set_validation_status(int(r['id']), req.validation_status)
-                    break
+        ok = await _run_blocking(_teach, req)
         return {"success": bool(ok)}
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -283,18 +549,20 @@ async def knowledge_teach(req: TeachRequest) -> Dict[str, Any]:
 @app.post("/knowledge/import")
 async def knowledge_import(req: TeachBulkRequest, domain: Optional[str] = None) -> Dict[str, Any]:
     try:
-        # Build list for batch_teach
-        items = []
         dom = domain or "general"
-        for it in req.items:
-            items.append({
-                'input': it.input,
-                'response': it.response,
-                'category': it.category or 'learned',
-                'confidence': it.confidence or 1.0
-            })
-        success, total = _lm.batch_teach(items, domain=dom)
-        return {"success": success, "total": total}
+        records = [{
+            'input': it.input,
+            'response': it.response,
+            'category': it.category or 'learned',
+            'confidence': it.confidence or 1.0,
+            'source': 'manual_training',
+        } for it in req.items]
+        stats = await _run_blocking(_lm.import_records, records, domain=dom)
+        if stats.get('error'):
+            raise HTTPException(status_code=500, detail=stats['error'])
+        return {"success": stats['inserted'], "total": len(records), "rows_per_sec": stats['rows_per_sec']}
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -302,7 +570,7 @@ async def knowledge_import(req: TeachBulkRequest, domain: Optional[str] = None)
 @app.get("/knowledge/pending", response_model=List[SearchResponseItem])
 async def knowledge_pending(domain: Optional[str] = None, limit: int = 100):
     try:
-        rows = _ks.get_pending_knowledge(domain=domain, limit=limit)
+        rows = await _run_blocking(_ks.get_pending_knowledge, domain=domain, limit=limit)
         out: List[SearchResponseItem] = []
         for r in rows:
             out.append(SearchResponseItem(
@@ -314,6 +582,8 @@ async def knowledge_pending(domain: Optional[str] = None, limit: int = 100):
                 _score=None
             ))
         return out
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -326,8 +596,10 @@ class ApproveRequest(BaseModel):
 @app.post("/knowledge/approve")
 async def knowledge_approve(req: ApproveRequest) -> Dict[str, Any]:
     try:
-        ok = _ks.set_validation_status(req.id, req.status)
+        ok = await _run_blocking(_ks.set_validation_status, req.id, req.status)
         return {"success": bool(ok)}
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -335,7 +607,7 @@ async def knowledge_approve(req: ApproveRequest) -> Dict[str, Any]:
 # ---------------------- Simple rate limiting middleware ----------------------
 # In-memory per-IP token bucket (dev-safe; replace with Redis in production)
 _rate_buckets: Dict[str, Dict[str, Any]] = {}
-_RATE_LIMIT: int = 120  # requests per window
+_RATE_LIMIT: int = int(os.environ.get("API_RATE_LIMIT", "120"))  # requests per window
 _RATE_WINDOW_SEC: int = 60
 
 @app.middleware("http")
@@ -32,4 +32,51 @@ def test_knowledge_search_empty_query_is_safe():
     payload: Dict[str, Any] = {"query": "  "}
     r = client.post("/knowledge/search", json=payload)
     assert r.status_code == 200
-    assert r.json() == []
\ No newline at end of file
+    assert r.json() == []
+
+def test_knowledge_search_batch_matches_single():
+    queries = ["switch price", "  ", "switch price"]
+    r = client.post("/knowledge/search/batch", json={"items": [{"query": q, "top_k": 3} for q in queries]})
+    assert r.status_code == 200, f"/knowledge/search/batch failed: {r.status_code} {r.text}"
+    data = r.json()
+    assert len(data) == len(queries)
+    assert data[1] == []
+    single = client.post("/knowledge/search", json={"query": "switch price", "top_k": 3}).json()
+    assert data[0] == single and data[2] == single
+
+
+def test_chat_batch_returns_reply_per_item():
+    items = [{"message": "switch ka price"}, {"message": "xyzzy qwerty"}]
+    r = client.post("/chat/batch", json={"items": items})
+    assert r.status_code == 200, f"/chat/batch failed: {r.status_code} {r.text}"
+    data = r.json()
+    assert len(data) == 2
+    assert all("reply" in d and "source" in d for d in data)
+    assert client.post("/chat/batch", json={"items": [{"message": " "}]}).status_code == 400
+
+
+def test_identical_inflight_queries_are_coalesced():
+    import asyncio
+    import threading
+    from src import web_api
+
+    calls = []
+    gate = threading.Event()
+
+    def compute(keys):
+        calls.append(list(keys))
+        gate.wait(5)
+        return [k[1].upper() for k in keys]
+
+    async def run():
+        first = asyncio.ensure_future(web_api._run_coalesced([("t", "a")], compute))
+        await asyncio.sleep(0.05)
+        second = asyncio.ensure_future(web_api._run_coalesced([("t", "a"), ("t", "b")], compute))
+        await asyncio.sleep(0.05)
+        gate.set()
+        return await first, await second
+
+    first, second = asyncio.run(run())
+    assert first == ["A"] and second == ["A", "B"]
+    assert calls == [[("t", "a")], [("t", "b")]]
+    assert not web_api._inflight_calls
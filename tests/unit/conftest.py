@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Shared unit-test fixtures: a deterministic fake sentence encoder.
+"""
+
+import zlib
+
+import numpy as np
+import pytest
+
+
+class FakeEncoder:
+    """Deterministic stand-in for SentenceTransformer that records what it encodes.
+
+    Each text maps to standard-normal noise seeded by its crc32. With center, vectors
+    are center + spread * noise, so texts sit close together and similarity alone
+    can't separate them.
+    """
+
+    def __init__(self, dim=16, center=None, spread=1.0, normalize=False):
+        self.dim = dim if center is None else len(center)
+        self.center = center
+        self.spread = spread
+        self.normalize = normalize
+        self.encoded = []
+
+    def vector(self, text):
+        vec = np.random.default_rng(zlib.crc32(text.encode())).standard_normal(self.dim) * self.spread
+        if self.center is not None:
+            vec = self.center + vec
+        if self.normalize:
+            vec = vec / np.linalg.norm(vec)
+        return vec.astype(np.float32)
+
+    def encode(self, texts, **kwargs):
+        self.encoded.extend(texts)
+        return np.stack([self.vector(t) for t in texts])
+
+    __call__ = encode  # Usable directly as an encode_fn
+
+    def get_sentence_embedding_dimension(self):
+        return self.dim
+
+
+@pytest.fixture
+def fake_encoder():
+    """Factory: fake_encoder(dim=..., center=..., spread=..., normalize=...) -> FakeEncoder"""
+    return FakeEncoder
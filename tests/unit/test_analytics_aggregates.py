@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Analytics aggregate tests: exact top-K, legacy trend folding, dirty-only persistence.
+"""
+
+import json
+import random
+import sqlite3
+
+from conversation.analytics_aggregates import TopK
+from conversation.dialog_flow import AdvancedConversationManager
+
+
+def test_top_k_matches_full_sort():
+    rng = random.Random(7)
+    top = TopK(k=5)
+    counts = {}
+    for _ in range(3000):
+        topic = f"topic_{int(rng.paretovariate(1.2)) % 40}"
+        top.increment(topic)
+        counts.setdefault(topic, 0)
+        counts[topic] += 1
+        # Full sort is stable: ties keep first-seen order, like the dict it replaced
+        assert top.top() == sorted(counts.items(), key=lambda kv: kv[1], reverse=True)[:5]
+    assert len(top._heap) <= 4 * top.k + 16
+
+
+def test_legacy_trend_is_folded_and_only_changed_metrics_are_written(tmp_path):
+    db_path = str(tmp_path / "conversation_data.db")
+    # Pre-aggregate databases kept every rating in one ever-growing list
+    trend = [{"timestamp": f"2025-{i // 28 + 1:02d}-{i % 28 + 1:02d}T12:00:00", "score": 0.5 + (i % 2) * 0.25}
+             for i in range(150)]
+    with sqlite3.connect(db_path) as conn:
+        conn.execute("CREATE TABLE analytics (metric_name TEXT PRIMARY KEY, metric_data TEXT, updated_at TIMESTAMP)")
+        conn.executemany("INSERT INTO analytics VALUES (?, ?, 'old')", [
+            ("total_conversations", "30"),
+            ("satisfaction_trends", json.dumps(trend)),
+            ("personality_distribution", "{}"),
+        ])
+
+    manager = AdvancedConversationManager(db_path)
+    overview = manager.get_conversation_analytics()
+    assert overview["satisfaction_analytics"]["total_ratings"] == 150
+    assert abs(overview["overview"]["avg_satisfaction"] - 0.625) < 1e-9
+
+    session_id = manager.start_conversation("u1")
+    manager.add_turn(session_id, "switch price", "ok", {"detected_language": "hi", "topic": "switches"})
+    manager.end_conversation(session_id, satisfaction_score=1.0)
+
+    analytics = manager.get_conversation_analytics()
+    assert analytics["overview"]["total_conversations"] == 31
+    assert analytics["satisfaction_analytics"]["trend_data"][-1]["score"] == 1.0
+    assert analytics["topic_analytics"]["most_frequent"] == [("switches", 1)]
+    assert analytics["user_analytics"]["relationship_distribution"] == {"new": 1}
+    with sqlite3.connect(db_path) as conn:
+        rows = dict(conn.execute("SELECT metric_name, updated_at FROM analytics"))
+        stored_trend = json.loads(conn.execute(
+            "SELECT metric_data FROM analytics WHERE metric_name = 'satisfaction_trends'").fetchone()[0])
+    assert rows["personality_distribution"] == "old"
+    assert rows["total_conversations"] != "old" and "satisfaction_summary" in rows
+    assert len(stored_trend) == manager.config["satisfaction_trend_points"] == 100
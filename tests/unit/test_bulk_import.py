@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Bulk import tests: streaming readers and KnowledgeStore.bulk_add_knowledge.
+"""
+
+import csv
+import json
+
+import pytest
+
+from src.bulk_import import iter_knowledge_file
+from src.knowledge_store import KnowledgeStore
+from src.learning import LearningManager
+
+RECORDS = [
+    {'input': f'item {i} ka price', 'response': f'{i} rupees', 'domain': 'shop', 'tags': ['bulk']}
+    for i in range(40)
+]
+
+
+@pytest.fixture
+def store(tmp_path):
+    ks = KnowledgeStore(str(tmp_path / "knowledge.db"))
+    yield ks
+    ks.close()
+
+
+def test_readers_stream_every_format(tmp_path, monkeypatch):
+    json_path = tmp_path / "k.json"
+    json_path.write_text(json.dumps(RECORDS, indent=2), encoding='utf-8')
+    jsonl_path = tmp_path / "k.jsonl"
+    jsonl_path.write_text('\n'.join(json.dumps(r) for r in RECORDS) + '\n{broken\n', encoding='utf-8')
+    csv_path = tmp_path / "k.csv"
+    with open(csv_path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=['input', 'response', 'domain'])
+        writer.writeheader()
+        writer.writerows({k: r[k] for k in ('input', 'response', 'domain')} for r in RECORDS)
+
+    # Tiny read size so array elements straddle buffer boundaries
+    monkeypatch.setattr("src.bulk_import._READ_SIZE", 7)
+    assert list(iter_knowledge_file(str(json_path))) == RECORDS
+    assert list(iter_knowledge_file(str(jsonl_path))) == RECORDS
+    assert [r['input'] for r in iter_knowledge_file(str(csv_path))] == [r['input'] for r in RECORDS]
+
+
+def test_bulk_load_rebuilds_fts_once_and_restores_triggers(store):
+    events = []
+    store.add_change_listener(lambda event, row: events.append(event))
+    records = RECORDS + [{'input': '', 'response': 'no question'}, {'response': 'missing'}]
+    stats = store.bulk_add_knowledge(records, domain='general', chunk_size=10)
+
+    assert stats['inserted'] == 40 and stats['skipped'] == 2
+    assert stats['domains'] == ['shop'] and stats['rows_per_sec'] > 0
+    assert events == ['bulk']
+    assert store.search_fulltext('item 17 ka price', domain='shop')[0]['response'] == '17 rupees'
+    assert store.search_fulltext('item 17')[0]['tags'] == ['bulk']
+
+    # Triggers are back: a regular add is searchable straight away
+    store.add_knowledge({'input': 'fan regulator kitne ka', 'response': 'Regulator 150', 'domain': 'shop'})
+    assert store.search_fulltext('fan regulator', domain='shop')
+    assert len(store._fts_triggers(store._read_conn())) >= 3
+
+
+def test_import_knowledge_file_uses_default_domain(store, tmp_path):
+    path = tmp_path / "k.jsonl"
+    path.write_text('\n'.join(json.dumps({'input': r['input'], 'response': r['response']}) for r in RECORDS),
+                    encoding='utf-8')
+    lm = LearningManager(store)
+    lm._rebuild_semantic_index_async = lambda domain: None
+    assert lm.import_knowledge_file(str(path), domain='electrical') == (40, 40)
+    assert len(store.get_knowledge_by_domain('electrical')) == 40
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+ContextIndex tests: token postings, importance order, lazy expiry.
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+pytest.importorskip("psutil")  # core.state_manager pulls in utils.performance_monitor
+
+from core.state_manager import ContextIndex, ContextType, ConversationContext
+
+
+def make_context(context_id, text, importance=0.5, context_type=ContextType.BUSINESS, expiry_time=None):
+    # Padded so the JSON quotes split off as their own tokens
+    return ConversationContext(context_id=context_id, context_type=context_type,
+                               data={'user_input': f" {text} "}, importance=importance, expiry_time=expiry_time)
+
+
+def test_token_matches_count_shared_words():
+    index = ContextIndex()
+    index.add(make_context("a", "switch ka price"))
+    index.add(make_context("b", "wire ka rate"))
+    index.add(make_context("c", "fan regulator"))
+    assert dict(index.token_matches("switch ka price batao".split())) == {"a": 3, "b": 1}
+
+    # Re-indexing replaced data drops the old postings and keeps the position
+    seq = index.seq["a"]
+    index.add(make_context("a", "mcb warranty", importance=0.9))
+    assert index.seq["a"] == seq
+    assert dict(index.token_matches(["switch"])) == {}
+    assert index.top_by_importance(ContextType.BUSINESS, 2) == ["a", "b"]
+
+
+def test_purge_expired_pops_only_due_entries():
+    now = datetime.now()
+    index = ContextIndex()
+    index.add(make_context("old", "switch", expiry_time=now - timedelta(minutes=5)))
+    index.add(make_context("new", "switch", expiry_time=now + timedelta(hours=1)))
+    index.add(make_context("forever", "switch"))
+    # A replaced expiry leaves a stale heap entry that must not evict the context
+    index.add(make_context("renewed", "switch", expiry_time=now - timedelta(minutes=1)))
+    index.add(make_context("renewed", "switch", expiry_time=now + timedelta(days=1)))
+
+    assert index.purge_expired(now) == ["old"]
+    assert index.purge_expired(now) == []
+    assert set(index.token_matches(["switch"])) == {"new", "forever", "renewed"}
+    assert len(index) == 3
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Conversation log tests: group-commit writer, schema migration, bucketed retention.
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.knowledge_store import KnowledgeStore, SCHEMA_MIGRATIONS
+
+
+@pytest.fixture
+def store(tmp_path):
+    ks = KnowledgeStore(str(tmp_path / "knowledge.db"), conversation_flush_ms=20)
+    yield ks
+    ks.close()
+
+
+def test_rows_are_batched_and_visible_to_history(store):
+    for i in range(500):
+        assert store.log_conversation("s1", "text", f"message {i}", f"reply {i}", domain="shop")
+    history = store.get_conversation_history("s1", limit=1000)
+    assert len(history) == 500
+    stats = store._conversation_log.get_stats()
+    assert stats['written'] == 500
+    assert stats['batches'] < 500
+
+
+def test_close_drains_queue(tmp_path):
+    path = str(tmp_path / "knowledge.db")
+    ks = KnowledgeStore(path, conversation_flush_ms=10000)
+    for i in range(50):
+        ks.log_conversation("s1", "text", f"message {i}")
+    ks.close()
+
+    reopened = KnowledgeStore(path, async_conversation_log=False)
+    assert len(reopened.get_conversation_history("s1")) == 50
+    reopened.close()
+
+
+def test_migration_adds_conversation_indexes(store):
+    conn = store._read_conn()
+    assert conn.execute("PRAGMA user_version").fetchone()[0] == SCHEMA_MIGRATIONS[-1][0]
+    plan = ' '.join(r[3] for r in conn.execute(
+        "EXPLAIN QUERY PLAN SELECT * FROM conversations WHERE session_id = ? ORDER BY timestamp DESC LIMIT 10",
+        ("s1",)))
+    assert "idx_conversations_session_ts" in plan
+
+
+def test_retention_deletes_only_old_rows(store):
+    now = datetime.now()
+    with store._write_conn() as conn:
+        conn.executemany(
+            "INSERT INTO conversations (session_id, message_type, message, timestamp) VALUES ('s1', 'text', 'm', ?)",
+            [((now - timedelta(days=d, hours=h)).isoformat(),) for d in (1, 40, 90) for h in range(0, 24, 6)],
+        )
+    assert store.cleanup_old_conversations(days=30, bucket_hours=12) == 8
+    assert len(store.get_conversation_history("s1")) == 4
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Conversation persistence tests: unit-of-work batching, durability modes, crash recovery.
+"""
+
+import asyncio
+import sqlite3
+import subprocess
+import sys
+import textwrap
+import threading
+import time
+import types
+from pathlib import Path
+
+import pytest
+
+from core.conversation_persistence import ConversationPersistence, DurabilityMode, UnitOfWork
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+SCHEMA = [
+    "CREATE TABLE conversation_turns (turn_id TEXT PRIMARY KEY, session_id TEXT, user_input TEXT)",
+    "CREATE TABLE user_profiles (user_id TEXT PRIMARY KEY, total_interactions INTEGER)",
+]
+TURN_SQL = "INSERT INTO conversation_turns (turn_id, session_id, user_input) VALUES (?, ?, ?)"
+PROFILE_SQL = "INSERT OR REPLACE INTO user_profiles (user_id, total_interactions) VALUES (?, ?)"
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = tmp_path / "conversation.db"
+    with sqlite3.connect(path) as conn:
+        for statement in SCHEMA:
+            conn.execute(statement)
+    return str(path)
+
+
+def turn_unit(i):
+    unit = UnitOfWork()
+    unit.insert(TURN_SQL, (f"turn_{i}", "s1", f"message {i}"))
+    unit.upsert(PROFILE_SQL, "u1", ("u1", i))
+    unit.upsert(PROFILE_SQL, "u1", ("u1", i + 1))  # Staged twice in one turn, written once
+    return unit
+
+
+@pytest.mark.parametrize("durability", list(DurabilityMode))
+def test_units_are_batched_and_coalesced(db_path, durability):
+    store = ConversationPersistence(db_path, durability=durability, group_commit_ms=50,
+                                    periodic_interval_sec=0.2)
+    tickets = [store.commit(turn_unit(i)) for i in range(200)]
+    assert tickets == list(range(1, 201))
+    assert store.flush()
+    store.close()
+
+    with sqlite3.connect(db_path) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM conversation_turns").fetchone()[0] == 200
+        assert conn.execute("SELECT total_interactions FROM user_profiles").fetchall() == [(200,)]
+    stats = store.get_stats()
+    assert stats['failed_units'] == 0 and stats['pending'] == 0
+    if durability is DurabilityMode.SYNC:
+        assert stats['transactions'] == 200
+    else:
+        assert stats['transactions'] < 200 and stats['coalesced'] > 0
+
+
+def test_bad_unit_does_not_sink_its_batch(db_path):
+    store = ConversationPersistence(db_path, group_commit_ms=50)
+    first = store.commit(turn_unit(1))
+    duplicate = store.commit(turn_unit(1))  # Same turn_id: primary key conflict
+    last = store.commit(turn_unit(2))
+    assert store.wait(first, 5) and store.wait(last, 5)
+    assert not store.wait(duplicate, 5)
+    store.close()
+    with sqlite3.connect(db_path) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM conversation_turns").fetchone()[0] == 2
+
+
+def stalled_store(db_path, **kwargs):
+    store = ConversationPersistence(db_path, max_pending=2, **kwargs)
+    release = threading.Event()
+    apply = store._apply
+    store._apply = lambda batch: release.wait(10) and apply(batch)  # Stall the writer
+    assert store.commit(turn_unit(0), wait=False)
+    time.sleep(0.1)  # Writer has taken the first unit and is stalled
+    assert all(store.commit(turn_unit(i), wait=False) for i in (1, 2))  # Queue is now full
+    return store, release
+
+
+def count_turns(db_path):
+    with sqlite3.connect(db_path) as conn:
+        return conn.execute("SELECT COUNT(*) FROM conversation_turns").fetchone()[0]
+
+
+def test_full_queue_applies_backpressure_unless_caller_opts_out(db_path):
+    store, release = stalled_store(db_path, group_commit_ms=0)
+    start = time.monotonic()
+    assert store.commit(turn_unit(3), block=False) == 0
+    assert not store.flush(timeout=0.1)  # Times out waiting; never blocks queueing its marker
+    assert time.monotonic() - start < 1.0
+    assert store.get_stats()['queue_full'] == 1
+
+    threading.Timer(0.2, release.set).start()
+    ticket = store.commit(turn_unit(4), wait=False)  # Blocks until the writer makes room
+    assert ticket and store.wait(ticket, 5)
+    store.close()
+    assert count_turns(db_path) == 4
+
+
+def test_sync_turns_are_never_dropped_when_the_queue_is_full(db_path):
+    state_manager = pytest.importorskip("core.state_manager")  # Needs psutil
+    store, release = stalled_store(db_path, durability=DurabilityMode.SYNC)
+    manager = types.SimpleNamespace(_persistence=store)
+
+    async def commit_turns():
+        commits = asyncio.gather(*(state_manager.ContextAwareConversationManager._commit_unit(manager, turn_unit(i))
+                                   for i in range(3, 8)))
+        await asyncio.sleep(0.2)  # Producers wait for room off the event loop
+        release.set()
+        return await commits
+
+    tickets = asyncio.run(commit_turns())
+    assert all(tickets) and len(set(tickets)) == 5
+    assert store.committed_ticket >= max(tickets)
+    store.close()
+    assert count_turns(db_path) == 8
+
+
+@pytest.mark.parametrize("durability", [DurabilityMode.GROUP, DurabilityMode.PERIODIC])
+def test_committed_turns_survive_a_crash(db_path, durability):
+    # The child acknowledges turns as their tickets commit, keeps writing, then dies
+    # without running atexit handlers or closing the database.
+    script = textwrap.dedent(f"""
+        import os, sys
+        sys.path.insert(0, {str(REPO_ROOT)!r})
+        from core.conversation_persistence import ConversationPersistence, DurabilityMode, UnitOfWork
+        store = ConversationPersistence({db_path!r}, durability=DurabilityMode({durability.value!r}),
+                                        group_commit_ms=5, periodic_interval_sec=0.05)
+        for i in range(1, 3001):
+            unit = UnitOfWork()
+            unit.insert({TURN_SQL!r}, (f"turn_{{i}}", "s1", f"message {{i}}"))
+            unit.upsert({PROFILE_SQL!r}, "u1", ("u1", i))
+            ticket = store.commit(unit)
+            if i % 250 == 0:
+                store.wait(ticket)
+            print("committed", store.committed_ticket, flush=True)
+        os._exit(9)
+    """)
+    result = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, timeout=120)
+    assert result.returncode == 9, result.stderr
+    acknowledged = max(int(line.split()[1]) for line in result.stdout.splitlines() if line.startswith("committed"))
+    assert acknowledged >= 2750
+
+    with sqlite3.connect(db_path) as conn:
+        assert conn.execute("PRAGMA integrity_check").fetchone()[0] == "ok"
+        stored = {row[0] for row in conn.execute("SELECT turn_id FROM conversation_turns")}
+        profile_count = conn.execute("SELECT total_interactions FROM user_profiles").fetchone()[0]
+    assert {f"turn_{i}" for i in range(1, acknowledged + 1)} <= stored
+    assert profile_count >= acknowledged
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+AdvancedConversationManager storage tests: appended turns, lazy reload, blob migration.
+"""
+
+import json
+import sqlite3
+
+import pytest
+
+from conversation.dialog_flow import AdvancedConversationManager
+
+TURN_METADATA = {"detected_language": "hi", "intent": "price_inquiry", "sentiment": "positive", "topic": "switches"}
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / "conversation_data.db")
+
+
+def test_turns_are_appended_and_reloaded_page_by_page(db_path):
+    manager = AdvancedConversationManager(db_path)
+    session_id = manager.start_conversation("u1")
+    for i in range(120):
+        manager.add_turn(session_id, f"switch {i} kitne ka hai", f"reply {i}", TURN_METADATA)
+
+    with sqlite3.connect(db_path) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM conversation_turns").fetchone()[0] == 120
+        assert conn.execute("SELECT turn_count, overall_sentiment FROM sessions").fetchone() == (120, "positive")
+
+    # A fresh manager (e.g. after a restart) resumes the unfinished session lazily
+    restarted = AdvancedConversationManager(db_path)
+    restarted.config["turn_page_size"] = 10
+    assert restarted.resume_conversation(session_id)
+    turns = restarted.active_sessions[session_id].turns
+    assert len(turns) == 120 and turns.loaded == 0
+    assert turns[-1].user_input == "switch 119 kitne ka hai"
+    assert [t.turn_id for t in turns[-12:-9]] == [f"{session_id}_{i}" for i in (108, 109, 110)]
+    assert turns.loaded == 20
+
+    restarted.add_turn(session_id, "wire bhi chahiye", "ok", TURN_METADATA)
+    summary = restarted.end_conversation(session_id, satisfaction_score=0.9)
+    assert summary["turn_count"] == 121
+    assert restarted.get_session_turns(session_id, offset=120)[0].user_input == "wire bhi chahiye"
+    assert not restarted.resume_conversation(session_id)  # Ended sessions stay closed
+
+
+def test_legacy_session_blobs_are_migrated(db_path):
+    turns = [{"turn_id": f"s1_{i}", "timestamp": "2025-01-01T10:00:00", "user_input": f"q{i}",
+              "system_response": f"a{i}", "detected_language": "en", "intent": "inquiry",
+              "sentiment": "negative" if i else "positive", "confidence": 0.5, "topic": "wire",
+              "phase": "inquiry", "voice_used": None, "response_time": 0.1, "satisfaction_score": None}
+             for i in range(3)]
+    blob = {"session_id": "s1", "user_id": "u1", "start_time": "2025-01-01T10:00:00",
+            "end_time": "2025-01-01T10:05:00", "turns": turns, "primary_language": "en",
+            "languages_used": ["en"], "topics_discussed": ["wire"], "phases_completed": ["inquiry"],
+            "overall_sentiment": "neutral", "satisfaction_score": 0.8, "business_outcome": "sale",
+            "follow_up_required": False, "summary": "Conversation with 3 turns."}
+    with sqlite3.connect(db_path) as conn:
+        conn.execute("CREATE TABLE conversation_sessions (session_id TEXT PRIMARY KEY, user_id TEXT, "
+                     "session_data TEXT, start_time TIMESTAMP, end_time TIMESTAMP)")
+        conn.execute("INSERT INTO conversation_sessions VALUES (?, ?, ?, ?, ?)",
+                     ("s1", "u1", json.dumps(blob), "2025-01-01 10:00:00", "2025-01-01 10:05:00"))
+
+    manager = AdvancedConversationManager(db_path)
+    session = manager.load_session("s1")
+    assert [t.user_input for t in session.turns] == ["q0", "q1", "q2"]
+    assert session.sentiment_total == -1 and session.business_outcome == "sale"
+    assert session.phases_completed[0].value == "inquiry"
+    with sqlite3.connect(db_path) as conn:
+        assert conn.execute("PRAGMA user_version").fetchone()[0] == 1
+        tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    assert "conversation_sessions" not in tables
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+EmbeddingStore tests: round-trip, reopen, dim checks and several processes sharing one store.
+"""
+
+import subprocess
+import sys
+import textwrap
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from src.embedding_store import EmbeddingStore
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+
+
+@pytest.fixture
+def encode(fake_encoder):
+    return fake_encoder(dim=8)
+
+
+def test_round_trip_and_reopen(encode, tmp_path):
+    store = EmbeddingStore("fake-model", base_dir=str(tmp_path), initial_capacity=2)
+    texts = [f"item {i}" for i in range(5)]
+    matrix = store.get_or_encode(texts + ["item 0"], encode)
+    assert np.array_equal(matrix, encode(texts + ["item 0"]))
+    assert len(store) == 5 and store.stats['misses'] == 5
+    assert store.get_many(["item 3", "unknown"])[1] is None
+
+    reopened = EmbeddingStore("fake-model", base_dir=str(tmp_path))
+    assert len(reopened) == 5 and reopened.dim == 8
+    calls = []
+    again = reopened.get_or_encode(texts, lambda missing: calls.append(missing) or encode(missing))
+    assert calls == [] and np.array_equal(again, encode(texts))
+
+
+def test_dim_mismatch_is_rejected(encode, tmp_path):
+    store = EmbeddingStore("fake-model", base_dir=str(tmp_path))
+    late = EmbeddingStore("fake-model", base_dir=str(tmp_path))  # Opened before any dim was stored
+    store.put_many(["a"], encode(["a"]))
+    with pytest.raises(ValueError):
+        store.put_many(["b"], np.zeros((1, 4), dtype=np.float32))
+    with pytest.raises(ValueError):
+        late.put_many(["c"], np.zeros((1, 4), dtype=np.float32))
+    assert len(EmbeddingStore("fake-model", base_dir=str(tmp_path))) == 1
+
+
+@pytest.mark.parametrize("damage", ["truncate", "delete"])
+def test_damaged_vectors_file_resets_the_store(encode, tmp_path, damage):
+    store = EmbeddingStore("fake-model", base_dir=str(tmp_path))
+    store.put_many(["a", "b"], encode(["a", "b"]))
+    if damage == "truncate":
+        with open(store.vectors_path, "r+b") as f:
+            f.truncate(4)
+    else:
+        store.vectors_path.unlink()
+
+    reopened = EmbeddingStore("fake-model", base_dir=str(tmp_path))
+    assert len(reopened) == 0 and reopened.get_many(["a"]) == [None]
+    assert np.array_equal(reopened.get_or_encode(["a"], encode), encode(["a"]))
+
+
+def test_stores_in_one_process_see_each_others_rows(encode, tmp_path):
+    first = EmbeddingStore("fake-model", base_dir=str(tmp_path))
+    second = EmbeddingStore("fake-model", base_dir=str(tmp_path))
+    first.put_many(["x", "y"], encode(["x", "y"]))
+    second.put_many(["z", "x"], encode(["z", "x"]))
+    assert np.array_equal(first.get_or_encode(["z"], pytest.fail), encode(["z"]))
+    assert np.array_equal(second.get_many(["y"])[0], encode.vector("y"))
+
+
+def test_concurrent_writers_get_distinct_rows(encode, tmp_path):
+    script = textwrap.dedent(f"""
+        import sys
+        sys.path.insert(0, {str(REPO_ROOT)!r})
+        from src.embedding_store import EmbeddingStore
+        from tests.unit.conftest import FakeEncoder
+        worker = int(sys.argv[1])
+        store = EmbeddingStore("fake-model", base_dir={str(tmp_path)!r}, initial_capacity=4)
+        encode = FakeEncoder(dim=8)
+        for batch in range(40):
+            texts = [f"w{{worker}} b{{batch}} t{{i}}" for i in range(3)] + [f"shared {{batch}}"]
+            store.get_or_encode(texts, encode)
+    """)
+    workers = [subprocess.Popen([sys.executable, "-c", script, str(w)], stderr=subprocess.PIPE, text=True)
+               for w in range(4)]
+    for proc in workers:
+        _, err = proc.communicate(timeout=120)
+        assert proc.returncode == 0, err
+
+    store = EmbeddingStore("fake-model", base_dir=str(tmp_path))
+    texts = [f"w{w} b{b} t{i}" for w in range(4) for b in range(40) for i in range(3)]
+    texts += [f"shared {b}" for b in range(40)]
+    assert len(store) == len(texts)
+    assert np.array_equal(store.get_or_encode(texts, pytest.fail), encode(texts))
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+OptimizedKnowledgeRetrieval FAISS row mirrors: vectorized filters and adaptive over-fetch, with a fake encoder.
+"""
+
+import asyncio
+
+import numpy as np
+import pytest
+
+pytest.importorskip("faiss")
+
+from src import optimized_knowledge_retrieval as okr
+from src.optimized_knowledge_retrieval import KnowledgeEntry, OptimizedKnowledgeRetrieval
+
+BASE = np.random.default_rng(0).standard_normal(16)
+
+
+@pytest.fixture
+def model(fake_encoder):
+    # Every text sits close to BASE, so similarity alone can't separate domains
+    return fake_encoder(center=BASE, spread=0.3, normalize=True)
+
+
+async def make_retrieval(tmp_path, entries, model):
+    retrieval = OptimizedKnowledgeRetrieval(db_path=str(tmp_path / "knowledge.db"), similarity_threshold=0.0)
+    retrieval.embedding_model = model
+    for entry in entries:
+        retrieval.knowledge_entries[entry.id] = entry
+    embeddings = await retrieval._generate_embeddings_batch([e.input_text for e in entries])
+    await retrieval._build_faiss_index(embeddings, [e.id for e in entries])
+    return retrieval
+
+
+def make_entries():
+    entries = []
+    for i in range(200):
+        domain = "lighting" if i % 50 == 7 else "general"  # 4 rare rows out of 200
+        entries.append(KnowledgeEntry(id=f"e{i}", input_text=f"question {i}", response_text=f"answer {i}",
+                                      metadata={"domain": domain, "category": "faq" if i % 2 else "price"},
+                                      importance_score=(i % 10) / 10))
+    return entries
+
+
+@pytest.fixture(autouse=True)
+def no_embedding_store(monkeypatch):
+    monkeypatch.setattr(okr, "EMBEDDING_STORE_AVAILABLE", False)
+
+
+def test_filter_mask_matches_apply_filters(model, tmp_path):
+    entries = make_entries()
+    retrieval = asyncio.run(make_retrieval(tmp_path, entries, model))
+    rows = np.arange(len(entries))
+    for filters in ({"domain": "lighting"}, {"category": "faq", "min_importance": 0.5},
+                    {"domain": "general", "category": "price"}, {"domain": "unknown"}, {}):
+        expected = [retrieval._apply_filters(e, filters) for e in entries]
+        assert retrieval._filter_mask(rows, filters).tolist() == expected
+    assert retrieval._row_ids[7] == "e7" and retrieval.knowledge_vectors["e7"] == 7
+
+
+def test_selective_filter_over_fetches_until_top_k(model, tmp_path):
+    async def scenario():
+        retrieval = await make_retrieval(tmp_path, make_entries(), model)
+        searches = retrieval.stats["faiss_searches"]
+        results = await retrieval._semantic_search("question 3", top_k=3, filters={"domain": "lighting"})
+        return retrieval, results, retrieval.stats["faiss_searches"] - searches
+
+    retrieval, results, searches = asyncio.run(scenario())
+    assert len(results) == 3 and all(r.metadata["domain"] == "lighting" for r in results)
+    assert searches <= 2  # Fetch size comes from the filter's selectivity, not a fixed 2x
+    confidences = [r.confidence for r in results]
+    assert confidences == sorted(confidences, reverse=True)
+
+    none = asyncio.run(retrieval._semantic_search("question 3", top_k=3, filters={"domain": "unknown"}))
+    assert none == []
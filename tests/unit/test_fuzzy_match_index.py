@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+UnifiedLearningManager fuzzy matching through the inverted index.
+"""
+
+import json
+import logging
+
+import pytest
+
+from core.adaptation_engine import UnifiedLearningManager
+
+
+@pytest.fixture
+def lm(tmp_path):
+    manager = UnifiedLearningManager(logging.getLogger("test"), knowledge_file=str(tmp_path / "knowledge.json"))
+    manager.backup_enabled = False
+    for question in ["havells switch ka price", "anchor switch ka price", "polycab wire ka rate",
+                     "fan regulator kitne ka hai"]:
+        assert manager.add_knowledge(question, f"answer for {question}")
+    return manager
+
+
+def test_substring_and_exact_matches(lm):
+    assert lm._find_best_match("polycab wire ka rate") == "polycab wire ka rate"
+    assert lm._find_best_match("olycab wire ka rat") == "polycab wire ka rate"
+    assert lm._find_best_match("bhai polycab wire ka rate") == "polycab wire ka rate"
+
+
+def test_word_overlap_prefers_earliest_question_on_ties(lm):
+    # Same score against both switch questions: insertion order decides
+    assert lm._find_best_match("switch ka price batao") == "havells switch ka price"
+    assert lm._find_best_match("regulator fan kitne ka hai") == "fan regulator kitne ka hai"
+    assert lm._find_best_match("random query xyz") is None
+
+
+def test_imported_and_removed_questions_are_indexed(lm, tmp_path):
+    import_file = tmp_path / "import.json"
+    import_file.write_text(json.dumps({"mcb 32 amp ka price": {"answer": "MCB 250"}}), encoding="utf-8")
+    assert lm.import_knowledge(str(import_file)) == (1, 1)
+    assert lm._find_best_match("32 amp mcb ka price") == "mcb 32 amp ka price"
+
+    del lm.knowledge_base["havells switch ka price"]
+    assert lm._find_best_match("switch ka price batao") == "anchor switch ka price"
+
+
+def test_canonical_key_is_a_single_probe(lm, monkeypatch):
+    monkeypatch.setattr(lm, "_find_best_match", lambda query: pytest.fail("fuzzy fallback used"))
+    assert lm.find_answer("Polycab wire ki price kya hai?", update_usage=False) == "answer for polycab wire ka rate"
+    assert lm.find_answer("polycab वायर की कीमत", update_usage=False) == "answer for polycab wire ka rate"
+    assert lm.find_answer("anchor switch ke rate batao", update_usage=False) == "answer for anchor switch ka price"
+
+
+def test_same_size_writes_outside_add_knowledge_are_seen(lm, monkeypatch):
+    assert lm.find_answer("anchor switch ke rate batao", update_usage=False) == "answer for anchor switch ka price"
+    # One removal and one insertion: same length, same dict object
+    del lm.knowledge_base["anchor switch ka price"]
+    lm.knowledge_base["legrand switch ka price"] = {"answer": "Legrand 80", "usage_count": 0}
+    assert lm.find_answer("anchor switch ke rate batao", update_usage=False) != "answer for anchor switch ka price"
+    assert lm.find_answer("legrand switch ki price", update_usage=False) == "Legrand 80"
+    assert "anchor switch ka price" not in lm._match_ids
+
+    monkeypatch.setattr(lm, "_rebuild_match_index", lambda: pytest.fail("index rebuilt"))
+    assert lm.add_knowledge("philips bulb ka price", "Bulb 40")  # Indexed in place
+    assert lm.find_answer("philips bulb ki price", update_usage=False) == "Bulb 40"
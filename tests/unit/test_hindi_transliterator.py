@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+HindiTransliterator tests: single-pass trie output matches the substitute-then-replace version.
+"""
+
+import random
+import re
+
+from nlp.processing.hindi_transliterator import HindiTransliterator, transliterate_hindi_batch
+
+
+def reference_transliterate(mapping, text):
+    """The previous algorithm: multi-character alternation, then one replace per character"""
+    if not text:
+        return ""
+    multi = '|'.join(sorted((k for k in mapping if len(k) > 1), key=len, reverse=True))
+    result = re.sub(multi, lambda m: mapping[m.group()], text)
+    for hindi, english in mapping.items():
+        if len(hindi) == 1:
+            result = result.replace(hindi, english)
+    return ' '.join(result.split()).strip()
+
+
+def test_known_queries():
+    translit = HindiTransliterator()
+    assert translit.transliterate("स्विच का प्राइस कितना है") == "switch ka price kitna hai"
+    assert translit.transliterate("वायर का रेट") == "wire ka rate"
+    assert translit.transliterate("सॉकेट की कीमत") == "socket ki kimt"
+    assert translit.transliterate("  हेलो   दुनिया ") == "helo duniya"
+    assert translit.transliterate("ww वायरस") == "ww wires"  # Keys match inside words, as before
+    assert transliterate_hindi_batch(["फैन कितने का है", "switch", ""]) == ["fan kitne ka hai", "switch", ""]
+
+
+def test_matches_reference_on_random_text():
+    translit = HindiTransliterator(cache_size=64)
+    rng = random.Random(2)
+    keys = list(translit.mapping)
+    alphabet = sorted({c for k in keys for c in k}) + list("ab \t।?0") + ['़', 'ॐ']
+    for _ in range(2000):
+        text = ''.join(rng.choice(keys) if rng.random() < 0.5 else rng.choice(alphabet)
+                       for _ in range(rng.randint(0, 12)))
+        assert translit.transliterate(text) == reference_transliterate(translit.mapping, text)
+    assert translit.cache_info().hits > 0
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+UnifiedLearningManager write-behind journal: answer path I/O, replay and compaction.
+"""
+
+import json
+import logging
+import os
+
+import pytest
+
+from core.adaptation_engine import UnifiedLearningManager
+
+
+def _manager(path):
+    lm = UnifiedLearningManager(logging.getLogger("test"), knowledge_file=str(path))
+    lm.backup_enabled = False
+    return lm
+
+
+@pytest.fixture
+def kb_file(tmp_path):
+    path = tmp_path / "knowledge_base.json"
+    path.write_text(json.dumps({"switch ka price": {"answer": "Switch 50", "usage_count": 0}}), encoding="utf-8")
+    return path
+
+
+def test_answer_path_does_not_rewrite_knowledge_file(kb_file):
+    lm = _manager(kb_file)
+    before = (kb_file.stat().st_mtime_ns, kb_file.read_text(encoding="utf-8"))
+    for _ in range(5):
+        assert lm.find_answer("switch ka price") == "Switch 50"
+    assert (kb_file.stat().st_mtime_ns, kb_file.read_text(encoding="utf-8")) == before
+
+    assert lm._flush_journal()
+    records = [json.loads(line) for line in open(lm.journal_file, encoding="utf-8")]
+    assert records[-1] == {"op": "usage", "q": "switch ka price", "count": 5}
+
+
+def test_journal_is_replayed_after_unclean_shutdown(kb_file):
+    lm = _manager(kb_file)
+    assert lm.add_knowledge("wire ka rate", "Wire 20")
+    lm.find_answer("switch ka price")
+    lm._flush_journal()
+    # No cleanup(): a new process replays the journal and compacts it
+    restarted = _manager(kb_file)
+    assert restarted.find_answer("wire ka rate", update_usage=False) == "Wire 20"
+    assert restarted.knowledge_base["switch ka price"]["usage_count"] == 1
+    assert not os.path.exists(restarted.journal_file)
+    on_disk = json.loads(kb_file.read_text(encoding="utf-8"))
+    assert on_disk["switch ka price"]["usage_count"] == 1 and "wire ka rate" in on_disk
+
+
+def test_replaying_already_compacted_records_is_idempotent(kb_file):
+    lm = _manager(kb_file)
+    lm.find_answer("switch ka price")
+    lm.find_answer("switch ka price")
+    lm._flush_journal()
+    with open(lm.journal_file, encoding="utf-8") as f:
+        journal = f.read()
+    assert lm.flush()
+    # Crash between writing the snapshot and deleting the rotated journal
+    with open(f"{lm.journal_file}.old", "w", encoding="utf-8") as f:
+        f.write(journal)
+    restarted = _manager(kb_file)
+    assert restarted.knowledge_base["switch ka price"]["usage_count"] == 2
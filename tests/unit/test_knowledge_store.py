@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+KnowledgeStore tests: pooled connections and the search/lookup paths.
+"""
+
+import sqlite3
+import threading
+
+import pytest
+
+from src.knowledge_store import KnowledgeStore, _meta_expr
+
+
+@pytest.fixture
+def store(tmp_path):
+    ks = KnowledgeStore(str(tmp_path / "knowledge.db"))
+    ks.add_knowledge({'input': 'switch ka price', 'response': 'Switch 50 rupees', 'domain': 'shop'})
+    ks.add_knowledge({'input': 'wire ka rate', 'response': 'Wire 20 rupees per meter', 'domain': 'shop'})
+    yield ks
+    ks.close()
+
+
+def test_connections_are_reused_per_thread(store):
+    first = store._read_conn()
+    store.get_stats()
+    assert store._read_conn() is first
+
+    seen = []
+    t = threading.Thread(target=lambda: seen.append(store._read_conn()))
+    t.start()
+    t.join()
+    assert seen and seen[0] is not first
+
+
+def test_pragmas_applied_to_query_connections(store):
+    conn = store._read_conn()
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    assert conn.execute("PRAGMA cache_size").fetchone()[0] == -16384
+
+
+def test_read_path_is_read_only(store):
+    with pytest.raises(sqlite3.OperationalError):
+        store._read_conn().execute("DELETE FROM knowledge")
+
+
+def test_writes_are_visible_to_readers(store):
+    row = store.search_fulltext("wire", domain="shop")[0]
+    assert store.update_usage_count(row['id'])
+    assert store.get_knowledge_by_id(row['id'])['usage_count'] == 1
+
+
+def test_misspelled_query_uses_trigram_index(store):
+    if not store._trigram_enabled:
+        pytest.skip("SQLite built without the trigram tokenizer")
+    rows = store.search_fulltext('swich ka price', domain='shop')
+    assert rows and rows[0]['input'] == 'switch ka price'
+    assert rows[0]['_score'] > 0
+
+
+def test_trigram_index_follows_deletes(store):
+    if not store._trigram_enabled:
+        pytest.skip("SQLite built without the trigram tokenizer")
+    kid = store.search_fulltext('wire ka rate')[0]['id']
+    store.delete_knowledge(kid)
+    assert store.search_fuzzy('wyre ka rate') == []
+
+
+def test_fuzzy_ranks_by_product_word_not_shared_fillers(tmp_path):
+    ks = KnowledgeStore(str(tmp_path / "knowledge.db"))
+    if not ks._trigram_enabled:
+        ks.close()
+        pytest.skip("SQLite built without the trigram tokenizer")
+    ks.add_knowledge({'input': 'switch ka price', 'response': 'Switch 50 rupees', 'domain': 'shop'})
+    ks.add_knowledge({'input': 'fan ka rate', 'response': 'Fan 900 rupees', 'domain': 'shop'})
+    ks.add_knowledge({'input': 'wire ka rate', 'response': 'Wire 20 rupees per meter', 'domain': 'shop'})
+
+    assert [r['input'] for r in ks.search_fulltext('fan ka price')] == ['fan ka rate']
+    assert [r['input'] for r in ks.search_fuzzy('fan ka price kya hai')] == ['fan ka rate']
+    assert [r['input'] for r in ks.search_fulltext('swich ka rate')] == ['switch ka price']
+    # The product word matches no row: no answer rather than whichever row shares "ka price"
+    assert ks.search_fulltext('pankha ka price') == []
+    assert ks.search_fuzzy('pankha ka rate') == []
+    ks.close()
+
+
+def test_query_punctuation_is_not_fts_syntax(store):
+    assert store.search_fulltext('switch ka price?')[0]['input'] == 'switch ka price'
+    assert store.search_fulltext('"OR (NEAR') == []
+
+
+def test_metadata_listings_and_json_set_update(store):
+    store.add_knowledge({'input': 'mcb ka rate', 'response': 'MCB 120', 'domain': 'shop',
+                         'validation_status': 'pending', 'source': 'web', 'tags': ['mcb', 'rate']})
+    pending = store.get_pending_knowledge(domain='shop')
+    assert [r['input'] for r in pending] == ['mcb ka rate']
+    kid = pending[0]['id']
+    assert [r['id'] for r in store.find_knowledge(tag='rate')] == [kid]
+    assert [r['id'] for r in store.find_knowledge(source='web', domain='shop')] == [kid]
+
+    assert store.update_metadata(kid, {'validation_status': 'approved', 'tags': ['wiring']})
+    row = store.get_knowledge_by_id(kid)
+    assert (row['validation_status'], row['source'], row['tags']) == ('approved', 'web', ['wiring'])
+    assert store.get_pending_knowledge() == []
+    assert store.find_knowledge(tag='rate') == []
+    assert store.update_metadata(10 ** 6, {'validation_status': 'approved'}) is False
+
+
+def test_metadata_migration_backfills_existing_rows(tmp_path):
+    path = str(tmp_path / "knowledge.db")
+    ks = KnowledgeStore(path)
+    ks.add_knowledge({'input': 'fan', 'response': 'Fan 900', 'tags': ['fan'], 'validation_status': 'pending'})
+    with ks._write_conn() as conn:
+        conn.executescript("""
+            DROP TRIGGER knowledge_tags_ai; DROP TRIGGER knowledge_tags_ad; DROP TRIGGER knowledge_tags_au;
+            DROP TABLE knowledge_tags; DROP INDEX idx_knowledge_validation_status; DROP INDEX idx_knowledge_source;
+            PRAGMA user_version = 1;
+        """)
+    ks.close()
+
+    reopened = KnowledgeStore(path)
+    assert [r['input'] for r in reopened.find_knowledge(tag='fan')] == ['fan']
+    plan = ' '.join(r[3] for r in reopened._read_conn().execute(
+        "EXPLAIN QUERY PLAN SELECT * FROM knowledge k WHERE " + _meta_expr('validation_status', 'k.metadata') + " = ?",
+        ('pending',)))
+    assert 'idx_knowledge_validation_status' in plan
+    reopened.close()
+
+
+def test_read_snapshot_serves_copies_and_refreshes_after_writes(tmp_path):
+    path = str(tmp_path / "knowledge.db")
+    ks = KnowledgeStore(path, read_snapshot=True, snapshot_refresh_sec=60)
+    events = []
+    ks.add_change_listener(lambda event, row: events.append(event))
+    assert ks.get_knowledge_by_domain('shop') == []
+    ks.add_knowledge({'input': 'switch ka price', 'response': 'Switch 50 rupees', 'domain': 'shop',
+                      'tags': ['switch']})
+
+    # Copy-on-write: readers keep the old version until a refresh is published
+    assert ks.search_fulltext('switch ka price') == [] and events == []
+    assert ks.refresh_snapshot()
+    assert events == ['add']
+    row = ks.search_fulltext('switch ka price', domain='shop')[0]
+    assert row['tags'] == ['switch']
+    assert ks.get_knowledge_by_domain('shop')[0]['id'] == row['id']
+
+    ks.get_knowledge_by_id(row['id'])['tags'].append('mutated')
+    ks.get_knowledge_by_id(row['id'])['response'] = 'changed'
+    assert ks.get_knowledge_by_id(row['id'])['response'] == 'Switch 50 rupees'
+    assert ks.get_knowledge_by_id(row['id'])['tags'] == ['switch']
+    assert ks.get_snapshot_stats()['snapshot_version'] == ks.get_snapshot_stats()['version']
+    ks.close()
@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+Tiered language detection: script fast path, n-gram model, escalation to the ensemble.
+"""
+
+import asyncio
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from nlp.models.ngram_language_model import CharNgramLanguageModel, get_language_model
+from src.enhanced_language_detection import DetectionMethod, EnhancedLanguageDetector
+
+
+def test_shipped_model_round_trip(tmp_path):
+    model = get_language_model()
+    assert model is not None and model.classes == ["en", "hi", "other"]
+    texts = ["where can i buy a good ceiling fan", "mujhe naya pankha chahiye", "dónde está la tienda"]
+    assert [label for label, _, _ in model.classify(texts)] == ["en", "hi", "other"]
+
+    path = tmp_path / "model.npz"
+    model.save(path)
+    reloaded = CharNgramLanguageModel.load(path)
+    assert reloaded.classify(texts) == model.classify(texts)
+    assert model.featurize(["", "123 ?!"]).sum() == 0
+
+
+def test_tiers_and_batch():
+    detector = EnhancedLanguageDetector()
+    texts = ["नमस्ते, आप कैसे हैं?", "the bulb in my kitchen is not working",
+             "kal tak wire bhej dena bhai", "Le fusible a encore sauté", ""]
+
+    async def detect():
+        single = [await detector.detect_language_advanced(text) for text in texts]
+        return single, await detector.detect_language_batch(texts)
+
+    single, batch = asyncio.run(detect())
+    assert [(r.detected_language, r.method_used) for r in single[:3]] == [
+        ("hi", DetectionMethod.SCRIPT), ("en", DetectionMethod.NGRAM), ("hi", DetectionMethod.NGRAM)]
+    assert single[3].method_used not in (DetectionMethod.SCRIPT, DetectionMethod.NGRAM)  # Escalated
+    assert [(r.detected_language, r.method_used) for r in batch] == \
+        [(r.detected_language, r.method_used) for r in single]
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Shared lexicon tests: one scan reproduces the per-pattern regex and keyword checks.
+"""
+
+import random
+import re
+
+from nlp.advanced_nlp import AdvancedNLPEngine
+from nlp.processing.lexicon import LexiconEngine, required_literals
+
+WORDS = ["Switch", "wire", "switches", "tube light", "light", "HOW TO", "kitne", "price?", "ſwitch",
+         "नमस्ते", "खराब", "bye", "  ", "!!", "good", "goodbye", "not working", "mcb", "?", "kya"]
+
+
+def test_required_literals():
+    assert required_literals(r"\b(?:not working|doesn\'t work)\b") == ("not working", "doesn't work")
+    assert required_literals(r"^(What|kya)") == ("what", "kya")
+    assert required_literals(r"\?$") == ("?",)
+    assert required_literals(r"(?:\?.*\?|\?{2,})") is None
+
+
+def test_scan_matches_separate_checks():
+    patterns = {
+        "intent": [r"\b(?:price|kitne|how to)\b", r"\?$", r"\b(?:help|madad)\b.*(?:urgent|jaldi)"],
+        "product": [r"\bswitch(?:es)?\b", r"(?:नमस्ते|खराब)"],
+    }
+    keywords = {"switches": ["switch", "switches", "स्विच"], "lighting": ["light", "tube light"]}
+    lexicon = LexiconEngine()
+    lexicon.register_patterns("patterns", patterns, flags=re.IGNORECASE, count=True)
+    lexicon.register_keywords("keywords", keywords)
+    compiled = [(label, re.compile(p, re.IGNORECASE)) for label, ps in patterns.items() for p in ps]
+
+    rng = random.Random(3)
+    for _ in range(500):
+        text = " ".join(rng.choice(WORDS) for _ in range(rng.randint(0, 6)))
+        hits = lexicon.scan(text)
+        expected = [(label, regex.pattern, len(regex.findall(text))) for label, regex in compiled]
+        assert hits.matches("patterns") == [hit for hit in expected if hit[2]]
+        assert hits.matches("keywords") == [(label, keyword, 1) for label, words in keywords.items()
+                                            for keyword in words if keyword in text.lower()]
+
+
+def test_nlp_intent_is_unchanged():
+    engine = AdvancedNLPEngine()
+    rng = random.Random(5)
+    for _ in range(300):
+        text = " ".join(rng.choice(WORDS) for _ in range(rng.randint(1, 5)))
+        text_lower = text.lower().strip()
+        expected = [intent for intent, patterns in engine.intent_patterns.items()
+                    for pattern in patterns if re.search(pattern, text_lower)]
+        assert engine.extract_intent(text).get("all_intents", []) == expected
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+AdvancedMultilingualProcessor: lazy analysis fields, analyze_many and aggregated metrics.
+"""
+
+import asyncio
+
+import pytest
+
+pytest.importorskip("psutil")  # utils.performance_monitor
+
+from nlp.processing.language_detector import AdvancedMultilingualProcessor, Deferred, LanguageCode
+from utils.performance_monitor import MetricAggregator, MetricType
+
+TEXTS = ["Switch ka price kya hai?", "What is the rate of copper wire?", "Thank you, ji. Bahut accha hai.",
+         "मैं एक इलेक्ट्रिकल दुकान खोल रहा हूं।", "", "Switch ka price kya hai?"]
+
+
+def test_lazy_fields_match_concurrent_and_batch():
+    processor = AdvancedMultilingualProcessor(enable_translation=False)
+
+    async def analyze():
+        lazy = [await processor.analyze_text(text) for text in TEXTS]
+        eager = [await processor.analyze_text(text, concurrent=True) for text in TEXTS]
+        return lazy, eager, await processor.analyze_many(TEXTS)
+
+    lazy, eager, batch = asyncio.run(analyze())
+    assert isinstance(vars(lazy[0])["_lazy_segments"], Deferred)  # Not computed until read
+    assert not isinstance(vars(eager[0])["_lazy_segments"], Deferred)
+    for results in (eager, batch):
+        for expected, got in zip(lazy, results):
+            assert (got.primary_language, got.segments, got.is_code_switching, got.transliterated_text) == \
+                (expected.primary_language, expected.segments, expected.is_code_switching,
+                 expected.transliterated_text)
+    assert lazy[0].primary_language == LanguageCode.HINGLISH and lazy[0].transliterated_text
+    assert lazy[4].segments == [] and lazy[4].primary_language == LanguageCode.UNKNOWN
+
+
+def test_failing_stage_falls_back_on_read(monkeypatch):
+    processor = AdvancedMultilingualProcessor(enable_translation=False)
+
+    def boom(*args):
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(processor, "_segment_by_language", boom)
+    monkeypatch.setattr(processor, "_transliterate_hinglish", boom)
+    analysis = asyncio.run(processor.analyze_text(TEXTS[0]))
+    assert (analysis.segments, analysis.is_code_switching, analysis.transliterated_text) == ([], False, None)
+    assert vars(analysis)["_lazy_segments"] == []  # Fallback memoized, stage not retried
+
+
+def test_metric_aggregator_drain():
+    aggregator = MetricAggregator()
+    for value in (3.0, 1.0, 2.0):
+        aggregator.add(MetricType.RESPONSE_TIME, value, "nlp", {"language": "en"})
+    aggregator.add(MetricType.RESPONSE_TIME, 10.0, "nlp", {"language": "hi"})
+    stats = aggregator.get_stats("nlp")["response_time:nlp"]
+    assert (stats["count"], stats["min"], stats["max"], stats["avg"]) == (4, 1.0, 10.0, 4.0)
+
+    _, _, aggregates = aggregator.drain()
+    assert aggregates[(MetricType.RESPONSE_TIME, "nlp", (("language", "en"),))] == [3, 6.0, 1.0, 3.0]
+    assert aggregator.get_stats() == {}
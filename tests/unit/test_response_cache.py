@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+ResponseCache tests: LRU tier, precise invalidation and the shared SQLite tier.
+"""
+
+import time
+
+import pytest
+
+from src.knowledge_store import KnowledgeStore
+from src.response_cache import ResponseCache
+
+
+@pytest.fixture
+def store(tmp_path):
+    ks = KnowledgeStore(str(tmp_path / "knowledge.db"))
+    ks.add_knowledge({'input': 'switch ka price', 'response': 'Switch 50 rupees', 'domain': 'shop'})
+    yield ks
+    ks.close()
+
+
+def _answer(cache, message, domain, reply, source='fts', knowledge_id=None):
+    key = cache.make_key(message, domain)
+    cache.put(key, message, reply, source, knowledge_id, cache.generation)
+    return key
+
+
+def test_normalized_key_and_lru_eviction():
+    cache = ResponseCache(max_entries=2)
+    assert cache.make_key("Switch  KA rate", "shop") == cache.make_key("switch ka price", "shop")
+    a = _answer(cache, "switch ka price", "shop", "50")
+    _answer(cache, "wire ka price", "shop", "20")
+    assert cache.get(a).reply == "50"
+    _answer(cache, "fan ka price", "shop", "900")
+    assert cache.get(cache.make_key("wire ka price", "shop")) is None
+    assert cache.get(a) is not None
+    assert cache.get_stats()['evictions'] == 1
+
+
+def test_knowledge_writes_invalidate_only_matching_entries(store):
+    cache = ResponseCache()
+    store.add_change_listener(cache.on_knowledge_change)
+    row = store.search_fulltext('switch', domain='shop', limit=1)[0]
+    switch = _answer(cache, "switch ka price", "shop", "Switch 50 rupees", knowledge_id=row['id'])
+    fan = _answer(cache, "fan kitne ka", "shop", "Fan 900", knowledge_id=999)
+    other = _answer(cache, "bulb", "tech", "Bulb 30", knowledge_id=998)
+    fallback = _answer(cache, "xyz", "shop", "?", source='fallback')
+
+    store.add_knowledge({'input': 'fan regulator', 'response': 'Regulator 150', 'domain': 'shop'})
+    assert cache.get(fan) is None          # query words occur in the new row
+    assert cache.get(fallback) is None     # fallback answers may now be found
+    assert cache.get(switch) is not None
+    assert cache.get(other) is not None    # different domain
+
+    store.update_metadata(row['id'], {'validation_status': 'approved'})
+    assert cache.get(switch) is None
+    assert cache.get(other) is not None
+
+
+def test_filler_words_do_not_match_every_add(store):
+    cache = ResponseCache()
+    store.add_change_listener(cache.on_knowledge_change)
+    switch = _answer(cache, "switch ka price kya hai", "shop", "Switch 50 rupees", knowledge_id=1)
+    bulb = _answer(cache, "bulb", "shop", "Bulb 30", knowledge_id=2)
+
+    store.add_knowledge({'input': 'wire ka daam kya hai', 'response': 'Wire 20 rupees', 'domain': 'shop'})
+    assert cache.get(switch) is not None
+    store.add_knowledge({'input': 'led bulb ka rate', 'response': 'LED 90', 'domain': 'shop'})
+    assert cache.get(bulb) is None and cache.get(switch) is not None
+
+
+def test_stale_put_after_invalidation_is_dropped():
+    cache = ResponseCache()
+    generation = cache.generation
+    cache.invalidate_row(1)
+    key = cache.make_key("switch ka price", "shop")
+    cache.put(key, "switch ka price", "old", "fts", 1, generation)
+    assert cache.get(key) is None
+
+
+def test_invalidation_during_put_is_not_overwritten(tmp_path):
+    cache = ResponseCache(shared_path=str(tmp_path / "chat_cache.db"), sync_interval=0.0)
+    key = cache.make_key("switch ka price", "shop")
+    generation, seq = cache.generation, cache.shared_seq()
+    put_shared = cache._put_shared
+
+    def slow_shared_write(*args):
+        written = put_shared(*args)
+        cache.invalidate_row(1)  # Lands between put()'s first check and the LRU insert
+        return written
+
+    cache._put_shared = slow_shared_write
+    cache.put(key, "switch ka price", "old", "fts", 1, generation, seq)
+    assert cache.get(key) is None
+    assert cache.get_shared(key) is None
+    cache.close()
+
+
+def test_shared_tier_serves_and_invalidates_across_workers(tmp_path):
+    path = str(tmp_path / "chat_cache.db")
+    worker_a = ResponseCache(shared_path=path, sync_interval=0.0)
+    worker_b = ResponseCache(shared_path=path, sync_interval=0.0)
+    key = _answer(worker_a, "switch ka price", "shop", "Switch 50 rupees", knowledge_id=7)
+
+    assert worker_b.get(key) is None
+    assert worker_b.get_shared(key).reply == "Switch 50 rupees"
+    assert worker_b.get(key) is not None
+
+    worker_a.on_knowledge_change('delete', {'id': 7})
+    worker_b.sync_remote()  # What its sync thread does every sync_interval
+    assert worker_b.get(key) is None
+    assert worker_b.get_shared(key) is None
+    worker_a.close()
+    worker_b.close()
+
+
+def test_sync_thread_applies_remote_invalidations(tmp_path):
+    path = str(tmp_path / "chat_cache.db")
+    worker_a = ResponseCache(shared_path=path, sync_interval=0.02)
+    worker_b = ResponseCache(shared_path=path, sync_interval=0.02)
+    key = _answer(worker_b, "switch ka price", "shop", "Switch 50 rupees", knowledge_id=7)
+    worker_a.invalidate_row(7)
+    deadline = time.monotonic() + 5
+    while worker_b.get(key) is not None and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert worker_b.get(key) is None
+    worker_a.close()
+    worker_b.close()
+    assert not worker_b._sync_thread.is_alive()
+
+
+def test_shared_put_computed_before_another_workers_invalidation_is_dropped(tmp_path):
+    path = str(tmp_path / "chat_cache.db")
+    worker_a = ResponseCache(shared_path=path, sync_interval=60.0)
+    worker_b = ResponseCache(shared_path=path, sync_interval=60.0)
+    key = worker_a.make_key("switch ka price", "shop")
+    generation, seq = worker_a.generation, worker_a.shared_seq()
+
+    worker_b.invalidate_row(7)  # Not yet synced into worker_a: its generation is unchanged
+    worker_a.put(key, "switch ka price", "old", "fts", 7, generation, seq)
+    assert worker_b.get_shared(key) is None
+    assert worker_a.get(key) is None
+
+    generation, seq = worker_a.generation, worker_a.shared_seq()
+    worker_a.put(key, "switch ka price", "new", "fts", 7, generation, seq)
+    assert worker_b.get_shared(key).reply == "new"
+    worker_a.close()
+    worker_b.close()
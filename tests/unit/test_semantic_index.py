@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+SemanticIndex tests with a fake encoder: resident pool hot-swap, incremental apply_changes / sync
+and the BackgroundIndexer.
+"""
+
+import pytest
+
+pytest.importorskip("hnswlib")
+
+from src import semantic_index
+from src.semantic_index import BackgroundIndexer, SemanticIndex, SemanticIndexPool, get_semantic_index_pool
+
+ITEMS = [(1, "switch ka price"), (2, "wire kitne ka hai"), (3, "mcb installation"), (4, "fan regulator")]
+
+
+@pytest.fixture
+def model(monkeypatch, fake_encoder):
+    fake = fake_encoder()
+    monkeypatch.setattr(semantic_index, "ST_AVAILABLE", True)
+    monkeypatch.setitem(semantic_index._models, "fake-model", fake)
+    return fake
+
+
+def make_index(tmp_path):
+    return SemanticIndex(base_dir=str(tmp_path / "index"), model_name="fake-model", use_embedding_store=False)
+
+
+def top_id(si, text, domain="shop"):
+    hits = si.search(text, domain, top_k=1)
+    return hits[0][0] if hits else None
+
+
+def test_pool_hot_swaps_after_save(model, tmp_path):
+    si = make_index(tmp_path)
+    si.build(ITEMS, "shop")
+    pool = get_semantic_index_pool(str(si.base_dir), "fake-model")
+    # Stands in for another worker process: never notified, only polls meta.json
+    polling = SemanticIndexPool(base_dir=str(si.base_dir), model_name="fake-model", check_interval=0.0)
+    assert pool.search("fan regulator", "shop", top_k=1)[0][0] == 4
+    assert polling.search("fan regulator", "shop", top_k=1)[0][0] == 4
+    before = pool.get("shop")
+    assert pool.get("shop") is before and pool.stats["loads"] == 1  # Resident between saves
+
+    si.add_items([(5, "led bulb")], "shop")
+    assert pool.search("led bulb", "shop", top_k=1)[0][0] == 5
+    assert polling.search("led bulb", "shop", top_k=1)[0][0] == 5
+    assert pool.get("shop") is not before and pool.stats["swaps"] == 1
+    assert pool.get_stats()["domains"]["shop"] == {"generation": 2, "count": 5}
+    assert before.knn_query(model.vector("fan regulator"), k=1)[0][0][0] == 4  # Old reference still usable
+
+    results = pool.search_batch(["led bulb", "mcb installation", "x"], ["shop", "shop", "missing"], top_k=1)
+    assert [r[0][0] if r else None for r in results] == [5, 3, None]
+
+
+def test_apply_changes_encodes_only_changed_rows(model, tmp_path):
+    si = make_index(tmp_path)
+    assert si.apply_changes("shop", upserts=ITEMS, deletes=[])  # No index yet: full build
+    assert top_id(si, "mcb installation") == 3
+
+    model.encoded.clear()
+    assert si.apply_changes("shop", upserts=[(2, "wire kitne ka hai"), (5, "led bulb")], deletes=[1])
+    assert model.encoded == ["led bulb"]
+    assert set(si._read_hashes("shop")) == {2, 3, 4, 5}
+    assert top_id(si, "led bulb") == 5
+    assert all(i != 1 for i, _ in si.search("switch ka price", "shop", top_k=4))
+
+    si.add_items([(3, "mcb fitting")], "shop")  # Changed text replaces the vector in place
+    assert top_id(si, "mcb fitting") == 3 and si._read_meta("shop")["count"] == 4
+
+
+def test_sync_diffs_against_stored_hashes(model, tmp_path):
+    si = make_index(tmp_path)
+    assert si.sync(ITEMS, "shop")
+    model.encoded.clear()
+    assert si.sync(ITEMS[1:] + [(6, "extension board")], "shop")
+    assert model.encoded == ["extension board"]
+    assert set(si._read_hashes("shop")) == {2, 3, 4, 6}
+
+
+def test_sync_with_no_rows_clears_the_domain(model, tmp_path):
+    si = make_index(tmp_path)
+    si.sync(ITEMS, "shop")
+    assert top_id(si, "fan regulator") == 4
+
+    assert si.sync([], "shop")
+    assert si._read_hashes("shop") == {} and si._read_meta("shop")["count"] == 0
+    assert si.search("fan regulator", "shop") == []
+
+    model.encoded.clear()
+    assert si.sync([(7, "door bell")], "shop")  # Refills incrementally from the empty index
+    assert model.encoded == ["door bell"] and top_id(si, "door bell") == 7
+    assert si.sync([], "empty")  # Nothing was ever indexed there
+
+
+def test_background_indexer_coalesces_and_clears(model, tmp_path):
+    rows = {"shop": list(ITEMS)}
+    fetched = []
+
+    def fetch_items(domain):
+        fetched.append(domain)
+        return list(rows[domain])
+
+    indexer = BackgroundIndexer(fetch_items, index=make_index(tmp_path), debounce=0.05, max_delay=1.0)
+    try:
+        for _ in range(20):
+            indexer.schedule("shop")
+        assert indexer.flush(timeout=10)
+        assert fetched == ["shop"]
+        assert top_id(indexer.index, "wire kitne ka hai") == 2
+
+        rows["shop"] = []
+        indexer.schedule("shop")
+        assert indexer.flush(timeout=10)
+        assert indexer.index.search("wire kitne ka hai", "shop") == []
+    finally:
+        indexer.shutdown()
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Active session store tests: timer wheel expiry, LRU spill and rehydration.
+"""
+
+from conversation.dialog_flow import AdvancedConversationManager
+from conversation.session_store import TimerWheel
+
+TURN_METADATA = {"detected_language": "hi", "intent": "price_inquiry", "sentiment": "neutral", "topic": "wire"}
+
+
+def test_timer_wheel_expires_only_due_keys():
+    wheel = TimerWheel(tick_seconds=1, wheel_size=8, now=1000)
+    wheel.schedule("a", 1003)
+    wheel.schedule("b", 1005)
+    wheel.schedule("c", 1030)  # Beyond one revolution
+    wheel.schedule("a", 1006)  # Activity pushed a back; its old slot entry is stale
+    wheel.schedule("d", 1004)
+    wheel.cancel("d")
+
+    assert wheel.advance(1004) == []
+    assert sorted(wheel.advance(1006)) == ["a", "b"]
+    assert wheel.advance(1029) == []
+    assert wheel.advance(5000) == ["c"]  # Long pause: one revolution covers it
+    assert len(wheel) == 0
+
+
+def test_idle_sessions_spill_and_rehydrate_on_next_turn(tmp_path):
+    manager = AdvancedConversationManager(str(tmp_path / "conversation_data.db"))
+    manager.active_sessions.max_sessions = 3
+    sessions = [manager.start_conversation(f"walk_in_{i}") for i in range(5)]
+    for session_id in sessions:
+        manager.add_turn(session_id, "wire ka rate", "ok", TURN_METADATA)
+
+    stats = manager.active_sessions.get_stats()
+    assert stats["resident"] == 3 and stats["spilled_now"] == 2
+    assert len(manager.active_sessions) == 5
+
+    # The least recently active session went to disk and comes back on its next turn
+    oldest = sessions[0]
+    assert oldest in manager.active_sessions
+    rehydrated = manager.active_sessions.get_stats()["rehydrated"]
+    manager.add_turn(oldest, "aur mcb?", "ok", TURN_METADATA)
+    assert manager.active_sessions.get_stats()["rehydrated"] == rehydrated + 1
+    assert [t.user_input for t in manager.active_sessions[oldest].turns] == ["wire ka rate", "aur mcb?"]
+    assert manager.end_conversation(oldest)["turn_count"] == 2
+
+
+def test_expiry_follows_last_activity(tmp_path):
+    manager = AdvancedConversationManager(str(tmp_path / "conversation_data.db"))
+    store = manager.active_sessions
+    busy, idle = manager.start_conversation("busy"), manager.start_conversation("idle")
+    start = store.last_activity(busy)
+    store.touch(busy, now=start + 3000)  # Still talking 50 minutes in
+
+    assert store.expire(now=start + 3700) == [idle]
+    assert store.expire(now=start + 6700) == [busy]
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+web_api blocking-work executor: request coalescing and admission control.
+"""
+
+import asyncio
+import threading
+
+import pytest
+
+from src import web_api
+
+
+def test_cancelled_owner_does_not_fail_joined_waiters():
+    release = threading.Event()
+    calls = []
+
+    def compute(keys):
+        calls.append(list(keys))
+        release.wait(5)
+        return [f"result {key}" for key in keys]
+
+    async def scenario():
+        owner = asyncio.ensure_future(web_api._run_coalesced(["k"], compute))
+        await asyncio.sleep(0.05)
+        waiter = asyncio.ensure_future(web_api._run_coalesced(["k"], compute))
+        await asyncio.sleep(0)
+        owner.cancel()
+        await asyncio.sleep(0)
+        release.set()
+        with pytest.raises(asyncio.CancelledError):
+            await owner
+        return await waiter
+
+    assert asyncio.run(scenario()) == ["result k"]
+    assert calls == [["k"]]
+    assert web_api._inflight_calls == {}
+
+
+def test_full_executor_queue_returns_429(monkeypatch):
+    from fastapi.testclient import TestClient
+
+    capacity = web_api._EXECUTOR_WORKERS + web_api._EXECUTOR_QUEUE
+    monkeypatch.setitem(web_api._executor_state, "inflight", capacity)
+    rejected = web_api._executor_state["rejected_total"]
+    client = TestClient(web_api.app)
+
+    r = client.post("/knowledge/search", json={"query": "switch price"})
+    assert r.status_code == 429 and r.headers["Retry-After"] == "1"
+    assert client.get("/health").status_code == 429
+    assert web_api._executor_state["rejected_total"] == rejected + 2
+    assert web_api._inflight_calls == {}  # Rejected keys are not left in flight
+
+    monkeypatch.setitem(web_api._executor_state, "inflight", capacity - 1)
+    assert client.get("/health").status_code == 200
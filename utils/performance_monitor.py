@@ -128,6 +128,54 @@ class ComponentMonitor:
             "uptime_seconds": time.time() - self.start_time
         }
 
+class MetricAggregator:
+    """In-memory count/total/min/max per (metric type, component, context) for hot paths
+
+    Recording is a dict update; the monitoring loop drains the aggregates into
+    the database in one batch instead of one task and INSERT per metric.
+    """
+    
+    def __init__(self):
+        self._aggregates = {}  # (metric_type, component, context items) -> [count, total, min, max]
+        self._window_start = datetime.now()
+        self._lock = threading.Lock()
+    
+    def add(self, metric_type: MetricType, value: float, component: str = "system",
+            context: Dict[str, Any] = None):
+        key = (metric_type, component, tuple(sorted(context.items())) if context else ())
+        with self._lock:
+            aggregate = self._aggregates.get(key)
+            if aggregate is None:
+                self._aggregates[key] = [1, value, value, value]
+            else:
+                aggregate[0] += 1
+                aggregate[1] += value
+                if value < aggregate[2]:
+                    aggregate[2] = value
+                if value > aggregate[3]:
+                    aggregate[3] = value
+    
+    def drain(self) -> tuple:
+        """(window start, window end, aggregates) since the last drain; resets the window"""
+        with self._lock:
+            aggregates, self._aggregates = self._aggregates, {}
+            window_start, self._window_start = self._window_start, datetime.now()
+        return window_start, self._window_start, aggregates
+    
+    def get_stats(self, component: str = None) -> Dict[str, Any]:
+        """Aggregates of the current window, keyed by metric type and component"""
+        stats = defaultdict(lambda: {"count": 0, "total": 0.0, "min": float("inf"), "max": float("-inf")})
+        with self._lock:
+            for (metric_type, name, _), (count, total, low, high) in self._aggregates.items():
+                if component is not None and name != component:
+                    continue
+                entry = stats[f"{metric_type.value}:{name}"]
+                entry["count"] += count
+                entry["total"] += total
+                entry["min"] = min(entry["min"], low)
+                entry["max"] = max(entry["max"], high)
+        return {key: {**entry, "avg": entry["total"] / entry["count"]} for key, entry in stats.items()}
+
 class PerformanceMonitor:
     """Main performance monitoring system"""
     
@@ -145,6 +193,7 @@ class PerformanceMonitor:
         self.components = {}  # Component name -> ComponentMonitor
         self.alert_rules = []
         self.active_alerts = {}  # Rule name -> last alert time
+        self.aggregator = MetricAggregator()  # Hot-path metrics, flushed by the monitoring loop
         
         # System tracking
         self.start_time = datetime.now()
@@ -210,11 +259,28 @@ class PerformanceMonitor:
                     )
                 ''')
                 
+                # Create aggregated metrics table (one row per window and key)
+                conn.execute('''
+                    CREATE TABLE IF NOT EXISTS metric_aggregates (
+                        id INTEGER PRIMARY KEY AUTOINCREMENT,
+                        window_start TEXT NOT NULL,
+                        window_end TEXT NOT NULL,
+                        metric_type TEXT NOT NULL,
+                        component TEXT NOT NULL,
+                        context TEXT,
+                        count INTEGER NOT NULL,
+                        total REAL NOT NULL,
+                        min_value REAL NOT NULL,
+                        max_value REAL NOT NULL
+                    )
+                ''')
+                
                 # Create indexes
                 conn.execute('CREATE INDEX IF NOT EXISTS idx_metrics_timestamp ON metrics(timestamp)')
                 conn.execute('CREATE INDEX IF NOT EXISTS idx_metrics_type ON metrics(metric_type)')
                 conn.execute('CREATE INDEX IF NOT EXISTS idx_metrics_component ON metrics(component)')
                 conn.execute('CREATE INDEX IF NOT EXISTS idx_health_timestamp ON health_snapshots(timestamp)')
+                conn.execute('CREATE INDEX IF NOT EXISTS idx_aggregates_window ON metric_aggregates(window_end)')
                 
             logger.info("📈 Performance database initialized")
             
@@ -307,6 +373,48 @@ class PerformanceMonitor:
         # Check alert rules
         self._check_alerts(metric)
     
+    def aggregate_metric(self,
+                         metric_type: MetricType,
+                         value: float,
+                         component: str = "system",
+                         context: Dict[str, Any] = None):
+        """Record a hot-path metric in memory; stored in batches by flush_aggregates()"""
+        
+        self.aggregator.add(metric_type, value, component, context)
+        
+        # Alert rules still see every value
+        if any(rule.metric_type == metric_type for rule in self.alert_rules):
+            self._check_alerts(PerformanceMetric(
+                timestamp=datetime.now(),
+                metric_type=metric_type,
+                value=value,
+                context=context,
+                component=component
+            ))
+    
+    def flush_aggregates(self) -> int:
+        """Write the aggregated metrics window to the database; returns rows written"""
+        window_start, window_end, aggregates = self.aggregator.drain()
+        if not aggregates:
+            return 0
+        
+        rows = [
+            (window_start.isoformat(), window_end.isoformat(), metric_type.value, component,
+             json.dumps(dict(context)) if context else None, count, total, low, high)
+            for (metric_type, component, context), (count, total, low, high) in aggregates.items()
+        ]
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                conn.executemany('''
+                    INSERT INTO metric_aggregates
+                    (window_start, window_end, metric_type, component, context, count, total, min_value, max_value)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ''', rows)
+            return len(rows)
+        except Exception as e:
+            logger.error(f"Failed to store metric aggregates: {e}")
+            return 0
+    
     async def _store_metric(self, metric: PerformanceMetric):
         """Store metric in database"""
         try:
@@ -461,8 +569,9 @@ class PerformanceMonitor:
                 self.record_metric(MetricType.ERROR_RATE, health.error_rate)
                 self.record_metric(MetricType.CACHE_HIT_RATE, health.cache_hit_rate)
                 
-                # Store health snapshot
+                # Store health snapshot and the aggregated hot-path metrics
                 await self._store_health_snapshot(health)
+                self.flush_aggregates()
                 
                 # Cleanup old data
                 await self._cleanup_old_data()
@@ -520,6 +629,9 @@ class PerformanceMonitor:
                 cursor = conn.execute('DELETE FROM health_snapshots WHERE timestamp < ?', (cutoff_str,))
                 deleted_snapshots = cursor.rowcount
                 
+                # Clean old aggregate windows
+                conn.execute('DELETE FROM metric_aggregates WHERE window_end < ?', (cutoff_str,))
+                
                 if deleted_metrics > 0 or deleted_snapshots > 0:
                     logger.info(f"🧹 Cleaned {deleted_metrics} old metrics, {deleted_snapshots} old snapshots")
                     
@@ -632,6 +744,7 @@ class PerformanceMonitor:
             "health": asdict(health),
             "metrics_summary": metrics_summary,
             "component_stats": component_stats,
+            "aggregated_metrics": self.aggregator.get_stats(),
             "active_alerts": len(self.active_alerts),
             "recommendations": self._get_performance_recommendations(health)
         }
@@ -666,6 +779,7 @@ class PerformanceMonitor:
         
         # Stop monitoring
         self.stop_monitoring()
+        self.flush_aggregates()
         
         # Clear data structures
         with self._lock: